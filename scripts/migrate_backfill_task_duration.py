@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Migration script: Backfill tasks.audio_duration from transcript records
+
+The task list now reads duration from tasks.audio_duration instead of
+loading each task's transcript. New tasks get the transcribed duration
+written with their status updates; this backfills tasks created before
+that change whose upload duration was unknown.
+
+Safe to run multiple times.
+
+Usage:
+    python scripts/migrate_backfill_task_duration.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from src.database.session import session_scope
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def migrate_backfill_task_duration():
+    """Copy transcript duration into tasks.audio_duration where missing"""
+
+    with session_scope() as session:
+        try:
+            logger.info("Backfilling audio_duration from transcript records...")
+            result = session.execute(text("""
+                UPDATE tasks
+                SET audio_duration = (
+                    SELECT duration
+                    FROM transcripts
+                    WHERE transcripts.task_id = tasks.task_id
+                    LIMIT 1
+                )
+                WHERE audio_duration IS NULL
+                AND EXISTS (
+                    SELECT 1 FROM transcripts WHERE transcripts.task_id = tasks.task_id
+                )
+            """))
+            session.commit()
+            logger.info(f"✓ Backfilled audio_duration for {result.rowcount} tasks")
+
+        except Exception as e:
+            logger.error(f"Migration failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    logger.info("Starting migration: Backfill task audio_duration")
+    migrate_backfill_task_duration()
+    logger.info("Migration completed successfully")
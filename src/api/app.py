@@ -49,6 +49,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],  # 任务列表游标分页
     )
 
     # 自定义中间件
@@ -123,7 +124,9 @@ def create_app() -> FastAPI:
         logger.info("Meeting Minutes Agent API shutting down...")
         
         # TODO: 关闭数据库连接
-        # TODO: 关闭 Redis 连接
+        # 关闭任务事件订阅连接
+        from src.utils.task_events import get_task_event_broadcaster
+        await get_task_event_broadcaster().aclose()
         # TODO: 关闭消息队列连接
         
         logger.info("Meeting Minutes Agent API shut down successfully")
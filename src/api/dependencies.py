@@ -12,7 +12,7 @@ from src.config.loader import get_config
 from src.core.providers import LLMProvider
 from src.database.session import get_session
 from src.database.repositories import UserRepository
-from src.providers.gemini_llm import GeminiLLM
+from src.providers.gemini_llm import get_gemini_llm
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -407,7 +407,7 @@ def get_llm_provider() -> LLMProvider:
         LLMProvider: LLM 提供商实例
         
     注意:
-        当前实现返回 GeminiLLM，未来可以根据配置或请求参数
+        当前实现返回进程内共享的 GeminiLLM，未来可以根据配置或请求参数
         动态选择不同的 LLM 提供商（如 OpenAI, Claude 等）
     """
     config = get_config()
@@ -416,4 +416,4 @@ def get_llm_provider() -> LLMProvider:
     # 可以根据配置或请求参数选择不同的提供商
     # 例如: config.default_llm_provider
     
-    return GeminiLLM(config.gemini)
+    return get_gemini_llm(config.gemini)
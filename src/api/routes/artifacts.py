@@ -10,11 +10,15 @@
 - GET /api/v1/tasks/{task_id}/artifacts/{type}/versions - 列出特定类型的所有版本
 - GET /api/v1/tasks/{task_id}/artifacts/{artifact_id} - 获取特定版本详情
 - POST /api/v1/tasks/{task_id}/artifacts/{type}/generate - 生成新版本
+- GET /api/v1/artifacts/{artifact_id}/stream - 流式生成内容推送 (SSE)
 """
 
-from typing import Dict, List, Optional
+from typing import AsyncGenerator, Dict, List, Optional
 from datetime import datetime
+import time
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
 from sqlalchemy.orm import Session
 import uuid
 import json
@@ -41,7 +45,9 @@ from src.database.repositories import (
     TranscriptRepository,
     SpeakerMappingRepository,
 )
+from src.services.artifact_stream import get_artifact_stream_hub
 from src.utils.logger import get_logger
+from src.utils.task_events import get_task_event_broadcaster, publish_task_event
 from src.utils.wecom_notification import get_wecom_service
 from src.config.loader import get_config
 
@@ -95,6 +101,73 @@ def _resolve_task_name(task: Task) -> Optional[str]:
     return None
 
 
+def _flush_partial_content(artifact_id: str, task_id: str, text: str) -> None:
+    """用短生命周期会话写入部分内容,并通知其他进程的 SSE 连接(在线程中执行)"""
+    from src.database.session import session_scope
+
+    with session_scope() as session:
+        ArtifactRepository(session).update_content_and_state(
+            artifact_id=artifact_id,
+            content={"status": "generating", "content": text},
+            state="processing",
+        )
+    # 不带 user_id: 只发往任务频道,不写入用户事件流
+    publish_task_event(
+        task_id, {"type": "artifact", "artifact_id": artifact_id, "state": "processing"}
+    )
+
+
+def _make_stream_callback(
+    artifact_id: str,
+    task_id: str,
+    flush_interval: float,
+):
+    """
+    创建流式生成的增量回调
+
+    增量实时推送给当前进程内的 SSE 订阅者,并每隔 flush_interval 秒把
+    已生成的部分 Markdown 写入 artifact 记录(state 保持 processing)、
+    发布任务事件,供轮询接口和其他进程的 SSE 连接读取。写库在线程中
+    使用独立会话完成,不阻塞事件循环。
+    """
+    hub = get_artifact_stream_hub()
+    last_flush = time.monotonic()
+
+    async def on_delta(text: str) -> None:
+        nonlocal last_flush
+        hub.publish(artifact_id, text)
+        now = time.monotonic()
+        if now - last_flush < flush_interval:
+            return
+        last_flush = now
+        await asyncio.to_thread(
+            _flush_partial_content, artifact_id, task_id, hub.text(artifact_id)
+        )
+
+    return on_delta
+
+
+async def _publish_artifact_status(
+    artifact_repo: ArtifactRepository,
+    artifact_id: str,
+    task_id: str,
+    user_id: str,
+) -> None:
+    """向用户级 SSE 发布 artifact 状态(get_status 的结果)"""
+    status = artifact_repo.get_status(artifact_id)
+    if status:
+        await asyncio.to_thread(
+            publish_task_event,
+            task_id,
+            {"type": "artifact", "user_id": user_id, **status},
+        )
+
+
+def _sse_message(event: str, data: Dict) -> str:
+    """格式化 SSE 消息"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 # ============================================================================
 # Async Generation Background Task
 # ============================================================================
@@ -110,6 +183,7 @@ async def _generate_artifact_async(
     meeting_date: Optional[str],
     meeting_time: Optional[str],
     task_name: str,
+    use_cache: bool = True,
 ):
     """
     异步生成 artifact 内容
@@ -126,6 +200,7 @@ async def _generate_artifact_async(
         meeting_date: 会议日期
         meeting_time: 会议时间
         task_name: 任务名称
+        use_cache: 是否允许使用缓存的生成结果
     """
     from src.database.session import get_session
     from src.database.repositories import (
@@ -136,6 +211,8 @@ async def _generate_artifact_async(
         TaskRepository,
     )
     from src.services.artifact_generation import ArtifactGenerationService
+    from src.services.llm_cache import get_llm_artifact_cache
+    from src.utils.cost import CostTracker
     from src.services.correction import CorrectionService
     from src.core.models import OutputLanguage
     from src.config.loader import get_config
@@ -145,8 +222,11 @@ async def _generate_artifact_async(
     
     # 创建独立的数据库会话
     db = get_session()
+    stream_hub = get_artifact_stream_hub()
     
     try:
+        await _publish_artifact_status(ArtifactRepository(db), artifact_id, task_id, user_id)
+        
         # 获取转写结果
         transcript_repo = TranscriptRepository(db)
         transcript = transcript_repo.get_by_task_id(task_id)
@@ -168,10 +248,10 @@ async def _generate_artifact_async(
             transcript_result = await correction_service.correct_speakers(transcript_result, speaker_mapping)
             logger.info(f"Applied speaker mapping to transcript")
         
-        # 创建 LLM provider
+        # 获取进程内共享的 LLM provider(复用连接池)
         config = get_config()
-        from src.providers.gemini_llm import GeminiLLM
-        llm_provider = GeminiLLM(config.gemini)
+        from src.providers.gemini_llm import get_gemini_llm
+        llm_provider = get_gemini_llm(config.gemini)
         
         # 创建 ArtifactGenerationService
         template_repo = PromptTemplateRepository(db)
@@ -181,8 +261,26 @@ async def _generate_artifact_async(
             llm_provider=llm_provider,
             template_repo=template_repo,
             artifact_repo=artifact_repo,
+            map_reduce_threshold_tokens=(
+                config.map_reduce.threshold_tokens if config.map_reduce.enabled else None
+            ),
+            map_chunk_tokens=config.map_reduce.chunk_tokens,
+            max_map_concurrency=config.map_reduce.max_concurrency,
+            artifact_cache=get_llm_artifact_cache(config.llm_cache),
+            compaction_config=config.transcript_compaction,
+            cost_tracker=CostTracker(config.pricing),
         )
         
+        # 流式生成: 增量推送给 SSE 订阅者并定期写入部分内容
+        stream_callback = None
+        if config.artifact_streaming.enabled:
+            stream_hub.start(artifact_id)
+            stream_callback = _make_stream_callback(
+                artifact_id,
+                task_id,
+                config.artifact_streaming.flush_interval_seconds,
+            )
+        
         # 调用服务生成内容
         output_lang = OutputLanguage.ZH_CN if prompt_instance.language == "zh-CN" else OutputLanguage.EN_US
         generated_artifact = await artifact_service.generate_artifact(
@@ -196,6 +294,8 @@ async def _generate_artifact_async(
             meeting_date=meeting_date,
             meeting_time=meeting_time,
             artifact_id=artifact_id,  # 使用已创建的 artifact_id
+            use_cache=use_cache,
+            stream_callback=stream_callback,
         )
         
         # 更新占位 artifact 的内容和状态
@@ -217,6 +317,17 @@ async def _generate_artifact_async(
             task.last_content_modified_at = datetime.now()
         
         db.commit()
+        await _publish_artifact_status(artifact_repo, artifact_id, task_id, user_id)
+        
+        stream_hub.finish(
+            artifact_id,
+            "complete",
+            {
+                "artifact_id": artifact_id,
+                "state": "success",
+                "content": generated_artifact.get_content_dict(),
+            },
+        )
         
         logger.info(f"Artifact {artifact_id} generated successfully (async)")
         
@@ -254,6 +365,17 @@ async def _generate_artifact_async(
         )
         
         db.commit()
+        await _publish_artifact_status(artifact_repo, artifact_id, task_id, user_id)
+        
+        stream_hub.finish(
+            artifact_id,
+            "error",
+            {
+                "artifact_id": artifact_id,
+                "state": "failed",
+                "error": {"code": error_info.error_code, "message": error_info.error_message},
+            },
+        )
         
         # 发送失败通知
         await _send_failure_notification(
@@ -267,6 +389,8 @@ async def _generate_artifact_async(
         )
         
     finally:
+        # 兜底: 确保订阅者不会一直等待(已正常结束时为空操作)
+        stream_hub.finish(artifact_id, "error", {"artifact_id": artifact_id, "state": "failed"})
         db.close()
 
 
@@ -551,6 +675,213 @@ async def get_artifact_status(
     return status
 
 
+def _read_artifact_stream_state(artifact_id: str) -> Optional[Dict]:
+    """用短生命周期会话读取 artifact 状态和已生成内容(在线程中执行)"""
+    from src.database.session import session_scope
+
+    with session_scope() as session:
+        artifact_repo = ArtifactRepository(session)
+        artifact = artifact_repo.get_by_id(artifact_id)
+        if artifact is None:
+            return None
+        state = {"state": artifact.state, "content": artifact.get_content_dict()}
+        if artifact.state == "failed":
+            state["error"] = (artifact_repo.get_status(artifact_id) or {}).get("error")
+        return state
+
+
+async def artifact_content_stream(
+    artifact_id: str,
+    task_id: str,
+    poll_interval: float = 1.0,
+    max_wait_seconds: float = 600.0,
+) -> AsyncGenerator[str, None]:
+    """
+    生成 artifact 内容的 SSE 流
+    
+    生成在当前进程内进行时直接转发增量;否则订阅任务事件,在生成进程
+    刷新部分内容或结束时读取数据库中的内容,期间一旦本进程开始流式生成
+    即切换为转发。Redis 不可用时降级为定期读取数据库。
+    
+    Args:
+        artifact_id: Artifact ID
+        task_id: Artifact 所属任务 ID(事件按任务分发)
+        poll_interval: 降级轮询数据库的间隔(秒)
+        max_wait_seconds: 最长等待时间(秒)
+        
+    Yields:
+        SSE 格式的消息
+    """
+    subscribed = False
+    try:
+        async with get_task_event_broadcaster().subscribe(task_id) as queue:
+            subscribed = True
+            async for message in _artifact_event_stream(
+                artifact_id, queue, poll_interval, max_wait_seconds
+            ):
+                yield message
+        return
+    except (RedisError, OSError) as e:
+        if subscribed:
+            raise
+        logger.warning(f"SSE: Task events unavailable, polling artifact {artifact_id}: {e}")
+    
+    async for message in _artifact_event_stream(artifact_id, None, poll_interval, max_wait_seconds):
+        yield message
+
+
+async def _artifact_event_stream(
+    artifact_id: str,
+    queue: Optional[asyncio.Queue],
+    poll_interval: float,
+    max_wait_seconds: float,
+    heartbeat_seconds: float = 15,
+) -> AsyncGenerator[str, None]:
+    """
+    artifact 内容 SSE 流的主体
+
+    Args:
+        artifact_id: Artifact ID
+        queue: 已订阅的任务事件队列,None 表示按 poll_interval 轮询
+        poll_interval: 轮询间隔(秒)
+        max_wait_seconds: 最长等待时间(秒)
+        heartbeat_seconds: 无事件时发送心跳注释的间隔(秒)
+
+    Yields:
+        SSE 格式的消息
+    """
+    hub = get_artifact_stream_hub()
+    sent_text = None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_seconds
+    
+    while loop.time() < deadline:
+        subscription = hub.subscribe(artifact_id)
+        if subscription is not None:
+            snapshot, hub_queue = subscription
+            try:
+                yield _sse_message("snapshot", {"artifact_id": artifact_id, "text": snapshot})
+                while True:
+                    try:
+                        event, data = await asyncio.wait_for(
+                            hub_queue.get(), timeout=max(deadline - loop.time(), 0.001)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                    yield _sse_message(event, data)
+                    if event != "delta":
+                        return
+            finally:
+                hub.unsubscribe(artifact_id, hub_queue)
+            break
+        
+        # 生成不在本进程内: 读取数据库中的部分内容
+        artifact = await asyncio.to_thread(_read_artifact_stream_state, artifact_id)
+        if artifact is None:
+            yield _sse_message("error", {"artifact_id": artifact_id, "error": "Artifact not found"})
+            return
+        
+        if artifact["state"] == "success":
+            yield _sse_message(
+                "complete",
+                {"artifact_id": artifact_id, "state": "success", "content": artifact["content"]},
+            )
+            return
+        if artifact["state"] == "failed":
+            yield _sse_message(
+                "error",
+                {"artifact_id": artifact_id, "state": "failed", "error": artifact.get("error")},
+            )
+            return
+        
+        partial = artifact["content"].get("content") or ""
+        if sent_text is None or not partial.startswith(sent_text):
+            yield _sse_message("snapshot", {"artifact_id": artifact_id, "text": partial})
+        elif len(partial) > len(sent_text):
+            yield _sse_message("delta", {"text": partial[len(sent_text):]})
+        sent_text = partial
+        
+        if queue is None:
+            await asyncio.sleep(poll_interval)
+            continue
+        
+        # 等待本 artifact 的下一个事件(None 表示订阅中断过,重新读取)
+        while loop.time() < deadline:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=min(deadline - loop.time(), heartbeat_seconds)
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None or (
+                event.get("type") == "artifact" and event.get("artifact_id") == artifact_id
+            ):
+                break
+    
+    yield _sse_message("timeout", {"artifact_id": artifact_id, "message": "Stream timeout"})
+    logger.warning(f"SSE: Artifact {artifact_id} stream timeout after {max_wait_seconds} seconds")
+
+
+@standalone_router.get("/{artifact_id}/stream")
+async def stream_artifact_content(
+    artifact_id: str,
+    user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """
+    流式推送 artifact 生成内容 (SSE)
+    
+    替代 /status 轮询:生成过程中实时推送新增的 Markdown。
+    
+    **事件类型:**
+    - `snapshot`: 当前已生成的全文(客户端替换已显示内容)
+    - `delta`: 新增文本(追加到已显示内容)
+    - `complete`: 生成完成,包含最终内容
+    - `error`: 生成失败
+    - `timeout`: 超时
+    
+    Args:
+        artifact_id: Artifact ID
+        user_id: 当前用户 ID (来自依赖注入)
+        db: 数据库会话
+        
+    Returns:
+        StreamingResponse: SSE 流
+        
+    Raises:
+        HTTPException: 404 如果 artifact 不存在
+        HTTPException: 403 如果无权访问
+    """
+    artifact_repo = ArtifactRepository(db)
+    artifact = artifact_repo.get_by_id(artifact_id)
+    
+    if not artifact:
+        raise HTTPException(status_code=404, detail="Artifact 不存在")
+    
+    task_repo = TaskRepository(db)
+    task = task_repo.get_by_id(artifact.task_id)
+    
+    if not task:
+        raise HTTPException(status_code=404, detail="关联的任务不存在")
+    
+    if task.user_id != user_id:
+        raise HTTPException(status_code=403, detail="无权访问此 artifact")
+    
+    task_id = task.task_id
+    db.close()  # 释放请求会话,流中只用短生命周期会话读取
+    
+    return StreamingResponse(
+        artifact_content_stream(artifact_id, task_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # 禁用 Nginx 缓冲
+        },
+    )
+
+
 @standalone_router.put("/{artifact_id}")
 async def update_artifact(
     artifact_id: str,
@@ -772,6 +1103,7 @@ async def generate_artifact(
         meeting_date=task.meeting_date,
         meeting_time=task.meeting_time,
         task_name=_resolve_task_name(task),
+        use_cache=request.use_cache,
     ))
     
     # 立即返回占位响应
@@ -31,6 +31,7 @@ from src.database.repositories import (
 )
 from src.services.artifact_generation import ArtifactGenerationService
 from src.utils.logger import get_logger
+from src.utils.task_status_cache import get_task_status_cache
 from src.utils.wecom_notification import get_wecom_service
 from src.config.loader import get_config
 
@@ -335,6 +336,7 @@ async def regenerate_artifact(
         meeting_date=task.meeting_date,
         meeting_time=task.meeting_time,
         task_name=_resolve_task_name(task),
+        use_cache=request.use_cache,
     ))
     
     # 立即返回占位响应
@@ -454,6 +456,9 @@ async def confirm_task(
     # 提交数据库事务
     db.commit()
     
+    # 提交后刷新状态缓存
+    get_task_status_cache().write(task.task_id, task_repo.get_status_payload(confirmed_task))
+    
     logger.info(f"Task {task.task_id} confirmed and archived successfully")
     
     return ConfirmTaskResponse(
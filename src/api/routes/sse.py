@@ -1,19 +1,40 @@
 """Server-Sent Events (SSE) for real-time task progress updates."""
 import asyncio
 import json
-from typing import AsyncGenerator
-from fastapi import APIRouter, Depends, HTTPException
+from typing import AsyncGenerator, Dict, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException
 from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
 from sqlalchemy.orm import Session
 
 from src.api.dependencies import get_current_user_id, get_db
-from src.database.repositories import TaskRepository
+from src.database.repositories import ArtifactRepository, TaskRepository
 from src.utils.logger import get_logger
+from src.utils.task_events import get_task_event_broadcaster, stream_id_key
 
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["SSE"])
 
+TERMINAL_STATES = ("success", "failed", "partial_success")
+
+
+def _read_task_progress(task_id: str) -> Optional[Dict]:
+    """用短生命周期会话读取任务当前进度(订阅中断后重新同步用)"""
+    from src.database.session import session_scope
+    
+    with session_scope() as session:
+        task = TaskRepository(session).get_by_id(task_id)
+        if not task:
+            return None
+        return {
+            "state": task.state,
+            "progress": task.progress,
+            "estimated_time": task.estimated_time,
+            "error_details": task.error_details,
+            "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+        }
+
 
 async def task_progress_stream(
     task_id: str,
@@ -23,6 +44,135 @@ async def task_progress_stream(
     """
     生成任务进度的 SSE 流
     
+    订阅任务状态变化事件,只在状态变化时推送;Redis 不可用时降级为
+    每秒轮询数据库。
+    
+    Args:
+        task_id: 任务 ID
+        user_id: 用户 ID
+        db: 数据库会话
+        
+    Yields:
+        SSE 格式的消息
+    """
+    subscribed = False
+    try:
+        async with get_task_event_broadcaster().subscribe(task_id) as queue:
+            subscribed = True
+            async for message in _task_event_stream(task_id, user_id, db, queue):
+                yield message
+        return
+    except (RedisError, OSError) as e:
+        if subscribed:
+            raise
+        logger.warning(f"SSE: Task events unavailable, falling back to polling: {e}")
+    
+    async for message in _poll_task_progress(task_id, user_id, db):
+        yield message
+
+
+async def _task_event_stream(
+    task_id: str,
+    user_id: str,
+    db: Session,
+    queue: asyncio.Queue,
+    max_wait_seconds: float = 600,
+    heartbeat_seconds: float = 15,
+) -> AsyncGenerator[str, None]:
+    """
+    基于任务事件的 SSE 流
+    
+    先订阅再读取初始状态,避免漏掉两者之间的变化。读取后立即释放
+    请求级数据库会话,之后只消费事件,不再查询数据库。
+    
+    Args:
+        task_id: 任务 ID
+        user_id: 用户 ID
+        db: 数据库会话
+        queue: 已订阅的事件队列
+        max_wait_seconds: 最长推送时间(秒)
+        heartbeat_seconds: 无事件时发送心跳注释的间隔(秒)
+        
+    Yields:
+        SSE 格式的消息
+    """
+    task = TaskRepository(db).get_by_id(task_id)
+    if not task:
+        yield f"event: error\ndata: {json.dumps({'error': 'Task not found'})}\n\n"
+        return
+    
+    if task.user_id != user_id:
+        yield f"event: error\ndata: {json.dumps({'error': 'Unauthorized'})}\n\n"
+        return
+    
+    initial_data = {
+        "task_id": task_id,
+        "state": task.state,
+        "progress": task.progress,
+        "estimated_time": task.estimated_time,
+        "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+    }
+    db.close()  # 释放连接,之后的更新全部来自事件
+    
+    yield f"event: progress\ndata: {json.dumps(initial_data)}\n\n"
+    if initial_data["state"] in TERMINAL_STATES:
+        yield f"event: complete\ndata: {json.dumps({'state': initial_data['state']})}\n\n"
+        return
+    
+    last_key = (initial_data["state"], initial_data["progress"], initial_data["updated_at"])
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_seconds
+    
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            yield f"event: timeout\ndata: {json.dumps({'message': 'Stream timeout'})}\n\n"
+            logger.warning(f"SSE: Task {task_id} stream timeout after {max_wait_seconds} seconds")
+            return
+        
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=min(remaining, heartbeat_seconds))
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        
+        if event is not None and event.get("type") == "artifact":
+            continue
+        if event is None:
+            # 订阅连接中断过,重新读取一次当前状态
+            event = await asyncio.to_thread(_read_task_progress, task_id)
+            if event is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'Task disappeared'})}\n\n"
+                return
+        
+        key = (event.get("state"), event.get("progress"), event.get("updated_at"))
+        if key != last_key:
+            data = {
+                "task_id": task_id,
+                "state": event.get("state"),
+                "progress": event.get("progress"),
+                "estimated_time": event.get("estimated_time"),
+                "error_details": event.get("error_details"),
+                "updated_at": event.get("updated_at"),
+            }
+            yield f"event: progress\ndata: {json.dumps(data)}\n\n"
+            last_key = key
+            logger.info(f"SSE: Task {task_id} progress update - {data['state']} {data['progress']}%")
+        
+        if event.get("state") in TERMINAL_STATES:
+            yield f"event: complete\ndata: {json.dumps({'state': event['state']})}\n\n"
+            logger.info(f"SSE: Task {task_id} completed, closing stream")
+            return
+
+
+async def _poll_task_progress(
+    task_id: str,
+    user_id: str,
+    db: Session,
+) -> AsyncGenerator[str, None]:
+    """
+    轮询数据库的任务进度 SSE 流(Redis 不可用时的降级方案)
+    
     Args:
         task_id: 任务 ID
         user_id: 用户 ID
@@ -98,7 +248,7 @@ async def task_progress_stream(
             logger.info(f"SSE: Task {task_id} progress update - {task.state} {task.progress}%")
         
         # 任务完成，关闭连接
-        if task.state in ["success", "failed", "partial_success"]:
+        if task.state in TERMINAL_STATES:
             yield f"event: complete\ndata: {json.dumps({'state': task.state})}\n\n"
             logger.info(f"SSE: Task {task_id} completed, closing stream")
             break
@@ -118,6 +268,7 @@ async def stream_task_progress(
     实时推送任务进度更新 (SSE)
     
     使用 Server-Sent Events 推送任务状态变化，无需前端轮询。
+    状态变化由 Redis 事件驱动,每个 API 进程共用一个订阅连接,连接期间不查询数据库。
     
     **连接方式:**
     ```javascript
@@ -166,3 +317,300 @@ async def stream_task_progress(
             "X-Accel-Buffering": "no",  # 禁用 Nginx 缓冲
         },
     )
+
+
+# ============================================================================
+# 用户级多路复用进度流
+# ============================================================================
+
+# 任务进度事件中推送给前端的字段
+_TASK_EVENT_FIELDS = (
+    "task_id",
+    "state",
+    "progress",
+    "estimated_time",
+    "error_code",
+    "error_message",
+    "error_details",
+    "updated_at",
+)
+
+
+def _read_user_snapshot(user_id: str) -> Dict:
+    """用短生命周期会话读取用户所有处理中任务和生成中衍生内容的当前状态"""
+    from src.database.session import session_scope
+    
+    with session_scope() as session:
+        tasks = [
+            {
+                "task_id": task.task_id,
+                "state": task.state,
+                "progress": task.progress,
+                "estimated_time": task.estimated_time,
+                "error_details": task.error_details,
+                "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+            }
+            for task in TaskRepository(session).get_active_by_user(user_id)
+        ]
+        artifact_repo = ArtifactRepository(session)
+        artifacts = []
+        for record in artifact_repo.get_processing_by_user(user_id):
+            status = artifact_repo.get_status(record.artifact_id)
+            if status:
+                artifacts.append({"task_id": record.task_id, **status})
+        return {"tasks": tasks, "artifacts": artifacts}
+
+
+def _user_event_message(event: Dict) -> str:
+    """把任务/衍生内容事件格式化为带 ID 的 SSE 消息"""
+    if event.get("type") == "artifact":
+        name = "artifact"
+        data = {k: v for k, v in event.items() if k not in ("type", "user_id", "event_id")}
+    else:
+        name = "progress"
+        data = {k: event.get(k) for k in _TASK_EVENT_FIELDS if k in event}
+    event_id = event.get("event_id")
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _snapshot_message(snapshot: Dict, event_id: Optional[str]) -> str:
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: snapshot\ndata: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+
+
+async def user_progress_stream(
+    user_id: str,
+    last_event_id: Optional[str] = None,
+    max_wait_seconds: float = 1800,
+    heartbeat_seconds: float = 15,
+) -> AsyncGenerator[str, None]:
+    """
+    生成用户级进度 SSE 流(所有处理中任务和生成中衍生内容)
+    
+    - 新连接: 先发送 snapshot 事件(当前全部状态),之后推送变化
+    - 断线重连: 按 Last-Event-ID 从用户事件流补发期间的事件;
+      ID 过旧或无效时改发 snapshot
+    - 到达 max_wait_seconds 后正常结束,浏览器 EventSource 会带着
+      Last-Event-ID 自动重连
+    
+    Redis 不可用时降级为定期读取快照并推送差异。
+    
+    Args:
+        user_id: 用户 ID
+        last_event_id: 客户端收到的最后一个事件 ID
+        max_wait_seconds: 单次连接最长时间(秒)
+        heartbeat_seconds: 无事件时发送心跳注释的间隔(秒)
+        
+    Yields:
+        SSE 格式的消息
+    """
+    broadcaster = get_task_event_broadcaster()
+    subscribed = False
+    try:
+        async with broadcaster.subscribe_user(user_id) as queue:
+            subscribed = True
+            async for message in _user_event_stream(
+                broadcaster, user_id, queue, last_event_id, max_wait_seconds, heartbeat_seconds
+            ):
+                yield message
+        return
+    except (RedisError, OSError) as e:
+        if subscribed:
+            raise
+        logger.warning(f"SSE: User events unavailable, falling back to polling: {e}")
+    
+    async for message in _poll_user_progress(user_id, max_wait_seconds):
+        yield message
+
+
+def _user_event_entity(event: Dict) -> Tuple[str, Optional[str]]:
+    """事件对应的任务或衍生内容(按实体去重的键)"""
+    if event.get("type") == "artifact":
+        return "artifact", event.get("artifact_id")
+    return "task", event.get("task_id")
+
+
+async def _user_stream_cursor(broadcaster, user_id: str) -> Optional[str]:
+    """读取快照前的用户事件流位置;读取失败时返回 None(快照不带 ID,之后的事件全部推送)"""
+    try:
+        return await broadcaster.last_user_event_id(user_id)
+    except (RedisError, OSError) as e:
+        logger.warning(f"SSE: Failed to read user event cursor for {user_id}: {e}")
+        return None
+
+
+async def _user_event_stream(
+    broadcaster,
+    user_id: str,
+    queue: asyncio.Queue,
+    last_event_id: Optional[str],
+    max_wait_seconds: float,
+    heartbeat_seconds: float,
+) -> AsyncGenerator[str, None]:
+    """基于用户事件的 SSE 流(已订阅后调用,先补发或快照,再推送实时事件)"""
+    yield "retry: 3000\n\n"
+    
+    replayed = None
+    if last_event_id:
+        try:
+            replayed = await broadcaster.replay_user_events(user_id, last_event_id)
+        except (RedisError, OSError) as e:
+            logger.warning(f"SSE: Failed to replay user events for {user_id}: {e}")
+    
+    # base: 补发或快照已覆盖的位置(不晚于它的事件都跳过)
+    # latest: 每个任务/衍生内容已推送的最新事件 ID。不同发布者的 XADD 和 PUBLISH
+    # 不是原子的,pub/sub 到达顺序可能与流 ID 顺序不同,因此只按实体去重,
+    # 不能用全局游标丢弃 ID 更小但属于其他实体的事件
+    latest: Dict[Tuple[str, Optional[str]], Tuple[int, int]] = {}
+    if replayed is None:
+        base = await _user_stream_cursor(broadcaster, user_id)
+        snapshot = await asyncio.to_thread(_read_user_snapshot, user_id)
+        yield _snapshot_message(snapshot, base)
+    else:
+        base = last_event_id
+        for event in replayed:
+            yield _user_event_message(event)
+            latest[_user_event_entity(event)] = stream_id_key(event["event_id"])
+        if replayed:
+            base = replayed[-1]["event_id"]
+    base_key = stream_id_key(base) if base else None
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_seconds
+    
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return
+        
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=min(remaining, heartbeat_seconds))
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        
+        if event is None:
+            # 订阅连接中断过,期间的事件可能丢失,重新发送快照
+            base = await _user_stream_cursor(broadcaster, user_id)
+            base_key = stream_id_key(base) if base else None
+            latest = {}
+            snapshot = await asyncio.to_thread(_read_user_snapshot, user_id)
+            yield _snapshot_message(snapshot, base)
+            continue
+        
+        event_id = event.get("event_id")
+        if event_id:
+            key = stream_id_key(event_id)
+            entity = _user_event_entity(event)
+            # 跳过补发或快照已覆盖的事件,以及同一实体已有更新状态的过期事件
+            if base_key and key <= base_key:
+                continue
+            if entity in latest and key <= latest[entity]:
+                continue
+            latest[entity] = key
+        
+        yield _user_event_message(event)
+
+
+async def _poll_user_progress(
+    user_id: str,
+    max_wait_seconds: float,
+    poll_interval: float = 2.0,
+) -> AsyncGenerator[str, None]:
+    """定期读取快照并推送差异的用户级 SSE 流(Redis 不可用时的降级方案)"""
+    snapshot = await asyncio.to_thread(_read_user_snapshot, user_id)
+    yield _snapshot_message(snapshot, None)
+    
+    tasks = {t["task_id"]: t for t in snapshot["tasks"]}
+    artifacts = {a["artifact_id"]: a for a in snapshot["artifacts"]}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_seconds
+    
+    while loop.time() < deadline:
+        await asyncio.sleep(poll_interval)
+        snapshot = await asyncio.to_thread(_read_user_snapshot, user_id)
+        current_tasks = {t["task_id"]: t for t in snapshot["tasks"]}
+        current_artifacts = {a["artifact_id"]: a for a in snapshot["artifacts"]}
+        
+        for task_id, task in current_tasks.items():
+            if tasks.get(task_id) != task:
+                yield _user_event_message(task)
+        for artifact_id, artifact in current_artifacts.items():
+            if artifacts.get(artifact_id) != artifact:
+                yield _user_event_message({"type": "artifact", **artifact})
+        
+        # 不再处于处理中的任务/衍生内容: 读取一次最终状态
+        finished_tasks = tasks.keys() - current_tasks.keys()
+        finished_artifacts = artifacts.keys() - current_artifacts.keys()
+        if finished_tasks or finished_artifacts:
+            for message in await asyncio.to_thread(
+                _read_finished_messages, finished_tasks, artifacts, finished_artifacts
+            ):
+                yield message
+        
+        tasks, artifacts = current_tasks, current_artifacts
+
+
+def _read_finished_messages(task_ids, artifacts: Dict[str, Dict], artifact_ids) -> list:
+    from src.database.session import session_scope
+    
+    messages = []
+    with session_scope() as session:
+        for task_id in task_ids:
+            event = None
+            task = TaskRepository(session).get_by_id(task_id)
+            if task:
+                event = {
+                    "task_id": task_id,
+                    "state": task.state,
+                    "progress": task.progress,
+                    "estimated_time": task.estimated_time,
+                    "error_details": task.error_details,
+                    "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+                }
+                messages.append(_user_event_message(event))
+        artifact_repo = ArtifactRepository(session)
+        for artifact_id in artifact_ids:
+            status = artifact_repo.get_status(artifact_id)
+            if status:
+                task_id = artifacts[artifact_id]["task_id"]
+                messages.append(
+                    _user_event_message({"type": "artifact", "task_id": task_id, **status})
+                )
+    return messages
+
+
+@router.get("/users/me/progress")
+async def stream_user_progress(
+    user_id: str = Depends(get_current_user_id),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    实时推送当前用户所有处理中任务和生成中衍生内容的状态 (SSE)
+    
+    一个浏览器标签页只需一个连接,替代为每个任务打开
+    `/sse/tasks/{task_id}/progress`。
+    
+    **事件类型(每个事件带 `id`,断线重连时浏览器自动通过
+    `Last-Event-ID` 续传):**
+    - `snapshot`: 当前全部状态 `{"tasks": [...], "artifacts": [...]}`,客户端替换本地状态
+    - `progress`: 单个任务的状态变化
+    - `artifact`: 单个衍生内容的生成状态变化(与 /artifacts/{id}/status 返回格式一致,附 task_id)
+    
+    Args:
+        user_id: 当前用户 ID
+        last_event_id: 最后收到的事件 ID(Last-Event-ID 请求头)
+        
+    Returns:
+        StreamingResponse: SSE 流
+    """
+    return StreamingResponse(
+        user_progress_stream(user_id, last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # 禁用 Nginx 缓冲
+        },
+    )
@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 """Task management endpoints."""
 
-import json
+import base64
 import os
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, load_only, raiseload
 import redis
 
 from src.api.dependencies import get_db, get_current_user_id, get_current_tenant_id, verify_task_ownership
@@ -24,9 +26,10 @@ from src.api.schemas import (
     TranscriptSegment,
 )
 from src.core.models import TaskState
-from src.database.models import Task
+from src.database.models import Task, TranscriptRecord
 from src.database.repositories import TaskRepository
 from src.utils.logger import get_logger
+from src.utils.task_status_cache import TaskStatusCache, get_task_status_cache
 from src.queue.manager import QueueManager, QueueBackend
 
 logger = get_logger(__name__)
@@ -189,15 +192,15 @@ async def get_task_status(
     task_id: str,
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
-    redis_client: Optional[redis.Redis] = Depends(get_redis_client),
+    status_cache: TaskStatusCache = Depends(get_task_status_cache),
 ):
     """
     查询任务状态
     
-    实现 Cache-Aside 模式:
+    缓存由 worker 在每次状态变化后写入(write-through),轮询几乎总能命中:
     1. 先查 Redis 缓存
     2. Cache Miss 则查数据库
-    3. 回填缓存(TTL 60秒)
+    3. 按版本回填缓存(不会覆盖 worker 已写入的更新状态)
     
     注意: 此端点保留手动检查以优化缓存性能。
     缓存命中时避免额外的数据库查询。
@@ -206,7 +209,7 @@ async def get_task_status(
         task_id: 任务 ID
         user_id: 用户 ID (来自认证)
         db: 数据库会话
-        redis_client: Redis 客户端(可选)
+        status_cache: 任务状态缓存
         
     Returns:
         TaskStatusResponse: 任务状态信息
@@ -215,105 +218,41 @@ async def get_task_status(
         HTTPException: 404 如果任务不存在
         HTTPException: 403 如果无权访问
     """
-    cache_key = f"task_status:{task_id}"
-    
     # 1. 尝试从 Redis 缓存读取
-    if redis_client:
-        try:
-            cached_data = redis_client.get(cache_key)
-            if cached_data:
-                logger.debug(f"Cache hit for task {task_id}")
-                data = json.loads(cached_data)
-                
-                # 验证权限(缓存中也需要验证)
-                if data.get("user_id") != user_id:
-                    raise HTTPException(status_code=403, detail="无权访问此任务")
-                
-                return TaskStatusResponse(
-                    task_id=data["task_id"],
-                    state=TaskState(data["state"]),
-                    progress=data.get("progress", 0.0),
-                    estimated_time=data.get("estimated_time"),
-                    audio_duration=data.get("audio_duration"),
-                    asr_language=data.get("asr_language"),
-                    error_code=data.get("error_code"),
-                    error_message=data.get("error_message"),
-                    error_details=data.get("error_details"),
-                    retryable=data.get("retryable"),
-                    updated_at=data["updated_at"],
-                )
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to decode cached data for task {task_id}: {e}")
-        except Exception as e:
-            logger.warning(f"Redis cache read failed for task {task_id}: {e}")
-    
-    # 2. Cache Miss,查询数据库
-    logger.debug(f"Cache miss for task {task_id}, querying database")
-    task_repo = TaskRepository(db)
-    task = task_repo.get_by_id(task_id)
+    data = status_cache.get(task_id)
     
-    if not task:
-        raise HTTPException(status_code=404, detail="任务不存在")
+    if data is None:
+        # 2. Cache Miss,查询数据库
+        logger.debug(f"Cache miss for task {task_id}, querying database")
+        task_repo = TaskRepository(db)
+        task = task_repo.get_by_id(task_id)
+        
+        if not task:
+            raise HTTPException(status_code=404, detail="任务不存在")
+        
+        data = task_repo.get_status_payload(task)
+        
+        # 3. 回填缓存
+        status_cache.write(task_id, data)
+    else:
+        logger.debug(f"Cache hit for task {task_id}")
     
-    # 验证权限
-    if task.user_id != user_id:
+    # 验证权限(缓存中也需要验证)
+    if data.get("user_id") != user_id:
         raise HTTPException(status_code=403, detail="无权访问此任务")
     
-    # 获取音频时长（优先从 Task 模型，如果没有则从转写记录）
-    audio_duration = task.audio_duration
-    if audio_duration is None and task.transcripts:
-        audio_duration = task.transcripts[0].duration
-    
-    # 获取 ASR 识别语言
-    asr_language = task.asr_language
-    
-    # 3. 回填缓存
-    # 对于进行中的任务，使用较短的TTL（5秒），确保能及时看到状态更新
-    # 对于已完成的任务，使用较长的TTL（60秒）
-    if redis_client:
-        try:
-            cache_data = {
-                "task_id": task.task_id,
-                "user_id": task.user_id,  # 用于权限验证
-                "state": task.state,
-                "progress": task.progress,
-                "estimated_time": task.estimated_time,
-                "audio_duration": audio_duration,
-                "asr_language": asr_language,
-                "error_code": task.error_code,
-                "error_message": task.error_message,
-                "error_details": task.error_details,
-                "retryable": task.retryable,
-                "updated_at": task.updated_at.isoformat() if task.updated_at else None,
-            }
-            
-            # 根据任务状态设置不同的TTL
-            if task.state in ["success", "failed", "partial_success"]:
-                ttl = 60  # 已完成的任务，缓存60秒
-            else:
-                ttl = 5  # 进行中的任务，缓存5秒，确保能及时看到更新
-            
-            redis_client.setex(
-                cache_key,
-                ttl,
-                json.dumps(cache_data, ensure_ascii=False),
-            )
-            logger.debug(f"Cached task status for {task_id} (TTL={ttl}s)")
-        except Exception as e:
-            logger.warning(f"Failed to cache task status for {task_id}: {e}")
-    
     return TaskStatusResponse(
-        task_id=task.task_id,
-        state=TaskState(task.state),
-        progress=task.progress,
-        estimated_time=task.estimated_time,
-        audio_duration=audio_duration,
-        asr_language=asr_language,
-        error_code=task.error_code,
-        error_message=task.error_message,
-        error_details=task.error_details,
-        retryable=task.retryable,
-        updated_at=task.updated_at,
+        task_id=data["task_id"],
+        state=TaskState(data["state"]),
+        progress=data.get("progress") or 0.0,
+        estimated_time=data.get("estimated_time"),
+        audio_duration=data.get("audio_duration"),
+        asr_language=data.get("asr_language"),
+        error_code=data.get("error_code"),
+        error_message=data.get("error_message"),
+        error_details=data.get("error_details"),
+        retryable=data.get("retryable"),
+        updated_at=data["updated_at"],
     )
 
 
@@ -440,10 +379,59 @@ async def get_transcript(
     )
 
 
+# 列表页需要的列(不加载 original_filenames、确认信息等,也不加载任何关系)
+_LIST_COLUMNS = (
+    Task.task_id,
+    Task.user_id,
+    Task.tenant_id,
+    Task.name,
+    Task.meeting_type,
+    Task.audio_files,
+    Task.file_order,
+    Task.audio_duration,
+    Task.asr_language,
+    Task.output_language,
+    Task.state,
+    Task.progress,
+    Task.error_code,
+    Task.error_message,
+    Task.error_details,
+    Task.retryable,
+    Task.folder_id,
+    Task.created_at,
+    Task.updated_at,
+    Task.completed_at,
+    Task.last_content_modified_at,
+)
+
+
+def _encode_task_cursor(task: Task) -> str:
+    """把 (created_at, task_id) 编码为不透明的分页游标"""
+    raw = f"{task.created_at.isoformat()}|{task.task_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_task_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    解析分页游标
+    
+    Raises:
+        HTTPException: 400 如果游标无效
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, task_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), task_id
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
 @router.get("", response_model=List[TaskDetailResponse])
 async def list_tasks(
-    limit: int = 100,
+    response: Response,
+    limit: int = Query(100, ge=1),
     offset: int = 0,
+    cursor: Optional[str] = None,
     state: Optional[str] = None,
     folder_id: Optional[str] = None,
     include_deleted: bool = False,
@@ -453,9 +441,15 @@ async def list_tasks(
     """
     列出用户的任务
     
+    按 (created_at, task_id) 倒序。传入 cursor 时使用游标分页(走
+    idx_task_user_created 索引,翻到任意页耗时不变),忽略 offset;
+    还有下一页时响应头 X-Next-Cursor 返回下一页的游标。
+    
     Args:
+        response: 响应对象(用于设置 X-Next-Cursor)
         limit: 返回数量限制
-        offset: 偏移量
+        offset: 偏移量(兼容旧客户端,建议改用 cursor)
+        cursor: 分页游标(上一页响应头 X-Next-Cursor 的值)
         state: 状态筛选 (pending/running/success/failed)
         folder_id: 文件夹筛选 (null 表示根目录)
         include_deleted: 是否包含已删除的任务
@@ -464,9 +458,16 @@ async def list_tasks(
         
     Returns:
         List[TaskDetailResponse]: 任务列表
+        
+    Raises:
+        HTTPException: 400 如果游标无效
     """
-    # 构建查询
-    query = db.query(Task).filter(Task.user_id == user_id)
+    # 构建查询: 只加载列表需要的列,禁止懒加载转写等关系
+    query = (
+        db.query(Task)
+        .options(load_only(*_LIST_COLUMNS), raiseload("*"))
+        .filter(Task.user_id == user_id)
+    )
     
     # 默认排除已删除的任务
     if not include_deleted:
@@ -484,16 +485,40 @@ async def list_tasks(
     if state:
         query = query.filter(Task.state == state)
     
-    # 排序和分页
-    tasks = query.order_by(Task.created_at.desc()).limit(limit).offset(offset).all()
+    # 排序和分页(多取一条判断是否还有下一页)
+    query = query.order_by(Task.created_at.desc(), Task.task_id.desc())
+    if cursor:
+        cursor_created_at, cursor_task_id = _decode_task_cursor(cursor)
+        query = query.filter(
+            or_(
+                Task.created_at < cursor_created_at,
+                and_(Task.created_at == cursor_created_at, Task.task_id < cursor_task_id),
+            )
+        )
+    else:
+        query = query.offset(offset)
+    tasks = query.limit(limit + 1).all()
+    
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        response.headers["X-Next-Cursor"] = _encode_task_cursor(tasks[-1])
+    
+    # 旧任务可能尚未写入时长: 一次性只查询转写记录的时长列
+    missing = [task.task_id for task in tasks if task.audio_duration is None]
+    durations = {}
+    if missing:
+        durations = dict(
+            db.query(TranscriptRecord.task_id, TranscriptRecord.duration)
+            .filter(TranscriptRecord.task_id.in_(missing))
+            .all()
+        )
     
     # 构建响应，包含 duration
     result = []
     for task in tasks:
-        # 获取音频时长（从转写记录）
-        duration = None
-        if task.transcripts:
-            duration = task.transcripts[0].duration
+        duration = task.audio_duration
+        if duration is None:
+            duration = durations.get(task.task_id)
         
         result.append(TaskDetailResponse(
             task_id=task.task_id,
@@ -637,13 +662,6 @@ async def cancel_task(
         error_details="Task cancelled by user"
     )
     
-    # 清除缓存
-    if redis_client:
-        try:
-            redis_client.delete(f"task_status:{task_id}")
-        except Exception as e:
-            logger.error(f"Failed to clear cache: {e}")
-    
     logger.info(f"Task cancelled: {task_id} by user {task.user_id}")
     
     return {
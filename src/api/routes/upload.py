@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 """文件上传 API 路由"""
 
-import os
+import asyncio
+import hashlib
+import json
+import re
+import shutil
+import time
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, File, HTTPException, Path as PathParam, Request, UploadFile, Depends
+from pydantic import BaseModel, Field
 
 from src.api.dependencies import get_current_user_id
 from src.utils.logger import get_logger
@@ -21,6 +26,18 @@ router = APIRouter()
 UPLOAD_BASE_DIR = Path("uploads")
 ALLOWED_EXTENSIONS = {".wav", ".opus", ".mp3", ".m4a", ".ogg"}
 MAX_FILE_SIZE = 500 * 1024 * 1024  # 500MB
+CHUNK_SIZE = 1024 * 1024  # 流式写入块大小 1MB
+
+# 分片上传配置
+SESSION_DIR_NAME = ".sessions"
+MAX_PART_SIZE = 64 * 1024 * 1024  # 单个分片最大 64MB
+MAX_PART_NUMBER = 10000
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+SESSION_TTL_SECONDS = 24 * 3600  # 会话创建后的有效期
+MAX_OPEN_SESSIONS_PER_USER = 10
+SESSION_SWEEP_INTERVAL = 600  # 全量清理过期会话的最短间隔(秒)
+
+_last_session_sweep = 0.0
 
 
 class UploadResponse(BaseModel):
@@ -30,9 +47,40 @@ class UploadResponse(BaseModel):
     original_filename: str  # 原始文件名
     file_size: int
     duration: Optional[float] = None
+    content_hash: Optional[str] = None  # SHA-256
     message: str = "文件上传成功"
 
 
+class UploadSessionCreateRequest(BaseModel):
+    """创建分片上传会话请求"""
+    filename: str = Field(..., description="原始文件名")
+    file_size: Optional[int] = Field(None, ge=0, description="文件总大小(字节,可选)")
+
+
+class UploadPartInfo(BaseModel):
+    """已上传分片信息"""
+    part_number: int
+    size: int
+    sha256: str
+
+
+class UploadSessionResponse(BaseModel):
+    """分片上传会话状态"""
+    session_id: str
+    original_filename: str
+    part_size: int = Field(..., description="建议分片大小(字节)")
+    max_file_size: int
+    uploaded_size: int = 0
+    parts: List[UploadPartInfo] = Field(default_factory=list)
+
+
+class UploadSessionCompleteRequest(BaseModel):
+    """完成分片上传请求"""
+    part_numbers: Optional[List[int]] = Field(
+        None, description="按顺序合并的分片编号,为空则按编号合并全部已上传分片"
+    )
+
+
 def ensure_upload_dir(user_id: str) -> Path:
     """确保用户上传目录存在"""
     user_dir = UPLOAD_BASE_DIR / user_id
@@ -42,8 +90,12 @@ def ensure_upload_dir(user_id: str) -> Path:
 
 def validate_file(file: UploadFile) -> None:
     """验证文件"""
-    # 验证文件扩展名
-    file_ext = Path(file.filename).suffix.lower()
+    validate_filename(file.filename)
+
+
+def validate_filename(filename: str) -> None:
+    """验证文件扩展名"""
+    file_ext = Path(filename).suffix.lower()
     if file_ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=415,
@@ -51,6 +103,77 @@ def validate_file(file: UploadFile) -> None:
         )
 
 
+def _file_too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"文件过大，最大支持 {limit / 1024 / 1024:.0f}MB"
+    )
+
+
+async def _iter_upload_file(file: UploadFile) -> AsyncIterator[bytes]:
+    """按固定大小读取上传文件"""
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def stream_to_file(
+    chunks: AsyncIterator[bytes],
+    file_path: Path,
+    limit: int,
+) -> Tuple[int, str]:
+    """
+    将数据块流式写入磁盘,同时计算大小和 SHA-256
+
+    写入在线程池中执行,不阻塞事件循环;超过大小限制时立即中止
+    并删除已写入的部分文件。
+
+    Args:
+        chunks: 数据块异步迭代器
+        file_path: 目标文件路径
+        limit: 最大字节数
+
+    Returns:
+        Tuple[int, str]: (文件大小, SHA-256 十六进制摘要)
+
+    Raises:
+        HTTPException: 413 文件过大
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    f = await asyncio.to_thread(open, file_path, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > limit:
+                raise _file_too_large(limit)
+            hasher.update(chunk)
+            await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        file_path.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(f.close)
+    return size, hasher.hexdigest()
+
+
+async def _probe_duration(file_path: Path) -> Optional[float]:
+    """尝试获取音频时长,失败时返回 None"""
+    try:
+        return await AudioProcessor().get_duration(str(file_path))
+    except Exception as e:
+        logger.warning(f"Failed to get audio duration: {e}")
+        return None
+
+
+def _unique_file_path(user_dir: Path, filename: str) -> Path:
+    """生成唯一文件路径"""
+    file_ext = Path(filename).suffix.lower()
+    return user_dir / f"{uuid.uuid4().hex[:16]}{file_ext}"
+
+
 @router.post("", response_model=UploadResponse, status_code=201)
 async def upload_audio(
     file: UploadFile = File(..., description="音频文件"),
@@ -78,38 +201,21 @@ async def upload_audio(
         # 验证文件
         validate_file(file)
         
-        # 读取文件内容
-        content = await file.read()
-        file_size = len(content)
-        
-        # 验证文件大小
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail=f"文件过大: {file_size / 1024 / 1024:.2f}MB，最大支持 500MB"
-            )
-        
         # 确保上传目录存在
         user_dir = ensure_upload_dir(user_id)
         
         # 生成唯一文件名
-        file_ext = Path(file.filename).suffix.lower()
-        unique_filename = f"{uuid.uuid4().hex[:16]}{file_ext}"
-        file_path = user_dir / unique_filename
+        file_path = _unique_file_path(user_dir, file.filename)
         
-        # 保存文件
-        with open(file_path, "wb") as f:
-            f.write(content)
+        # 分块写入磁盘(边写边校验大小并计算哈希)
+        file_size, content_hash = await stream_to_file(
+            _iter_upload_file(file), file_path, MAX_FILE_SIZE
+        )
         
         logger.info(f"File uploaded: {file_path} ({file_size} bytes) by user {user_id}")
         
         # 尝试获取音频时长
-        duration = None
-        try:
-            audio_processor = AudioProcessor()
-            duration = audio_processor.get_duration(str(file_path))
-        except Exception as e:
-            logger.warning(f"Failed to get audio duration: {e}")
+        duration = await _probe_duration(file_path)
         
         # 返回相对路径（用于后续 API 调用）
         # 使用正斜杠以保持跨平台兼容性
@@ -121,6 +227,7 @@ async def upload_audio(
             original_filename=file.filename,  # 保存原始文件名
             file_size=file_size,
             duration=duration,
+            content_hash=content_hash,
             message=f"文件上传成功: {file.filename}"
         )
         
@@ -134,6 +241,328 @@ async def upload_audio(
         )
 
 
+# ============================================================================
+# 分片(可续传)上传
+# ============================================================================
+
+
+def _session_dir(user_id: str, session_id: str) -> Path:
+    """获取上传会话目录(校验会话 ID 防止路径穿越)"""
+    if not SESSION_ID_PATTERN.match(session_id):
+        raise HTTPException(status_code=404, detail="上传会话不存在")
+    return UPLOAD_BASE_DIR / user_id / SESSION_DIR_NAME / session_id
+
+
+def _session_expired(session_dir: Path, now: float) -> bool:
+    """会话是否已过期(元数据缺失或损坏的目录按修改时间计算)"""
+    meta_path = session_dir / "session.json"
+    try:
+        expires_at = json.loads(meta_path.read_text(encoding="utf-8"))["expires_at"]
+    except (OSError, ValueError, KeyError, TypeError):
+        try:
+            expires_at = session_dir.stat().st_mtime + SESSION_TTL_SECONDS
+        except OSError:
+            return False
+    return expires_at <= now
+
+
+def _sweep_user_sessions(user_id: str, now: float) -> int:
+    """
+    删除用户的过期上传会话
+    
+    Returns:
+        int: 剩余的未过期会话数
+    """
+    sessions_root = UPLOAD_BASE_DIR / user_id / SESSION_DIR_NAME
+    if not sessions_root.is_dir():
+        return 0
+    open_sessions = 0
+    for session_dir in sessions_root.iterdir():
+        if not session_dir.is_dir():
+            continue
+        if _session_expired(session_dir, now):
+            shutil.rmtree(session_dir, ignore_errors=True)
+            logger.info(f"Upload session expired and removed: {session_dir.name} (user {user_id})")
+        else:
+            open_sessions += 1
+    return open_sessions
+
+
+def _sweep_expired_sessions(now: float) -> None:
+    """清理所有用户的过期上传会话(按 SESSION_SWEEP_INTERVAL 限频)"""
+    global _last_session_sweep
+    if now - _last_session_sweep < SESSION_SWEEP_INTERVAL:
+        return
+    _last_session_sweep = now
+    if not UPLOAD_BASE_DIR.is_dir():
+        return
+    for user_dir in UPLOAD_BASE_DIR.iterdir():
+        if (user_dir / SESSION_DIR_NAME).is_dir():
+            _sweep_user_sessions(user_dir.name, now)
+
+
+def _load_session(user_id: str, session_id: str) -> Tuple[Path, dict]:
+    """
+    读取上传会话元数据
+    
+    Raises:
+        HTTPException: 404 会话不存在
+        HTTPException: 410 会话已过期(同时删除会话目录)
+    """
+    session_dir = _session_dir(user_id, session_id)
+    meta_path = session_dir / "session.json"
+    if not meta_path.exists():
+        raise HTTPException(status_code=404, detail="上传会话不存在")
+    if _session_expired(session_dir, time.time()):
+        shutil.rmtree(session_dir, ignore_errors=True)
+        raise HTTPException(status_code=410, detail="上传会话已过期,请重新上传")
+    return session_dir, json.loads(meta_path.read_text(encoding="utf-8"))
+
+
+def _part_path(session_dir: Path, part_number: int) -> Path:
+    return session_dir / f"{part_number:05d}.part"
+
+
+def _list_parts(session_dir: Path) -> List[UploadPartInfo]:
+    """列出已上传的分片"""
+    parts = []
+    for part_file in sorted(session_dir.glob("*.part")):
+        hash_file = part_file.with_suffix(".sha256")
+        if not hash_file.exists():
+            # 哈希文件在分片写入完成后才生成,缺失表示分片未完整上传
+            continue
+        parts.append(UploadPartInfo(
+            part_number=int(part_file.stem),
+            size=part_file.stat().st_size,
+            sha256=hash_file.read_text(encoding="utf-8").strip(),
+        ))
+    return parts
+
+
+def _session_response(session_id: str, meta: dict, parts: List[UploadPartInfo]) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        session_id=session_id,
+        original_filename=meta["original_filename"],
+        part_size=MAX_PART_SIZE,
+        max_file_size=MAX_FILE_SIZE,
+        uploaded_size=sum(part.size for part in parts),
+        parts=parts,
+    )
+
+
+@router.post("/sessions", response_model=UploadSessionResponse, status_code=201)
+async def create_upload_session(
+    request: UploadSessionCreateRequest,
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    创建分片上传会话
+    
+    大文件可拆分为多个分片分别上传(PUT /sessions/{id}/parts/{n}),
+    中断后通过 GET /sessions/{id} 查询已完成的分片并续传,
+    最后调用 POST /sessions/{id}/complete 合并。
+    
+    Args:
+        request: 创建请求
+        user_id: 用户 ID (来自认证)
+        
+    Returns:
+        UploadSessionResponse: 会话信息
+        
+    Raises:
+        HTTPException: 415 不支持的文件格式
+        HTTPException: 413 文件过大
+        HTTPException: 429 未完成的上传会话过多
+    """
+    validate_filename(request.filename)
+    if request.file_size is not None and request.file_size > MAX_FILE_SIZE:
+        raise _file_too_large(MAX_FILE_SIZE)
+    
+    # 清理放弃的会话,避免残留分片占满磁盘
+    now = time.time()
+    await asyncio.to_thread(_sweep_expired_sessions, now)
+    open_sessions = await asyncio.to_thread(_sweep_user_sessions, user_id, now)
+    if open_sessions >= MAX_OPEN_SESSIONS_PER_USER:
+        raise HTTPException(
+            status_code=429,
+            detail=f"未完成的上传会话过多(最多 {MAX_OPEN_SESSIONS_PER_USER} 个),请完成或取消后重试",
+        )
+    
+    session_id = uuid.uuid4().hex
+    session_dir = _session_dir(user_id, session_id)
+    session_dir.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "original_filename": request.filename,
+        "file_size": request.file_size,
+        "created_at": now,
+        "expires_at": now + SESSION_TTL_SECONDS,
+    }
+    (session_dir / "session.json").write_text(json.dumps(meta), encoding="utf-8")
+    
+    logger.info(f"Upload session created: {session_id} ({request.filename}) by user {user_id}")
+    return _session_response(session_id, meta, [])
+
+
+@router.get("/sessions/{session_id}", response_model=UploadSessionResponse)
+async def get_upload_session(
+    session_id: str,
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    查询分片上传会话(用于断点续传)
+    
+    Args:
+        session_id: 会话 ID
+        user_id: 用户 ID (来自认证)
+        
+    Returns:
+        UploadSessionResponse: 会话信息及已上传分片
+        
+    Raises:
+        HTTPException: 404 会话不存在
+        HTTPException: 410 会话已过期
+    """
+    session_dir, meta = _load_session(user_id, session_id)
+    return _session_response(session_id, meta, _list_parts(session_dir))
+
+
+@router.put("/sessions/{session_id}/parts/{part_number}", response_model=UploadPartInfo)
+async def upload_part(
+    request: Request,
+    session_id: str,
+    part_number: int = PathParam(..., ge=1, le=MAX_PART_NUMBER),
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    上传单个分片(请求体为分片原始字节)
+    
+    重复上传同一编号会覆盖之前的分片,可用于重试。
+    
+    Args:
+        request: HTTP 请求(流式读取请求体)
+        session_id: 会话 ID
+        part_number: 分片编号(从 1 开始)
+        user_id: 用户 ID (来自认证)
+        
+    Returns:
+        UploadPartInfo: 分片信息
+        
+    Raises:
+        HTTPException: 404 会话不存在
+        HTTPException: 410 会话已过期
+        HTTPException: 413 分片或文件总大小超限
+    """
+    session_dir, _ = _load_session(user_id, session_id)
+    
+    # 其他分片已占用的大小
+    other_size = sum(
+        part.size for part in _list_parts(session_dir) if part.part_number != part_number
+    )
+    limit = min(MAX_PART_SIZE, MAX_FILE_SIZE - other_size)
+    
+    part_path = _part_path(session_dir, part_number)
+    hash_path = part_path.with_suffix(".sha256")
+    hash_path.unlink(missing_ok=True)
+    
+    size, digest = await stream_to_file(request.stream(), part_path, limit)
+    hash_path.write_text(digest, encoding="utf-8")
+    
+    return UploadPartInfo(part_number=part_number, size=size, sha256=digest)
+
+
+@router.post("/sessions/{session_id}/complete", response_model=UploadResponse, status_code=201)
+async def complete_upload_session(
+    session_id: str,
+    request: Optional[UploadSessionCompleteRequest] = None,
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    合并分片,生成最终文件
+    
+    Args:
+        session_id: 会话 ID
+        request: 合并请求(可指定分片顺序)
+        user_id: 用户 ID (来自认证)
+        
+    Returns:
+        UploadResponse: 上传结果
+        
+    Raises:
+        HTTPException: 404 会话不存在
+        HTTPException: 410 会话已过期
+        HTTPException: 400 分片缺失
+    """
+    session_dir, meta = _load_session(user_id, session_id)
+    parts = {part.part_number: part for part in _list_parts(session_dir)}
+    
+    part_numbers = (request.part_numbers if request and request.part_numbers else sorted(parts))
+    missing = [n for n in part_numbers if n not in parts]
+    if not part_numbers or missing:
+        raise HTTPException(status_code=400, detail=f"分片缺失: {missing or '无已上传分片'}")
+    
+    expected_size = meta.get("file_size")
+    total_size = sum(parts[n].size for n in part_numbers)
+    if expected_size is not None and total_size != expected_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"文件大小不一致: 已上传 {total_size} 字节，预期 {expected_size} 字节"
+        )
+    
+    async def iter_parts() -> AsyncIterator[bytes]:
+        for n in part_numbers:
+            f: BinaryIO = await asyncio.to_thread(open, _part_path(session_dir, n), "rb")
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(f.read, CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                await asyncio.to_thread(f.close)
+    
+    user_dir = ensure_upload_dir(user_id)
+    file_path = _unique_file_path(user_dir, meta["original_filename"])
+    file_size, content_hash = await stream_to_file(iter_parts(), file_path, MAX_FILE_SIZE)
+    
+    await asyncio.to_thread(shutil.rmtree, session_dir, True)
+    logger.info(
+        f"Upload session {session_id} completed: {file_path} "
+        f"({file_size} bytes, {len(part_numbers)} parts) by user {user_id}"
+    )
+    
+    duration = await _probe_duration(file_path)
+    return UploadResponse(
+        success=True,
+        file_path=str(file_path).replace("\\", "/"),
+        original_filename=meta["original_filename"],
+        file_size=file_size,
+        duration=duration,
+        content_hash=content_hash,
+        message=f"文件上传成功: {meta['original_filename']}"
+    )
+
+
+@router.delete("/sessions/{session_id}", status_code=204)
+async def abort_upload_session(
+    session_id: str,
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    取消分片上传会话并删除已上传分片
+    
+    Args:
+        session_id: 会话 ID
+        user_id: 用户 ID (来自认证)
+        
+    Raises:
+        HTTPException: 404 会话不存在
+        HTTPException: 410 会话已过期
+    """
+    session_dir, _ = _load_session(user_id, session_id)
+    await asyncio.to_thread(shutil.rmtree, session_dir, True)
+    logger.info(f"Upload session aborted: {session_id} by user {user_id}")
+
+
 @router.delete("/{file_path:path}", status_code=204)
 async def delete_uploaded_file(
     file_path: str,
@@ -222,6 +222,7 @@ class GenerateArtifactRequest(BaseModel):
 
     prompt_instance: PromptInstance = Field(..., description="提示词实例")
     name: Optional[str] = Field(None, description="自定义显示名称")
+    use_cache: bool = Field(True, description="是否允许返回相同输入的缓存生成结果")
 
     model_config = {
         "json_schema_extra": {
@@ -793,6 +794,7 @@ class UploadResponse(BaseModel):
     file_path: str = Field(..., description="文件路径")
     file_size: int = Field(..., description="文件大小(字节)")
     duration: Optional[float] = Field(None, description="音频时长(秒)")
+    content_hash: Optional[str] = Field(None, description="文件内容 SHA-256")
 
     model_config = {
         "json_schema_extra": {
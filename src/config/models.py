@@ -57,6 +57,12 @@ class VolcanoConfig(BaseModel):
     boosting_table_id: Optional[str] = Field(None, description="全局热词库 ID (BoostingTableID)")
     max_retries: int = Field(default=3, description="最大重试次数")
     timeout: int = Field(default=300, description="超时时间(秒)")
+    poll_interval: float = Field(default=2.0, gt=0, description="结果轮询初始间隔(秒)")
+    max_poll_interval: float = Field(default=30.0, gt=0, description="结果轮询最大间隔(秒)")
+    poll_concurrency: int = Field(default=8, ge=1, description="结果轮询最大并发查询数")
+    max_poll_wait: int = Field(
+        default=300, ge=1, description="单个任务最长等待结果时间(秒),超时后降级到备用 ASR"
+    )
 
     @field_validator("access_key", "secret_key", "app_id")
     @classmethod
@@ -100,6 +106,8 @@ class IFlyTekConfig(BaseModel):
     group_id: str = Field(..., description="声纹库 ID")
     max_retries: int = Field(default=3, description="最大重试次数")
     timeout: int = Field(default=30, description="超时时间(秒)")
+    max_concurrency: int = Field(default=4, ge=1, description="并发识别的说话人数上限")
+    qps_limit: Optional[float] = Field(None, gt=0, description="每秒最大请求数(讯飞 QPS 配额,为空不限制)")
 
     @field_validator("app_id", "api_key", "api_secret")
     @classmethod
@@ -119,6 +127,10 @@ class GeminiConfig(BaseModel):
     temperature: float = Field(default=0.7, ge=0, le=2, description="温度参数")
     max_retries: int = Field(default=3, description="最大重试次数")
     timeout: int = Field(default=120, description="超时时间(秒)")
+    max_concurrency: int = Field(default=8, ge=1, description="最大并发请求数(共享连接池大小)")
+    pricing_tier: str = Field(
+        default="gemini-flash", description="计费档位(对应 pricing 中的 Token 单价)"
+    )
 
     @field_validator("api_keys")
     @classmethod
@@ -130,6 +142,15 @@ class GeminiConfig(BaseModel):
             raise ValueError("API 密钥不能为空")
         return v
 
+    @field_validator("pricing_tier")
+    @classmethod
+    def validate_pricing_tier(cls, v: str) -> str:
+        """验证计费档位"""
+        allowed = ["gemini-flash", "gemini-pro"]
+        if v not in allowed:
+            raise ValueError(f"pricing_tier 必须是 {allowed} 之一")
+        return v
+
 
 class GSUCConfig(BaseModel):
     """GSUC OAuth2.0 配置"""
@@ -180,6 +201,116 @@ class QueueConfig(BaseModel):
     max_priority: int = Field(default=10, description="最大优先级")
 
 
+class WorkerConfig(BaseModel):
+    """Worker 配置"""
+
+    max_concurrent_tasks: int = Field(
+        default=1,
+        ge=1,
+        description="单个 Worker 进程内并发处理的任务数(>1 时使用常驻事件循环,建议配合 PostgreSQL)",
+    )
+    max_shutdown_wait: int = Field(default=300, description="停机时等待在途任务的最长时间(秒)")
+
+    # 阶段并发限制(None 表示不限制),在 max_concurrent_tasks 之内进一步约束各提供商
+    asr_concurrency: Optional[int] = Field(None, ge=1, description="ASR 阶段最大并发数")
+    voiceprint_concurrency: Optional[int] = Field(None, ge=1, description="声纹识别阶段最大并发数")
+    llm_concurrency: Optional[int] = Field(None, ge=1, description="LLM 阶段最大并发数")
+    llm_requests_per_minute: Optional[int] = Field(None, ge=1, description="LLM 阶段每分钟最大调用数")
+
+    status_flush_interval_ms: int = Field(
+        default=500,
+        ge=0,
+        description="任务进度合并写库的最短间隔(毫秒),终态立即写入;0 表示每次更新直接写库",
+    )
+
+
+class ASRCacheConfig(BaseModel):
+    """ASR 结果缓存配置"""
+
+    enabled: bool = Field(default=True, description="是否启用 ASR 结果缓存")
+    directory: str = Field(default="cache/asr", description="缓存目录")
+    ttl_hours: int = Field(default=168, ge=1, description="缓存有效期(小时)")
+    max_size_mb: int = Field(default=1024, ge=1, description="缓存最大占用空间(MB)")
+
+
+class LLMCacheConfig(BaseModel):
+    """LLM 衍生内容缓存配置"""
+
+    enabled: bool = Field(default=True, description="是否缓存相同输入的生成结果")
+    directory: str = Field(default="cache/llm", description="缓存目录")
+    ttl_hours: int = Field(default=72, ge=1, description="缓存有效期(小时)")
+    max_size_mb: int = Field(default=256, ge=1, description="缓存最大占用空间(MB)")
+
+
+class LongAudioConfig(BaseModel):
+    """长音频分块转写配置"""
+
+    enabled: bool = Field(default=False, description="是否对长音频分块并发转写")
+    chunk_seconds: int = Field(
+        default=1800, ge=60, description="分块时长(秒),音频超过 1.5 倍时切分"
+    )
+    overlap_seconds: float = Field(default=5.0, ge=0, description="相邻分块重叠时长(秒)")
+    silence_search_seconds: float = Field(
+        default=30.0, ge=0, description="在分块边界前后查找静音的范围(秒)"
+    )
+    max_concurrency: int = Field(default=4, ge=1, description="分块转写最大并发数")
+
+
+class ASRHedgingConfig(BaseModel):
+    """ASR 对冲请求配置"""
+
+    enabled: bool = Field(default=False, description="主 ASR 超时未完成时是否并行启动备用 ASR")
+    percentile: float = Field(
+        default=95.0,
+        gt=0,
+        le=100,
+        description="按主 ASR 每秒音频耗时的该百分位乘以音频时长确定对冲等待时间",
+    )
+    initial_delay_seconds: float = Field(
+        default=300.0, gt=0, description="样本不足或音频时长未知时的对冲等待时间(秒)"
+    )
+    min_delay_seconds: float = Field(default=30.0, ge=0, description="对冲等待时间下限(秒)")
+    max_delay_seconds: float = Field(default=1800.0, gt=0, description="对冲等待时间上限(秒)")
+    min_samples: int = Field(default=20, ge=1, description="使用百分位所需的最少样本数")
+    window_size: int = Field(default=200, ge=1, description="保留的最近每秒音频耗时样本数")
+
+
+class MapReduceConfig(BaseModel):
+    """长转写 map-reduce 生成配置"""
+
+    enabled: bool = Field(default=False, description="长转写是否先分块提取要点再汇总生成")
+    threshold_tokens: int = Field(
+        default=60000, ge=1000, description="转写估算 Token 数超过该值时使用 map-reduce"
+    )
+    chunk_tokens: int = Field(default=30000, ge=1000, description="map 阶段每个分块的 Token 预算")
+    max_concurrency: int = Field(default=8, ge=1, description="map 阶段最大并发数")
+
+
+class ArtifactStreamingConfig(BaseModel):
+    """衍生内容流式生成配置"""
+
+    enabled: bool = Field(default=False, description="是否流式生成并通过 SSE 推送增量内容")
+    flush_interval_seconds: float = Field(
+        default=2.0, gt=0, description="部分内容写入 artifact 记录的间隔(秒)"
+    )
+
+
+class TranscriptCompactionConfig(BaseModel):
+    """生成前转写压缩配置"""
+
+    enabled: bool = Field(default=False, description="构建提示词前是否压缩转写")
+    merge_gap_seconds: float = Field(
+        default=5.0, ge=0, description="同一说话人连续片段合并的最大间隔(秒)"
+    )
+    max_turn_seconds: float = Field(default=120.0, gt=0, description="合并后单个轮次的最大时长(秒)")
+    timestamp_interval_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="提示词中时间戳的最小间隔(秒): 只在距上次标注达到该间隔的行标注开始时间,0 表示每行标注",
+    )
+    strip_fillers: bool = Field(default=True, description="是否去掉语气词(嗯/呃/um/uh 等)")
+
+
 class StorageConfig(BaseModel):
     """存储配置"""
 
@@ -190,6 +321,14 @@ class StorageConfig(BaseModel):
     secret_key: str = Field(..., description="Secret Key")
     endpoint: Optional[str] = Field(None, description="自定义端点")
     temp_file_ttl: int = Field(default=3600, description="临时文件 TTL(秒)")
+    multipart_threshold: int = Field(
+        default=64 * 1024 * 1024, ge=0, description="超过该大小(字节)使用分片上传"
+    )
+    multipart_part_size: int = Field(
+        default=16 * 1024 * 1024, ge=5 * 1024 * 1024, description="分片大小(字节)"
+    )
+    multipart_concurrency: int = Field(default=4, ge=1, description="分片并发上传数")
+    part_max_retries: int = Field(default=3, ge=1, description="单个分片最大重试次数")
 
 
 class PricingConfig(BaseModel):
@@ -262,7 +401,17 @@ class AppConfig(BaseModel):
     frontend: Optional[FrontendConfig] = Field(None, description="前端配置 (可选)")
     log: LogConfig = Field(default_factory=LogConfig)
     queue: QueueConfig = Field(default_factory=QueueConfig)
+    worker: WorkerConfig = Field(default_factory=WorkerConfig)
     storage: StorageConfig
+    asr_cache: ASRCacheConfig = Field(default_factory=ASRCacheConfig)
+    long_audio: LongAudioConfig = Field(default_factory=LongAudioConfig)
+    asr_hedging: ASRHedgingConfig = Field(default_factory=ASRHedgingConfig)
+    map_reduce: MapReduceConfig = Field(default_factory=MapReduceConfig)
+    transcript_compaction: TranscriptCompactionConfig = Field(
+        default_factory=TranscriptCompactionConfig
+    )
+    llm_cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+    artifact_streaming: ArtifactStreamingConfig = Field(default_factory=ArtifactStreamingConfig)
     pricing: PricingConfig = Field(default_factory=PricingConfig)
     
     # 业务配置
@@ -270,6 +419,9 @@ class AppConfig(BaseModel):
     audio_retention_max_days: int = Field(default=90, description="音频最大保留天数")
     enable_speaker_recognition: bool = Field(default=True, description="是否启用说话人识别")
     default_asr_provider: str = Field(default="volcano", description="默认 ASR 提供商")
+    parallel_multi_file_asr: bool = Field(
+        default=False, description="多文件会议是否按分片并行转写(否则拼接后整体转写),仅对执行说话人识别的任务生效"
+    )
     
     @field_validator("env")
     @classmethod
@@ -1,7 +1,7 @@
 """Abstract provider interfaces for ASR, Voiceprint, and LLM services."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from src.core.models import (
     ASRLanguage,
@@ -67,6 +67,15 @@ class ASRProvider(ABC):
         """
         pass
 
+    def get_default_hotword_resource(self) -> Optional[str]:
+        """
+        获取未指定热词集时使用的全局热词资源 ID
+
+        Returns:
+            Optional[str]: 全局热词资源 ID,没有时返回 None
+        """
+        return None
+
 
 class VoiceprintProvider(ABC):
     """声纹识别提供商抽象基类"""
@@ -77,6 +86,7 @@ class VoiceprintProvider(ABC):
         transcript: TranscriptionResult,
         audio_url: str,
         known_speakers: Optional[List[SpeakerIdentity]] = None,
+        speaker_samples: Optional[Dict[str, bytes]] = None,
         **kwargs,
     ) -> dict:
         """
@@ -86,6 +96,8 @@ class VoiceprintProvider(ABC):
             transcript: 转写结果
             audio_url: 音频文件 URL
             known_speakers: 已知说话人列表(用于 1:N 搜索)
+            speaker_samples: 调用方已提取的样本 {speaker_label: WAV bytes}(可选),
+                提供时直接使用,不再从 audio_url 重新提取
             **kwargs: 其他提供商特定参数
 
         Returns:
@@ -144,7 +156,8 @@ class LLMProvider(ABC):
             transcript: 转写结果
             prompt_instance: 提示词实例
             output_language: 输出语言
-            **kwargs: 其他提供商特定参数
+            **kwargs: 其他提供商特定参数(stream_callback: 支持流式生成的
+                提供商以新增的 Markdown 文本调用该异步回调)
 
         Returns:
             GeneratedArtifact: 生成的衍生内容
@@ -156,6 +169,63 @@ class LLMProvider(ABC):
         """
         pass
 
+    def supports_chunk_summaries(self) -> bool:
+        """
+        是否支持提取转写分块要点(map-reduce 生成)
+
+        不支持的提供商始终单次生成。
+
+        Returns:
+            bool: 是否实现了 summarize_transcript_chunk
+        """
+        return False
+
+    async def summarize_transcript_chunk(
+        self,
+        transcript: TranscriptionResult,
+        output_language: OutputLanguage = OutputLanguage.ZH_CN,
+        **kwargs,
+    ) -> str:
+        """
+        提取转写分块的要点笔记(map-reduce 生成的 map 阶段)
+
+        可选能力: 实现该方法的提供商需同时让 supports_chunk_summaries 返回 True。
+
+        Args:
+            transcript: 转写分块
+            output_language: 输出语言
+            **kwargs: 其他参数(chunk_index, chunk_count, instructions)
+
+        Returns:
+            str: 要点笔记
+
+        Raises:
+            LLMError: LLM 相关错误
+        """
+        raise NotImplementedError(
+            f"{self.get_provider_name()} does not support transcript chunk summaries"
+        )
+
+    def get_pricing_model(self) -> str:
+        """
+        获取计费模型(成本估算使用的价格档位)
+
+        Returns:
+            str: 价格档位 (gemini-flash/gemini-pro)
+        """
+        return "gemini-flash"
+
+    def get_model_fingerprint(self) -> str:
+        """
+        获取模型指纹(用于生成结果缓存键)
+
+        模型或生成参数变化时指纹随之变化,使旧缓存失效。
+
+        Returns:
+            str: 模型指纹
+        """
+        return self.get_provider_name()
+
     @abstractmethod
     async def get_prompt_template(self, template_id: str) -> str:
         """
@@ -170,12 +240,16 @@ class LLMProvider(ABC):
         pass
 
     @abstractmethod
-    def format_transcript(self, transcript: TranscriptionResult) -> str:
+    def format_transcript(
+        self, transcript: TranscriptionResult, timestamp_interval: Optional[float] = None
+    ) -> str:
         """
         格式化转写文本
 
         Args:
             transcript: 转写结果
+            timestamp_interval: 时间戳最小间隔(秒);None 表示每行标注起止时间,
+                否则只在距上次标注达到该间隔的行标注开始时间
 
         Returns:
             str: 格式化后的文本
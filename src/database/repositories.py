@@ -2,7 +2,6 @@
 """Database repositories for data access."""
 
 import json
-import os
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
@@ -26,9 +25,22 @@ from src.core.models import (
     PromptInstance,
 )
 from src.utils.logger import get_logger
+from src.utils.task_events import publish_task_event
+from src.utils.task_status_cache import get_task_status_cache, status_version
 
 logger = get_logger(__name__)
 
+# 处理中(尚未结束)的任务状态
+ACTIVE_TASK_STATES = (
+    "pending",
+    "queued",
+    "running",
+    "transcribing",
+    "identifying",
+    "correcting",
+    "summarizing",
+)
+
 
 class UserRepository:
     """用户仓库"""
@@ -83,11 +95,52 @@ class UserRepository:
         return user
 
 
+def _task_status_payload(session: Session, task: Task) -> Dict[str, Any]:
+    """构建任务状态缓存数据(与 /tasks/{task_id}/status 响应字段一致)"""
+    audio_duration = task.audio_duration
+    if audio_duration is None:
+        # 只读时长列,避免加载完整转写
+        row = (
+            session.query(TranscriptRecord.duration)
+            .filter(TranscriptRecord.task_id == task.task_id)
+            .first()
+        )
+        audio_duration = row[0] if row else None
+    state = task.state.value if hasattr(task.state, "value") else task.state
+    return {
+        "task_id": task.task_id,
+        "user_id": task.user_id,  # 用于权限验证
+        "state": state,
+        "progress": task.progress,
+        "estimated_time": task.estimated_time,
+        "audio_duration": audio_duration,
+        "asr_language": task.asr_language,
+        "error_code": task.error_code,
+        "error_message": task.error_message,
+        "error_details": task.error_details,
+        "retryable": task.retryable,
+        "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+        "version": status_version(task.updated_at),
+    }
+
+
 class TaskRepository:
     """任务仓库"""
 
     def __init__(self, session: Session):
         self.session = session
+    
+    def get_status_payload(self, task: Task) -> Dict[str, Any]:
+        """
+        构建任务状态缓存数据
+        
+        Args:
+            task: 任务
+            
+        Returns:
+            Dict[str, Any]: 状态数据(含 user_id 和 version)
+        """
+        return _task_status_payload(self.session, task)
 
     def create(
         self,
@@ -152,6 +205,19 @@ class TaskRepository:
             .all()
         )
 
+    def get_active_by_user(self, user_id: str) -> List[Task]:
+        """获取用户正在处理中(未结束)的任务"""
+        return (
+            self.session.query(Task)
+            .filter(
+                Task.user_id == user_id,
+                Task.is_deleted == False,
+                Task.state.in_(ACTIVE_TASK_STATES),
+            )
+            .order_by(desc(Task.created_at))
+            .all()
+        )
+
     def update_state(
         self,
         task_id: str,
@@ -159,6 +225,7 @@ class TaskRepository:
         progress: Optional[float] = None,
         estimated_time: Optional[int] = None,
         error_details: Optional[str] = None,
+        audio_duration: Optional[float] = None,
     ) -> None:
         """
         更新任务状态
@@ -166,59 +233,100 @@ class TaskRepository:
         使用独立的session和事务，确保状态更新立即可见，
         不影响主session中的其他操作。
         """
+        self.update_states([
+            {
+                "task_id": task_id,
+                "state": state,
+                "progress": progress,
+                "estimated_time": estimated_time,
+                "error_details": error_details,
+                "audio_duration": audio_duration,
+            }
+        ])
+    
+    def update_states(self, updates: List[Dict[str, Any]]) -> None:
+        """
+        在一个独立事务中批量更新多个任务的状态
+        
+        提交后逐个写入状态缓存并通知 SSE 订阅者。失败只记录日志,不影响主流程。
+        
+        Args:
+            updates: 状态更新列表,每项包含 task_id、state,以及可选的
+                progress、estimated_time、error_details、audio_duration
+                (None 表示不修改)
+        """
         # 使用独立的session来更新状态，立即commit
         from src.database.session import session_scope
         
+        if not updates:
+            return
+        
         try:
+            changes = []
             with session_scope() as independent_session:
-                # 在独立session中查询任务
-                task = independent_session.query(Task).filter(Task.task_id == task_id).first()
-                if task:
+                task_ids = [update["task_id"] for update in updates]
+                tasks = {
+                    task.task_id: task
+                    for task in independent_session.query(Task).filter(Task.task_id.in_(task_ids)).all()
+                }
+                for update in updates:
+                    task_id = update["task_id"]
+                    task = tasks.get(task_id)
+                    if task is None:
+                        changes.append((task_id, None, None))
+                        continue
+                    
+                    state = update["state"]
                     task.state = state
-                    if progress is not None:
-                        task.progress = progress
-                    if estimated_time is not None:
-                        task.estimated_time = estimated_time
-                    if error_details is not None:
-                        task.error_details = error_details
+                    if update.get("progress") is not None:
+                        task.progress = update["progress"]
+                    if update.get("estimated_time") is not None:
+                        task.estimated_time = update["estimated_time"]
+                    if update.get("error_details") is not None:
+                        task.error_details = update["error_details"]
+                    if update.get("audio_duration"):
+                        # 转写得到的实际时长,列表页直接读取,不再加载转写记录
+                        task.audio_duration = update["audio_duration"]
                     task.updated_at = datetime.now()
                     
                     if state in ["success", "failed", "partial_success"]:
                         task.completed_at = datetime.now()
                     
-                    # session_scope会自动commit
-                    logger.info(f"Task state updated: {task_id} -> {state} (progress={progress}%, estimated_time={estimated_time}s)")
+                    event = {
+                        "user_id": task.user_id,
+                        "state": task.state,
+                        "progress": task.progress,
+                        "estimated_time": task.estimated_time,
+                        "error_details": task.error_details,
+                        "updated_at": task.updated_at.isoformat(),
+                    }
+                    changes.append((task_id, event, _task_status_payload(independent_session, task)))
+                    
+                    logger.info(
+                        f"Task state updated: {task_id} -> {state} "
+                        f"(progress={update.get('progress')}%, estimated_time={update.get('estimated_time')}s)"
+                    )
+                # session_scope会自动commit
             
-            # 清除 Redis 缓存，确保 API 返回最新数据
-            self._clear_task_cache(task_id)
+            for task_id, event, status in changes:
+                # 提交后写入最新状态(write-through),状态查询直接命中缓存
+                self._write_task_cache(task_id, status)
+                
+                # 提交后再通知 SSE 订阅者
+                if event is not None:
+                    publish_task_event(task_id, event)
             
         except Exception as e:
             logger.error(f"Failed to update task state: {e}")
             # 不抛出异常，避免影响主流程
     
-    def _clear_task_cache(self, task_id: str) -> None:
-        """清除任务状态的 Redis 缓存"""
-        try:
-            import redis
-            # 使用连接池，避免每次都创建新连接
-            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-            r = redis.from_url(
-                redis_url,
-                decode_responses=True,
-                socket_connect_timeout=1,  # 1秒连接超时
-                socket_timeout=1,  # 1秒操作超时
-            )
-            cache_key = f"task_status:{task_id}"
-            deleted = r.delete(cache_key)
-            if deleted:
-                logger.debug(f"Cleared cache for task {task_id}")
-            else:
-                logger.debug(f"Cache key not found for task {task_id} (already cleared or never cached)")
-            # 显式关闭连接
-            r.close()
-        except Exception as e:
-            # 缓存清除失败不影响主流程，只记录警告
-            logger.warning(f"Failed to clear cache for task {task_id}: {e}")
+    def _write_task_cache(self, task_id: str, status: Optional[Dict[str, Any]]) -> None:
+        """写入任务状态缓存(任务不存在时清除缓存),失败不影响主流程"""
+        cache = get_task_status_cache()
+        if status is None:
+            cache.delete(task_id)
+        else:
+            cache.write(task_id, status)
     
     def update_status(
         self,
@@ -228,6 +336,7 @@ class TaskRepository:
         estimated_time: Optional[int] = None,
         error_details: Optional[str] = None,
         updated_at: Optional[datetime] = None,
+        audio_duration: Optional[float] = None,
     ) -> None:
         """更新任务状态（支持 TaskState enum）"""
         # 将 TaskState enum 转换为字符串
@@ -238,6 +347,7 @@ class TaskRepository:
             progress=progress,
             estimated_time=estimated_time,
             error_details=error_details,
+            audio_duration=audio_duration,
         )
     
     def update_error(
@@ -272,10 +382,29 @@ class TaskRepository:
                     task.retryable = retryable
                     task.updated_at = datetime.now()
                     
+                    event = {
+                        "user_id": task.user_id,
+                        "state": task.state,
+                        "progress": task.progress,
+                        "estimated_time": task.estimated_time,
+                        "error_code": error_code,
+                        "error_message": error_message,
+                        "error_details": error_details,
+                        "retryable": retryable,
+                        "updated_at": task.updated_at.isoformat(),
+                    }
+                    
+                    status = _task_status_payload(independent_session, task)
+                    
                     logger.info(f"Task error updated: {task_id} -> {error_code}: {error_message} (retryable={retryable})")
+                else:
+                    event = None
+                    status = None
+            
+            self._write_task_cache(task_id, status)
             
-            # 清除缓存
-            self._clear_task_cache(task_id)
+            if event is not None:
+                publish_task_event(task_id, event)
             
         except Exception as e:
             logger.error(f"Failed to update task error: {e}")
@@ -654,6 +783,19 @@ class ArtifactRepository:
             .all()
         )
 
+    def get_processing_by_user(self, user_id: str) -> List[GeneratedArtifactRecord]:
+        """获取用户任务下正在生成中的衍生内容"""
+        return (
+            self.session.query(GeneratedArtifactRecord)
+            .join(Task, Task.task_id == GeneratedArtifactRecord.task_id)
+            .filter(
+                Task.user_id == user_id,
+                Task.is_deleted == False,
+                GeneratedArtifactRecord.state == "processing",
+            )
+            .all()
+        )
+
     def create_placeholder(
         self,
         artifact_id: str,
@@ -18,6 +18,9 @@ logger = get_logger(__name__)
 class AzureASR(ASRProvider):
     """Azure Speech Service ASR 提供商实现"""
 
+    # 单次请求支持的最大音频时长(秒)
+    MAX_AUDIO_DURATION = 7200
+
     def __init__(self, config: AzureConfig):
         """
         初始化 Azure ASR 提供商
@@ -64,41 +67,37 @@ class AzureASR(ASRProvider):
                 temp_input_path = temp_file.name
                 temp_file.write(audio_data)
             
+            temp_wav_path = None
             try:
                 # 转换为 WAV 格式（Azure ASR 需要 WAV）
                 logger.info(f"Converting audio to WAV format for Azure ASR")
                 temp_wav_path = await self.audio_processor.convert_format(temp_input_path)
-                
-                # 读取转换后的 WAV 数据
-                with open(temp_wav_path, 'rb') as f:
-                    audio_data = f.read()
-                
+
                 # 获取音频时长
-                duration = self.audio_processor.get_duration(temp_wav_path)
+                duration = await self.audio_processor.get_duration(temp_wav_path)
                 logger.info(f"Azure ASR audio duration: {duration}s")
-                
-                # 清理 WAV 临时文件
-                try:
-                    os.unlink(temp_wav_path)
-                except:
-                    pass
+
+                if duration > self.MAX_AUDIO_DURATION:
+                    # 切分音频并分别转写(切分需要 WAV 文件,转写完成后再清理)
+                    segments = await self._transcribe_long_audio(
+                        temp_wav_path, duration, asr_language, hotword_set, **kwargs
+                    )
+                else:
+                    # 读取转换后的 WAV 数据并直接转写
+                    with open(temp_wav_path, 'rb') as f:
+                        audio_data = f.read()
+                    segments = await self._transcribe_audio(
+                        audio_data, asr_language, hotword_set, **kwargs
+                    )
             finally:
-                # 清理输入临时文件
-                try:
-                    os.unlink(temp_input_path)
-                except:
-                    pass
-
-            if duration > 7200:  # 2 小时
-                # 切分音频并分别转写
-                segments = await self._transcribe_long_audio(
-                    audio_data, asr_language, hotword_set, **kwargs
-                )
-            else:
-                # 直接转写
-                segments = await self._transcribe_audio(
-                    audio_data, asr_language, hotword_set, **kwargs
-                )
+                # 清理临时文件
+                for path in (temp_input_path, temp_wav_path):
+                    if path is None:
+                        continue
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
 
             # 构建完整文本
             full_text = " ".join(seg.text for seg in segments)
@@ -119,7 +118,8 @@ class AzureASR(ASRProvider):
 
     async def _transcribe_long_audio(
         self,
-        audio_data: bytes,
+        wav_path: str,
+        total_duration: float,
         asr_language: ASRLanguage,
         hotword_set: Optional[HotwordSet],
         **kwargs,
@@ -128,7 +128,8 @@ class AzureASR(ASRProvider):
         转写超过 2 小时的音频(自动切分)
 
         Args:
-            audio_data: 音频数据
+            wav_path: 转换后的 WAV 文件路径
+            total_duration: 音频总时长(秒)
             asr_language: ASR 识别语言
             hotword_set: 热词集
             **kwargs: 其他参数
@@ -137,25 +138,26 @@ class AzureASR(ASRProvider):
             List[Segment]: 转写片段列表
         """
         # 切分音频为 2 小时的片段
-        chunk_duration = 7200  # 2 小时
-        total_duration = self.audio_processor.get_duration(audio_data)
-        chunks = []
-
+        chunk_duration = self.MAX_AUDIO_DURATION
+        offsets = []
         current_time = 0.0
         while current_time < total_duration:
-            end_time = min(current_time + chunk_duration, total_duration)
-            chunk = self.audio_processor.extract_segment(audio_data, current_time, end_time)
-            chunks.append((chunk, current_time))
-            current_time = end_time
+            offsets.append(current_time)
+            current_time = min(current_time + chunk_duration, total_duration)
+
+        logger.info(f"Azure ASR split audio into {len(offsets)} chunks")
 
-        logger.info(f"Azure ASR split audio into {len(chunks)} chunks")
+        async def transcribe_chunk(offset: float) -> List[Segment]:
+            # 逐块切分,避免同时在内存中保留所有片段
+            chunk = await self.audio_processor.extract_segment(
+                wav_path, offset, min(offset + chunk_duration, total_duration)
+            )
+            return await self._transcribe_audio(
+                chunk, asr_language, hotword_set, offset=offset, **kwargs
+            )
 
         # 并发转写所有片段
-        tasks = [
-            self._transcribe_audio(chunk, asr_language, hotword_set, offset=offset, **kwargs)
-            for chunk, offset in chunks
-        ]
-        results = await asyncio.gather(*tasks)
+        results = await asyncio.gather(*(transcribe_chunk(offset) for offset in offsets))
 
         # 合并结果
         all_segments = []
@@ -1,11 +1,14 @@
 """Gemini LLM provider implementation."""
 
 import asyncio
+import hashlib
 import json
 import logging
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+import httpx
 from google import genai
 from google.genai import types
 
@@ -58,6 +61,112 @@ GLOBAL_SYSTEM_INSTRUCTION = """【底层约束 - 必须严格遵守】
 """
 
 
+# map-reduce 生成的 map 阶段提示词
+CHUNK_NOTES_PROMPT = """以下是一场长会议转写的第 {chunk_index}/{chunk_count} 部分。请提取这一部分的详细要点笔记,供之后汇总生成最终内容:
+
+- 按时间顺序记录讨论的议题、观点和结论,注明发言人
+- 完整保留决策、行动项(负责人、截止时间)、数字、日期和专有名词
+- 只记录转写中出现的内容,不要推断或编造
+- 不要写开场白或总结语
+
+## 会议转写(第 {chunk_index}/{chunk_count} 部分)
+{transcript}"""
+
+CHUNK_NOTES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "notes": {"type": "string", "description": "Markdown 格式的要点笔记"},
+    },
+    "required": ["notes"],
+}
+
+
+# JSON 字符串的单字符转义
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class ContentStreamDecoder:
+    """
+    从流式 JSON 响应中增量解码 content 字段
+
+    结构化输出的响应形如 {"content": "<Markdown>", ...},按分块到达。
+    每次 feed 返回 content 字符串新增的已解码文本;转义序列被分块截断时
+    留到下一次再解码。
+    """
+
+    _KEY_RE = re.compile(r'"content"\s*:\s*"')
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._buffer = ""
+        self._pos: Optional[int] = None  # content 值中下一个待解码字符的位置
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        """已接收的完整响应文本"""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> str:
+        """
+        输入一个响应分块
+
+        Args:
+            chunk: 响应文本分块
+
+        Returns:
+            str: content 字段新增的文本(可能为空)
+        """
+        self._chunks.append(chunk)
+        if self._done:
+            return ""
+        self._buffer += chunk
+
+        if self._pos is None:
+            match = self._KEY_RE.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        buffer = self._buffer
+        i = self._pos
+        out = []
+        while i < len(buffer):
+            ch = buffer[i]
+            if ch == '"':
+                self._done = True
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            if i + 1 >= len(buffer):
+                break
+            escape = buffer[i + 1]
+            if escape != "u":
+                out.append(_JSON_ESCAPES.get(escape, escape))
+                i += 2
+                continue
+            if i + 6 > len(buffer):
+                break
+            code = int(buffer[i + 2:i + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # 代理对: 等低位 \uXXXX 到齐再解码
+                if i + 12 > len(buffer):
+                    break
+                low = int(buffer[i + 8:i + 12], 16)
+                out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                i += 12
+            else:
+                out.append(chr(code))
+                i += 6
+
+        # 丢弃已解码部分,只保留未完成的转义
+        self._buffer = buffer[i:]
+        self._pos = 0
+        return "".join(out)
+
+
 class GeminiLLM(LLMProvider):
     """Gemini LLM 提供商实现"""
 
@@ -65,37 +174,79 @@ class GeminiLLM(LLMProvider):
         """
         初始化 Gemini LLM 提供商
 
+        每个 API 密钥对应一个 genai 客户端,所有客户端共用同一个 httpx
+        连接池;轮换密钥只切换索引,不重建客户端。连接池、客户端和并发
+        限制按事件循环懒加载(逐个处理模式下每个任务一个事件循环)。
+
         Args:
             config: Gemini 配置
         """
-        self.config = config
-        self.current_key_index = 0
-        self._configure_api()
-
-    def _configure_api(self) -> None:
-        """配置 Gemini API"""
-        if not self.config.api_keys:
+        if not config.api_keys:
             raise ValueError("Gemini API keys not configured")
 
-        # 使用当前密钥创建客户端
-        self.client = genai.Client(api_key=self.config.api_keys[self.current_key_index])
+        self.config = config
+        self.current_key_index = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._clients: Dict[int, genai.Client] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _bind_loop(self) -> None:
+        """确保连接池、客户端和并发限制属于当前事件循环"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            # 旧循环的连接池无法在新循环中关闭,由 Worker 在循环结束前调用 aclose 关闭
+            self._http_client = None
+            self._clients = {}
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+    def _get_client(self) -> genai.Client:
+        """获取当前密钥对应的客户端(共用连接池)"""
+        self._bind_loop()
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_concurrency,
+                    max_keepalive_connections=self.config.max_concurrency,
+                ),
+            )
+            self._clients = {}
+
+        client = self._clients.get(self.current_key_index)
+        if client is None:
+            client = genai.Client(
+                api_key=self.config.api_keys[self.current_key_index],
+                http_options=types.HttpOptions(
+                    timeout=self.config.timeout * 1000,
+                    httpx_async_client=self._http_client,
+                ),
+            )
+            self._clients[self.current_key_index] = client
+        return client
 
     def _rotate_api_key(self) -> bool:
         """
-        轮换到下一个 API 密钥
+        轮换到下一个 API 密钥(循环使用)
 
         Returns:
-            bool: 是否成功轮换(False 表示已用完所有密钥)
+            bool: 是否成功轮换(False 表示只有一个密钥)
         """
-        self.current_key_index += 1
-        if self.current_key_index >= len(self.config.api_keys):
+        if len(self.config.api_keys) < 2:
             return False
 
-        # 重新创建客户端
-        self.client = genai.Client(api_key=self.config.api_keys[self.current_key_index])
+        self.current_key_index = (self.current_key_index + 1) % len(self.config.api_keys)
         logger.info(f"Rotated to API key index {self.current_key_index}")
         return True
 
+    async def aclose(self) -> None:
+        """关闭共享的连接池"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        self._clients = {}
+
     async def generate_artifact(
         self,
         transcript: TranscriptionResult,
@@ -110,7 +261,9 @@ class GeminiLLM(LLMProvider):
             transcript: 转写结果
             prompt_instance: 提示词实例
             output_language: 输出语言
-            **kwargs: 其他参数(task_id, created_by, version, speaker_mapping, meeting_date, meeting_time)
+            **kwargs: 其他参数(task_id, created_by, version, speaker_mapping, meeting_date, meeting_time,
+                stream_callback: 流式生成时接收新增 Markdown 的异步回调,
+                timestamp_interval: 转写时间戳最小间隔,见 format_transcript)
 
         Returns:
             GeneratedArtifact: 生成的衍生内容
@@ -127,7 +280,9 @@ class GeminiLLM(LLMProvider):
                 raise LLMError("Template not provided", provider="gemini")
 
             # 2. 格式化转写文本（segments 中已经包含真实姓名）
-            formatted_transcript = self.format_transcript(transcript)
+            formatted_transcript = self.format_transcript(
+                transcript, timestamp_interval=kwargs.get("timestamp_interval")
+            )
 
             # 3. 构建完整提示词
             prompt = self._build_prompt(
@@ -147,8 +302,14 @@ class GeminiLLM(LLMProvider):
             # 5. 构建 JSON Schema（如果模板提供了）
             response_schema = self._build_response_schema(template)
 
-            # 6. 调用 Gemini API
-            response_text, usage_metadata = await self._call_gemini_api(prompt, response_schema)
+            # 6. 调用 Gemini API(提供 stream_callback 时流式生成,边生成边回调新增的 Markdown)
+            stream_callback = kwargs.get("stream_callback")
+            if stream_callback is not None:
+                response_text, usage_metadata = await self._stream_gemini_api(
+                    prompt, response_schema, stream_callback
+                )
+            else:
+                response_text, usage_metadata = await self._call_gemini_api(prompt, response_schema)
 
             # 7. 解析响应
             content_dict = self._parse_response(response_text, template.artifact_type)
@@ -209,6 +370,65 @@ class GeminiLLM(LLMProvider):
             logger.error(f"Failed to generate artifact: {e}")
             raise LLMError(f"Failed to generate artifact: {e}", provider="gemini")
 
+    def get_pricing_model(self) -> str:
+        """
+        获取计费模型
+
+        Returns:
+            str: 配置的价格档位
+        """
+        return self.config.pricing_tier
+
+    def supports_chunk_summaries(self) -> bool:
+        """
+        是否支持提取转写分块要点
+
+        Returns:
+            bool: 始终为 True
+        """
+        return True
+
+    async def summarize_transcript_chunk(
+        self,
+        transcript: TranscriptionResult,
+        output_language: OutputLanguage = OutputLanguage.ZH_CN,
+        **kwargs,
+    ) -> str:
+        """
+        提取转写分块的要点笔记(map-reduce 生成的 map 阶段)
+
+        Args:
+            transcript: 转写分块
+            output_language: 输出语言
+            **kwargs: 其他参数(chunk_index, chunk_count, instructions, timestamp_interval)
+
+        Returns:
+            str: 要点笔记
+
+        Raises:
+            LLMError: LLM 相关错误
+        """
+        chunk_index = kwargs.get("chunk_index", 1)
+        chunk_count = kwargs.get("chunk_count", 1)
+        prompt = CHUNK_NOTES_PROMPT.format(
+            chunk_index=chunk_index,
+            chunk_count=chunk_count,
+            transcript=self.format_transcript(
+                transcript, timestamp_interval=kwargs.get("timestamp_interval")
+            ),
+        )
+        if kwargs.get("instructions"):
+            prompt += f"\n\n## 最终内容的生成要求(供参考,请保留与之相关的信息)\n{kwargs['instructions']}"
+        prompt += f"\n\n{self._get_language_instruction(output_language)}"
+
+        response_text, _ = await self._call_gemini_api(prompt, CHUNK_NOTES_SCHEMA)
+        notes = self._parse_response(response_text, "chunk_notes").get("notes", "")
+        if not notes:
+            raise LLMError(
+                f"Empty notes for transcript chunk {chunk_index}/{chunk_count}", provider="gemini"
+            )
+        return notes
+
     def _build_prompt(
         self,
         template: PromptTemplate,
@@ -383,88 +603,194 @@ class GeminiLLM(LLMProvider):
         logger.info(f"=== END OF PROMPT ===")
         
         last_error = None
+        # 本次调用已尝试的密钥数(共享实例上轮换是循环的,需单独计数)
+        keys_tried = 1
 
         for attempt in range(self.config.max_retries):
             try:
-                # 配置生成参数 - 使用结构化 JSON 输出
-                config_params = {
-                    "max_output_tokens": self.config.max_tokens,
-                    "temperature": self.config.temperature,
-                    "response_mime_type": "application/json",  # 强制 JSON 输出
-                    "system_instruction": GLOBAL_SYSTEM_INSTRUCTION,  # 全局 System Instruction（格式约束）
-                }
-                
-                # 如果提供了 schema，添加到配置中
-                if response_schema:
-                    config_params["response_schema"] = response_schema
-                
-                config = types.GenerateContentConfig(**config_params)
-
-                # 调用 API
-                response = await asyncio.to_thread(
-                    self.client.models.generate_content,
-                    model=self.config.model,
-                    contents=prompt,
-                    config=config,
-                )
+                config = self._build_generation_config(response_schema)
+
+                # 调用 API(原生异步接口,受并发限制)
+                client = self._get_client()
+                async with self._semaphore:
+                    response = await client.aio.models.generate_content(
+                        model=self.config.model,
+                        contents=prompt,
+                        config=config,
+                    )
 
                 # 检查响应
                 if not response.text:
                     raise LLMError("Empty response from Gemini", provider="gemini")
 
                 # 提取使用统计信息
-                usage_metadata = {}
-                if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                    usage_metadata = {
-                        "prompt_token_count": getattr(response.usage_metadata, 'prompt_token_count', 0),
-                        "candidates_token_count": getattr(response.usage_metadata, 'candidates_token_count', 0),
-                        "total_token_count": getattr(response.usage_metadata, 'total_token_count', 0),
-                    }
-                    logger.info(f"Gemini API usage: {usage_metadata}")
-
+                usage_metadata = self._extract_usage(response)
                 return response.text, usage_metadata
 
             except Exception as e:
-                error_msg = str(e).lower()
                 last_error = e
+                if self._rotate_on_limit_error(e, keys_tried):
+                    keys_tried += 1
+                    continue
 
-                # Token 超限
-                if "token" in error_msg and "limit" in error_msg:
-                    raise LLMTokenLimitError(
-                        f"Token limit exceeded: {e}",
-                        provider="gemini",
-                        details={"error": str(e)},
-                    )
+                # 其他错误,指数退避重试
+                await self._backoff_before_retry(attempt, e)
 
-                # 速率限制
-                if "rate" in error_msg or "quota" in error_msg or "429" in error_msg:
-                    # 尝试轮换密钥
-                    if self._rotate_api_key():
-                        logger.warning(f"Rate limit hit, rotated to next API key")
-                        continue
-                    else:
-                        raise RateLimitError(
-                            f"Rate limit exceeded and no more API keys available: {e}",
-                            provider="gemini",
-                            details={"error": str(e)},
-                        )
+        raise LLMError(
+            f"Failed to call Gemini API after {self.config.max_retries} attempts: {last_error}",
+            provider="gemini",
+        )
 
-                # 其他错误,指数退避重试
-                if attempt < self.config.max_retries - 1:
-                    wait_time = 2**attempt
-                    logger.warning(
-                        f"Gemini API call failed (attempt {attempt + 1}/{self.config.max_retries}), "
-                        f"retrying in {wait_time}s: {e}"
+    async def _stream_gemini_api(
+        self,
+        prompt: str,
+        response_schema: Optional[Dict],
+        on_delta: Callable[[str], Awaitable[None]],
+    ) -> tuple[str, dict]:
+        """
+        流式调用 Gemini API,边接收边回调 content 字段新增的 Markdown
+
+        重试、退避和密钥轮换与 _call_gemini_api 相同,但只在尚未回调任何
+        内容时重试;已推送增量后中断直接抛出,避免客户端收到重复内容。
+
+        Args:
+            prompt: 提示词
+            response_schema: JSON Schema 定义（可选）
+            on_delta: 增量回调,参数为新增的 Markdown 文本
+
+        Returns:
+            tuple[str, dict]: (完整响应文本（JSON 格式）, 使用统计信息)
+
+        Raises:
+            LLMError: API 调用失败或流中断
+            LLMTokenLimitError: Token 超限
+            RateLimitError: 速率限制
+        """
+        logger.info(f"Streaming Gemini generation: prompt length {len(prompt)} chars")
+
+        last_error = None
+        keys_tried = 1
+
+        for attempt in range(self.config.max_retries):
+            decoder = ContentStreamDecoder()
+            emitted = False
+            try:
+                config = self._build_generation_config(response_schema)
+                client = self._get_client()
+                usage_metadata = {}
+                async with self._semaphore:
+                    stream = await client.aio.models.generate_content_stream(
+                        model=self.config.model,
+                        contents=prompt,
+                        config=config,
                     )
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"Gemini API call failed after {self.config.max_retries} attempts: {e}")
+                    async for chunk in stream:
+                        # 使用统计在最后一个分块中才完整
+                        usage_metadata = self._extract_usage(chunk, log=False) or usage_metadata
+                        delta = decoder.feed(chunk.text or "")
+                        if delta:
+                            emitted = True
+                            await on_delta(delta)
+
+                if not decoder.text:
+                    raise LLMError("Empty response from Gemini", provider="gemini")
+
+                logger.info(f"Gemini API usage: {usage_metadata}")
+                return decoder.text, usage_metadata
+
+            except Exception as e:
+                if emitted:
+                    raise LLMError(f"Gemini stream interrupted: {e}", provider="gemini")
+                last_error = e
+                if self._rotate_on_limit_error(e, keys_tried):
+                    keys_tried += 1
+                    continue
+                await self._backoff_before_retry(attempt, e)
 
         raise LLMError(
             f"Failed to call Gemini API after {self.config.max_retries} attempts: {last_error}",
             provider="gemini",
         )
 
+    def _build_generation_config(self, response_schema: Optional[Dict]) -> types.GenerateContentConfig:
+        """构建生成参数 - 使用结构化 JSON 输出"""
+        config_params = {
+            "max_output_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "response_mime_type": "application/json",  # 强制 JSON 输出
+            "system_instruction": GLOBAL_SYSTEM_INSTRUCTION,  # 全局 System Instruction（格式约束）
+        }
+
+        # 如果提供了 schema，添加到配置中
+        if response_schema:
+            config_params["response_schema"] = response_schema
+
+        return types.GenerateContentConfig(**config_params)
+
+    def _extract_usage(self, response, log: bool = True) -> dict:
+        """提取使用统计信息"""
+        usage_metadata = {}
+        if hasattr(response, 'usage_metadata') and response.usage_metadata:
+            usage_metadata = {
+                "prompt_token_count": getattr(response.usage_metadata, 'prompt_token_count', 0),
+                "candidates_token_count": getattr(response.usage_metadata, 'candidates_token_count', 0),
+                "total_token_count": getattr(response.usage_metadata, 'total_token_count', 0),
+            }
+            if log:
+                logger.info(f"Gemini API usage: {usage_metadata}")
+        return usage_metadata
+
+    def _rotate_on_limit_error(self, error: Exception, keys_tried: int) -> bool:
+        """
+        处理 Token 超限和速率限制错误
+
+        Args:
+            error: API 调用异常
+            keys_tried: 本次调用已尝试的密钥数(共享实例上轮换是循环的,需单独计数)
+
+        Returns:
+            bool: 速率限制且已轮换到下一个密钥时返回 True,其他错误返回 False
+
+        Raises:
+            LLMTokenLimitError: Token 超限
+            RateLimitError: 速率限制且没有更多可用密钥
+        """
+        error_msg = str(error).lower()
+
+        # Token 超限
+        if "token" in error_msg and "limit" in error_msg:
+            raise LLMTokenLimitError(
+                f"Token limit exceeded: {error}",
+                provider="gemini",
+                details={"error": str(error)},
+            )
+
+        # 速率限制
+        if "rate" in error_msg or "quota" in error_msg or "429" in error_msg:
+            # 尝试轮换密钥
+            if keys_tried < len(self.config.api_keys) and self._rotate_api_key():
+                logger.warning(f"Rate limit hit, rotated to next API key")
+                return True
+            raise RateLimitError(
+                f"Rate limit exceeded and no more API keys available: {error}",
+                provider="gemini",
+                details={"error": str(error)},
+            )
+
+        return False
+
+    async def _backoff_before_retry(self, attempt: int, error: Exception) -> None:
+        """指数退避(最后一次尝试只记录日志)"""
+        if attempt < self.config.max_retries - 1:
+            wait_time = 2**attempt
+            logger.warning(
+                f"Gemini API call failed (attempt {attempt + 1}/{self.config.max_retries}), "
+                f"retrying in {wait_time}s: {error}"
+            )
+            await asyncio.sleep(wait_time)
+        else:
+            logger.error(f"Gemini API call failed after {self.config.max_retries} attempts: {error}")
+
     def _parse_response(self, response_text: str, artifact_type: str) -> Dict[str, Any]:
         """
         解析 Gemini 响应（原生 JSON 格式）
@@ -609,12 +935,16 @@ class GeminiLLM(LLMProvider):
 
 请以 JSON 格式返回结果。"""
 
-    def format_transcript(self, transcript: TranscriptionResult) -> str:
+    def format_transcript(
+        self, transcript: TranscriptionResult, timestamp_interval: Optional[float] = None
+    ) -> str:
         """
         格式化转写文本
 
         Args:
             transcript: 转写结果
+            timestamp_interval: 时间戳最小间隔(秒);None 表示每行标注起止时间,
+                否则只在距上次标注达到该间隔的行标注开始时间(首行总是标注)
 
         Returns:
             str: 格式化后的文本
@@ -623,12 +953,20 @@ class GeminiLLM(LLMProvider):
             return ""
 
         lines = []
+        last_stamp: Optional[float] = None
         for segment in transcript.segments:
-            # 格式: [说话人] 文本 (开始时间 - 结束时间)
             speaker = segment.speaker or "未知说话人"
-            start_time = self._format_time(segment.start_time)
-            end_time = self._format_time(segment.end_time)
-            lines.append(f"[{speaker}] {segment.text} ({start_time} - {end_time})")
+            if timestamp_interval is None:
+                # 格式: [说话人] 文本 (开始时间 - 结束时间)
+                start_time = self._format_time(segment.start_time)
+                end_time = self._format_time(segment.end_time)
+                lines.append(f"[{speaker}] {segment.text} ({start_time} - {end_time})")
+            elif last_stamp is None or segment.start_time - last_stamp >= timestamp_interval:
+                # 格式: [说话人] 文本 (开始时间)
+                lines.append(f"[{speaker}] {segment.text} ({self._format_time(segment.start_time)})")
+                last_stamp = segment.start_time
+            else:
+                lines.append(f"[{speaker}] {segment.text}")
 
         return "\n".join(lines)
 
@@ -647,6 +985,19 @@ class GeminiLLM(LLMProvider):
         secs = int(seconds % 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
+    def get_model_fingerprint(self) -> str:
+        """
+        获取模型指纹(模型名、生成参数和系统指令)
+
+        Returns:
+            str: 模型指纹
+        """
+        instruction_hash = hashlib.sha256(GLOBAL_SYSTEM_INSTRUCTION.encode("utf-8")).hexdigest()[:12]
+        return (
+            f"gemini:{self.config.model}:t={self.config.temperature}:"
+            f"max={self.config.max_tokens}:sys={instruction_hash}"
+        )
+
     def get_provider_name(self) -> str:
         """
         获取提供商名称
@@ -655,3 +1006,25 @@ class GeminiLLM(LLMProvider):
             str: 提供商名称
         """
         return "gemini"
+
+
+# 进程内共享实例
+_shared_llm: Optional[GeminiLLM] = None
+
+
+def get_gemini_llm(config: GeminiConfig) -> GeminiLLM:
+    """
+    获取进程内共享的 Gemini LLM 实例
+
+    配置变化(如重新加载)时重建实例。
+
+    Args:
+        config: Gemini 配置
+
+    Returns:
+        GeminiLLM: 共享实例
+    """
+    global _shared_llm
+    if _shared_llm is None or _shared_llm.config != config:
+        _shared_llm = GeminiLLM(config)
+    return _shared_llm
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """iFLYTEK Voiceprint Recognition Provider Implementation."""
 
+import asyncio
 import base64
 import hashlib
 import hmac
@@ -23,6 +24,7 @@ from src.core.exceptions import (
 from src.core.models import SpeakerIdentity, TranscriptionResult
 from src.core.providers import VoiceprintProvider
 from src.utils.logger import get_logger
+from src.utils.rate_limiter import AsyncRateLimiter
 
 logger = get_logger(__name__)
 
@@ -45,12 +47,21 @@ class IFlyTekVoiceprint(VoiceprintProvider):
         self.score_threshold = 0.58  # 高置信度阈值（调整为 0.58）
         self.min_accept_score = 0.40  # 最低容忍分数（防止完全是噪音）
         self.gap_threshold = 0.15  # 分差挽救阈值（需显著高于第二名）
+        
+        # 并发与限流
+        self.max_concurrency = config.max_concurrency
+        self.rate_limiter = AsyncRateLimiter(config.qps_limit)
+        
+        # 复用的 HTTP 客户端(按事件循环懒加载)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def identify_speakers(
         self,
         transcript: TranscriptionResult,
         audio_url: str,
         known_speakers: Optional[List[SpeakerIdentity]] = None,
+        speaker_samples: Optional[Dict[str, bytes]] = None,
         **kwargs,
     ) -> Dict[str, str]:
         """
@@ -60,6 +71,8 @@ class IFlyTekVoiceprint(VoiceprintProvider):
             transcript: 转写结果
             audio_url: 本地音频文件路径 (参数名保留为 audio_url 以兼容接口)
             known_speakers: 已知说话人列表(用于 1:N 搜索)
+            speaker_samples: 预先提取的样本 {speaker_label: WAV bytes}(可选),
+                缺失的说话人仍从 audio_url 提取
             **kwargs: 其他提供商特定参数
 
         Returns:
@@ -68,39 +81,48 @@ class IFlyTekVoiceprint(VoiceprintProvider):
         Raises:
             VoiceprintError: 声纹识别相关错误
         """
-        speaker_mapping = {}
-        
         # 获取唯一说话人标签
         speaker_labels = transcript.speakers
-        logger.info(f"Identifying {len(speaker_labels)} speakers")
-
-        for speaker_label in speaker_labels:
-            try:
-                # 提取该说话人的音频样本(3-6秒)
-                audio_sample = await self._extract_speaker_sample(
-                    transcript, audio_url, speaker_label
-                )
+        speaker_samples = speaker_samples or {}
+        logger.info(
+            f"Identifying {len(speaker_labels)} speakers "
+            f"(concurrency={self.max_concurrency})"
+        )
 
-                # 进行 1:N 搜索
-                result = await self._search_speaker(audio_sample, known_speakers)
+        # 各说话人相互独立,并发识别(样本提取 + 1:N 搜索)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def identify_one(speaker_label: str) -> str:
+            async with semaphore:
+                try:
+                    # 优先使用调用方提供的样本,否则提取该说话人的音频样本(3-6秒)
+                    audio_sample = speaker_samples.get(speaker_label)
+                    if audio_sample is None:
+                        audio_sample = await self._extract_speaker_sample(
+                            transcript, audio_url, speaker_label
+                        )
+
+                    # 进行 1:N 搜索
+                    result = await self._search_speaker(audio_sample, known_speakers)
+
+                    if result:
+                        logger.info(
+                            f"Speaker {speaker_label} identified as {result['name']} "
+                            f"(score: {result['score']:.3f})"
+                        )
+                        return result["name"]
 
-                if result:
-                    speaker_mapping[speaker_label] = result["name"]
-                    logger.info(
-                        f"Speaker {speaker_label} identified as {result['name']} "
-                        f"(score: {result['score']:.3f})"
-                    )
-                else:
                     # 识别失败,保留原标签
-                    speaker_mapping[speaker_label] = speaker_label
                     logger.warning(f"Speaker {speaker_label} not identified, keeping original label")
+                    return speaker_label
 
-            except Exception as e:
-                # 识别失败,保留原标签
-                speaker_mapping[speaker_label] = speaker_label
-                logger.error(f"Failed to identify speaker {speaker_label}: {e}")
+                except Exception as e:
+                    # 识别失败,保留原标签
+                    logger.error(f"Failed to identify speaker {speaker_label}: {e}")
+                    return speaker_label
 
-        return speaker_mapping
+        names = await asyncio.gather(*(identify_one(label) for label in speaker_labels))
+        return dict(zip(speaker_labels, names))
 
     async def _extract_speaker_sample(
         self, transcript: TranscriptionResult, audio_path: str, speaker_label: str
@@ -340,45 +362,78 @@ class IFlyTekVoiceprint(VoiceprintProvider):
             AuthenticationError: 认证失败
             RateLimitError: 速率限制
         """
-        # 生成鉴权参数
+        # QPS 限流
+        await self.rate_limiter.acquire()
+
+        # 生成鉴权参数(签名包含时间戳,需在限流之后生成)
         auth_params = self._generate_auth_params()
 
         # 构建完整 URL
         url = f"{self.api_url}?{urlencode(auth_params)}"
 
-        # 发送请求
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            try:
-                response = await client.post(
-                    url,
-                    json=request_body,
-                    headers={"Content-Type": "application/json"},
-                )
+        # 发送请求(复用连接池)
+        client = self._get_client()
+        try:
+            response = await client.post(
+                url,
+                json=request_body,
+                headers={"Content-Type": "application/json"},
+            )
+
+            # 检查 HTTP 状态码
+            if response.status_code == 401:
+                raise AuthenticationError(f"iFLYTEK authentication failed: {response.text}")
+            elif response.status_code == 403:
+                raise AuthenticationError(f"iFLYTEK authorization failed: {response.text}")
+            elif response.status_code == 429:
+                raise RateLimitError("iFLYTEK rate limit exceeded")
 
-                # 检查 HTTP 状态码
-                if response.status_code == 401:
-                    raise AuthenticationError(f"iFLYTEK authentication failed: {response.text}")
-                elif response.status_code == 403:
-                    raise AuthenticationError(f"iFLYTEK authorization failed: {response.text}")
-                elif response.status_code == 429:
-                    raise RateLimitError("iFLYTEK rate limit exceeded")
+            response.raise_for_status()
 
-                response.raise_for_status()
+            # 解析响应
+            result = response.json()
 
-                # 解析响应
-                result = response.json()
+            # 检查业务错误码
+            if "header" in result and result["header"].get("code") != 0:
+                error_code = result["header"].get("code")
+                error_msg = result["header"].get("message", "Unknown error")
+                raise VoiceprintError(f"iFLYTEK API error {error_code}: {error_msg}")
 
-                # 检查业务错误码
-                if "header" in result and result["header"].get("code") != 0:
-                    error_code = result["header"].get("code")
-                    error_msg = result["header"].get("message", "Unknown error")
-                    raise VoiceprintError(f"iFLYTEK API error {error_code}: {error_msg}")
+            return result
 
-                return result
+        except httpx.HTTPError as e:
+            logger.error(f"iFLYTEK HTTP error: {e}")
+            raise VoiceprintError(f"iFLYTEK HTTP error: {e}")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        获取共享的 HTTP 客户端
 
-            except httpx.HTTPError as e:
-                logger.error(f"iFLYTEK HTTP error: {e}")
-                raise VoiceprintError(f"iFLYTEK HTTP error: {e}")
+        客户端在同一事件循环内复用连接;事件循环变化时(逐个处理模式下
+        每个任务一个事件循环)重新创建。旧客户端的连接无法在新循环中关闭,
+        由 Worker 在每个事件循环结束前调用 aclose 关闭。
+
+        Returns:
+            httpx.AsyncClient: HTTP 客户端
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """关闭共享的 HTTP 客户端"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     def _generate_auth_params(self) -> dict:
         """
@@ -1,6 +1,5 @@
 """Volcano Engine ASR Provider Implementation."""
 
-import asyncio
 import json
 from typing import Optional
 
@@ -16,6 +15,7 @@ from src.core.exceptions import (
 )
 from src.core.models import ASRLanguage, HotwordSet, Segment, TranscriptionResult
 from src.core.providers import ASRProvider
+from src.providers.volcano_poller import VolcanoResultPoller
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -36,6 +36,8 @@ class VolcanoASR(ASRProvider):
         self.submit_url = "https://openspeech-direct.zijieapi.com/api/v3/auc/bigmodel/submit"
         self.query_url = "https://openspeech-direct.zijieapi.com/api/v3/auc/bigmodel/query"
         self.resource_id = "volc.bigasr.auc"
+        # 所有进行中的任务共用一个轮询器
+        self.poller = VolcanoResultPoller(config, self.query_url, self.resource_id)
 
     async def transcribe(
         self,
@@ -66,7 +68,7 @@ class VolcanoASR(ASRProvider):
             task_id, x_tt_logid = await self._submit_task(audio_url, asr_language, hotword_set, **kwargs)
             logger.info(f"Volcano ASR task submitted: {task_id}")
 
-            # 轮询结果(指数退避)
+            # 等待共享轮询器返回结果(指数退避)
             result = await self._poll_result(task_id, x_tt_logid)
             logger.info(f"Volcano ASR task completed: {task_id}")
 
@@ -178,68 +180,28 @@ class VolcanoASR(ASRProvider):
                 logger.error(f"Volcano ASR HTTP error: {e}")
                 raise ASRError(f"Volcano ASR HTTP error: {e}")
 
-    async def _poll_result(self, task_id: str, x_tt_logid: str, max_wait: int = 300) -> dict:
+    async def _poll_result(
+        self, task_id: str, x_tt_logid: str, max_wait: Optional[float] = None
+    ) -> dict:
         """
-        轮询转写结果 (V3 API, 指数退避)
+        等待转写结果 (V3 API)
+
+        任务登记到共享轮询器,由其统一按指数退避查询。
 
         Args:
             task_id: 任务 ID
             x_tt_logid: 日志 ID
-            max_wait: 最大等待时间(秒)
+            max_wait: 最大等待时间(秒),默认使用配置 max_poll_wait
 
         Returns:
             dict: 转写结果
 
         Raises:
-            ASRError: 轮询失败或超时
+            ASRError: 任务失败或超时
         """
-        # 构建 V3 API 请求头
-        headers = {
-            "X-Api-App-Key": self.config.app_id,
-            "X-Api-Access-Key": self.config.access_key,
-            "X-Api-Resource-Id": self.resource_id,
-            "X-Api-Request-Id": task_id,
-            "X-Tt-Logid": x_tt_logid,
-        }
-
-        start_time = asyncio.get_event_loop().time()
-        retry_delay = 2  # 初始延迟 2 秒
-        max_retry_delay = 30  # 最大延迟 30 秒
-
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            while True:
-                # 检查超时
-                elapsed = asyncio.get_event_loop().time() - start_time
-                if elapsed > max_wait:
-                    raise ASRError(f"Volcano ASR polling timeout after {max_wait}s")
-
-                try:
-                    response = await client.post(
-                        self.query_url, json={}, headers=headers
-                    )
-
-                    # V3 API 使用 header 返回状态
-                    status_code = response.headers.get("X-Api-Status-Code", "")
-                    message = response.headers.get("X-Api-Message", "")
-
-                    if status_code == "20000000":
-                        # 转写成功
-                        result_data = response.json() if response.text else {}
-                        return result_data.get("result", {})
-                    elif status_code in ["20000001", "20000002"]:
-                        # 处理中或排队中,继续轮询
-                        status_text = "处理中" if status_code == "20000001" else "排队中"
-                        logger.debug(f"Volcano ASR task {task_id} {status_text}: {message}")
-                        await asyncio.sleep(retry_delay)
-                        # 指数退避,最大 30 秒
-                        retry_delay = min(retry_delay * 1.5, max_retry_delay)
-                    else:
-                        # 任务失败
-                        raise ASRError(f"Volcano ASR task failed: [{status_code}] {message}")
-
-                except httpx.HTTPError as e:
-                    logger.error(f"Volcano ASR polling HTTP error: {e}")
-                    raise ASRError(f"Volcano ASR polling HTTP error: {e}")
+        if max_wait is None:
+            max_wait = self.config.max_poll_wait
+        return await self.poller.wait_for_result(task_id, x_tt_logid, max_wait)
 
     def _parse_result(self, result: dict, audio_url: str) -> TranscriptionResult:
         """
@@ -344,6 +306,10 @@ class VolcanoASR(ASRProvider):
                 logger.error(f"Volcano ASR status query HTTP error: {e}")
                 raise ASRError(f"Volcano ASR status query HTTP error: {e}")
 
+    async def aclose(self) -> None:
+        """停止结果轮询并关闭共享连接"""
+        await self.poller.aclose()
+
     def get_provider_name(self) -> str:
         """
         获取提供商名称
@@ -353,6 +319,15 @@ class VolcanoASR(ASRProvider):
         """
         return "volcano"
 
+    def get_default_hotword_resource(self) -> Optional[str]:
+        """
+        获取全局热词库 ID(未指定用户热词集时使用)
+
+        Returns:
+            Optional[str]: 配置的 boosting_table_id
+        """
+        return self.config.boosting_table_id or None
+
     def _map_language(self, asr_language: ASRLanguage) -> str:
         """
         映射 ASRLanguage 到火山引擎语言代码
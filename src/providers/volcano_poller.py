@@ -0,0 +1,257 @@
+"""Shared background poller for in-flight Volcano Engine ASR jobs."""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import httpx
+
+from src.config.models import VolcanoConfig
+from src.core.exceptions import ASRError
+from src.utils.logger import get_logger
+from src.utils.metrics import get_metrics_collector
+
+logger = get_logger(__name__)
+
+# V3 API 状态码
+STATUS_SUCCESS = "20000000"
+STATUS_PROCESSING = "20000001"
+STATUS_QUEUED = "20000002"
+
+
+@dataclass
+class _PollJob:
+    """一个等待结果的转写任务"""
+
+    task_id: str
+    x_tt_logid: str
+    future: asyncio.Future
+    next_poll_at: float
+    delay: float
+    errors: int = field(default=0)
+
+
+class VolcanoResultPoller:
+    """
+    火山引擎转写结果轮询器
+
+    每个 Worker 一个实例,统一跟踪所有进行中的任务:
+    - 通过同一个连接池查询,避免每个任务单独建连
+    - 单个后台协程按各任务的退避时间表批量轮询
+    - 结果到达时完成对应任务的 Future
+
+    同步原语和 HTTP 客户端按事件循环懒加载(逐个处理模式下每个任务一个事件循环)。
+    """
+
+    def __init__(self, config: VolcanoConfig, query_url: str, resource_id: str):
+        """
+        初始化轮询器
+
+        Args:
+            config: 火山引擎配置
+            query_url: 查询接口 URL
+            resource_id: 资源 ID
+        """
+        self.config = config
+        self.query_url = query_url
+        self.resource_id = resource_id
+        self.poll_interval = config.poll_interval
+        self.max_poll_interval = config.max_poll_interval
+        self.max_concurrency = config.poll_concurrency
+        self.max_consecutive_errors = config.max_retries
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._jobs: Dict[str, _PollJob] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def in_flight(self) -> int:
+        """进行中的任务数"""
+        return len(self._jobs)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """确保客户端和同步原语属于当前事件循环"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            # 旧循环的连接池无法在新循环中关闭,由 Worker 在循环结束前调用 aclose 关闭
+            self._client = None
+            self._jobs = {}
+            self._task = None
+            self._wakeup = asyncio.Event()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取共享的 HTTP 客户端"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._client
+
+    async def wait_for_result(
+        self, task_id: str, x_tt_logid: str, max_wait: Optional[float] = None
+    ) -> dict:
+        """
+        登记任务并等待结果
+
+        Args:
+            task_id: 任务 ID
+            x_tt_logid: 日志 ID
+            max_wait: 最大等待时间(秒),None 表示不限制
+
+        Returns:
+            dict: 转写结果 (result 字段内容)
+
+        Raises:
+            ASRError: 任务失败、连续查询失败或超时
+        """
+        loop = self._bind_loop()
+        job = _PollJob(
+            task_id=task_id,
+            x_tt_logid=x_tt_logid,
+            future=loop.create_future(),
+            next_poll_at=loop.time(),
+            delay=self.poll_interval,
+        )
+        self._jobs[task_id] = job
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        self._wakeup.set()
+
+        try:
+            if max_wait:
+                return await asyncio.wait_for(job.future, max_wait)
+            return await job.future
+        except asyncio.TimeoutError:
+            raise ASRError(f"Volcano ASR polling timeout after {max_wait}s")
+        finally:
+            if self._jobs.get(task_id) is job:
+                del self._jobs[task_id]
+
+    async def _run(self) -> None:
+        """后台轮询循环,没有进行中的任务时退出"""
+        loop = asyncio.get_running_loop()
+        metrics = get_metrics_collector()
+        try:
+            while self._jobs:
+                metrics.set_gauge("volcano_asr_jobs_in_flight", len(self._jobs))
+                now = loop.time()
+                due = [job for job in self._jobs.values() if job.next_poll_at <= now]
+                if due:
+                    await asyncio.gather(*(self._poll_one(job) for job in due))
+                    continue
+
+                next_at = min(job.next_poll_at for job in self._jobs.values())
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_at - now)
+                except asyncio.TimeoutError:
+                    pass
+        except Exception as e:
+            # 轮询循环本身的异常(单个任务的异常已在 _poll_one 中处理)
+            # 让所有等待者失败,避免永久挂起
+            logger.error(f"Volcano ASR poller crashed: {e}", exc_info=True)
+            for job in list(self._jobs.values()):
+                if not job.future.done():
+                    job.future.set_exception(ASRError(f"Volcano ASR poller failed: {e}"))
+        finally:
+            metrics.set_gauge("volcano_asr_jobs_in_flight", len(self._jobs))
+
+    async def _poll_one(self, job: _PollJob) -> None:
+        """查询单个任务并更新其状态(单个任务的异常只让该任务失败)"""
+        try:
+            await self._query_one(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 如成功响应体无法解析、结果格式异常等,不能影响其他任务
+            logger.error(f"Volcano ASR polling failed for {job.task_id}: {e}", exc_info=True)
+            self._finish(job, error=ASRError(f"Volcano ASR polling failed: {e}"))
+
+    async def _query_one(self, job: _PollJob) -> None:
+        if job.future.done():
+            self._jobs.pop(job.task_id, None)
+            return
+
+        headers = {
+            "X-Api-App-Key": self.config.app_id,
+            "X-Api-Access-Key": self.config.access_key,
+            "X-Api-Resource-Id": self.resource_id,
+            "X-Api-Request-Id": job.task_id,
+            "X-Tt-Logid": job.x_tt_logid,
+        }
+
+        async with self._semaphore:
+            try:
+                response = await self._get_client().post(self.query_url, json={}, headers=headers)
+            except httpx.HTTPError as e:
+                job.errors += 1
+                logger.warning(
+                    f"Volcano ASR polling HTTP error for {job.task_id} "
+                    f"({job.errors}/{self.max_consecutive_errors}): {e}"
+                )
+                if job.errors >= self.max_consecutive_errors:
+                    self._finish(job, error=ASRError(f"Volcano ASR polling HTTP error: {e}"))
+                else:
+                    self._reschedule(job)
+                return
+
+        job.errors = 0
+        status_code = response.headers.get("X-Api-Status-Code", "")
+        message = response.headers.get("X-Api-Message", "")
+
+        if status_code == STATUS_SUCCESS:
+            result_data = response.json() if response.text else {}
+            self._finish(job, result=result_data.get("result", {}))
+        elif status_code in (STATUS_PROCESSING, STATUS_QUEUED):
+            status_text = "处理中" if status_code == STATUS_PROCESSING else "排队中"
+            logger.debug(f"Volcano ASR task {job.task_id} {status_text}: {message}")
+            self._reschedule(job)
+        else:
+            self._finish(
+                job, error=ASRError(f"Volcano ASR task failed: [{status_code}] {message}")
+            )
+
+    def _reschedule(self, job: _PollJob) -> None:
+        """按指数退避安排下一次查询"""
+        job.next_poll_at = self._loop.time() + job.delay
+        job.delay = min(job.delay * 1.5, self.max_poll_interval)
+
+    def _finish(
+        self,
+        job: _PollJob,
+        result: Optional[dict] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """完成任务的 Future 并停止跟踪"""
+        self._jobs.pop(job.task_id, None)
+        if job.future.done():
+            return
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    async def aclose(self) -> None:
+        """停止轮询并关闭共享的 HTTP 客户端"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for job in list(self._jobs.values()):
+            self._finish(job, error=ASRError("Volcano ASR poller closed"))
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
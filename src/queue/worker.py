@@ -10,11 +10,12 @@ import time
 import logging
 import asyncio
 import os
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from src.queue.manager import QueueManager
 from src.services.pipeline import PipelineService
+from src.services.status_writer import TaskStatusWriter
 from src.database.session import session_scope
 from src.database.repositories import TaskRepository
 from src.core.models import TaskState
@@ -28,6 +29,9 @@ class TaskWorker:
     
     从队列拉取任务并执行会议处理管线。
     实现优雅停机机制。
+
+    max_concurrent_tasks 为 1 时逐个处理任务;大于 1 时在一个常驻事件循环中
+    并发执行多个任务,每个任务使用独立的 session 和仓库。
     """
     
     def __init__(
@@ -35,6 +39,9 @@ class TaskWorker:
         queue_manager: QueueManager,
         pipeline_service: PipelineService,
         max_shutdown_wait: int = 300,
+        max_concurrent_tasks: int = 1,
+        status_writer: Optional[TaskStatusWriter] = None,
+        providers: Optional[List[Any]] = None,
     ):
         """
         初始化 Worker
@@ -43,13 +50,21 @@ class TaskWorker:
             queue_manager: 队列管理器
             pipeline_service: 管线服务
             max_shutdown_wait: 最大停机等待时间(秒)
+            max_concurrent_tasks: 最大并发任务数(1 表示逐个处理)
+            status_writer: 管线使用的状态合并写入器(可选,任务结束时写入剩余更新)
+            providers: 持有连接池的提供商(实现 aclose),连接池绑定在事件循环上,
+                在事件循环结束前关闭(逐个处理模式下每个任务结束时)
         """
         self.queue_manager = queue_manager
         self.pipeline_service = pipeline_service
         self.max_shutdown_wait = max_shutdown_wait
+        self.max_concurrent_tasks = max(1, max_concurrent_tasks)
+        self.status_writer = status_writer
+        self.providers = list(providers or [])
         
         self.running = False
         self.current_task_id: Optional[str] = None
+        self.active_tasks: Dict[str, asyncio.Task] = {}
         self.shutdown_requested = False
         
         # Redis 客户端（用于检查取消状态）
@@ -84,6 +99,11 @@ class TaskWorker:
         
         if self.current_task_id:
             logger.info(f"Waiting for current task to complete: {self.current_task_id}")
+        elif self.active_tasks:
+            logger.info(f"Waiting for in-flight tasks to complete: {list(self.active_tasks)}")
+        elif self.max_concurrent_tasks > 1:
+            # 并发模式下由事件循环自行退出,避免在循环内部直接 sys.exit
+            logger.info("No task in progress, stopping event loop")
         else:
             logger.info("No task in progress, shutting down immediately")
             sys.exit(0)
@@ -92,9 +112,14 @@ class TaskWorker:
         """
         启动 Worker 主循环
         """
-        logger.info("Starting TaskWorker...")
+        logger.info(f"Starting TaskWorker (max_concurrent_tasks={self.max_concurrent_tasks})...")
         self.running = True
         
+        if self.max_concurrent_tasks > 1:
+            asyncio.run(self._run_concurrent())
+            logger.info("TaskWorker stopped")
+            return
+        
         while self.running:
             try:
                 # 拉取任务
@@ -109,7 +134,7 @@ class TaskWorker:
                     
                     try:
                         # Run async _process_task in event loop
-                        asyncio.run(self._process_task(task_id, task_data))
+                        asyncio.run(self._run_serial_task(task_id, task_data))
                     except Exception as e:
                         logger.error(f"Task {task_id} failed: {e}", exc_info=True)
                         self._mark_task_failed(task_id, str(e))
@@ -127,6 +152,107 @@ class TaskWorker:
         
         logger.info("TaskWorker stopped")
     
+    async def _run_concurrent(self):
+        """
+        并发模式主循环
+
+        在单个事件循环中拉取任务并以 asyncio.Task 形式执行,
+        通过信号量限制在途任务数量。停机时等待在途任务完成
+        (最多 max_shutdown_wait 秒),超时则取消。
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+        
+        while self.running:
+            # 先占用槽位再拉取,保证拉到的任务一定能立即执行
+            await semaphore.acquire()
+            if not self.running:
+                semaphore.release()
+                break
+            
+            try:
+                # 队列客户端是同步的,放到线程中避免阻塞在途任务
+                message = await asyncio.to_thread(self.queue_manager.pull, 1)
+            except Exception as e:
+                semaphore.release()
+                logger.error(f"Worker error: {e}", exc_info=True)
+                await asyncio.sleep(1)  # 避免错误循环
+                continue
+            
+            if not message:
+                semaphore.release()
+                continue
+            
+            task_id = message["task_id"]
+            task = asyncio.create_task(self._run_task(task_id, message["data"]))
+            self.active_tasks[task_id] = task
+            
+            def _on_done(_task: asyncio.Task, task_id: str = task_id) -> None:
+                self.active_tasks.pop(task_id, None)
+                semaphore.release()
+            
+            task.add_done_callback(_on_done)
+        
+        if self.active_tasks:
+            logger.info(f"Waiting for {len(self.active_tasks)} in-flight tasks to complete")
+            _, pending = await asyncio.wait(
+                list(self.active_tasks.values()),
+                timeout=self.max_shutdown_wait,
+            )
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"Cancelled {len(pending)} tasks after {self.max_shutdown_wait}s shutdown wait")
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        await self._close_providers()
+        logger.info("Shutdown completed")
+    
+    async def _run_serial_task(self, task_id: str, task_data: dict):
+        """
+        在逐个处理模式下执行单个任务
+
+        每个任务运行在独立的事件循环中,任务结束时关闭提供商绑定在该循环上的
+        连接池,否则下一个任务换循环重建客户端时旧连接会泄漏。
+
+        Args:
+            task_id: 任务 ID
+            task_data: 任务数据
+        """
+        try:
+            await self._process_task(task_id, task_data)
+        finally:
+            await self._close_providers()
+    
+    async def _close_providers(self):
+        """关闭提供商在当前事件循环上的连接池"""
+        for provider in self.providers:
+            try:
+                await provider.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close {type(provider).__name__}: {e}")
+    
+    async def _run_task(self, task_id: str, task_data: dict):
+        """
+        在并发模式下执行单个任务并处理失败
+
+        Args:
+            task_id: 任务 ID
+            task_data: 任务数据
+        """
+        logger.info(
+            f"Processing task: {task_id} "
+            f"({len(self.active_tasks)}/{self.max_concurrent_tasks} in flight)"
+        )
+        try:
+            await self._process_task(task_id, task_data)
+        except asyncio.CancelledError:
+            logger.warning(f"Task {task_id} cancelled during shutdown")
+            self._mark_task_failed(task_id, "Worker shutdown before task completed")
+            raise
+        except Exception as e:
+            logger.error(f"Task {task_id} failed: {e}", exc_info=True)
+            self._mark_task_failed(task_id, str(e))
+    
     async def _process_task(self, task_id: str, task_data: dict):
         """
         处理单个任务
@@ -160,16 +286,18 @@ class TaskWorker:
                 speaker_repo = SpeakerRepository(session)
                 template_repo = PromptTemplateRepository(session)
                 
-                # 临时设置到 pipeline
-                self.pipeline_service.tasks = task_repo  # 添加这一行
-                self.pipeline_service.transcripts = transcript_repo
-                self.pipeline_service.artifact_generation.artifacts = artifact_repo
-                self.pipeline_service.artifact_generation.templates = template_repo
-                self.pipeline_service.speaker_mappings = speaker_mapping_repo
-                self.pipeline_service.speakers = speaker_repo
+                # 为本任务绑定独立仓库,不修改共享的 pipeline_service
+                pipeline = self.pipeline_service.bind_repositories(
+                    task_repo=task_repo,
+                    transcript_repo=transcript_repo,
+                    speaker_mapping_repo=speaker_mapping_repo,
+                    speaker_repo=speaker_repo,
+                    artifact_repo=artifact_repo,
+                    template_repo=template_repo,
+                )
                 
                 # 执行管线
-                result = await self.pipeline_service.process_meeting(
+                result = await pipeline.process_meeting(
                     task_id=task_id,
                     user_id=task_data["user_id"],
                     audio_files=task_data["audio_files"],
@@ -197,6 +325,11 @@ class TaskWorker:
             logger.error(f"Task {task_id} failed: {e}")
             # 不需要再次更新，pipeline 已经处理了
             raise
+        
+        finally:
+            # 写入合并中的进度,避免晚于后续的失败标记落库
+            if self.status_writer is not None:
+                await self.status_writer.flush()
     
     def _update_task_state(
         self,
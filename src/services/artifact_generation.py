@@ -1,11 +1,14 @@
 """Artifact generation service implementation."""
 
+import asyncio
+import copy
 import json
 import logging
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from src.config.models import TranscriptCompactionConfig
 from src.core.exceptions import LLMError, ValidationError
 from src.core.models import (
     GeneratedArtifact,
@@ -15,6 +18,15 @@ from src.core.models import (
     TranscriptionResult,
 )
 from src.core.providers import LLMProvider
+from src.services.llm_cache import LLMArtifactCache
+from src.services.map_reduce import (
+    build_condensed_transcript,
+    estimate_transcript_tokens,
+    split_transcript,
+)
+from src.services.transcript_compaction import compact_transcript
+from src.utils.cost import CostTracker, estimate_text_tokens
+from src.utils.rate_limiter import AsyncRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +44,13 @@ class ArtifactGenerationService:
         llm_provider: LLMProvider,
         template_repo=None,
         artifact_repo=None,
+        map_reduce_threshold_tokens: Optional[int] = None,
+        map_chunk_tokens: int = 30000,
+        max_map_concurrency: int = 8,
+        artifact_cache: Optional[LLMArtifactCache] = None,
+        compaction_config: Optional[TranscriptCompactionConfig] = None,
+        cost_tracker: Optional[CostTracker] = None,
+        llm_rate_limiter: Optional[AsyncRateLimiter] = None,
     ):
         """
         初始化服务
@@ -40,10 +59,46 @@ class ArtifactGenerationService:
             llm_provider: LLM 提供商
             template_repo: 提示词模板仓库(可选,Phase 1 可为 None)
             artifact_repo: 衍生内容仓库(可选,Phase 1 可为 None)
+            map_reduce_threshold_tokens: 转写超过该 Token 数时使用 map-reduce 生成,
+                None 表示始终单次生成
+            map_chunk_tokens: map 阶段每个分块的 Token 预算
+            max_map_concurrency: map 阶段最大并发数
+            artifact_cache: 生成结果缓存(可选)
+            compaction_config: 生成前转写压缩配置(可选,未启用时使用原始转写)
+            cost_tracker: 成本跟踪器(记录压缩前后的 Token 估算)
+            llm_rate_limiter: LLM 每分钟请求限流器(与阶段调度器共用);
+                map 阶段的每次调用各占一个请求额度
         """
         self.llm = llm_provider
         self.templates = template_repo
         self.artifacts = artifact_repo
+        self.map_reduce_threshold_tokens = map_reduce_threshold_tokens
+        self.map_chunk_tokens = map_chunk_tokens
+        self.max_map_concurrency = max_map_concurrency
+        self.artifact_cache = artifact_cache
+        self.compaction_config = compaction_config
+        self.cost_tracker = cost_tracker or CostTracker()
+        self.llm_rate_limiter = llm_rate_limiter or AsyncRateLimiter()
+
+    def bind_repositories(
+        self,
+        template_repo=None,
+        artifact_repo=None,
+    ) -> "ArtifactGenerationService":
+        """
+        创建绑定到指定仓库的服务副本(共享 LLM 提供商)
+
+        Args:
+            template_repo: 提示词模板仓库
+            artifact_repo: 衍生内容仓库
+
+        Returns:
+            ArtifactGenerationService: 服务副本
+        """
+        bound = copy.copy(self)
+        bound.templates = template_repo
+        bound.artifacts = artifact_repo
+        return bound
 
     async def generate_artifact(
         self,
@@ -77,7 +132,7 @@ class ArtifactGenerationService:
             output_language: 输出语言
             user_id: 创建者 ID
             template: 提示词模板(可选,如果不提供则从 repo 获取)
-            **kwargs: 其他参数
+            **kwargs: 其他参数(use_cache=False 跳过生成结果缓存)
             
         Returns:
             GeneratedArtifact: 生成的衍生内容
@@ -157,22 +212,74 @@ class ArtifactGenerationService:
                 logger.info(f"Using provided artifact_id: {artifact_id}")
             
             # 从 kwargs 中移除 artifact_id，避免重复传递
-            kwargs_without_artifact_id = {k: v for k, v in kwargs.items() if k != "artifact_id"}
+            kwargs_without_artifact_id = {
+                k: v for k, v in kwargs.items() if k not in ("artifact_id", "use_cache")
+            }
             
-            # 7. 调用 LLM 生成内容
-            artifact = await self.llm.generate_artifact(
-                transcript=transcript,
-                prompt_instance=prompt_instance,
-                output_language=output_language,
-                template=template,
-                task_id=task_id,
-                artifact_id=artifact_id,
-                version=next_version,
-                created_by=user_id,
-                **kwargs_without_artifact_id,
-            )
+            # 7. 压缩转写,减少提示词 Token
+            transcript, compaction_info = self._compact_transcript(task_id, transcript)
+            if compaction_info:
+                metadata = dict(kwargs_without_artifact_id.get("metadata") or {})
+                metadata["compaction"] = compaction_info
+                kwargs_without_artifact_id["metadata"] = metadata
+                kwargs_without_artifact_id["timestamp_interval"] = (
+                    self.compaction_config.timestamp_interval_seconds
+                )
+
+            # 8. 查找生成结果缓存
+            cache_key = None
+            cached = None
+            if self.artifact_cache is not None and kwargs.get("use_cache", True):
+                cache_key = self._build_cache_key(
+                    transcript, template, prompt_instance, output_language,
+                    kwargs_without_artifact_id,
+                )
+                cached = await self.artifact_cache.get(cache_key, template.artifact_type)
+
+            if cached is not None:
+                artifact = GeneratedArtifact(
+                    artifact_id=artifact_id,
+                    task_id=task_id,
+                    artifact_type=template.artifact_type,
+                    version=next_version,
+                    prompt_instance=prompt_instance,
+                    content=json.dumps(cached["content"], ensure_ascii=False),
+                    metadata={
+                        **(kwargs_without_artifact_id.get("metadata") or {}),
+                        **cached["metadata"],
+                        "cache_hit": True,
+                    },
+                    created_by=user_id,
+                )
+            else:
+                # 9. 调用 LLM 生成内容(长转写先 map 为分块要点,再 reduce 为最终内容)
+                llm_transcript, map_reduce_info = await self._map_transcript(
+                    transcript, template, prompt_instance, output_language,
+                    timestamp_interval=kwargs_without_artifact_id.get("timestamp_interval"),
+                )
+                if map_reduce_info:
+                    metadata = dict(kwargs_without_artifact_id.get("metadata") or {})
+                    metadata["map_reduce"] = map_reduce_info
+                    kwargs_without_artifact_id["metadata"] = metadata
+
+                artifact = await self.llm.generate_artifact(
+                    transcript=llm_transcript,
+                    prompt_instance=prompt_instance,
+                    output_language=output_language,
+                    template=template,
+                    task_id=task_id,
+                    artifact_id=artifact_id,
+                    version=next_version,
+                    created_by=user_id,
+                    **kwargs_without_artifact_id,
+                )
+
+                if cache_key is not None:
+                    await self.artifact_cache.put(
+                        cache_key, artifact.get_content_dict(), artifact.metadata
+                    )
             
-            # 8. 保存到数据库(如果有 repo)
+            # 10. 保存到数据库(如果有 repo)
             if self.artifacts is not None:
                 # 检查是否使用了已存在的 artifact_id（异步生成场景）
                 provided_artifact_id = kwargs.get("artifact_id")
@@ -224,6 +331,151 @@ class ArtifactGenerationService:
             logger.error(f"Failed to generate artifact: {e}", exc_info=True)
             raise LLMError(f"生成衍生内容失败: {e}", provider="artifact_generation")
 
+    def _compact_transcript(
+        self, task_id: str, transcript: TranscriptionResult
+    ) -> tuple[TranscriptionResult, Optional[Dict]]:
+        """
+        按配置压缩转写,并向成本跟踪器报告压缩前后的 Token 估算
+
+        Token 按实际发送给模型的格式化文本估算: 压缩前为默认格式,压缩后
+        为按 timestamp_interval_seconds 稀疏标注时间戳的格式。
+
+        Args:
+            task_id: 任务 ID
+            transcript: 转写结果
+
+        Returns:
+            tuple[TranscriptionResult, Optional[Dict]]: (用于生成的转写, 压缩元数据)
+        """
+        config = self.compaction_config
+        if config is None or not config.enabled or not transcript.segments:
+            return transcript, None
+
+        compacted = compact_transcript(
+            transcript,
+            merge_gap_seconds=config.merge_gap_seconds,
+            max_turn_seconds=config.max_turn_seconds,
+            remove_fillers=config.strip_fillers,
+        )
+        if not compacted.segments:
+            # 全是语气词时保留原文,避免空提示词
+            return transcript, None
+
+        summary = self.cost_tracker.record_prompt_compaction(
+            task_id=task_id,
+            original_tokens=estimate_text_tokens(self.llm.format_transcript(transcript)),
+            compacted_tokens=estimate_text_tokens(
+                self.llm.format_transcript(
+                    compacted, timestamp_interval=config.timestamp_interval_seconds
+                )
+            ),
+            model=self.llm.get_pricing_model(),
+        )
+        return compacted, {
+            "segments": [len(transcript.segments), len(compacted.segments)],
+            "original_tokens": summary["original_tokens"],
+            "compacted_tokens": summary["compacted_tokens"],
+        }
+
+    def _build_cache_key(
+        self,
+        transcript: TranscriptionResult,
+        template: PromptTemplate,
+        prompt_instance: PromptInstance,
+        output_language: OutputLanguage,
+        kwargs: Dict,
+    ) -> str:
+        """生成结果缓存键(包含所有影响提示词的输入)"""
+        map_reduce = None
+        if self.map_reduce_threshold_tokens:
+            map_reduce = [self.map_reduce_threshold_tokens, self.map_chunk_tokens]
+        return LLMArtifactCache.make_key(
+            formatted_transcript=self.llm.format_transcript(
+                transcript, timestamp_interval=kwargs.get("timestamp_interval")
+            ),
+            template=template,
+            prompt_instance=prompt_instance,
+            output_language=output_language,
+            model_fingerprint=self.llm.get_model_fingerprint(),
+            meeting_date=kwargs.get("meeting_date"),
+            meeting_time=kwargs.get("meeting_time"),
+            map_reduce=map_reduce,
+        )
+
+    async def _map_transcript(
+        self,
+        transcript: TranscriptionResult,
+        template: PromptTemplate,
+        prompt_instance: PromptInstance,
+        output_language: OutputLanguage,
+        timestamp_interval: Optional[float] = None,
+    ) -> tuple[TranscriptionResult, Optional[Dict]]:
+        """
+        map-reduce 的 map 阶段: 长转写按 Token 预算切分并并发提取要点
+
+        转写未超过阈值时原样返回。否则各分块的要点组成精简转写,
+        由调用方按模板照常生成(reduce 阶段),输出格式与单次生成一致。
+
+        Args:
+            transcript: 转写结果
+            template: 提示词模板
+            prompt_instance: 提示词实例
+            output_language: 输出语言
+            timestamp_interval: 分块格式化时的时间戳最小间隔(见 LLMProvider.format_transcript)
+
+        Returns:
+            tuple[TranscriptionResult, Optional[Dict]]: (用于生成的转写, map-reduce 元数据)
+        """
+        if not self.map_reduce_threshold_tokens or not self.llm.supports_chunk_summaries():
+            return transcript, None
+
+        total_tokens = estimate_transcript_tokens(transcript)
+        if total_tokens <= self.map_reduce_threshold_tokens:
+            return transcript, None
+
+        chunks = split_transcript(transcript, self.map_chunk_tokens)
+        if len(chunks) < 2:
+            return transcript, None
+
+        logger.info(
+            f"Using map-reduce generation: ~{total_tokens} tokens in {len(chunks)} chunks "
+            f"(concurrency={self.max_map_concurrency})"
+        )
+
+        # 让 map 阶段知道最终要生成什么,保留相关信息
+        instructions = (prompt_instance.prompt_text or template.prompt_body).replace("{transcript}", "")
+        if prompt_instance.custom_instructions:
+            instructions += f"\n{prompt_instance.custom_instructions}"
+
+        semaphore = asyncio.Semaphore(self.max_map_concurrency)
+
+        async def summarize(index: int, chunk: TranscriptionResult) -> str:
+            async with semaphore:
+                # 阶段调度器只为整次生成限流一次,map 调用逐个计入每分钟请求数
+                await self.llm_rate_limiter.acquire()
+                return await self.llm.summarize_transcript_chunk(
+                    chunk,
+                    output_language,
+                    chunk_index=index,
+                    chunk_count=len(chunks),
+                    instructions=instructions.strip(),
+                    timestamp_interval=timestamp_interval,
+                )
+
+        tasks = [
+            asyncio.ensure_future(summarize(index, chunk))
+            for index, chunk in enumerate(chunks, start=1)
+        ]
+        try:
+            notes = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        condensed = build_condensed_transcript(list(notes), chunks, transcript)
+        return condensed, {"chunks": len(chunks), "transcript_tokens": total_tokens}
+
     async def _get_next_version(self, task_id: str, artifact_type: str, display_name: Optional[str] = None) -> int:
         """
         获取下一个版本号
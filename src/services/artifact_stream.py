@@ -0,0 +1,128 @@
+"""In-process fan-out of streamed artifact content to SSE subscribers."""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ArtifactStream:
+    """单个正在生成的 artifact 的流状态"""
+
+    text: str = ""
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+
+
+class ArtifactStreamHub:
+    """
+    流式生成内容的进程内分发中心
+
+    生成任务通过 publish 推送新增 Markdown,SSE 连接通过 subscribe 获取
+    当前已生成的全文快照和后续事件队列。队列事件为 (event, data):
+    - ("delta", {"text": 新增文本})
+    - ("complete", {...}) / ("error", {...}): 终止事件,之后流被移除
+
+    只覆盖当前进程内发起的生成;其他进程的生成由 SSE 端点轮询数据库中
+    定期刷新的部分内容。
+    """
+
+    def __init__(self):
+        self._streams: Dict[str, _ArtifactStream] = {}
+
+    def is_active(self, artifact_id: str) -> bool:
+        """是否正在当前进程内流式生成"""
+        return artifact_id in self._streams
+
+    def start(self, artifact_id: str) -> None:
+        """
+        开始一个 artifact 的流
+
+        Args:
+            artifact_id: Artifact ID
+        """
+        self._streams.setdefault(artifact_id, _ArtifactStream())
+
+    def publish(self, artifact_id: str, text: str) -> None:
+        """
+        推送新增文本
+
+        Args:
+            artifact_id: Artifact ID
+            text: 新增的 Markdown 文本
+        """
+        stream = self._streams.get(artifact_id)
+        if stream is None or not text:
+            return
+        stream.text += text
+        for queue in stream.subscribers:
+            queue.put_nowait(("delta", {"text": text}))
+
+    def text(self, artifact_id: str) -> str:
+        """当前已生成的全文(流不存在时为空)"""
+        stream = self._streams.get(artifact_id)
+        return stream.text if stream else ""
+
+    def finish(self, artifact_id: str, event: str, data: Dict[str, Any]) -> None:
+        """
+        结束流,向所有订阅者发送终止事件
+
+        Args:
+            artifact_id: Artifact ID
+            event: 终止事件类型(complete/error)
+            data: 事件数据
+        """
+        stream = self._streams.pop(artifact_id, None)
+        if stream is None:
+            return
+        for queue in stream.subscribers:
+            queue.put_nowait((event, data))
+
+    def subscribe(self, artifact_id: str) -> Optional[Tuple[str, asyncio.Queue]]:
+        """
+        订阅流
+
+        Args:
+            artifact_id: Artifact ID
+
+        Returns:
+            Optional[Tuple[str, asyncio.Queue]]: (当前全文快照, 事件队列),
+            当前进程内没有该流时返回 None
+        """
+        stream = self._streams.get(artifact_id)
+        if stream is None:
+            return None
+        queue: asyncio.Queue = asyncio.Queue()
+        stream.subscribers.add(queue)
+        return stream.text, queue
+
+    def unsubscribe(self, artifact_id: str, queue: asyncio.Queue) -> None:
+        """
+        取消订阅(客户端断开时调用)
+
+        Args:
+            artifact_id: Artifact ID
+            queue: subscribe 返回的事件队列
+        """
+        stream = self._streams.get(artifact_id)
+        if stream is not None:
+            stream.subscribers.discard(queue)
+
+
+# 进程内共享实例
+_hub: Optional[ArtifactStreamHub] = None
+
+
+def get_artifact_stream_hub() -> ArtifactStreamHub:
+    """
+    获取进程内共享的流式内容分发中心
+
+    Returns:
+        ArtifactStreamHub: 分发中心
+    """
+    global _hub
+    if _hub is None:
+        _hub = ArtifactStreamHub()
+    return _hub
@@ -0,0 +1,129 @@
+"""Content-addressed cache for ASR transcription results."""
+
+import asyncio
+import hashlib
+import logging
+from typing import List, Optional
+
+from src.core.models import ASRLanguage, TranscriptionResult
+from src.services.file_cache import JSONFileCache
+from src.utils.metrics import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+
+class ASRResultCache(JSONFileCache):
+    """
+    ASR 结果缓存
+
+    以 (音频内容哈希, ASR 语言, 热词集版本, 提供商, 转写方式) 为键,在本地目录中
+    持久化 TranscriptionResult。同一录音重复提交(LLM 失败后重试、
+    更换提示词模板、重复任务)时可跳过上传和 ASR。
+
+    - TTL: 按写入时间过期
+    - 容量: 超过 max_size_bytes 时按最近访问时间淘汰
+    """
+
+    metric_prefix = "asr_cache"
+
+    @staticmethod
+    async def hash_audio_files(audio_files: List[str], chunk_size: int = 1024 * 1024) -> str:
+        """
+        计算有序音频文件列表的内容哈希
+
+        Args:
+            audio_files: 按拼接顺序排列的音频文件路径
+            chunk_size: 读取块大小
+
+        Returns:
+            str: SHA-256 十六进制摘要
+        """
+
+        def compute() -> str:
+            hasher = hashlib.sha256()
+            for path in audio_files:
+                file_hasher = hashlib.sha256()
+                with open(path, "rb") as f:
+                    while True:
+                        chunk = f.read(chunk_size)
+                        if not chunk:
+                            break
+                        file_hasher.update(chunk)
+                # 逐文件摘要再组合,避免不同切分方式得到相同哈希
+                hasher.update(file_hasher.digest())
+            return hasher.hexdigest()
+
+        return await asyncio.to_thread(compute)
+
+    @staticmethod
+    def make_key(
+        audio_hash: str,
+        asr_language: ASRLanguage,
+        hotword_version: str,
+        provider: str,
+        mode: str = "whole",
+    ) -> str:
+        """
+        生成缓存键
+
+        Args:
+            audio_hash: 音频内容哈希
+            asr_language: ASR 识别语言
+            hotword_version: 热词集版本标识
+            provider: ASR 提供商名称
+            mode: 转写方式(整体、分片合并或长音频分块,结果的说话人标签和拼接方式不同)
+
+        Returns:
+            str: 缓存键
+        """
+        raw = "\n".join(
+            [audio_hash, ASRLanguage(asr_language).value, hotword_version, provider, mode]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, *keys: str) -> Optional[TranscriptionResult]:
+        """
+        按顺序查找缓存,返回第一个命中的结果
+
+        Args:
+            *keys: 候选缓存键(如主 ASR、备用 ASR 各一个)
+
+        Returns:
+            Optional[TranscriptionResult]: 命中的结果,未命中返回 None
+        """
+        metrics = get_metrics_collector()
+        for key in keys:
+            result = await asyncio.to_thread(self._read, key)
+            if result is not None:
+                metrics.increment_counter("asr_cache_hits_total", labels={"provider": result.provider})
+                logger.info(f"ASR cache hit: {key[:12]} ({result.provider})")
+                return result
+        metrics.increment_counter("asr_cache_misses_total")
+        return None
+
+    async def put(self, key: str, result: TranscriptionResult) -> None:
+        """
+        写入缓存(失败只记录日志,不影响转写流程)
+
+        Args:
+            key: 缓存键
+            result: 转写结果
+        """
+        try:
+            await asyncio.to_thread(self._write, key, result)
+            await asyncio.to_thread(self._evict)
+        except Exception as e:
+            logger.warning(f"Failed to write ASR cache entry {key[:12]}: {e}")
+
+    def _read(self, key: str) -> Optional[TranscriptionResult]:
+        entry = self._read_entry(key)
+        if entry is None:
+            return None
+        try:
+            return TranscriptionResult.model_validate(entry["result"])
+        except (KeyError, ValueError) as e:
+            self._discard(key, e)
+            return None
+
+    def _write(self, key: str, result: TranscriptionResult) -> None:
+        self._write_entry(key, {"result": result.model_dump(mode="json")})
@@ -0,0 +1,85 @@
+"""Latency-based hedging policy for ASR requests."""
+
+from collections import deque
+from typing import Deque, Optional
+
+# 计算每秒耗时时的最短音频时长(避免极短音频的固定开销被放大)
+MIN_AUDIO_SECONDS = 1.0
+
+
+class ASRHedgingPolicy:
+    """
+    ASR 对冲策略
+
+    记录主 ASR 最近每秒音频的耗时(耗时 ÷ 音频时长),以其指定百分位乘以
+    当前音频时长作为对冲等待时间: 主 ASR 超过该时间仍未完成时,并行启动
+    备用 ASR,取先完成的结果。ASR 耗时随音频时长增长,按绝对耗时统计时
+    短音频为主的负载会让几乎所有长会议都被对冲。
+    样本不足或音频时长未知时使用初始等待时间;结果限制在 [min_delay, max_delay] 内。
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 300.0,
+        min_delay: float = 30.0,
+        max_delay: float = 1800.0,
+        min_samples: int = 20,
+        window_size: int = 200,
+    ):
+        """
+        初始化对冲策略
+
+        Args:
+            percentile: 触发对冲的耗时百分位(0-100)
+            initial_delay: 样本不足时的对冲等待时间(秒)
+            min_delay: 对冲等待时间下限(秒)
+            max_delay: 对冲等待时间上限(秒)
+            min_samples: 使用百分位所需的最少样本数
+            window_size: 保留的最近样本数
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        # 每秒音频的耗时(秒/秒)
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+
+    @property
+    def sample_count(self) -> int:
+        """已记录的样本数"""
+        return len(self._latencies)
+
+    def record_latency(self, seconds: float, audio_duration: float) -> None:
+        """
+        记录一次主 ASR 完成耗时
+
+        对冲后被取消的主 ASR 记录其已耗时,作为真实耗时的下界。
+
+        Args:
+            seconds: 耗时(秒)
+            audio_duration: 音频时长(秒)
+        """
+        self._latencies.append(seconds / max(audio_duration, MIN_AUDIO_SECONDS))
+
+    def hedge_delay(self, audio_duration: Optional[float] = None) -> float:
+        """
+        计算当前的对冲等待时间
+
+        Args:
+            audio_duration: 待转写音频时长(秒),None 表示未知
+
+        Returns:
+            float: 等待时间(秒)
+        """
+        if audio_duration is None or len(self._latencies) < self.min_samples:
+            delay = self.initial_delay
+        else:
+            values = sorted(self._latencies)
+            k = (len(values) - 1) * self.percentile / 100
+            f = int(k)
+            c = min(f + 1, len(values) - 1)
+            per_second = values[f] + (values[c] - values[f]) * (k - f)
+            delay = per_second * max(audio_duration, MIN_AUDIO_SECONDS)
+        return min(max(delay, self.min_delay), self.max_delay)
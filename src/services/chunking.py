@@ -0,0 +1,200 @@
+"""Silence-aware chunk planning and stitching for long-recording ASR."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from src.core.models import Segment, TranscriptionResult
+from src.utils.audio import PCMWaveBuffer
+
+# 静音检测帧长(秒)与采样步长
+_FRAME_SECONDS = 0.1
+_SAMPLE_STRIDE = 4
+
+
+@dataclass
+class AudioChunk:
+    """一个转写分块"""
+
+    index: int
+    start: float  # 分块音频起点(含重叠区)
+    end: float  # 分块音频终点(含重叠区)
+    keep_start: float  # 该分块负责的区间起点(去重用)
+    keep_end: float  # 该分块负责的区间终点
+
+
+def find_quietest_point(
+    buffer: PCMWaveBuffer, start_time: float, end_time: float, target: float
+) -> float:
+    """
+    在时间窗口内查找能量最低的位置
+
+    按 100ms 帧计算平均绝对振幅,能量相同时取离目标点最近的帧。
+
+    Args:
+        buffer: 目标格式 PCM 缓冲区(16-bit 单声道)
+        start_time: 窗口起点(秒)
+        end_time: 窗口终点(秒)
+        target: 期望切分点(秒)
+
+    Returns:
+        float: 切分时间点(秒)
+    """
+    frame = max(1, int(buffer.sample_rate * _FRAME_SECONDS))
+    best_time = target
+    best_key = None
+
+    # 视图需在缓冲区关闭前释放
+    with buffer.pcm_view(start_time, end_time) as pcm, pcm.cast("h") as samples:
+        for offset in range(0, len(samples) - frame + 1, frame):
+            energy = sum(map(abs, samples[offset:offset + frame:_SAMPLE_STRIDE]))
+            frame_time = start_time + (offset + frame / 2) / buffer.sample_rate
+            key = (energy, abs(frame_time - target))
+            if best_key is None or key < best_key:
+                best_key = key
+                best_time = frame_time
+    return best_time
+
+
+def plan_chunks(
+    buffer: PCMWaveBuffer,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float,
+) -> List[AudioChunk]:
+    """
+    规划分块: 在固定边界附近的静音处切分,并为每块加上重叠区
+
+    最后一块长度在 0.5~1.5 倍 chunk_seconds 之间,避免产生过短的尾块。
+
+    Args:
+        buffer: 目标格式 PCM 缓冲区
+        chunk_seconds: 目标分块时长(秒)
+        overlap_seconds: 相邻分块重叠时长(秒,每侧)
+        search_seconds: 在边界前后查找静音的范围(秒)
+
+    Returns:
+        List[AudioChunk]: 分块列表
+    """
+    duration = buffer.duration
+    cut_points = [0.0]
+    boundary = chunk_seconds
+    while boundary < duration - chunk_seconds / 2:
+        window_start = max(cut_points[-1] + chunk_seconds / 2, boundary - search_seconds)
+        window_end = min(duration, boundary + search_seconds)
+        cut = find_quietest_point(buffer, window_start, window_end, boundary)
+        cut_points.append(cut)
+        boundary = cut + chunk_seconds
+    cut_points.append(duration)
+
+    return [
+        AudioChunk(
+            index=i,
+            start=max(0.0, cut_points[i] - overlap_seconds),
+            end=min(duration, cut_points[i + 1] + overlap_seconds),
+            keep_start=cut_points[i],
+            keep_end=cut_points[i + 1],
+        )
+        for i in range(len(cut_points) - 1)
+    ]
+
+
+def _overlap(a: Segment, b: Segment) -> float:
+    return max(0.0, min(a.end_time, b.end_time) - max(a.start_time, b.start_time))
+
+
+def _match_speakers(
+    previous: List[Segment], current: List[Segment]
+) -> Dict[str, str]:
+    """
+    根据重叠区内同时出现的片段,把当前分块的说话人标签映射到上一分块的全局标签
+
+    Args:
+        previous: 上一分块在重叠区内的片段(全局时间、全局标签)
+        current: 当前分块在重叠区内的片段(全局时间、分块内标签)
+
+    Returns:
+        Dict[str, str]: {分块内标签: 全局标签}
+    """
+    votes: Dict[Tuple[str, str], float] = {}
+    totals: Dict[str, float] = {}
+    for cur in current:
+        for prev in previous:
+            overlap = _overlap(cur, prev)
+            if overlap > 0:
+                votes[(cur.speaker, prev.speaker)] = votes.get((cur.speaker, prev.speaker), 0.0) + overlap
+                totals[cur.speaker] = totals.get(cur.speaker, 0.0) + overlap
+
+    mapping: Dict[str, str] = {}
+    claimed = set()
+    for (cur_label, prev_label), weight in sorted(votes.items(), key=lambda item: -item[1]):
+        if cur_label in mapping or prev_label in claimed:
+            continue
+        # 需占该标签重叠时长的多数才认为是同一人
+        if weight > totals[cur_label] / 2:
+            mapping[cur_label] = prev_label
+            claimed.add(prev_label)
+    return mapping
+
+
+def stitch_chunk_results(
+    results: List[TranscriptionResult], chunks: List[AudioChunk]
+) -> TranscriptionResult:
+    """
+    拼接各分块的转写结果
+
+    - 片段时间加上分块起点偏移
+    - 重叠区去重: 片段中点落在分块负责区间内才保留
+    - 说话人标签: 利用重叠区内两侧片段的时间重合关系对齐,
+      无法对齐的标签分配新的全局编号
+    - 全文: 片段文本按行拼接,与多文件合并(merge_transcripts)一致,避免英文单词粘连
+
+    Args:
+        results: 各分块的转写结果
+        chunks: 对应的分块
+
+    Returns:
+        TranscriptionResult: 拼接后的转写结果
+    """
+    merged: List[Segment] = []
+    previous_all: List[Segment] = []
+    next_label = 1
+
+    for result, chunk in zip(results, chunks):
+        shifted = [
+            seg.model_copy(
+                update={
+                    "start_time": seg.start_time + chunk.start,
+                    "end_time": seg.end_time + chunk.start,
+                }
+            )
+            for seg in result.segments
+        ]
+
+        # 与上一分块在重叠区 [keep_start - overlap, keep_start + overlap] 内对齐说话人
+        region_start = chunk.start
+        region_end = 2 * chunk.keep_start - chunk.start
+        mapping = _match_speakers(
+            [s for s in previous_all if s.end_time > region_start and s.start_time < region_end],
+            [s for s in shifted if s.end_time > region_start and s.start_time < region_end],
+        )
+        for seg in shifted:
+            if seg.speaker not in mapping:
+                mapping[seg.speaker] = f"Speaker {next_label}"
+                next_label += 1
+
+        labelled = [seg.model_copy(update={"speaker": mapping[seg.speaker]}) for seg in shifted]
+        is_last = chunk.index == chunks[-1].index
+        for seg in labelled:
+            midpoint = (seg.start_time + seg.end_time) / 2
+            if chunk.keep_start <= midpoint and (midpoint < chunk.keep_end or is_last):
+                merged.append(seg)
+        previous_all = labelled
+
+    providers = list(dict.fromkeys(result.provider for result in results))
+    return TranscriptionResult(
+        segments=merged,
+        full_text="\n".join(seg.text for seg in merged),
+        duration=max((seg.end_time for seg in merged), default=0.0),
+        language=results[0].language if results else "zh-CN",
+        provider="+".join(providers),
+    )
@@ -0,0 +1,109 @@
+"""Local JSON file cache with TTL and LRU size eviction."""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.utils.metrics import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+
+class JSONFileCache:
+    """
+    本地 JSON 文件缓存
+
+    每个条目一个文件(按键前两位分目录),写入时间记录在条目内:
+    - TTL: 按写入时间过期
+    - 容量: 超过 max_size_bytes 时按最近访问时间(mtime)淘汰
+    - 写入: 先写临时文件再替换,避免并发读到半写入的条目
+    """
+
+    # 指标名前缀(淘汰计数为 {metric_prefix}_evictions_total)
+    metric_prefix = "file_cache"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_size_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            ttl_seconds: 条目有效期(秒)
+            max_size_bytes: 缓存目录最大总大小(字节)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取未过期的条目,损坏或过期的条目会被删除"""
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        if time.time() - entry.get("cached_at", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        # 更新访问时间,用于容量淘汰
+        os.utime(path)
+        return entry
+
+    def _discard(self, key: str, reason: Exception) -> None:
+        """删除内容无效的条目"""
+        path = self._entry_path(key)
+        logger.warning(f"Discarding invalid cache entry {path}: {reason}")
+        path.unlink(missing_ok=True)
+
+    def _write_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"cached_at": time.time(), **entry}
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, path)
+
+    def _evict(self) -> None:
+        """删除过期条目,并按最近访问时间淘汰至容量上限以内"""
+        now = time.time()
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                # mtime 在每次命中时刷新,超过 TTL 未访问的条目必然已过期
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_size_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            get_metrics_collector().increment_counter(f"{self.metric_prefix}_evictions_total")
@@ -0,0 +1,146 @@
+"""Deterministic cache for LLM-generated artifact content."""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from src.config.models import LLMCacheConfig
+from src.core.models import OutputLanguage, PromptInstance, PromptTemplate
+from src.services.file_cache import JSONFileCache
+from src.utils.metrics import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+
+class LLMArtifactCache(JSONFileCache):
+    """
+    LLM 衍生内容缓存
+
+    以 (格式化转写哈希, 模板, 提示词实例, 输出语言, 模型指纹) 为键,
+    缓存生成的内容和元数据。同一转写用相同模板和参数重复生成
+    (重复点击、切换回之前的模板)时直接返回缓存结果。
+    """
+
+    metric_prefix = "llm_cache"
+
+    @staticmethod
+    def make_key(
+        formatted_transcript: str,
+        template: PromptTemplate,
+        prompt_instance: PromptInstance,
+        output_language: OutputLanguage,
+        model_fingerprint: str,
+        **extra: Any,
+    ) -> str:
+        """
+        生成缓存键
+
+        Args:
+            formatted_transcript: 格式化后的转写文本
+            template: 提示词模板
+            prompt_instance: 提示词实例
+            output_language: 输出语言
+            model_fingerprint: 模型指纹(模型名及生成参数)
+            **extra: 其他影响生成结果的输入(会议时间、生成模式等)
+
+        Returns:
+            str: 缓存键
+        """
+        payload = {
+            "transcript": hashlib.sha256(formatted_transcript.encode("utf-8")).hexdigest(),
+            "template": {
+                "template_id": template.template_id,
+                "artifact_type": template.artifact_type,
+                "prompt_body": template.prompt_body,
+            },
+            "prompt_instance": {
+                "prompt_text": prompt_instance.prompt_text,
+                "parameters": prompt_instance.parameters,
+                "custom_instructions": prompt_instance.custom_instructions,
+                "language": prompt_instance.language,
+            },
+            "output_language": OutputLanguage(output_language).value,
+            "model": model_fingerprint,
+            "extra": extra,
+        }
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str, artifact_type: str) -> Optional[Dict[str, Any]]:
+        """
+        查找缓存
+
+        Args:
+            key: 缓存键
+            artifact_type: 内容类型(用于指标标签)
+
+        Returns:
+            Optional[Dict[str, Any]]: {"content": 内容字典, "metadata": 元数据},未命中返回 None
+        """
+        entry = await asyncio.to_thread(self._read, key)
+        labels = {"artifact_type": artifact_type}
+        if entry is None:
+            get_metrics_collector().increment_counter("llm_cache_misses_total", labels=labels)
+            return None
+        get_metrics_collector().increment_counter("llm_cache_hits_total", labels=labels)
+        logger.info(f"LLM artifact cache hit: {key[:12]} ({artifact_type})")
+        return entry
+
+    async def put(self, key: str, content: Dict[str, Any], metadata: Dict[str, Any]) -> None:
+        """
+        写入缓存(失败只记录日志,不影响生成流程)
+
+        Args:
+            key: 缓存键
+            content: 内容字典
+            metadata: 元数据
+        """
+        try:
+            await asyncio.to_thread(
+                self._write_entry, key, {"content": content, "metadata": metadata}
+            )
+            await asyncio.to_thread(self._evict)
+        except Exception as e:
+            logger.warning(f"Failed to write LLM cache entry {key[:12]}: {e}")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._read_entry(key)
+        if entry is None:
+            return None
+        if not isinstance(entry.get("content"), dict):
+            self._discard(key, ValueError("missing content"))
+            return None
+        return {"content": entry["content"], "metadata": entry.get("metadata") or {}}
+
+
+# 进程内共享实例
+_shared_cache: Optional[LLMArtifactCache] = None
+
+
+def get_llm_artifact_cache(config: LLMCacheConfig) -> Optional[LLMArtifactCache]:
+    """
+    获取进程内共享的 LLM 衍生内容缓存
+
+    Args:
+        config: LLM 缓存配置
+
+    Returns:
+        Optional[LLMArtifactCache]: 缓存实例,未启用时返回 None
+    """
+    global _shared_cache
+    if not config.enabled:
+        return None
+    if (
+        _shared_cache is None
+        or str(_shared_cache.cache_dir) != config.directory
+        or _shared_cache.ttl_seconds != config.ttl_hours * 3600
+        or _shared_cache.max_size_bytes != config.max_size_mb * 1024 * 1024
+    ):
+        _shared_cache = LLMArtifactCache(
+            cache_dir=config.directory,
+            ttl_seconds=config.ttl_hours * 3600,
+            max_size_bytes=config.max_size_mb * 1024 * 1024,
+        )
+    return _shared_cache
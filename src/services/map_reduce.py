@@ -0,0 +1,118 @@
+"""Transcript splitting helpers for map-reduce artifact generation."""
+
+from typing import List
+
+from src.core.models import Segment, TranscriptionResult
+from src.utils.cost import estimate_text_tokens
+
+# 每个片段除文本外的格式开销(说话人、时间戳)
+_SEGMENT_OVERHEAD_TOKENS = 12
+
+
+def segment_tokens(segment: Segment) -> int:
+    """估算单个片段格式化后的 Token 数"""
+    return estimate_text_tokens(segment.text) + estimate_text_tokens(segment.speaker) + _SEGMENT_OVERHEAD_TOKENS
+
+
+def estimate_transcript_tokens(transcript: TranscriptionResult) -> int:
+    """
+    估算转写文本格式化后的 Token 数
+
+    Args:
+        transcript: 转写结果
+
+    Returns:
+        int: 估算的 Token 数
+    """
+    return sum(segment_tokens(segment) for segment in transcript.segments)
+
+
+def split_transcript(transcript: TranscriptionResult, max_tokens: int) -> List[TranscriptionResult]:
+    """
+    按 Token 预算切分转写,优先在说话人轮次边界切分
+
+    同一说话人连续的片段组成一个轮次,轮次整体放入分块;单个轮次
+    超过预算时才在片段边界切开。
+
+    Args:
+        transcript: 转写结果
+        max_tokens: 每个分块的 Token 预算
+
+    Returns:
+        List[TranscriptionResult]: 分块列表(按时间顺序)
+    """
+    turns: List[List[Segment]] = []
+    for segment in transcript.segments:
+        if turns and turns[-1][-1].speaker == segment.speaker:
+            turns[-1].append(segment)
+        else:
+            turns.append([segment])
+
+    chunks: List[List[Segment]] = []
+    current: List[Segment] = []
+    current_tokens = 0
+
+    def flush() -> None:
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(current)
+        current, current_tokens = [], 0
+
+    for turn in turns:
+        turn_tokens = sum(segment_tokens(segment) for segment in turn)
+        if current and current_tokens + turn_tokens > max_tokens:
+            flush()
+        if turn_tokens <= max_tokens:
+            current.extend(turn)
+            current_tokens += turn_tokens
+            continue
+
+        # 超长轮次: 在片段边界切开
+        for segment in turn:
+            tokens = segment_tokens(segment)
+            if current and current_tokens + tokens > max_tokens:
+                flush()
+            current.append(segment)
+            current_tokens += tokens
+    flush()
+
+    return [
+        transcript.model_copy(
+            update={
+                "segments": segments,
+                "full_text": "".join(segment.text for segment in segments),
+                "duration": segments[-1].end_time - segments[0].start_time,
+            }
+        )
+        for segments in chunks
+    ]
+
+
+def build_condensed_transcript(
+    notes: List[str], chunks: List[TranscriptionResult], source: TranscriptionResult
+) -> TranscriptionResult:
+    """
+    把各分块的要点笔记组装成供 reduce 阶段使用的精简转写
+
+    每个分块对应一个片段,保留分块的起止时间,便于最终内容引用时间线。
+
+    Args:
+        notes: 各分块的要点笔记
+        chunks: 对应的转写分块
+        source: 原始转写结果
+
+    Returns:
+        TranscriptionResult: 精简转写
+    """
+    segments = [
+        Segment(
+            text=note,
+            start_time=chunk.segments[0].start_time,
+            end_time=chunk.segments[-1].end_time,
+            speaker=f"第 {index} 部分要点",
+        )
+        for index, (note, chunk) in enumerate(zip(notes, chunks), start=1)
+    ]
+    return source.model_copy(
+        update={"segments": segments, "full_text": "\n".join(notes)}
+    )
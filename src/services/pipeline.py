@@ -1,5 +1,7 @@
 """Pipeline orchestration service implementation."""
 
+import copy
+import contextlib
 import logging
 from datetime import datetime
 from typing import List, Optional
@@ -16,6 +18,8 @@ from src.core.models import (
 from src.services.artifact_generation import ArtifactGenerationService
 from src.services.correction import CorrectionService
 from src.services.speaker_recognition import SpeakerRecognitionService
+from src.services.stage_scheduler import PipelineStage, StageScheduler
+from src.services.status_writer import TaskStatusWriter
 from src.services.transcription import TranscriptionService
 from src.utils.cost import CostTracker
 from src.utils.error_handler import classify_exception
@@ -24,6 +28,9 @@ from src.config.models import PricingConfig
 
 logger = logging.getLogger(__name__)
 
+# 转写阶段中音频上传所占的进度区间 (0-10%)
+UPLOAD_PROGRESS_SPAN = 10.0
+
 
 class PipelineService:
     """
@@ -45,6 +52,8 @@ class PipelineService:
         speaker_repo=None,
         audit_logger=None,
         pricing_config: Optional[PricingConfig] = None,
+        stage_scheduler: Optional[StageScheduler] = None,
+        status_writer: Optional[TaskStatusWriter] = None,
     ):
         """
         初始化管线服务
@@ -60,6 +69,8 @@ class PipelineService:
             speaker_repo: 说话人仓库(可选)
             audit_logger: 审计日志记录器(可选)
             pricing_config: 价格配置(可选)
+            stage_scheduler: 阶段调度器(可选,为 None 时各阶段不限并发)
+            status_writer: 状态合并写入器(可选,为 None 时每次状态更新直接写库)
         """
         self.transcription = transcription_service
         self.speaker_recognition = speaker_recognition_service
@@ -71,6 +82,45 @@ class PipelineService:
         self.speakers = speaker_repo
         self.audit_logger = audit_logger
         self.cost_tracker = CostTracker(pricing_config) if pricing_config else CostTracker()
+        self.stage_scheduler = stage_scheduler
+        self.status_writer = status_writer
+
+    def bind_repositories(
+        self,
+        task_repo=None,
+        transcript_repo=None,
+        speaker_mapping_repo=None,
+        speaker_repo=None,
+        artifact_repo=None,
+        template_repo=None,
+    ) -> "PipelineService":
+        """
+        创建绑定到指定仓库的管线副本
+
+        副本共享各服务和提供商实例,仅替换仓库(属于调用方的 session),
+        因此多个任务可以在同一事件循环中并发执行而不会互相覆盖仓库。
+
+        Args:
+            task_repo: 任务仓库
+            transcript_repo: 转写记录仓库
+            speaker_mapping_repo: 说话人映射仓库
+            speaker_repo: 说话人仓库
+            artifact_repo: 衍生内容仓库
+            template_repo: 提示词模板仓库
+
+        Returns:
+            PipelineService: 绑定了新仓库的管线副本
+        """
+        bound = copy.copy(self)
+        bound.tasks = task_repo
+        bound.transcripts = transcript_repo
+        bound.speaker_mappings = speaker_mapping_repo
+        bound.speakers = speaker_repo
+        bound.artifact_generation = self.artifact_generation.bind_repositories(
+            template_repo=template_repo,
+            artifact_repo=artifact_repo,
+        )
+        return bound
 
     async def process_meeting(
         self,
@@ -177,15 +227,26 @@ class PipelineService:
                 audio_duration=None,  # 还不知道音频时长
             )
             
+            def report_upload_progress(sent: int, total: int) -> None:
+                if total > 0:
+                    self._update_task_status(
+                        task_id,
+                        TaskState.TRANSCRIBING,
+                        progress=round(UPLOAD_PROGRESS_SPAN * sent / total, 1),
+                    )
+            
             try:
-                transcript, audio_url, local_audio_path = await self.transcription.transcribe(
-                    audio_files=audio_files,
-                    file_order=file_order,
-                    asr_language=asr_language,
-                    hotword_set_id=hotword_set_id,
-                    tenant_id=tenant_id,
-                    user_id=user_id,
-                )
+                async with self._stage(PipelineStage.ASR, task_id):
+                    transcript, audio_url, local_audio_path = await self.transcription.transcribe(
+                        audio_files=audio_files,
+                        file_order=file_order,
+                        asr_language=asr_language,
+                        hotword_set_id=hotword_set_id,
+                        tenant_id=tenant_id,
+                        user_id=user_id,
+                        upload_progress_callback=report_upload_progress,
+                        speaker_recognition=not skip_speaker_recognition,
+                    )
             except Exception as e:
                 # ASR 阶段错误
                 logger.error(f"Task {task_id}: ASR failed: {e}", exc_info=True)
@@ -278,11 +339,12 @@ class PipelineService:
                 
                 try:
                     # 调用说话人识别服务 (使用本地音频路径)
-                    speaker_mapping = await self.speaker_recognition.recognize_speakers(
-                        transcript=transcript,
-                        audio_path=local_audio_path,
-                        known_speakers=None,  # TODO: 从数据库加载已知说话人
-                    )
+                    async with self._stage(PipelineStage.VOICEPRINT, task_id):
+                        speaker_mapping = await self.speaker_recognition.recognize_speakers(
+                            transcript=transcript,
+                            audio_path=local_audio_path,
+                            known_speakers=None,  # TODO: 从数据库加载已知说话人
+                        )
                 except Exception as e:
                     # 声纹识别阶段错误
                     logger.error(f"Task {task_id}: Voiceprint recognition failed: {e}", exc_info=True)
@@ -417,18 +479,19 @@ class PipelineService:
             )
             
             try:
-                artifact = await self.artifact_generation.generate_artifact(
-                    task_id=task_id,
-                    transcript=transcript,
-                    artifact_type="meeting_minutes",
-                    prompt_instance=prompt_instance,
-                    output_language=output_language,
-                    user_id=user_id,
-                    template=template,
-                    meeting_date=meeting_date,  # 传入会议日期
-                    meeting_time=meeting_time,  # 传入会议时间
-                    display_name="纪要",  # 添加默认 display_name
-                )
+                async with self._stage(PipelineStage.LLM, task_id):
+                    artifact = await self.artifact_generation.generate_artifact(
+                        task_id=task_id,
+                        transcript=transcript,
+                        artifact_type="meeting_minutes",
+                        prompt_instance=prompt_instance,
+                        output_language=output_language,
+                        user_id=user_id,
+                        template=template,
+                        meeting_date=meeting_date,  # 传入会议日期
+                        meeting_time=meeting_time,  # 传入会议时间
+                        display_name="纪要",  # 添加默认 display_name
+                    )
             except Exception as e:
                 # LLM 生成阶段错误
                 logger.error(f"Task {task_id}: LLM generation failed: {e}", exc_info=True)
@@ -605,6 +668,18 @@ class PipelineService:
                 except Exception as e:
                     logger.warning(f"Failed to cleanup temp file {local_audio_path}: {e}")
 
+    def _stage(self, stage: PipelineStage, task_id: str):
+        """
+        获取阶段槽位上下文(未配置调度器时不做限制)
+
+        Args:
+            stage: 管线阶段
+            task_id: 任务 ID
+        """
+        if self.stage_scheduler is None:
+            return contextlib.nullcontext()
+        return self.stage_scheduler.stage(stage, task_id)
+
     def _update_task_status(
         self,
         task_id: str,
@@ -620,7 +695,7 @@ class PipelineService:
             task_id: 任务 ID
             state: 任务状态
             progress: 进度百分比 (0-100)
-            audio_duration: 音频总时长(秒)，用于计算预估时间
+            audio_duration: 音频总时长(秒)，用于计算预估时间，并写入任务记录供列表页使用
             error_details: 错误详情
         """
         if self.tasks is None:
@@ -644,14 +719,26 @@ class PipelineService:
                 estimated_time = int(total_estimated_time * (1 - progress / 100.0))
         
         try:
-            self.tasks.update_status(
-                task_id=task_id,
-                state=state,
-                progress=progress,
-                estimated_time=estimated_time,
-                error_details=error_details,
-                updated_at=datetime.now(),
-            )
+            if self.status_writer is not None:
+                # 合并高频进度更新,按间隔批量写库
+                self.status_writer.submit(
+                    task_id=task_id,
+                    state=state.value,
+                    progress=progress,
+                    estimated_time=estimated_time,
+                    error_details=error_details,
+                    audio_duration=audio_duration,
+                )
+            else:
+                self.tasks.update_status(
+                    task_id=task_id,
+                    state=state,
+                    progress=progress,
+                    estimated_time=estimated_time,
+                    error_details=error_details,
+                    updated_at=datetime.now(),
+                    audio_duration=audio_duration,
+                )
             
             logger.info(
                 f"Task {task_id}: Status updated - state={state.value}, "
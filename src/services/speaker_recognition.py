@@ -1,5 +1,6 @@
 """Speaker recognition service for identifying speakers in audio."""
 
+import asyncio
 import logging
 from collections import defaultdict
 from typing import Dict, List, Optional
@@ -27,6 +28,7 @@ class SpeakerRecognitionService:
         storage_client: StorageClient,
         sample_duration_min: float = 3.0,
         sample_duration_max: float = 6.0,
+        max_concurrency: int = 4,
     ):
         """
         初始化说话人识别服务
@@ -37,12 +39,14 @@ class SpeakerRecognitionService:
             storage_client: 存储客户端
             sample_duration_min: 最小样本时长(秒)
             sample_duration_max: 最大样本时长(秒)
+            max_concurrency: 并发提取样本的最大数量
         """
         self.voiceprint = voiceprint_provider
         self.audio_processor = audio_processor
         self.storage = storage_client
         self.sample_duration_min = sample_duration_min
         self.sample_duration_max = sample_duration_max
+        self.max_concurrency = max(1, max_concurrency)
 
     async def recognize_speakers(
         self,
@@ -92,12 +96,13 @@ class SpeakerRecognitionService:
                     logger.warning("No speaker samples extracted, returning empty mapping")
                     return {}
 
-                # 3. 调用声纹识别
+                # 3. 调用声纹识别(传入已提取的样本,提供商无需再次提取)
                 logger.info(f"Recognizing {len(speaker_samples)} speakers")
                 speaker_mapping = await self.voiceprint.identify_speakers(
                     transcript=transcript,
                     audio_url=converted_audio_path,  # 使用转换后的路径
                     known_speakers=known_speakers,
+                    speaker_samples=speaker_samples,
                 )
 
                 logger.info(f"Speaker recognition completed: {speaker_mapping}")
@@ -140,29 +145,54 @@ class SpeakerRecognitionService:
             if segment.speaker:
                 speaker_segments[segment.speaker].append(segment)
 
-        # 2. 为每个说话人选择最佳样本
-        speaker_samples = {}
-        for speaker, segments in speaker_segments.items():
+        # 2. 目标格式 WAV 只映射一次,按采样偏移直接切片
+        pcm_buffer = self.audio_processor.open_pcm_buffer(audio_path)
+        if pcm_buffer is not None:
+            with pcm_buffer:
+                speaker_samples = {}
+                for speaker, segments in speaker_segments.items():
+                    best_segment = self._select_best_segment(segments)
+                    if best_segment:
+                        speaker_samples[speaker] = pcm_buffer.slice(
+                            best_segment.start_time, best_segment.end_time
+                        )
+            logger.debug(f"Sliced {len(speaker_samples)} speaker samples from PCM buffer")
+            return speaker_samples
+
+        # 3. 其他格式: 为每个说话人选择最佳样本并并发提取
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def extract(speaker: str, segments: List) -> Optional[bytes]:
             # 选择最佳片段(优先选择时长在 3-6 秒之间的片段)
             best_segment = self._select_best_segment(segments)
+            if not best_segment:
+                return None
 
-            if best_segment:
-                # 提取音频样本
+            # 提取音频样本
+            async with semaphore:
                 try:
                     sample = await self.audio_processor.extract_segment(
                         audio_path=audio_path,
                         start_time=best_segment.start_time,
                         end_time=best_segment.end_time,
                     )
-                    speaker_samples[speaker] = sample
-                    logger.debug(
-                        f"Extracted sample for {speaker}: "
-                        f"{best_segment.start_time:.2f}s - {best_segment.end_time:.2f}s"
-                    )
                 except Exception as e:
                     logger.warning(f"Failed to extract sample for {speaker}: {e}")
+                    return None
+
+            logger.debug(
+                f"Extracted sample for {speaker}: "
+                f"{best_segment.start_time:.2f}s - {best_segment.end_time:.2f}s"
+            )
+            return sample
 
-        return speaker_samples
+        speakers = list(speaker_segments)
+        samples = await asyncio.gather(
+            *(extract(speaker, speaker_segments[speaker]) for speaker in speakers)
+        )
+        return {
+            speaker: sample for speaker, sample in zip(speakers, samples) if sample is not None
+        }
 
     def _select_best_segment(self, segments: List) -> Optional[object]:
         """
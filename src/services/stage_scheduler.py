@@ -0,0 +1,128 @@
+"""Per-stage concurrency scheduling for the meeting pipeline."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Dict, Optional
+
+from src.utils.metrics import get_metrics_collector
+from src.utils.rate_limiter import AsyncRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineStage(str, Enum):
+    """管线阶段(每个阶段对应一类外部资源)"""
+
+    ASR = "asr"  # 上传 + ASR 轮询,主要是等待
+    VOICEPRINT = "voiceprint"  # ffmpeg 样本提取 + 声纹搜索
+    LLM = "llm"  # 衍生内容生成
+
+
+class StageScheduler:
+    """
+    阶段调度器
+
+    为每个管线阶段维护独立的并发槽位和等待队列。任务进入某阶段前
+    排队获取该阶段的槽位,完成后释放并进入下一阶段的队列,因此
+    一个等待 LLM 的任务不会占用 ASR 槽位,各提供商的配额可以被
+    独立用满。
+
+    LLM 阶段可额外配置每分钟最大请求数,用于平滑突发调用。
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[PipelineStage, int]] = None,
+        llm_requests_per_minute: Optional[int] = None,
+    ):
+        """
+        初始化阶段调度器
+
+        Args:
+            limits: 各阶段最大并发数,未配置的阶段不限制
+            llm_requests_per_minute: LLM 阶段每分钟最多启动的调用数(可选)
+        """
+        self.limits: Dict[PipelineStage, int] = {
+            PipelineStage(stage): max(1, limit) for stage, limit in (limits or {}).items()
+        }
+        self.llm_rate_limiter = AsyncRateLimiter.per_minute(llm_requests_per_minute)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphores: Dict[PipelineStage, asyncio.Semaphore] = {}
+        self._waiting: Dict[PipelineStage, int] = {stage: 0 for stage in PipelineStage}
+        self._running: Dict[PipelineStage, int] = {stage: 0 for stage in PipelineStage}
+
+    def _bind_loop(self) -> None:
+        """确保同步原语属于当前事件循环(逐个处理模式下每个任务一个事件循环)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphores = {
+                stage: asyncio.Semaphore(limit) for stage, limit in self.limits.items()
+            }
+
+    @asynccontextmanager
+    async def stage(self, stage: PipelineStage, task_id: str = "") -> AsyncIterator[None]:
+        """
+        占用一个阶段槽位
+
+        Args:
+            stage: 管线阶段
+            task_id: 任务 ID(用于日志)
+
+        Usage:
+            async with scheduler.stage(PipelineStage.ASR, task_id):
+                await transcription.transcribe(...)
+        """
+        self._bind_loop()
+        semaphore = self._semaphores.get(stage)
+        metrics = get_metrics_collector()
+
+        start = time.monotonic()
+        self._waiting[stage] += 1
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                if stage == PipelineStage.LLM:
+                    await self.llm_rate_limiter.acquire()
+            except BaseException:
+                if semaphore is not None:
+                    semaphore.release()
+                raise
+        finally:
+            self._waiting[stage] -= 1
+
+        waited = time.monotonic() - start
+        metrics.observe_histogram(f"pipeline_stage_wait_seconds_{stage.value}", waited)
+        if waited >= 1.0:
+            logger.info(f"Task {task_id}: waited {waited:.1f}s for {stage.value} slot")
+
+        self._running[stage] += 1
+        metrics.set_gauge("pipeline_stage_running", self._running[stage], {"stage": stage.value})
+        try:
+            yield
+        finally:
+            self._running[stage] -= 1
+            metrics.set_gauge("pipeline_stage_running", self._running[stage], {"stage": stage.value})
+            if semaphore is not None:
+                semaphore.release()
+
+    def get_stats(self) -> Dict[str, Dict[str, Optional[int]]]:
+        """
+        获取各阶段当前状态
+
+        Returns:
+            Dict: {stage: {"limit": int|None, "running": int, "waiting": int}}
+        """
+        return {
+            stage.value: {
+                "limit": self.limits.get(stage),
+                "running": self._running[stage],
+                "waiting": self._waiting[stage],
+            }
+            for stage in PipelineStage
+        }
@@ -0,0 +1,165 @@
+"""Coalescing writer for pipeline task status updates."""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = ("success", "failed", "partial_success", "cancelled")
+
+
+def _write_with_repository(updates: List[Dict[str, Any]]) -> None:
+    from src.database.repositories import TaskRepository
+
+    # update_states 使用独立的 session 和事务
+    TaskRepository(None).update_states(updates)
+
+
+class TaskStatusWriter:
+    """
+    任务状态合并写入器(每个 Worker 一个)
+
+    管线每个阶段会多次上报进度(上传进度尤其频繁),逐次写库会在 SQLite 上
+    造成锁竞争。写入器按任务合并更新,只保留最新值:
+    - 空闲时的第一次更新立即写入,之后每个 flush_interval 最多写一次
+    - 终态(success/failed/partial_success/cancelled)立即写入
+    - 每次写入把所有待写任务放进同一个事务
+
+    submit 可以在事件循环内或其他线程中调用;没有可用事件循环时直接同步写入。
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.5,
+        write_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ):
+        """
+        初始化写入器
+
+        Args:
+            flush_interval: 两次写入之间的最短间隔(秒)
+            write_batch: 批量写入函数(默认 TaskRepository.update_states)
+        """
+        self.flush_interval = flush_interval
+        self._write_batch = write_batch or _write_with_repository
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._urgent: Optional[asyncio.Event] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._runner: Optional[asyncio.Task] = None
+
+    def _bind_loop(self) -> None:
+        # 事件、锁和后台任务属于创建它们的事件循环
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._urgent = asyncio.Event()
+            self._write_lock = asyncio.Lock()
+            self._runner = None
+
+    def submit(
+        self,
+        task_id: str,
+        state: str,
+        progress: Optional[float] = None,
+        estimated_time: Optional[int] = None,
+        error_details: Optional[str] = None,
+        audio_duration: Optional[float] = None,
+    ) -> None:
+        """
+        提交状态更新(与同一任务尚未写入的更新合并)
+
+        Args:
+            task_id: 任务 ID
+            state: 任务状态
+            progress: 进度百分比(None 表示不修改)
+            estimated_time: 预计剩余时间(None 表示不修改)
+            error_details: 错误详情(None 表示不修改)
+            audio_duration: 音频总时长(None 表示不修改)
+        """
+        with self._lock:
+            pending = self._pending.setdefault(task_id, {"task_id": task_id})
+            pending["state"] = state
+            for key, value in (
+                ("progress", progress),
+                ("estimated_time", estimated_time),
+                ("error_details", error_details),
+                ("audio_duration", audio_duration),
+            ):
+                if value is not None:
+                    pending[key] = value
+        urgent = state in TERMINAL_STATES
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is not None:
+            self._signal(urgent)
+        elif self._loop is not None and not self._loop.is_closed() and self._loop.is_running():
+            # 从线程中上报(如上传进度回调)
+            self._loop.call_soon_threadsafe(self._signal, urgent)
+        else:
+            self._write(self._take_pending())
+
+    def _signal(self, urgent: bool) -> None:
+        self._bind_loop()
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        self._wakeup.set()
+        if urgent:
+            self._urgent.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            self._urgent.clear()
+            # 取消(aclose)时让进行中的写入完成,避免与后续写入乱序
+            await asyncio.shield(self.flush())
+            # 限制写入频率: 间隔内到达的更新被合并,终态更新提前唤醒
+            try:
+                await asyncio.wait_for(self._urgent.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _take_pending(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            updates = list(self._pending.values())
+            self._pending.clear()
+        return updates
+
+    def _write(self, updates: List[Dict[str, Any]]) -> None:
+        if not updates:
+            return
+        try:
+            self._write_batch(updates)
+            logger.debug(f"Flushed status updates for {len(updates)} tasks")
+        except Exception as e:
+            logger.warning(f"Failed to flush task status updates: {e}")
+
+    async def flush(self) -> None:
+        """立即写入所有待写更新(任务结束时调用,保证状态落库)"""
+        self._bind_loop()
+        # 串行写入,保证同一任务的更新按提交顺序落库
+        async with self._write_lock:
+            updates = self._take_pending()
+            if updates:
+                await asyncio.to_thread(self._write, updates)
+
+    async def aclose(self) -> None:
+        """停止后台写入并写入剩余更新"""
+        if self._runner is not None and self._loop is asyncio.get_running_loop():
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        await self.flush()
@@ -0,0 +1,94 @@
+"""Transcript compaction before building LLM prompts."""
+
+import re
+from typing import List
+
+from src.core.models import Segment, TranscriptionResult
+
+# 语气词: 中文只去掉几乎不承载语义的"嗯/呃/唔",英文去掉独立的 um/uh/erm/hmm
+_CJK_FILLER_RE = re.compile(r"[嗯呃唔]+[，,、。.…]*")
+_LATIN_FILLER_RE = re.compile(r"\b(?:u+m+|u+h+|e+r+m+|h+m+)\b[,.]?\s*", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s{2,}")
+# 去掉语气词后只剩标点的片段视为空
+_PUNCTUATION_ONLY_RE = re.compile(r"^[\s，,、。.…!！?？]*$")
+
+
+def strip_fillers(text: str) -> str:
+    """
+    去掉文本中的语气词
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        str: 去掉语气词后的文本,只剩标点时返回空字符串
+    """
+    text = _CJK_FILLER_RE.sub("", text)
+    text = _LATIN_FILLER_RE.sub("", text)
+    text = _SPACE_RE.sub(" ", text).strip()
+    if _PUNCTUATION_ONLY_RE.match(text):
+        return ""
+    return text
+
+
+def _join_text(left: str, right: str) -> str:
+    # 两侧都是拉丁字母/数字时补空格,中文直接拼接
+    if left and right and left[-1].isascii() and right[0].isascii():
+        return f"{left} {right}"
+    return left + right
+
+
+def compact_transcript(
+    transcript: TranscriptionResult,
+    merge_gap_seconds: float = 5.0,
+    max_turn_seconds: float = 120.0,
+    remove_fillers: bool = True,
+) -> TranscriptionResult:
+    """
+    压缩转写,减少提示词 Token
+
+    - 去掉语气词,只剩语气词的片段(附和声)直接丢弃
+    - 合并同一说话人间隔不超过 merge_gap_seconds 的连续片段,
+      合并后的轮次不超过 max_turn_seconds,保证时间线仍可引用
+
+    时间戳保持原值;提示词中减少时间戳由 LLMProvider.format_transcript
+    的 timestamp_interval 控制。
+
+    Args:
+        transcript: 转写结果
+        merge_gap_seconds: 同一说话人片段合并的最大间隔(秒)
+        max_turn_seconds: 合并后单个轮次的最大时长(秒)
+        remove_fillers: 是否去掉语气词
+
+    Returns:
+        TranscriptionResult: 压缩后的转写(原对象不变)
+    """
+    merged: List[Segment] = []
+    for segment in transcript.segments:
+        text = strip_fillers(segment.text) if remove_fillers else segment.text.strip()
+        if not text:
+            continue
+
+        last = merged[-1] if merged else None
+        if (
+            last is not None
+            and last.speaker == segment.speaker
+            and segment.start_time - last.end_time <= merge_gap_seconds
+            and segment.end_time - last.start_time <= max_turn_seconds
+        ):
+            merged[-1] = last.model_copy(
+                update={
+                    "text": _join_text(last.text, text),
+                    "end_time": max(last.end_time, segment.end_time),
+                    "confidence": None,
+                }
+            )
+        else:
+            merged.append(segment.model_copy(update={"text": text}))
+
+    return transcript.model_copy(
+        update={
+            "segments": merged,
+            "full_text": "".join(segment.text for segment in merged),
+        }
+    )
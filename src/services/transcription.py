@@ -1,17 +1,74 @@
 """Transcription service for audio processing."""
 
+import asyncio
 import logging
+import os
+import tempfile
 from typing import Dict, List, Optional
 
 from src.core.exceptions import ASRError, AudioFormatError, StorageError
-from src.core.models import ASRLanguage, HotwordSet, TranscriptionResult
+from src.core.models import ASRLanguage, HotwordSet, Segment, TranscriptionResult
 from src.core.providers import ASRProvider
+from src.services.asr_cache import ASRResultCache
+from src.services.asr_hedging import ASRHedgingPolicy
+from src.services.chunking import AudioChunk, plan_chunks, stitch_chunk_results
 from src.utils.audio import AudioProcessor
-from src.utils.storage import StorageClient
+from src.utils.metrics import get_metrics_collector
+from src.utils.storage import ProgressCallback, StorageClient
 
 logger = logging.getLogger(__name__)
 
 
+def merge_transcripts(
+    results: List[TranscriptionResult], offsets: List[float]
+) -> TranscriptionResult:
+    """
+    合并按顺序分片转写的结果
+
+    片段时间加上各分片在拼接音频中的起始偏移。各分片的说话人标签相互独立
+    (不同分片的 "Speaker 1" 不一定是同一人),因此按首次出现顺序重新编号为
+    全局唯一的 "Speaker N"。
+
+    注意: 这里不做跨分片的说话人对齐 —— 分片之间没有重叠音频,无法像长音频
+    分块那样按重叠区对齐,同一人在不同分片中会得到不同标签。只有后续声纹识别
+    把这些标签映射到同一姓名时才会合并,未注册声纹的说话人仍保持分开,
+    因此调用方只应在会执行说话人识别时使用分片并行转写。
+
+    Args:
+        results: 各分片的转写结果(按拼接顺序)
+        offsets: 各分片的起始偏移(秒)
+
+    Returns:
+        TranscriptionResult: 合并后的转写结果
+    """
+    speaker_labels: Dict[tuple, str] = {}
+    segments: List[Segment] = []
+
+    for index, (result, offset) in enumerate(zip(results, offsets)):
+        for segment in result.segments:
+            label_key = (index, segment.speaker)
+            if label_key not in speaker_labels:
+                speaker_labels[label_key] = f"Speaker {len(speaker_labels) + 1}"
+            segments.append(
+                segment.model_copy(
+                    update={
+                        "start_time": segment.start_time + offset,
+                        "end_time": segment.end_time + offset,
+                        "speaker": speaker_labels[label_key],
+                    }
+                )
+            )
+
+    providers = list(dict.fromkeys(result.provider for result in results))
+    return TranscriptionResult(
+        segments=segments,
+        full_text="\n".join(result.full_text for result in results if result.full_text),
+        duration=max((seg.end_time for seg in segments), default=0.0),
+        language=results[0].language if results else "zh-CN",
+        provider="+".join(providers),
+    )
+
+
 class TranscriptionService:
     """
     转写服务
@@ -25,6 +82,13 @@ class TranscriptionService:
         fallback_asr: ASRProvider,
         storage_client: StorageClient,
         audio_processor: AudioProcessor,
+        asr_cache: Optional[ASRResultCache] = None,
+        parallel_multi_file: bool = False,
+        long_audio_chunk_seconds: Optional[float] = None,
+        chunk_overlap_seconds: float = 5.0,
+        chunk_search_seconds: float = 30.0,
+        max_chunk_concurrency: int = 4,
+        hedging_policy: Optional[ASRHedgingPolicy] = None,
     ):
         """
         初始化转写服务
@@ -34,11 +98,27 @@ class TranscriptionService:
             fallback_asr: 备用 ASR 提供商(Azure)
             storage_client: 存储客户端
             audio_processor: 音频处理器
+            asr_cache: ASR 结果缓存(可选)
+            parallel_multi_file: 多文件时是否按分片并行转写(否则拼接后整体转写);
+                仅在执行说话人识别的任务上生效
+            long_audio_chunk_seconds: 长音频分块时长(秒),None 表示不分块;
+                音频超过 1.5 倍该时长时在静音处切分并发转写
+            chunk_overlap_seconds: 相邻分块重叠时长(秒)
+            chunk_search_seconds: 在分块边界前后查找静音的范围(秒)
+            max_chunk_concurrency: 分块转写最大并发数
+            hedging_policy: ASR 对冲策略(可选),主 ASR 超时未完成时并行启动备用 ASR
         """
         self.primary_asr = primary_asr
         self.fallback_asr = fallback_asr
         self.storage = storage_client
         self.audio_processor = audio_processor
+        self.asr_cache = asr_cache
+        self.parallel_multi_file = parallel_multi_file
+        self.long_audio_chunk_seconds = long_audio_chunk_seconds
+        self.chunk_overlap_seconds = chunk_overlap_seconds
+        self.chunk_search_seconds = chunk_search_seconds
+        self.max_chunk_concurrency = max_chunk_concurrency
+        self.hedging_policy = hedging_policy
 
     async def transcribe(
         self,
@@ -48,6 +128,8 @@ class TranscriptionService:
         hotword_set: Optional[HotwordSet] = None,
         user_id: Optional[str] = None,
         tenant_id: Optional[str] = None,
+        upload_progress_callback: Optional[ProgressCallback] = None,
+        speaker_recognition: bool = True,
         **kwargs,
     ) -> tuple[TranscriptionResult, str, str]:
         """
@@ -61,6 +143,12 @@ class TranscriptionService:
         5. 如果失败,降级到备用 ASR (Azure)
         6. 返回标准化结果、音频 URL 和本地音频路径
 
+        配置了 ASR 结果缓存时,先按音频内容哈希查找缓存,命中则跳过
+        上传和 ASR(此时返回的音频 URL 为空字符串)。
+        配置了长音频分块时,超长录音按静音切分后并发转写(音频 URL 同样为空)。
+        多文件分片并行转写只在后续会执行说话人识别时启用,因为分片间的
+        说话人标签需要声纹识别来统一(见 merge_transcripts)。
+
         Args:
             audio_files: 音频文件路径列表
             file_order: 文件顺序(索引列表),如果为 None 则按原顺序
@@ -68,6 +156,8 @@ class TranscriptionService:
             hotword_set: 热词集
             user_id: 用户 ID
             tenant_id: 租户 ID
+            upload_progress_callback: 上传进度回调 (已上传字节数, 总字节数)
+            speaker_recognition: 转写后是否会执行说话人识别
             **kwargs: 其他参数
 
         Returns:
@@ -79,53 +169,456 @@ class TranscriptionService:
             StorageError: 存储操作失败
         """
         try:
-            # 1. 处理音频文件 (拼接或使用单个文件)
-            local_audio_path, audio_url = await self._prepare_audio(audio_files, file_order)
+            ordered_files = self._order_files(audio_files, file_order)
 
-            # 2. 尝试主 ASR (火山引擎)
-            try:
-                logger.info(
-                    f"Attempting primary ASR ({self.primary_asr.get_provider_name()}) "
-                    f"for audio: {audio_url}"
+            # 先确定转写方式: 分片合并、长音频分块的结果与整体转写不同,缓存需按方式区分
+            # (跳过说话人识别时整体转写,否则同一人会在各分片得到不同标签)
+            parallel_parts = (
+                self.parallel_multi_file and speaker_recognition and len(ordered_files) > 1
+            )
+            local_audio_path: Optional[str] = None
+            chunked = False
+            if parallel_parts:
+                mode = "parts"
+            else:
+                # 1. 处理音频文件 (拼接或使用单个文件)
+                local_audio_path = await self._build_local_audio(ordered_files)
+                chunked = await self._needs_chunking(local_audio_path)
+                mode = (
+                    f"chunked:{self.long_audio_chunk_seconds}:"
+                    f"{self.chunk_overlap_seconds}:{self.chunk_search_seconds}"
+                    if chunked else "whole"
                 )
-                result = await self.primary_asr.transcribe(
-                    audio_url=audio_url,
-                    asr_language=asr_language,
-                    hotword_set=hotword_set,
-                    **kwargs,
+
+            # 0. 查找 ASR 结果缓存
+            cache_keys: Dict[str, str] = {}
+            if self.asr_cache is not None:
+                cache_keys = await self._build_cache_keys(
+                    ordered_files, asr_language, hotword_set, kwargs.get("hotword_set_id"), mode
                 )
-                logger.info(
-                    f"Primary ASR succeeded: {len(result.segments)} segments, "
-                    f"duration={result.duration:.2f}s"
+                cached = await self.asr_cache.get(*cache_keys.values()) if cache_keys else None
+                if cached is not None:
+                    if local_audio_path is None:
+                        local_audio_path = await self._build_local_audio(ordered_files)
+                    return cached, "", local_audio_path
+
+            if parallel_parts:
+                # 多文件并行模式: 各分片分别上传和转写,再按偏移合并
+                result, local_audio_path = await self._transcribe_parts(
+                    ordered_files, asr_language, hotword_set, upload_progress_callback, **kwargs
+                )
+                audio_url = ""
+            elif chunked:
+                # 长音频: 按静音切分后并发转写
+                result = await self._transcribe_chunked(
+                    local_audio_path, asr_language, hotword_set,
+                    upload_progress_callback, **kwargs
+                )
+                audio_url = ""
+            else:
+                # 注意: 不要删除拼接后的文件,因为说话人识别需要使用它
+                audio_url = await self._upload_audio(
+                    local_audio_path, upload_progress_callback
                 )
-                return result, audio_url, local_audio_path
 
-            except ASRError as e:
-                # 主 ASR 失败,降级到备用 ASR
-                logger.warning(
-                    f"Primary ASR failed: {e}, falling back to "
-                    f"{self.fallback_asr.get_provider_name()}"
+                # 2. 主 ASR,失败时降级到备用 ASR
+                result = await self._run_asr(
+                    audio_url, asr_language, hotword_set,
+                    audio_duration=await self._hedging_duration(local_audio_path),
+                    **kwargs,
                 )
 
-                # 3. 降级到备用 ASR (Azure)
-                result = await self.fallback_asr.transcribe(
+            await self._store_cache(cache_keys, result)
+            return result, audio_url, local_audio_path
+
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            raise ASRError(f"Transcription failed: {e}", provider="transcription_service")
+
+    async def _run_asr(
+        self,
+        audio_url: str,
+        asr_language: ASRLanguage,
+        hotword_set: Optional[HotwordSet],
+        audio_duration: Optional[float] = None,
+        **kwargs,
+    ) -> TranscriptionResult:
+        """
+        转写已上传的音频(主 ASR 失败时降级到备用 ASR)
+
+        Args:
+            audio_url: 音频 URL
+            asr_language: ASR 识别语言
+            hotword_set: 热词集
+            audio_duration: 音频时长(秒),用于按时长计算对冲等待时间
+            **kwargs: 其他参数
+
+        Returns:
+            TranscriptionResult: 转写结果
+
+        Raises:
+            ASRError: 主备 ASR 均失败
+        """
+        if self.hedging_policy is not None:
+            return await self._run_asr_hedged(
+                audio_url, asr_language, hotword_set, audio_duration, **kwargs
+            )
+
+        # 尝试主 ASR (火山引擎)
+        try:
+            logger.info(
+                f"Attempting primary ASR ({self.primary_asr.get_provider_name()}) "
+                f"for audio: {audio_url}"
+            )
+            result = await self.primary_asr.transcribe(
+                audio_url=audio_url,
+                asr_language=asr_language,
+                hotword_set=hotword_set,
+                **kwargs,
+            )
+            logger.info(
+                f"Primary ASR succeeded: {len(result.segments)} segments, "
+                f"duration={result.duration:.2f}s"
+            )
+            return result
+
+        except ASRError as e:
+            # 主 ASR 失败,降级到备用 ASR
+            logger.warning(
+                f"Primary ASR failed: {e}, falling back to "
+                f"{self.fallback_asr.get_provider_name()}"
+            )
+
+            # 降级到备用 ASR (Azure)
+            result = await self.fallback_asr.transcribe(
+                audio_url=audio_url,
+                asr_language=asr_language,
+                hotword_set=hotword_set,
+                **kwargs,
+            )
+            logger.info(
+                f"Fallback ASR succeeded: {len(result.segments)} segments, "
+                f"duration={result.duration:.2f}s"
+            )
+            return result
+
+    async def _run_asr_hedged(
+        self,
+        audio_url: str,
+        asr_language: ASRLanguage,
+        hotword_set: Optional[HotwordSet],
+        audio_duration: Optional[float],
+        **kwargs,
+    ) -> TranscriptionResult:
+        """
+        对冲方式转写: 主 ASR 超过对冲等待时间仍未完成时并行启动备用 ASR
+
+        取先成功的结果并取消另一方;主 ASR 在等待时间内失败时与普通降级相同。
+        等待时间按音频时长缩放,时长未知时使用初始等待时间且不记录耗时样本。
+
+        Args:
+            audio_url: 音频 URL
+            asr_language: ASR 识别语言
+            hotword_set: 热词集
+            audio_duration: 音频时长(秒)
+            **kwargs: 其他参数
+
+        Returns:
+            TranscriptionResult: 转写结果
+
+        Raises:
+            ASRError: 主备 ASR 均失败
+        """
+        policy = self.hedging_policy
+        metrics = get_metrics_collector()
+        primary_name = self.primary_asr.get_provider_name()
+        fallback_name = self.fallback_asr.get_provider_name()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        async def call_primary() -> TranscriptionResult:
+            result = await self.primary_asr.transcribe(
+                audio_url=audio_url,
+                asr_language=asr_language,
+                hotword_set=hotword_set,
+                **kwargs,
+            )
+            if audio_duration is not None:
+                policy.record_latency(loop.time() - started, audio_duration)
+            return result
+
+        def call_fallback() -> asyncio.Future:
+            return asyncio.ensure_future(
+                self.fallback_asr.transcribe(
                     audio_url=audio_url,
                     asr_language=asr_language,
                     hotword_set=hotword_set,
                     **kwargs,
                 )
+            )
+
+        delay = policy.hedge_delay(audio_duration)
+        logger.info(
+            f"Attempting primary ASR ({primary_name}) for audio: {audio_url} "
+            f"(hedge after {delay:.0f}s)"
+        )
+        primary_task = asyncio.ensure_future(call_primary())
+        tasks = [primary_task]
+        try:
+            await asyncio.wait(tasks, timeout=delay)
+
+            if primary_task.done():
+                try:
+                    result = primary_task.result()
+                except ASRError as e:
+                    logger.warning(f"Primary ASR failed: {e}, falling back to {fallback_name}")
+                    fallback_task = call_fallback()
+                    tasks.append(fallback_task)
+                    result = await fallback_task
                 logger.info(
-                    f"Fallback ASR succeeded: {len(result.segments)} segments, "
+                    f"ASR succeeded ({result.provider}): {len(result.segments)} segments, "
                     f"duration={result.duration:.2f}s"
                 )
-                return result, audio_url, local_audio_path
+                return result
 
+            # 主 ASR 超时未完成,并行启动备用 ASR
+            logger.warning(
+                f"Primary ASR still running after {delay:.0f}s, hedging with {fallback_name}"
+            )
+            metrics.increment_counter("asr_hedges_total", labels={"provider": primary_name})
+            fallback_task = call_fallback()
+            tasks.append(fallback_task)
+
+            pending = set(tasks)
+            last_error: Optional[ASRError] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        result = task.result()
+                    except ASRError as e:
+                        name = primary_name if task is primary_task else fallback_name
+                        logger.warning(f"Hedged ASR ({name}) failed: {e}")
+                        last_error = e
+                        continue
+
+                    winner = primary_name if task is primary_task else fallback_name
+                    metrics.increment_counter("asr_hedge_wins_total", labels={"provider": winner})
+                    logger.info(
+                        f"Hedged ASR won by {winner}: {len(result.segments)} segments, "
+                        f"duration={result.duration:.2f}s"
+                    )
+                    return result
+
+            raise last_error
+        finally:
+            # 取消仍在运行的一方(火山引擎轮询会随之停止)
+            unfinished = [task for task in tasks if not task.done()]
+            if primary_task in unfinished and len(tasks) > 1 and audio_duration is not None:
+                # 对冲后被取消的主 ASR 没有完成耗时,记录已耗时(不小于对冲等待时间)
+                # 作为下界样本;否则只有快的请求被记录,百分位会不断下移
+                policy.record_latency(max(loop.time() - started, delay), audio_duration)
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def _transcribe_parts(
+        self,
+        ordered_files: List[str],
+        asr_language: ASRLanguage,
+        hotword_set: Optional[HotwordSet],
+        progress_callback: Optional[ProgressCallback] = None,
+        **kwargs,
+    ) -> tuple[TranscriptionResult, str]:
+        """
+        并行转写多个音频分片
+
+        各分片并发上传和转写,同时在本地拼接完整音频(说话人识别需要),
+        最后按拼接偏移合并片段。
+
+        Args:
+            ordered_files: 排序后的音频文件列表
+            asr_language: ASR 识别语言
+            hotword_set: 热词集
+            progress_callback: 上传进度回调(汇总所有分片)
+            **kwargs: 其他参数
+
+        Returns:
+            tuple[TranscriptionResult, str]: (合并后的转写结果, 拼接后的本地音频路径)
+
+        Raises:
+            ASRError: 任一分片转写失败
+            AudioFormatError: 音频拼接失败
+        """
+        logger.info(f"Transcribing {len(ordered_files)} audio parts in parallel")
+
+        sizes = [os.path.getsize(path) for path in ordered_files]
+        total_size = sum(sizes)
+        sent = [0] * len(ordered_files)
+
+        def part_progress(index: int) -> Optional[ProgressCallback]:
+            if progress_callback is None:
+                return None
+
+            def report(part_sent: int, part_total: int) -> None:
+                sent[index] = part_sent
+                progress_callback(sum(sent), total_size)
+
+            return report
+
+        async def transcribe_part(index: int, path: str) -> TranscriptionResult:
+            audio_url = await self._upload_audio(path, part_progress(index))
+            return await self._run_asr(
+                audio_url, asr_language, hotword_set,
+                audio_duration=await self._hedging_duration(path),
+                **kwargs,
+            )
+
+        concat_task = asyncio.ensure_future(
+            self.audio_processor.concatenate_audio(ordered_files)
+        )
+        part_tasks = [
+            asyncio.ensure_future(transcribe_part(i, path))
+            for i, path in enumerate(ordered_files)
+        ]
+        try:
+            part_results = await asyncio.gather(*part_tasks)
+            concatenated_path, offsets = await concat_task
+        except BaseException:
+            for task in [concat_task, *part_tasks]:
+                task.cancel()
+            await asyncio.gather(concat_task, *part_tasks, return_exceptions=True)
+            raise
+
+        return merge_transcripts(part_results, offsets), concatenated_path
+
+    async def _hedging_duration(self, audio_path: str) -> Optional[float]:
+        """获取对冲策略所需的音频时长(未启用对冲或读取失败时为 None)"""
+        if self.hedging_policy is None:
+            return None
+        try:
+            return await self.audio_processor.get_duration(audio_path)
         except Exception as e:
-            logger.error(f"Transcription failed: {e}")
-            raise ASRError(f"Transcription failed: {e}", provider="transcription_service")
+            logger.warning(f"Failed to read audio duration for ASR hedging: {e}")
+            return None
+
+    async def _needs_chunking(self, local_audio_path: str) -> bool:
+        """是否需要按长音频分块转写"""
+        if not self.long_audio_chunk_seconds:
+            return False
+        duration = await self.audio_processor.get_duration(local_audio_path)
+        return duration > self.long_audio_chunk_seconds * 1.5
+
+    async def _transcribe_chunked(
+        self,
+        local_audio_path: str,
+        asr_language: ASRLanguage,
+        hotword_set: Optional[HotwordSet],
+        progress_callback: Optional[ProgressCallback] = None,
+        **kwargs,
+    ) -> TranscriptionResult:
+        """
+        长音频分块并发转写
+
+        在固定边界附近的静音处切分,各分块带重叠区独立上传和转写
+        (并发数受 max_chunk_concurrency 限制),再按偏移拼接并去重。
+
+        Args:
+            local_audio_path: 本地音频路径
+            asr_language: ASR 识别语言
+            hotword_set: 热词集
+            progress_callback: 上传进度回调(汇总所有分块)
+            **kwargs: 其他参数
+
+        Returns:
+            TranscriptionResult: 拼接后的转写结果
+
+        Raises:
+            ASRError: 任一分块转写失败
+            AudioFormatError: 音频转换或切分失败
+        """
+        converted_path = None
+        buffer = self.audio_processor.open_pcm_buffer(local_audio_path)
+        if buffer is None:
+            converted_path = await self.audio_processor.convert_format(local_audio_path)
+            buffer = self.audio_processor.open_pcm_buffer(converted_path)
+            if buffer is None:
+                os.unlink(converted_path)
+                raise AudioFormatError(f"无法切分音频: {local_audio_path}")
+
+        try:
+            chunks = await asyncio.to_thread(
+                plan_chunks,
+                buffer,
+                self.long_audio_chunk_seconds,
+                self.chunk_overlap_seconds,
+                self.chunk_search_seconds,
+            )
+            logger.info(
+                f"Transcribing {buffer.duration:.0f}s audio in {len(chunks)} chunks "
+                f"(concurrency={self.max_chunk_concurrency})"
+            )
+
+            total_seconds = sum(chunk.end - chunk.start for chunk in chunks)
+            sent: Dict[int, float] = {}
+
+            def chunk_progress(chunk: AudioChunk) -> Optional[ProgressCallback]:
+                if progress_callback is None:
+                    return None
+
+                def report(chunk_sent: int, chunk_total: int) -> None:
+                    # 按时长比例汇总,各分块字节率相同
+                    fraction = chunk_sent / chunk_total if chunk_total else 1.0
+                    sent[chunk.index] = fraction * (chunk.end - chunk.start)
+                    progress_callback(int(sum(sent.values()) * 1000), int(total_seconds * 1000))
+
+                return report
+
+            semaphore = asyncio.Semaphore(self.max_chunk_concurrency)
+
+            async def transcribe_chunk(chunk: AudioChunk) -> TranscriptionResult:
+                async with semaphore:
+                    chunk_path = await asyncio.to_thread(self._write_chunk, buffer, chunk)
+                    try:
+                        audio_url = await self._upload_audio(chunk_path, chunk_progress(chunk))
+                    finally:
+                        os.unlink(chunk_path)
+                    return await self._run_asr(
+                        audio_url, asr_language, hotword_set,
+                        audio_duration=chunk.end - chunk.start,
+                        **kwargs,
+                    )
+
+            tasks = [asyncio.ensure_future(transcribe_chunk(chunk)) for chunk in chunks]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+            return stitch_chunk_results(results, chunks)
+        finally:
+            buffer.close()
+            if converted_path is not None and os.path.exists(converted_path):
+                os.unlink(converted_path)
+
+    @staticmethod
+    def _write_chunk(buffer, chunk: AudioChunk) -> str:
+        """将分块写入临时 WAV 文件"""
+        with tempfile.NamedTemporaryFile(
+            suffix=f"_chunk{chunk.index:03d}.wav", delete=False
+        ) as f:
+            f.write(buffer.slice(chunk.start, chunk.end))
+            return f.name
 
     async def _prepare_audio(
-        self, audio_files: List[str], file_order: Optional[List[int]] = None
+        self,
+        audio_files: List[str],
+        file_order: Optional[List[int]] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> tuple[str, str]:
         """
         准备音频文件(拼接并上传)
@@ -133,6 +626,7 @@ class TranscriptionService:
         Args:
             audio_files: 音频文件路径列表
             file_order: 文件顺序
+            progress_callback: 上传进度回调
 
         Returns:
             tuple[str, str]: (本地音频路径, TOS 预签名 URL)
@@ -141,13 +635,34 @@ class TranscriptionService:
             AudioFormatError: 音频处理失败
             StorageError: 上传失败
         """
-        # 如果只有一个文件,直接上传
+        # 1. 按 file_order 排序并拼接(单个文件直接使用)
+        ordered_files = self._order_files(audio_files, file_order)
+        local_audio_path = await self._build_local_audio(ordered_files)
+
+        # 2. 上传
+        # 注意: 不要在这里删除拼接后的文件,因为说话人识别需要使用它
+        audio_url = await self._upload_audio(local_audio_path, progress_callback)
+        return local_audio_path, audio_url
+
+    def _order_files(
+        self, audio_files: List[str], file_order: Optional[List[int]] = None
+    ) -> List[str]:
+        """
+        按 file_order 排列音频文件
+
+        Args:
+            audio_files: 音频文件路径列表
+            file_order: 文件顺序
+
+        Returns:
+            List[str]: 排序后的文件列表
+
+        Raises:
+            AudioFormatError: file_order 与文件数量不匹配
+        """
         if len(audio_files) == 1:
-            audio_url = await self._upload_audio(audio_files[0])
-            return audio_files[0], audio_url
+            return list(audio_files)
 
-        # 多个文件,需要拼接
-        # 1. 按 file_order 排序
         if file_order is None:
             file_order = list(range(len(audio_files)))
 
@@ -157,26 +672,124 @@ class TranscriptionService:
                 f"audio_files length ({len(audio_files)})"
             )
 
-        # 按顺序排列文件
-        ordered_files = [audio_files[i] for i in file_order]
+        return [audio_files[i] for i in file_order]
+
+    async def _build_local_audio(self, ordered_files: List[str]) -> str:
+        """
+        获取用于处理的本地音频(多个文件时拼接)
+
+        Args:
+            ordered_files: 排序后的音频文件列表
+
+        Returns:
+            str: 本地音频路径
+
+        Raises:
+            AudioFormatError: 音频拼接失败
+        """
+        if len(ordered_files) == 1:
+            return ordered_files[0]
 
-        # 2. 拼接音频
         logger.info(f"Concatenating {len(ordered_files)} audio files")
         concatenated_path, offsets = await self.audio_processor.concatenate_audio(
             ordered_files
         )
+        return concatenated_path
 
-        # 3. 上传拼接后的音频
-        # 注意: 不要在这里删除 concatenated_path,因为说话人识别需要使用它
-        audio_url = await self._upload_audio(concatenated_path)
-        return concatenated_path, audio_url
+    async def _build_cache_keys(
+        self,
+        ordered_files: List[str],
+        asr_language: ASRLanguage,
+        hotword_set: Optional[HotwordSet],
+        hotword_set_id: Optional[str],
+        mode: str,
+    ) -> Dict[str, str]:
+        """
+        为主/备 ASR 生成缓存键
 
-    async def _upload_audio(self, local_path: str) -> str:
+        Args:
+            ordered_files: 排序后的音频文件列表
+            asr_language: ASR 识别语言
+            hotword_set: 热词集
+            hotword_set_id: 热词集 ID(未传入热词集时按 ID 读取其当前版本)
+            mode: 转写方式(whole / parts / chunked:分块参数)
+
+        Returns:
+            Dict[str, str]: {提供商名称: 缓存键},计算音频哈希失败时为空
+        """
+        try:
+            audio_hash = await self.asr_cache.hash_audio_files(ordered_files)
+        except OSError as e:
+            logger.warning(f"Failed to hash audio for ASR cache: {e}")
+            return {}
+
+        if hotword_set is not None:
+            hotword_version = self._hotword_version(hotword_set)
+        elif hotword_set_id:
+            hotword_version = await asyncio.to_thread(self._load_hotword_version, hotword_set_id)
+        else:
+            hotword_version = "none"
+
+        keys = {}
+        for provider in (self.primary_asr, self.fallback_asr):
+            name = provider.get_provider_name()
+            # 提供商的全局热词表变化时同样需要重新转写
+            version = f"{hotword_version}|{provider.get_default_hotword_resource() or 'none'}"
+            keys[name] = self.asr_cache.make_key(audio_hash, asr_language, version, name, mode)
+        return keys
+
+    @staticmethod
+    def _hotword_version(hotword_set: HotwordSet) -> str:
+        """热词集版本标识(资源 ID 和更新时间变化时缓存失效)"""
+        return (
+            f"{hotword_set.hotword_set_id}:{hotword_set.provider_resource_id}:"
+            f"{hotword_set.updated_at.isoformat()}"
+        )
+
+    @staticmethod
+    def _load_hotword_version(hotword_set_id: str) -> str:
+        """
+        按 ID 读取热词集的当前版本标识
+
+        Args:
+            hotword_set_id: 热词集 ID
+
+        Returns:
+            str: 版本标识;热词集不存在或读取失败时为 ID 本身
+        """
+        from src.database.repositories import HotwordSetRepository
+        from src.database.session import session_scope
+
+        try:
+            with session_scope() as session:
+                record = HotwordSetRepository(session).get_by_id(hotword_set_id)
+                if record is None:
+                    return hotword_set_id
+                updated_at = record.updated_at.isoformat() if record.updated_at else "none"
+                return f"{hotword_set_id}:{record.provider_resource_id}:{updated_at}"
+        except Exception as e:
+            logger.warning(f"Failed to load hotword set {hotword_set_id} for ASR cache: {e}")
+            return hotword_set_id
+
+    async def _store_cache(
+        self,
+        cache_keys: Dict[str, str],
+        result: TranscriptionResult,
+    ) -> None:
+        """将 ASR 结果写入缓存(按实际产生结果的提供商,混合提供商的结果不缓存)"""
+        key = cache_keys.get(result.provider)
+        if self.asr_cache is not None and key:
+            await self.asr_cache.put(key, result)
+
+    async def _upload_audio(
+        self, local_path: str, progress_callback: Optional[ProgressCallback] = None
+    ) -> str:
         """
         上传音频到 TOS 并生成预签名 URL
 
         Args:
             local_path: 本地文件路径
+            progress_callback: 上传进度回调
 
         Returns:
             str: TOS 预签名 URL (24小时有效期)
@@ -195,7 +808,10 @@ class TranscriptionService:
         # 上传
         logger.info(f"Uploading audio to TOS: {object_key}")
         audio_url = await self.storage.upload_file(
-            local_path=local_path, object_key=object_key, content_type="audio/wav"
+            local_path=local_path,
+            object_key=object_key,
+            content_type="audio/wav",
+            progress_callback=progress_callback,
         )
 
         # 生成预签名 URL (24小时有效期)
@@ -221,4 +837,4 @@ class TranscriptionService:
         Raises:
             AudioFormatError: 获取失败
         """
-        return self.audio_processor.get_duration(audio_path)
+        return await self.audio_processor.get_duration(audio_path)
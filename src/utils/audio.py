@@ -1,10 +1,14 @@
 """Audio processing utilities."""
 
+import asyncio
 import io
-import subprocess
+import mmap
+import os
+import struct
 import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 
 try:
     from pydub import AudioSegment as PydubAudioSegment
@@ -17,6 +21,247 @@ except ImportError:
     CouldntDecodeError = Exception
 
 from src.core.exceptions import AudioFormatError
+from src.utils.audio_probe import probe_duration
+
+
+class _ProcessLimiter:
+    """
+    ffmpeg/ffprobe 进程数限制器
+
+    进程级全局上限(默认等于 CPU 核数),避免多个会议并发处理时
+    同时拉起过多解码进程。信号量按事件循环创建。
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """占用一个进程槽位"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        async with self._semaphore:
+            yield
+
+
+_process_limiter = _ProcessLimiter(os.cpu_count() or 4)
+
+
+async def run_process(cmd: List[str], timeout: float) -> Tuple[int, bytes, bytes]:
+    """
+    异步执行外部命令(受全局进程数限制)
+
+    Args:
+        cmd: 命令及参数
+        timeout: 超时时间(秒)
+
+    Returns:
+        Tuple[int, bytes, bytes]: (返回码, stdout, stderr)
+
+    Raises:
+        asyncio.TimeoutError: 执行超时(进程会被终止)
+    """
+    async with _process_limiter.slot():
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except BaseException:
+            # 超时或被取消时确保子进程退出
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        return process.returncode, stdout, stderr
+
+
+def build_wav_header(
+    data_size: int, sample_rate: int, channels: int, sample_width: int
+) -> bytes:
+    """
+    构建标准 44 字节 PCM WAV 文件头
+
+    Args:
+        data_size: PCM 数据字节数
+        sample_rate: 采样率
+        channels: 声道数
+        sample_width: 采样宽度(字节)
+
+    Returns:
+        bytes: WAV 文件头
+    """
+    block_align = channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+        b"data",
+        data_size,
+    )
+
+
+class PCMWaveBuffer:
+    """
+    内存映射的 PCM WAV 缓冲区
+
+    解析 RIFF 头定位 data 块后将整个文件映射到内存,按采样偏移切片并
+    重新封装 WAV 头,无需启动 ffmpeg。适用于 convert_format 产出的
+    16kHz 单声道 16-bit WAV,同一文件可多次切片而只解码一次。
+
+    Usage:
+        with PCMWaveBuffer(path) as buffer:
+            sample = buffer.slice(3.0, 7.5)
+    """
+
+    def __init__(self, audio_path: str):
+        """
+        打开并映射 WAV 文件
+
+        Args:
+            audio_path: WAV 文件路径
+
+        Raises:
+            AudioFormatError: 不是可直接切片的 PCM WAV 文件
+        """
+        self.audio_path = str(audio_path)
+        self._file = open(self.audio_path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError) as e:
+            self._file.close()
+            raise AudioFormatError(
+                f"无法映射音频文件: {e}", details={"path": self.audio_path}
+            )
+
+        try:
+            self._parse_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_header(self) -> None:
+        """解析 RIFF 块,定位 fmt 与 data 块"""
+        buf = self._mmap
+        if len(buf) < 12 or buf[0:4] != b"RIFF" or buf[8:12] != b"WAVE":
+            raise AudioFormatError("不是 RIFF/WAVE 文件", details={"path": self.audio_path})
+
+        fmt = None
+        pos = 12
+        while pos + 8 <= len(buf):
+            chunk_id = bytes(buf[pos : pos + 4])
+            chunk_size = struct.unpack_from("<I", buf, pos + 4)[0]
+            body = pos + 8
+            if chunk_id == b"fmt ":
+                fmt = struct.unpack_from("<HHIIHH", buf, body)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    break
+                # 流式写出的 WAV 可能未回填 data 大小,以文件实际长度为准
+                self.data_offset = body
+                self.data_size = min(chunk_size, len(buf) - body)
+                audio_format, channels, sample_rate, _, block_align, bits = fmt
+                # 0xFFFE = WAVE_FORMAT_EXTENSIBLE(ffmpeg 对部分输入会写出该格式)
+                if audio_format not in (1, 0xFFFE) or bits % 8 != 0 or not block_align:
+                    raise AudioFormatError(
+                        f"不支持的 WAV 编码: format={audio_format}, bits={bits}",
+                        details={"path": self.audio_path},
+                    )
+                self.channels = channels
+                self.sample_rate = sample_rate
+                self.sample_width = bits // 8
+                self.block_align = block_align
+                return
+            pos = body + chunk_size + (chunk_size & 1)  # 块按偶数字节对齐
+
+        raise AudioFormatError("WAV 文件缺少 fmt/data 块", details={"path": self.audio_path})
+
+    @property
+    def frame_count(self) -> int:
+        """采样帧数"""
+        return self.data_size // self.block_align
+
+    @property
+    def duration(self) -> float:
+        """时长(秒)"""
+        return self.frame_count / self.sample_rate if self.sample_rate else 0.0
+
+    def matches_format(self, sample_rate: int, channels: int, sample_width: int) -> bool:
+        """
+        是否为指定的 PCM 格式
+
+        Args:
+            sample_rate: 采样率
+            channels: 声道数
+            sample_width: 采样宽度(字节)
+        """
+        return (
+            self.sample_rate == sample_rate
+            and self.channels == channels
+            and self.sample_width == sample_width
+        )
+
+    def pcm_view(self, start_time: float, end_time: float) -> memoryview:
+        """
+        获取时间区间内 PCM 数据的零拷贝视图
+
+        Args:
+            start_time: 开始时间(秒)
+            end_time: 结束时间(秒)
+
+        Returns:
+            memoryview: PCM 数据视图(调用方需在 close 前释放)
+        """
+        start_frame = min(max(int(round(start_time * self.sample_rate)), 0), self.frame_count)
+        end_frame = min(max(int(round(end_time * self.sample_rate)), start_frame), self.frame_count)
+        start = self.data_offset + start_frame * self.block_align
+        end = self.data_offset + end_frame * self.block_align
+        return memoryview(self._mmap)[start:end]
+
+    def slice(self, start_time: float, end_time: float) -> bytes:
+        """
+        提取时间区间并封装为 WAV
+
+        Args:
+            start_time: 开始时间(秒)
+            end_time: 结束时间(秒)
+
+        Returns:
+            bytes: WAV 格式的音频片段
+        """
+        with self.pcm_view(start_time, end_time) as pcm:
+            header = build_wav_header(
+                len(pcm), self.sample_rate, self.channels, self.sample_width
+            )
+            return header + pcm
+
+    def close(self) -> None:
+        """释放内存映射和文件句柄"""
+        try:
+            self._mmap.close()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "PCMWaveBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
 
 class AudioProcessor:
@@ -45,6 +290,11 @@ class AudioProcessor:
         Raises:
             AudioFormatError: 音频格式错误
         """
+        # 快速路径: 已是目标格式的 WAV 直接按采样偏移切片,无需 ffmpeg
+        sample = self._slice_target_wav(audio_path, start_time, end_time)
+        if sample is not None:
+            return sample
+
         try:
             # 确保路径是字符串格式
             audio_path_str = str(Path(audio_path))
@@ -75,16 +325,11 @@ class AudioProcessor:
                 ]
                 
                 # 执行 ffmpeg
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
+                returncode, _, stderr = await run_process(cmd, timeout=30)
                 
-                if result.returncode != 0:
+                if returncode != 0:
                     raise AudioFormatError(
-                        f"ffmpeg 转换失败: {result.stderr}",
+                        f"ffmpeg 转换失败: {stderr.decode(errors='replace')}",
                         details={"path": audio_path, "start": start_time, "end": end_time},
                     )
                 
@@ -103,7 +348,7 @@ class AudioProcessor:
                 except:
                     pass
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             raise AudioFormatError(
                 f"ffmpeg 转换超时",
                 details={"path": audio_path, "start": start_time, "end": end_time},
@@ -116,6 +361,44 @@ class AudioProcessor:
                 details={"path": audio_path, "start": start_time, "end": end_time, "error": str(e)},
             )
 
+    def open_pcm_buffer(self, audio_path: str) -> Optional[PCMWaveBuffer]:
+        """
+        以内存映射方式打开目标格式(16kHz/mono/16-bit)的 WAV 文件
+
+        Args:
+            audio_path: 音频文件路径
+
+        Returns:
+            Optional[PCMWaveBuffer]: 缓冲区;文件不是目标格式 WAV 时返回 None
+        """
+        if Path(audio_path).suffix.lower() != ".wav" or not os.path.isfile(audio_path):
+            return None
+        try:
+            buffer = PCMWaveBuffer(audio_path)
+        except (AudioFormatError, OSError):
+            return None
+        if not buffer.matches_format(
+            self.target_sample_rate, self.target_channels, self.target_sample_width
+        ):
+            buffer.close()
+            return None
+        return buffer
+
+    def _slice_target_wav(
+        self, audio_path: str, start_time: float, end_time: float
+    ) -> Optional[bytes]:
+        """
+        从目标格式 WAV 中直接切片
+
+        Returns:
+            Optional[bytes]: WAV 片段;不适用时返回 None
+        """
+        buffer = self.open_pcm_buffer(audio_path)
+        if buffer is None:
+            return None
+        with buffer:
+            return buffer.slice(start_time, end_time)
+
     async def convert_format(
         self, audio_path: str, output_path: Optional[str] = None
     ) -> str:
@@ -158,22 +441,17 @@ class AudioProcessor:
             ]
             
             # 执行 ffmpeg
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            returncode, _, stderr = await run_process(cmd, timeout=60)
             
-            if result.returncode != 0:
+            if returncode != 0:
                 raise AudioFormatError(
-                    f"ffmpeg 转换失败: {result.stderr}",
+                    f"ffmpeg 转换失败: {stderr.decode(errors='replace')}",
                     details={"path": audio_path},
                 )
             
             return output_path
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             raise AudioFormatError(
                 f"ffmpeg 转换超时",
                 details={"path": audio_path},
@@ -192,6 +470,9 @@ class AudioProcessor:
         """
         拼接多个音频文件
 
+        每个输入由 ffmpeg 解码为 16kHz/mono/16-bit PCM 流,按块写入同一个
+        WAV 文件,内存占用与音频总时长无关。
+
         Args:
             audio_paths: 音频文件路径列表(按顺序)
             output_path: 输出文件路径,如果为 None 则使用临时文件
@@ -205,64 +486,120 @@ class AudioProcessor:
         if not audio_paths:
             raise AudioFormatError("音频文件列表为空")
 
+        # 确定输出路径
+        created_output = output_path is None
+        if output_path is None:
+            temp_file = tempfile.NamedTemporaryFile(
+                suffix=".wav", delete=False, mode="wb"
+            )
+            output_path = temp_file.name
+            temp_file.close()
+
+        bytes_per_second = (
+            self.target_sample_rate * self.target_channels * self.target_sample_width
+        )
+
         try:
-            # 加载并拼接音频
-            combined = None
-            offsets = [0.0]  # 第一个音频的偏移为 0
+            offsets = []
+            total_bytes = 0
 
-            for audio_path in audio_paths:
-                # 确保路径是字符串格式
-                audio_path_str = str(Path(audio_path))
-                
-                # 加载音频 - 明确指定格式以避免 codec_type 错误
-                file_ext = Path(audio_path).suffix.lower().lstrip('.')
-                if file_ext in ['ogg', 'oga']:
-                    audio = PydubAudioSegment.from_ogg(audio_path_str)
-                elif file_ext in ['mp3']:
-                    audio = PydubAudioSegment.from_mp3(audio_path_str)
-                elif file_ext in ['wav']:
-                    audio = PydubAudioSegment.from_wav(audio_path_str)
-                elif file_ext in ['m4a', 'mp4']:
-                    audio = PydubAudioSegment.from_file(audio_path_str, format='m4a')
-                else:
-                    # 对于其他格式，使用通用方法
-                    audio = PydubAudioSegment.from_file(audio_path_str)
-                
-                audio = self._convert_to_target_format(audio)
+            with open(output_path, "wb") as output:
+                # 先写占位头,全部数据写完后回填实际大小
+                output.write(self._build_target_wav_header(0))
 
-                if combined is None:
-                    combined = audio
-                else:
+                for audio_path in audio_paths:
                     # 记录当前偏移(秒)
-                    current_offset = len(combined) / 1000.0
-                    offsets.append(current_offset)
-                    # 拼接
-                    combined += audio
+                    offsets.append(total_bytes / bytes_per_second)
+                    total_bytes += await self._decode_to_pcm(audio_path, output)
 
-            # 确定输出路径
-            if output_path is None:
-                temp_file = tempfile.NamedTemporaryFile(
-                    suffix=".wav", delete=False, mode="wb"
-                )
-                output_path = temp_file.name
-                temp_file.close()
+                output.seek(0)
+                output.write(self._build_target_wav_header(total_bytes))
 
-            # 导出
-            combined.export(output_path, format="wav")
             return output_path, offsets
 
-        except CouldntDecodeError as e:
-            raise AudioFormatError(
-                f"无法解码音频文件",
-                details={"error": str(e)},
-            )
         except Exception as e:
+            if created_output and os.path.exists(output_path):
+                os.remove(output_path)
+            if isinstance(e, AudioFormatError):
+                raise
             raise AudioFormatError(
                 f"拼接音频失败: {e}",
                 details={"error": str(e)},
             )
 
-    def get_duration(self, audio_path: str) -> float:
+    def _build_target_wav_header(self, data_size: int) -> bytes:
+        """构建目标格式(16kHz/mono/16-bit)的 WAV 文件头"""
+        return build_wav_header(
+            data_size,
+            self.target_sample_rate,
+            self.target_channels,
+            self.target_sample_width,
+        )
+
+    async def _decode_to_pcm(
+        self, audio_path: str, output, chunk_size: int = 1024 * 1024
+    ) -> int:
+        """
+        使用 ffmpeg 将音频解码为目标格式的裸 PCM 并分块写入 output
+
+        Args:
+            audio_path: 输入音频文件路径
+            output: 可写的二进制文件对象
+            chunk_size: 每次读取的字节数
+
+        Returns:
+            int: 写入的 PCM 字节数(按帧对齐)
+
+        Raises:
+            AudioFormatError: 解码失败
+        """
+        cmd = [
+            'ffmpeg',
+            '-v', 'error',
+            '-i', str(Path(audio_path)),  # 输入文件
+            '-f', 's16le',  # 裸 PCM
+            '-acodec', 'pcm_s16le',
+            '-ar', str(self.target_sample_rate),  # 采样率 16kHz
+            '-ac', str(self.target_channels),  # 单声道
+            'pipe:1',
+        ]
+
+        written = 0
+        async with _process_limiter.slot():
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                while True:
+                    chunk = await process.stdout.read(chunk_size)
+                    if not chunk:
+                        break
+                    output.write(chunk)
+                    written += len(chunk)
+                stderr = await process.stderr.read()
+                returncode = await process.wait()
+            finally:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+
+        if returncode != 0:
+            raise AudioFormatError(
+                f"无法解码音频文件: {stderr.decode(errors='replace')}",
+                details={"path": audio_path},
+            )
+
+        # 保证每个片段按帧对齐,后续偏移计算才准确
+        frame_size = self.target_channels * self.target_sample_width
+        remainder = written % frame_size
+        if remainder:
+            output.write(b"\x00" * (frame_size - remainder))
+            written += frame_size - remainder
+        return written
+
+    async def get_duration(self, audio_path: str) -> float:
         """
         获取音频时长
 
@@ -275,11 +612,16 @@ class AudioProcessor:
         Raises:
             AudioFormatError: 音频格式错误
         """
+        # 优先从容器头部读取,避免启动 ffprobe
+        duration = probe_duration(audio_path)
+        if duration is not None:
+            return duration
+
         try:
             # 确保路径是字符串格式
             audio_path_str = str(Path(audio_path))
             
-            # 使用 ffprobe 获取音频时长
+            # 头部无法确定时长时回退到 ffprobe
             cmd = [
                 'ffprobe',
                 '-v', 'error',
@@ -288,26 +630,21 @@ class AudioProcessor:
                 audio_path_str
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            returncode, stdout, stderr = await run_process(cmd, timeout=10)
             
-            if result.returncode != 0:
+            if returncode != 0:
                 raise AudioFormatError(
-                    f"ffprobe 获取时长失败: {result.stderr}",
+                    f"ffprobe 获取时长失败: {stderr.decode(errors='replace')}",
                     details={"path": audio_path},
                 )
             
             # 解析时长
-            duration_str = result.stdout.strip()
+            duration_str = stdout.decode().strip()
             duration = float(duration_str)
             
             return duration
             
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             raise AudioFormatError(
                 f"ffprobe 获取时长超时",
                 details={"path": audio_path},
@@ -317,36 +654,14 @@ class AudioProcessor:
                 f"无法解析音频时长: {e}",
                 details={"path": audio_path, "error": str(e)},
             )
+        except AudioFormatError:
+            raise
         except Exception as e:
             raise AudioFormatError(
                 f"获取音频时长失败: {e}",
                 details={"path": str(audio_path), "error": str(e)},
             )
 
-    def _convert_to_target_format(self, audio: PydubAudioSegment) -> PydubAudioSegment:
-        """
-        转换音频为目标格式
-
-        Args:
-            audio: 输入音频
-
-        Returns:
-            PydubAudioSegment: 转换后的音频
-        """
-        # 设置采样率
-        if audio.frame_rate != self.target_sample_rate:
-            audio = audio.set_frame_rate(self.target_sample_rate)
-
-        # 设置声道数
-        if audio.channels != self.target_channels:
-            audio = audio.set_channels(self.target_channels)
-
-        # 设置采样宽度
-        if audio.sample_width != self.target_sample_width:
-            audio = audio.set_sample_width(self.target_sample_width)
-
-        return audio
-
     def validate_audio_format(self, audio_path: str) -> bool:
         """
         验证音频格式是否符合要求
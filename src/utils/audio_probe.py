@@ -0,0 +1,264 @@
+"""Pure-Python audio duration probing from container headers."""
+
+import logging
+import os
+import struct
+from typing import BinaryIO, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Ogg 尾部扫描窗口(最后一页最大约 64KB)
+_OGG_TAIL_SIZE = 65536 + 27 + 255
+
+# MPEG 音频帧头表
+_MP3_BITRATES = {
+    # (version_bits, layer_bits) -> kbps 表
+    (3, 1): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],  # MPEG1 L3
+    (3, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],  # MPEG1 L2
+    (3, 3): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],  # MPEG1 L1
+}
+_MP3_BITRATES_V2_L1 = [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256]
+_MP3_BITRATES_V2_L23 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG1
+    2: [22050, 24000, 16000],  # MPEG2
+    0: [11025, 12000, 8000],  # MPEG2.5
+}
+
+
+def probe_duration(audio_path: str) -> Optional[float]:
+    """
+    从容器头部读取音频时长(不启动子进程)
+
+    支持 WAV(RIFF 块大小)、OGG(末页 granule position)、
+    MP3(Xing/VBRI 帧数或 CBR 码率)和 M4A/MP4(mvhd 原子)。
+
+    Args:
+        audio_path: 音频文件路径
+
+    Returns:
+        Optional[float]: 时长(秒),无法从头部确定时返回 None
+    """
+    try:
+        with open(audio_path, "rb") as f:
+            head = f.read(12)
+            f.seek(0)
+            parser = _select_parser(head, os.path.splitext(audio_path)[1].lower())
+            if parser is None:
+                return None
+            file_size = os.fstat(f.fileno()).st_size
+            duration = parser(f, file_size)
+    except (OSError, struct.error, ValueError) as e:
+        logger.debug(f"Header probe failed for {audio_path}: {e}")
+        return None
+
+    if duration is None or duration <= 0:
+        return None
+    return duration
+
+
+def _select_parser(
+    head: bytes, suffix: str
+) -> Optional[Callable[[BinaryIO, int], Optional[float]]]:
+    """根据文件魔数(其次是扩展名)选择解析器"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return _probe_wav
+    if head[:4] == b"OggS":
+        return _probe_ogg
+    if head[4:8] == b"ftyp":
+        return _probe_mp4
+    if head[:3] == b"ID3" or suffix == ".mp3":
+        return _probe_mp3
+    return None
+
+
+def _probe_wav(f: BinaryIO, file_size: int) -> Optional[float]:
+    """WAV: data 块字节数 / fmt 块中的 byte rate"""
+    f.seek(12)
+    byte_rate = None
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+        body_offset = f.tell()
+
+        if chunk_id == b"fmt ":
+            fmt = f.read(16)
+            if len(fmt) < 16:
+                return None
+            byte_rate = struct.unpack("<I", fmt[8:12])[0]
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # 流式写入的 WAV 可能未回填大小,按实际文件大小截断
+            data_size = min(chunk_size, file_size - body_offset)
+            return data_size / byte_rate
+
+        f.seek(body_offset + chunk_size + (chunk_size & 1))
+
+
+def _probe_ogg(f: BinaryIO, file_size: int) -> Optional[float]:
+    """OGG: 末页 granule position / 采样率(Vorbis 或 Opus)"""
+    first_page = f.read(27)
+    if len(first_page) < 27:
+        return None
+    serial = first_page[14:18]
+    segment_count = first_page[26]
+    f.seek(27 + segment_count)
+    ident = f.read(19)
+
+    pre_skip = 0
+    if ident.startswith(b"\x01vorbis") and len(ident) >= 16:
+        sample_rate = struct.unpack("<I", ident[12:16])[0]
+    elif ident.startswith(b"OpusHead") and len(ident) >= 12:
+        # Opus 的 granule position 固定以 48kHz 计数
+        sample_rate = 48000
+        pre_skip = struct.unpack("<H", ident[10:12])[0]
+    else:
+        return None
+    if not sample_rate:
+        return None
+
+    tail_start = max(0, file_size - _OGG_TAIL_SIZE)
+    f.seek(tail_start)
+    tail = f.read()
+
+    # 从后往前找属于同一逻辑流的最后一页
+    pos = tail.rfind(b"OggS")
+    while pos != -1:
+        page = tail[pos:pos + 27]
+        if len(page) == 27 and page[14:18] == serial:
+            granule = struct.unpack("<q", page[6:14])[0]
+            if granule >= 0:
+                return max(0, granule - pre_skip) / sample_rate
+        pos = tail.rfind(b"OggS", 0, pos)
+    return None
+
+
+def _parse_mp3_frame_header(header: bytes) -> Optional[Dict[str, int]]:
+    """解析 MPEG 音频帧头,无效时返回 None"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    if version == 3:
+        bitrate = _MP3_BITRATES[(version, layer)][bitrate_index]
+    elif layer == 3:
+        bitrate = _MP3_BITRATES_V2_L1[bitrate_index]
+    else:
+        bitrate = _MP3_BITRATES_V2_L23[bitrate_index]
+
+    if layer == 3:
+        samples_per_frame = 384
+    elif layer == 1 and version != 3:
+        samples_per_frame = 576
+    else:
+        samples_per_frame = 1152
+
+    return {
+        "version": version,
+        "bitrate": bitrate * 1000,
+        "sample_rate": _MP3_SAMPLE_RATES[version][rate_index],
+        "samples_per_frame": samples_per_frame,
+        "mono": (header[3] >> 6) == 3,
+    }
+
+
+def _probe_mp3(f: BinaryIO, file_size: int) -> Optional[float]:
+    """MP3: Xing/Info 或 VBRI 头中的帧数,否则按首帧码率估算(CBR)"""
+    audio_start = 0
+    id3 = f.read(10)
+    if id3[:3] == b"ID3" and len(id3) == 10:
+        # ID3v2 大小为 synchsafe 整数
+        size = (id3[6] << 21) | (id3[7] << 14) | (id3[8] << 7) | id3[9]
+        audio_start = 10 + size + (10 if id3[5] & 0x10 else 0)
+
+    f.seek(audio_start)
+    buffer = f.read(65536)
+    frame_offset = -1
+    frame = None
+    for i in range(len(buffer) - 3):
+        if buffer[i] == 0xFF:
+            frame = _parse_mp3_frame_header(buffer[i:i + 4])
+            if frame is not None:
+                frame_offset = i
+                break
+    if frame is None:
+        return None
+
+    frame_data = buffer[frame_offset:frame_offset + 200]
+
+    # Xing/Info 头位于 side information 之后
+    if frame["version"] == 3:
+        side_info = 17 if frame["mono"] else 32
+    else:
+        side_info = 9 if frame["mono"] else 17
+    xing_pos = 4 + side_info
+    tag = frame_data[xing_pos:xing_pos + 4]
+    if tag in (b"Xing", b"Info") and len(frame_data) >= xing_pos + 12:
+        flags = struct.unpack(">I", frame_data[xing_pos + 4:xing_pos + 8])[0]
+        if flags & 0x01:
+            frames = struct.unpack(">I", frame_data[xing_pos + 8:xing_pos + 12])[0]
+            return frames * frame["samples_per_frame"] / frame["sample_rate"]
+
+    # VBRI 头固定位于帧头后 32 字节
+    if frame_data[36:40] == b"VBRI" and len(frame_data) >= 54:
+        frames = struct.unpack(">I", frame_data[50:54])[0]
+        return frames * frame["samples_per_frame"] / frame["sample_rate"]
+
+    audio_size = file_size - audio_start - frame_offset
+    f.seek(max(0, file_size - 128))
+    if f.read(3) == b"TAG":
+        audio_size -= 128
+    return audio_size * 8 / frame["bitrate"]
+
+
+def _probe_mp4(f: BinaryIO, file_size: int) -> Optional[float]:
+    """M4A/MP4: moov/mvhd 中的 duration / timescale"""
+    moov = _find_atom(f, 0, file_size, b"moov")
+    if moov is None:
+        return None
+    mvhd = _find_atom(f, moov[0], moov[1], b"mvhd")
+    if mvhd is None:
+        return None
+
+    f.seek(mvhd[0])
+    version = f.read(4)[0]
+    if version == 1:
+        data = f.read(28)
+        timescale, duration = struct.unpack(">I Q", data[16:28])
+    else:
+        data = f.read(16)
+        timescale, duration = struct.unpack(">II", data[8:16])
+    if not timescale:
+        return None
+    return duration / timescale
+
+
+def _find_atom(f: BinaryIO, start: int, end: int, name: bytes) -> Optional[tuple]:
+    """在 [start, end) 内查找原子,返回 (内容起点, 内容终点)"""
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        size, atom_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return None
+        if atom_type == name:
+            return offset + header_size, min(offset + size, end)
+        offset += size
+    return None
@@ -1,9 +1,29 @@
 """Cost tracking and estimation utilities."""
 
+import logging
 from datetime import datetime
 from typing import Dict, Optional
 
 from src.config.models import PricingConfig
+from src.utils.metrics import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_text_tokens(text: str) -> int:
+    """
+    粗略估算文本的 Token 数
+
+    中日韩字符约 1 字 1 Token,其他字符约 4 个字符 1 Token。
+
+    Args:
+        text: 文本
+
+    Returns:
+        int: 估算的 Token 数
+    """
+    cjk = sum(1 for ch in text if ch >= "\u2e80")
+    return cjk + (len(text) - cjk + 3) // 4
 
 
 class CostTracker:
@@ -177,3 +197,49 @@ class CostTracker:
             int: 估算的 Token 数
         """
         return int(duration * self.pricing.estimated_tokens_per_second)
+
+    def record_prompt_compaction(
+        self,
+        task_id: str,
+        original_tokens: int,
+        compacted_tokens: int,
+        model: str = "gemini-flash",
+    ) -> Dict[str, float]:
+        """
+        记录转写压缩前后的提示词 Token 估算
+
+        Args:
+            task_id: 任务 ID
+            original_tokens: 压缩前估算 Token 数
+            compacted_tokens: 压缩后估算 Token 数
+            model: LLM 模型 (gemini-flash/gemini-pro)
+
+        Returns:
+            Dict[str, float]: {
+                "original_tokens": 压缩前 Token 数,
+                "compacted_tokens": 压缩后 Token 数,
+                "saved_tokens": 节省的 Token 数,
+                "saved_cost": 节省的成本(元)
+            }
+        """
+        saved_tokens = max(original_tokens - compacted_tokens, 0)
+        metrics = get_metrics_collector()
+        metrics.increment_counter("llm_prompt_tokens_original_total", original_tokens)
+        metrics.increment_counter("llm_prompt_tokens_compacted_total", compacted_tokens)
+        if original_tokens:
+            metrics.observe_histogram(
+                "llm_prompt_compaction_ratio", compacted_tokens / original_tokens
+            )
+
+        summary = {
+            "original_tokens": original_tokens,
+            "compacted_tokens": compacted_tokens,
+            "saved_tokens": saved_tokens,
+            "saved_cost": self.calculate_llm_cost(saved_tokens, model),
+        }
+
+        logger.info(
+            f"Task {task_id}: transcript compacted ~{original_tokens} -> ~{compacted_tokens} "
+            f"prompt tokens (saved ¥{summary['saved_cost']:.4f})"
+        )
+        return summary
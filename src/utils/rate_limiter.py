@@ -0,0 +1,62 @@
+"""Asyncio rate limiting utilities."""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """
+    异步速率限制器
+
+    按固定间隔放行调用(rate 次/秒),并发调用者按到达顺序依次获得时间片。
+    同步原语按事件循环懒加载,可在每个任务一个事件循环的场景下复用。
+    """
+
+    def __init__(self, rate: Optional[float] = None):
+        """
+        初始化速率限制器
+
+        Args:
+            rate: 每秒允许的调用次数,None 或 <=0 表示不限制
+        """
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_start = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def per_minute(cls, rate: Optional[float]) -> "AsyncRateLimiter":
+        """
+        按每分钟调用次数创建限制器
+
+        Args:
+            rate: 每分钟允许的调用次数
+
+        Returns:
+            AsyncRateLimiter: 速率限制器
+        """
+        return cls(rate / 60.0 if rate else None)
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用限速"""
+        return self.interval > 0
+
+    async def acquire(self) -> None:
+        """等待直到允许下一次调用"""
+        if not self.enabled:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+
+        if delay > 0:
+            await asyncio.sleep(delay)
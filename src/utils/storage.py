@@ -1,15 +1,23 @@
 """Storage client for TOS (Tencent Object Storage) operations."""
 
 import asyncio
+import logging
+import os
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional
 
 import tos
+from tos.models2 import UploadedPart
 
 from src.core.exceptions import DownloadError, StorageError, UploadError
 
+logger = logging.getLogger(__name__)
+
+# 上传进度回调: (已上传字节数, 总字节数)
+ProgressCallback = Callable[[int, int], None]
+
 
 class StorageClient:
     """存储客户端(TOS)"""
@@ -22,6 +30,10 @@ class StorageClient:
         secret_key: str,
         endpoint: Optional[str] = None,
         temp_file_ttl: int = 3600,
+        multipart_threshold: int = 64 * 1024 * 1024,
+        multipart_part_size: int = 16 * 1024 * 1024,
+        multipart_concurrency: int = 4,
+        part_max_retries: int = 3,
     ):
         """
         初始化存储客户端
@@ -33,6 +45,10 @@ class StorageClient:
             secret_key: Secret Key
             endpoint: 自定义端点
             temp_file_ttl: 临时文件 TTL(秒)
+            multipart_threshold: 超过该大小(字节)使用分片上传
+            multipart_part_size: 分片大小(字节),TOS 要求除最后一片外不小于 5MB
+            multipart_concurrency: 分片并发上传数
+            part_max_retries: 单个分片最大重试次数
         """
         self.bucket = bucket
         self.region = region
@@ -40,6 +56,10 @@ class StorageClient:
         self.secret_key = secret_key
         self.endpoint = endpoint or f"tos-{region}.volces.com"
         self.temp_file_ttl = temp_file_ttl
+        self.multipart_threshold = multipart_threshold
+        self.multipart_part_size = multipart_part_size
+        self.multipart_concurrency = max(1, multipart_concurrency)
+        self.part_max_retries = max(1, part_max_retries)
         self._temp_files = set()  # 跟踪临时文件
         
         # 初始化 TOS 客户端
@@ -51,15 +71,22 @@ class StorageClient:
         )
 
     async def upload_file(
-        self, local_path: str, object_key: str, content_type: Optional[str] = None
+        self,
+        local_path: str,
+        object_key: str,
+        content_type: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> str:
         """
         上传文件到 TOS
 
+        大于 multipart_threshold 的文件使用分片并发上传。
+
         Args:
             local_path: 本地文件路径
             object_key: 对象键(存储路径)
             content_type: 内容类型
+            progress_callback: 上传进度回调 (已上传字节数, 总字节数)
 
         Returns:
             str: 对象 URL
@@ -75,17 +102,25 @@ class StorageClient:
                     details={"path": local_path},
                 )
 
-            # 在线程池中执行同步上传操作
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.client.put_object_from_file(
-                    bucket=self.bucket,
-                    key=object_key,
-                    file_path=local_path,
-                    content_type=content_type,
-                ),
-            )
+            file_size = os.path.getsize(local_path)
+            if file_size >= self.multipart_threshold:
+                await self._multipart_upload(
+                    local_path, object_key, file_size, content_type, progress_callback
+                )
+            else:
+                # 在线程池中执行同步上传操作
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(
+                    None,
+                    lambda: self.client.put_object_from_file(
+                        bucket=self.bucket,
+                        key=object_key,
+                        file_path=local_path,
+                        content_type=content_type,
+                    ),
+                )
+                if progress_callback:
+                    progress_callback(file_size, file_size)
 
             # 返回对象 URL
             url = f"https://{self.bucket}.{self.endpoint}/{object_key}"
@@ -97,6 +132,129 @@ class StorageClient:
                 details={"local_path": local_path, "object_key": object_key, "error": str(e)},
             )
 
+    async def _multipart_upload(
+        self,
+        local_path: str,
+        object_key: str,
+        file_size: int,
+        content_type: Optional[str],
+        progress_callback: Optional[ProgressCallback],
+    ) -> None:
+        """
+        分片并发上传
+
+        分片在线程池中按 multipart_concurrency 并发上传,每个分片独立重试;
+        任一分片最终失败时取消整个分片上传,避免残留未完成的分片。
+
+        Args:
+            local_path: 本地文件路径
+            object_key: 对象键
+            file_size: 文件大小(字节)
+            content_type: 内容类型
+            progress_callback: 上传进度回调
+
+        Raises:
+            Exception: 分片上传或合并失败
+        """
+        loop = asyncio.get_event_loop()
+        created = await loop.run_in_executor(
+            None,
+            lambda: self.client.create_multipart_upload(
+                bucket=self.bucket, key=object_key, content_type=content_type
+            ),
+        )
+        upload_id = created.upload_id
+
+        part_size = self.multipart_part_size
+        offsets = list(range(0, file_size, part_size))
+        semaphore = asyncio.Semaphore(self.multipart_concurrency)
+        uploaded_bytes = 0
+
+        logger.info(
+            f"Multipart upload {object_key}: {file_size} bytes in {len(offsets)} parts "
+            f"(concurrency={self.multipart_concurrency})"
+        )
+
+        async def upload_one(part_number: int, offset: int) -> UploadedPart:
+            nonlocal uploaded_bytes
+            length = min(part_size, file_size - offset)
+            async with semaphore:
+                for attempt in range(1, self.part_max_retries + 1):
+                    try:
+                        result = await loop.run_in_executor(
+                            None,
+                            self._upload_part_from_file,
+                            local_path,
+                            object_key,
+                            upload_id,
+                            part_number,
+                            offset,
+                            length,
+                        )
+                        break
+                    except Exception as e:
+                        if attempt >= self.part_max_retries:
+                            raise
+                        logger.warning(
+                            f"Part {part_number} of {object_key} failed "
+                            f"(attempt {attempt}/{self.part_max_retries}): {e}"
+                        )
+                        await asyncio.sleep(2 ** (attempt - 1))
+
+            uploaded_bytes += length
+            if progress_callback:
+                progress_callback(uploaded_bytes, file_size)
+            return UploadedPart(part_number, result.etag)
+
+        tasks = [
+            asyncio.ensure_future(upload_one(i + 1, offset)) for i, offset in enumerate(offsets)
+        ]
+        try:
+            parts: List[UploadedPart] = await asyncio.gather(*tasks)
+            await loop.run_in_executor(
+                None,
+                lambda: self.client.complete_multipart_upload(
+                    bucket=self.bucket, key=object_key, upload_id=upload_id, parts=parts
+                ),
+            )
+        except BaseException:
+            # 停止尚未完成的分片,再取消整个分片上传
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await loop.run_in_executor(
+                    None,
+                    lambda: self.client.abort_multipart_upload(
+                        bucket=self.bucket, key=object_key, upload_id=upload_id
+                    ),
+                )
+            except Exception as abort_error:
+                logger.warning(f"Failed to abort multipart upload {upload_id}: {abort_error}")
+            raise
+
+    def _upload_part_from_file(
+        self,
+        local_path: str,
+        object_key: str,
+        upload_id: str,
+        part_number: int,
+        offset: int,
+        length: int,
+    ):
+        """读取文件的指定区间并上传为一个分片(在线程池中执行)"""
+        with open(local_path, "rb") as f:
+            f.seek(offset)
+            content = f.read(length)
+        return self.client.upload_part(
+            bucket=self.bucket,
+            key=object_key,
+            upload_id=upload_id,
+            part_number=part_number,
+            content=content,
+            content_length=length,
+        )
+
     async def download_file(self, object_key: str, local_path: Optional[str] = None) -> str:
         """
         从 TOS 下载文件
@@ -0,0 +1,306 @@
+"""Task state change events over Redis pub/sub."""
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# 任务状态变化事件频道
+TASK_EVENTS_CHANNEL = "task_events"
+# 每个用户最近事件的 Redis Stream(用于 SSE 断线后按 Last-Event-ID 补发)
+USER_EVENTS_STREAM = "user_events:{user_id}"
+USER_EVENTS_MAXLEN = 500
+USER_EVENTS_TTL_SECONDS = 24 * 3600
+
+_publisher: Optional[redis.Redis] = None
+
+
+def _redis_url() -> str:
+    return os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def stream_id_key(event_id: str) -> Tuple[int, int]:
+    """把 Redis Stream 条目 ID("毫秒-序号")转换为可比较的元组"""
+    millis, _, seq = event_id.partition("-")
+    return int(millis), int(seq or 0)
+
+
+def publish_task_event(task_id: str, event: Dict[str, Any]) -> None:
+    """
+    发布任务状态变化事件(失败只记录警告,不影响主流程)
+
+    事件包含 user_id 时同时追加到该用户的事件流,发布的消息带上流条目 ID
+    (event_id),供用户级 SSE 作为事件 ID 和断线补发的游标。
+
+    Args:
+        task_id: 任务 ID
+        event: 事件数据(type 为 task 或 artifact;state/progress/updated_at 等)
+    """
+    global _publisher
+    try:
+        if _publisher is None:
+            _publisher = redis.from_url(
+                _redis_url(),
+                decode_responses=True,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+        payload = {"type": "task", "task_id": task_id, **event}
+        user_id = payload.get("user_id")
+        if user_id:
+            stream = USER_EVENTS_STREAM.format(user_id=user_id)
+            payload["event_id"] = _publisher.xadd(
+                stream,
+                {"event": json.dumps(payload, ensure_ascii=False, default=str)},
+                maxlen=USER_EVENTS_MAXLEN,
+                approximate=True,
+            )
+            _publisher.expire(stream, USER_EVENTS_TTL_SECONDS)
+        _publisher.publish(
+            TASK_EVENTS_CHANNEL,
+            json.dumps(payload, ensure_ascii=False, default=str),
+        )
+    except Exception as e:
+        logger.warning(f"Failed to publish task event for {task_id}: {e}")
+
+
+class TaskEventBroadcaster:
+    """
+    任务事件的进程内分发
+
+    每个 API 进程只用一个 Redis 订阅连接监听 TASK_EVENTS_CHANNEL,按 task_id
+    或 user_id 分发给各 SSE 连接的队列。队列中的 None 表示订阅连接曾中断,
+    期间的事件可能丢失,订阅者应重新读取一次当前状态。
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, reconnect_delay: float = 1.0):
+        """
+        初始化分发器
+
+        Args:
+            redis_url: Redis 连接 URL(默认读取 REDIS_URL 环境变量)
+            reconnect_delay: 订阅连接中断后的重连间隔(秒)
+        """
+        self.redis_url = redis_url or _redis_url()
+        self.reconnect_delay = reconnect_delay
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._client: Optional[aioredis.Redis] = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self) -> None:
+        # 监听任务和锁属于创建它们的事件循环
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._start_lock = asyncio.Lock()
+            self._listener = None
+            self._client = None
+            self._pubsub = None
+            self._subscribers = {}
+
+    async def _connect(self) -> None:
+        self._client = aioredis.from_url(self.redis_url, decode_responses=True)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(TASK_EVENTS_CHANNEL)
+
+    async def _disconnect(self) -> None:
+        pubsub, client = self._pubsub, self._client
+        self._pubsub = None
+        self._client = None
+        try:
+            if pubsub is not None:
+                await pubsub.aclose()
+            if client is not None:
+                await client.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing task event subscription: {e}")
+
+    async def _ensure_listening(self) -> None:
+        self._bind_loop()
+        async with self._start_lock:
+            if self._listener is not None and not self._listener.done():
+                return
+            # 首次连接失败直接抛出,由调用方降级
+            try:
+                await self._connect()
+            except Exception:
+                await self._disconnect()
+                raise
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._connect()
+                    # 中断期间的事件已丢失,通知订阅者重新同步
+                    self._broadcast_resync()
+                async for message in self._pubsub.listen():
+                    if message.get("type") == "message":
+                        self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task event subscription lost, reconnecting: {e}")
+                await self._disconnect()
+                await asyncio.sleep(self.reconnect_delay)
+
+    def _dispatch(self, data: str) -> None:
+        try:
+            event = json.loads(data)
+        except ValueError:
+            logger.warning(f"Ignoring malformed task event: {data!r}")
+            return
+        keys = [f"task:{event.get('task_id')}"]
+        if event.get("user_id"):
+            keys.append(f"user:{event['user_id']}")
+        for key in keys:
+            for queue in self._subscribers.get(key, ()):
+                queue.put_nowait(event)
+
+    def _broadcast_resync(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait(None)
+
+    def subscribe(self, task_id: str):
+        """
+        订阅单个任务的事件
+
+        Args:
+            task_id: 任务 ID
+
+        Returns:
+            异步上下文管理器,进入时返回事件队列(事件字典,或表示需要重新同步的 None)
+
+        Raises:
+            redis.exceptions.RedisError: Redis 不可用
+        """
+        return self._subscription(f"task:{task_id}")
+
+    def subscribe_user(self, user_id: str):
+        """
+        订阅用户所有任务和衍生内容的事件
+
+        Args:
+            user_id: 用户 ID
+
+        Returns:
+            异步上下文管理器,进入时返回事件队列(事件字典,或表示需要重新同步的 None)
+
+        Raises:
+            redis.exceptions.RedisError: Redis 不可用
+        """
+        return self._subscription(f"user:{user_id}")
+
+    @asynccontextmanager
+    async def _subscription(self, key: str) -> AsyncIterator[asyncio.Queue]:
+        await self._ensure_listening()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(key, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[key]
+
+    def _stream_client(self) -> aioredis.Redis:
+        # 订阅连接重连期间 _client 为 None,按 Redis 不可用处理
+        if self._client is None:
+            raise redis.exceptions.ConnectionError("Task event connection is reconnecting")
+        return self._client
+
+    async def last_user_event_id(self, user_id: str) -> Optional[str]:
+        """
+        获取用户事件流的最新条目 ID
+
+        Args:
+            user_id: 用户 ID
+
+        Returns:
+            Optional[str]: 最新事件 ID,流为空时返回 None
+
+        Raises:
+            redis.exceptions.RedisError: Redis 不可用或订阅连接正在重连
+        """
+        entries = await self._stream_client().xrevrange(
+            USER_EVENTS_STREAM.format(user_id=user_id), count=1
+        )
+        return entries[0][0] if entries else None
+
+    async def replay_user_events(
+        self, user_id: str, last_event_id: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        读取 last_event_id 之后的用户事件(断线补发)
+
+        Args:
+            user_id: 用户 ID
+            last_event_id: 客户端收到的最后一个事件 ID
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: 按顺序的事件列表;ID 无效或早于
+            保留范围(可能有事件已被裁剪)时返回 None,调用方应改发完整快照
+
+        Raises:
+            redis.exceptions.RedisError: Redis 不可用或订阅连接正在重连
+        """
+        try:
+            cursor = stream_id_key(last_event_id)
+        except ValueError:
+            return None
+
+        client = self._stream_client()
+        stream = USER_EVENTS_STREAM.format(user_id=user_id)
+        oldest = await client.xrange(stream, count=1)
+        if not oldest or stream_id_key(oldest[0][0]) > cursor:
+            return None
+
+        entries = await client.xrange(stream, min=f"({last_event_id}", max="+")
+        events = []
+        for entry_id, fields in entries:
+            event = json.loads(fields["event"])
+            event["event_id"] = entry_id
+            events.append(event)
+        return events
+
+    async def aclose(self) -> None:
+        """停止监听并关闭订阅连接"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        await self._disconnect()
+
+
+# 进程内共享实例
+_broadcaster: Optional[TaskEventBroadcaster] = None
+
+
+def get_task_event_broadcaster() -> TaskEventBroadcaster:
+    """
+    获取进程内共享的任务事件分发器
+
+    Returns:
+        TaskEventBroadcaster: 分发器
+    """
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = TaskEventBroadcaster()
+    return _broadcaster
@@ -0,0 +1,169 @@
+"""Write-through Redis cache for task status payloads."""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# 任务状态缓存键
+TASK_STATUS_KEY = "task_status:{task_id}"
+# 进行中的任务由 worker 在每次状态变化时写入,TTL 只是兜底
+ACTIVE_TTL_SECONDS = 300
+TERMINAL_TTL_SECONDS = 600
+TERMINAL_STATES = ("success", "failed", "partial_success", "cancelled")
+
+# 只有版本不低于缓存中已有版本时才写入,避免较旧的状态覆盖较新的状态
+# (例如 API 回填时读到的旧数据晚于 worker 的写入到达)
+_WRITE_IF_NEWER = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    local ok, data = pcall(cjson.decode, current)
+    if ok and type(data) == 'table' and tonumber(data['version'] or 0) > tonumber(ARGV[2]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return 1
+"""
+
+
+def status_version(updated_at: Optional[datetime]) -> int:
+    """
+    根据任务 updated_at 计算状态版本号(微秒时间戳)
+
+    Args:
+        updated_at: 任务最后更新时间
+
+    Returns:
+        int: 版本号,没有更新时间时为 0
+    """
+    if updated_at is None:
+        return 0
+    return int(updated_at.timestamp() * 1_000_000)
+
+
+class TaskStatusCache:
+    """
+    任务状态缓存(write-through)
+
+    worker 在状态变化提交后直接写入最新状态,状态查询接口几乎总能命中缓存。
+    所有操作共用一个带连接池的客户端;Redis 不可用时只记录警告,调用方
+    降级到数据库。
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        """
+        初始化缓存
+
+        Args:
+            redis_url: Redis 连接 URL(默认读取 REDIS_URL 环境变量)
+        """
+        self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self._client: Optional[redis.Redis] = None
+        self._write_script = None
+
+    @property
+    def client(self) -> redis.Redis:
+        """共享的 Redis 客户端(内部维护连接池,首次使用时创建)"""
+        if self._client is None:
+            self._client = redis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+        return self._client
+
+    def _get_write_script(self):
+        if self._write_script is None:
+            self._write_script = self.client.register_script(_WRITE_IF_NEWER)
+        return self._write_script
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存的任务状态
+
+        Args:
+            task_id: 任务 ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 状态数据,未命中或读取失败时返回 None
+        """
+        try:
+            cached = self.client.get(TASK_STATUS_KEY.format(task_id=task_id))
+        except Exception as e:
+            logger.warning(f"Task status cache read failed for {task_id}: {e}")
+            return None
+        if not cached:
+            return None
+        try:
+            return json.loads(cached)
+        except ValueError as e:
+            logger.warning(f"Failed to decode cached status for {task_id}: {e}")
+            return None
+
+    def write(self, task_id: str, status: Dict[str, Any]) -> bool:
+        """
+        写入任务状态(版本较旧时不覆盖)
+
+        写入失败时尝试删除缓存键,避免后续查询读到过期状态。
+
+        Args:
+            task_id: 任务 ID
+            status: 状态数据,需包含 state 和 version
+
+        Returns:
+            bool: 是否写入(版本较旧被跳过或写入失败时为 False)
+        """
+        key = TASK_STATUS_KEY.format(task_id=task_id)
+        ttl = TERMINAL_TTL_SECONDS if status.get("state") in TERMINAL_STATES else ACTIVE_TTL_SECONDS
+        try:
+            written = self._get_write_script()(
+                keys=[key],
+                args=[
+                    json.dumps(status, ensure_ascii=False, default=str),
+                    status.get("version", 0),
+                    ttl,
+                ],
+            )
+            if not written:
+                logger.debug(f"Skipped stale status write for task {task_id}")
+            return bool(written)
+        except Exception as e:
+            logger.warning(f"Task status cache write failed for {task_id}: {e}")
+            self.delete(task_id)
+            return False
+
+    def delete(self, task_id: str) -> None:
+        """
+        删除缓存的任务状态
+
+        Args:
+            task_id: 任务 ID
+        """
+        try:
+            self.client.delete(TASK_STATUS_KEY.format(task_id=task_id))
+        except Exception as e:
+            logger.warning(f"Failed to clear cache for task {task_id}: {e}")
+
+
+# 进程内共享实例
+_cache: Optional[TaskStatusCache] = None
+
+
+def get_task_status_cache() -> TaskStatusCache:
+    """
+    获取进程内共享的任务状态缓存
+
+    Returns:
+        TaskStatusCache: 任务状态缓存
+    """
+    global _cache
+    if _cache is None:
+        _cache = TaskStatusCache()
+    return _cache
@@ -0,0 +1,136 @@
+"""Tests for the task list projection and keyset pagination."""
+
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.api.routes.tasks import list_tasks
+from src.database.models import Base, Task, TranscriptRecord
+from src.database.repositories import TaskRepository
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_task(db, task_id, created_at, user_id="user_1", audio_duration=None):
+    db.add(Task(
+        task_id=task_id,
+        user_id=user_id,
+        tenant_id="tenant_1",
+        meeting_type="general",
+        audio_files=json.dumps(["a.ogg"]),
+        file_order=json.dumps([0]),
+        audio_duration=audio_duration,
+        state="success",
+        progress=100.0,
+        created_at=created_at,
+        updated_at=created_at,
+    ))
+
+
+async def fetch(db, **kwargs):
+    response = Response()
+    kwargs.setdefault("limit", 100)
+    kwargs.setdefault("offset", 0)
+    tasks = await list_tasks(
+        response,
+        cursor=kwargs.pop("cursor", None),
+        state=None,
+        folder_id=None,
+        include_deleted=False,
+        user_id="user_1",
+        db=db,
+        **kwargs,
+    )
+    return [t.task_id for t in tasks], response.headers.get("X-Next-Cursor"), tasks
+
+
+class TestListTasks:
+    """任务列表"""
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_cover_all_tasks_in_order(self, db):
+        base = datetime(2026, 1, 1, 9, 0, 0)
+        for i in range(5):
+            add_task(db, f"task_{i}", base + timedelta(minutes=i), audio_duration=60.0)
+        # 同一时间创建的任务按 task_id 区分先后
+        add_task(db, "task_5a", base + timedelta(minutes=10))
+        add_task(db, "task_5b", base + timedelta(minutes=10))
+        add_task(db, "other", base + timedelta(minutes=20), user_id="user_2")
+        db.commit()
+
+        pages, cursor = [], None
+        while True:
+            ids, cursor, _ = await fetch(db, limit=3, cursor=cursor)
+            pages.append(ids)
+            if cursor is None:
+                break
+
+        assert pages == [
+            ["task_5b", "task_5a", "task_4"],
+            ["task_3", "task_2", "task_1"],
+            ["task_0"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_duration_comes_from_task_row_without_loading_transcripts(self, db):
+        base = datetime(2026, 1, 1, 9, 0, 0)
+        add_task(db, "task_new", base + timedelta(minutes=1), audio_duration=1800.0)
+        add_task(db, "task_legacy", base)
+        db.add(TranscriptRecord(
+            transcript_id="tr_1",
+            task_id="task_legacy",
+            segments="[" + ",".join(["{}"] * 1000) + "]",
+            full_text="...",
+            duration=900.0,
+            provider="volcano",
+        ))
+        db.commit()
+        db.expunge_all()
+
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        _, _, tasks = await fetch(db)
+
+        assert {t.task_id: t.duration for t in tasks} == {"task_new": 1800.0, "task_legacy": 900.0}
+        assert not any("transcripts.segments" in s for s in statements)
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(self, db):
+        with pytest.raises(HTTPException) as exc:
+            await fetch(db, cursor="not-a-cursor")
+        assert exc.value.status_code == 400
+
+
+class TestDurationWriteBack:
+    """状态更新写入转写时长"""
+
+    def test_update_state_stores_audio_duration(self, db):
+        add_task(db, "task_1", datetime(2026, 1, 1, 9, 0, 0))
+        db.commit()
+
+        @contextmanager
+        def scope():
+            yield db
+            db.commit()
+
+        with patch("src.database.session.session_scope", scope), \
+                patch("src.database.repositories.get_task_status_cache", return_value=MagicMock()), \
+                patch("src.database.repositories.publish_task_event"):
+            TaskRepository(db).update_state("task_1", "transcribing", progress=40.0, audio_duration=1234.5)
+
+        assert db.get(Task, "task_1").audio_duration == 1234.5
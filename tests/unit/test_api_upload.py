@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+单元测试: 文件上传 API
+
+测试内容:
+1. 流式上传(分块写入、哈希、大小限制)
+2. 分片(可续传)上传会话
+"""
+
+import hashlib
+import io
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from src.api.routes import upload
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    """将上传目录重定向到临时目录,并跳过时长探测"""
+    monkeypatch.setattr(upload, "UPLOAD_BASE_DIR", tmp_path)
+    with patch.object(upload.AudioProcessor, "get_duration", new_callable=AsyncMock, return_value=12.0):
+        yield tmp_path
+
+
+class FakeRequest:
+    """模拟流式请求体"""
+
+    def __init__(self, data: bytes, chunk_size: int = 7):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    async def stream(self):
+        for i in range(0, len(self.data), self.chunk_size):
+            yield self.data[i:i + self.chunk_size]
+
+
+class TestStreamingUpload:
+    """流式上传测试"""
+
+    @pytest.mark.asyncio
+    async def test_upload_streams_chunks_and_hashes(self, upload_dir, monkeypatch):
+        monkeypatch.setattr(upload, "CHUNK_SIZE", 4)
+        content = b"RIFF" + b"x" * 37
+        file = UploadFile(file=io.BytesIO(content), filename="meeting.wav")
+        file.read = AsyncMock(wraps=file.read)
+
+        response = await upload.upload_audio(file=file, user_id="user_1")
+
+        assert response.file_size == len(content)
+        assert response.content_hash == hashlib.sha256(content).hexdigest()
+        assert response.duration == 12.0
+        assert response.file_path.startswith(f"{upload_dir}/user_1/".replace("\\", "/"))
+        assert (upload_dir / "user_1" / response.file_path.rsplit("/", 1)[1]).read_bytes() == content
+        # 每次只读取一个块,不会整体读入内存
+        assert all(call.args == (4,) for call in file.read.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_upload_over_limit_aborts_and_cleans_up(self, upload_dir, monkeypatch):
+        monkeypatch.setattr(upload, "CHUNK_SIZE", 4)
+        monkeypatch.setattr(upload, "MAX_FILE_SIZE", 10)
+        file = UploadFile(file=io.BytesIO(b"a" * 11), filename="meeting.mp3")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload.upload_audio(file=file, user_id="user_1")
+
+        assert exc_info.value.status_code == 413
+        assert list((upload_dir / "user_1").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_upload_rejects_unsupported_extension(self):
+        file = UploadFile(file=io.BytesIO(b"data"), filename="notes.txt")
+        with pytest.raises(HTTPException) as exc_info:
+            await upload.upload_audio(file=file, user_id="user_1")
+        assert exc_info.value.status_code == 415
+
+
+class TestUploadSessions:
+    """分片上传会话测试"""
+
+    @pytest.mark.asyncio
+    async def test_multipart_upload_out_of_order_and_resume(self, upload_dir):
+        session = await upload.create_upload_session(
+            upload.UploadSessionCreateRequest(filename="long.ogg", file_size=30),
+            user_id="user_1",
+        )
+        parts = [b"a" * 10, b"b" * 10, b"c" * 10]
+
+        # 乱序上传,第 1 片失败后重传
+        await upload.upload_part(FakeRequest(parts[2]), session.session_id, 3, user_id="user_1")
+        await upload.upload_part(FakeRequest(parts[0]), session.session_id, 1, user_id="user_1")
+
+        status = await upload.get_upload_session(session.session_id, user_id="user_1")
+        assert [p.part_number for p in status.parts] == [1, 3]
+        assert status.uploaded_size == 20
+
+        part = await upload.upload_part(FakeRequest(parts[1]), session.session_id, 2, user_id="user_1")
+        assert part.sha256 == hashlib.sha256(parts[1]).hexdigest()
+
+        response = await upload.complete_upload_session(session.session_id, None, user_id="user_1")
+
+        content = b"".join(parts)
+        assert response.file_size == 30
+        assert response.original_filename == "long.ogg"
+        assert response.content_hash == hashlib.sha256(content).hexdigest()
+        final_name = response.file_path.rsplit("/", 1)[1]
+        assert (upload_dir / "user_1" / final_name).read_bytes() == content
+        # 会话目录已清理
+        assert not (upload_dir / "user_1" / upload.SESSION_DIR_NAME / session.session_id).exists()
+
+    @pytest.mark.asyncio
+    async def test_complete_with_missing_part_fails(self):
+        session = await upload.create_upload_session(
+            upload.UploadSessionCreateRequest(filename="long.ogg"), user_id="user_1"
+        )
+        await upload.upload_part(FakeRequest(b"abc"), session.session_id, 1, user_id="user_1")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload.complete_upload_session(
+                session.session_id,
+                upload.UploadSessionCompleteRequest(part_numbers=[1, 2]),
+                user_id="user_1",
+            )
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_total_size_limit_across_parts(self, monkeypatch):
+        monkeypatch.setattr(upload, "MAX_FILE_SIZE", 15)
+        session = await upload.create_upload_session(
+            upload.UploadSessionCreateRequest(filename="long.ogg"), user_id="user_1"
+        )
+        await upload.upload_part(FakeRequest(b"a" * 10), session.session_id, 1, user_id="user_1")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload.upload_part(FakeRequest(b"b" * 10), session.session_id, 2, user_id="user_1")
+        assert exc_info.value.status_code == 413
+
+        # 超限的分片不计入已上传
+        status = await upload.get_upload_session(session.session_id, user_id="user_1")
+        assert [p.part_number for p in status.parts] == [1]
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_scoped_per_user(self):
+        session = await upload.create_upload_session(
+            upload.UploadSessionCreateRequest(filename="long.ogg"), user_id="user_1"
+        )
+        with pytest.raises(HTTPException) as exc_info:
+            await upload.get_upload_session(session.session_id, user_id="user_2")
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_invalid_session_id_rejected(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await upload.get_upload_session("../../etc", user_id="user_1")
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_abort_removes_parts(self, upload_dir):
+        session = await upload.create_upload_session(
+            upload.UploadSessionCreateRequest(filename="long.ogg"), user_id="user_1"
+        )
+        await upload.upload_part(FakeRequest(b"abc"), session.session_id, 1, user_id="user_1")
+        await upload.abort_upload_session(session.session_id, user_id="user_1")
+        assert not (upload_dir / "user_1" / upload.SESSION_DIR_NAME / session.session_id).exists()
+
+    @pytest.mark.asyncio
+    async def test_expired_session_is_rejected_and_removed(self, upload_dir, monkeypatch):
+        session = await upload.create_upload_session(
+            upload.UploadSessionCreateRequest(filename="long.ogg"), user_id="user_1"
+        )
+        monkeypatch.setattr(upload.time, "time", lambda: 10**12)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload.upload_part(FakeRequest(b"abc"), session.session_id, 1, user_id="user_1")
+
+        assert exc_info.value.status_code == 410
+        assert not (upload_dir / "user_1" / upload.SESSION_DIR_NAME / session.session_id).exists()
+
+    @pytest.mark.asyncio
+    async def test_create_sweeps_abandoned_sessions_and_caps_open_ones(self, upload_dir, monkeypatch):
+        monkeypatch.setattr(upload, "MAX_OPEN_SESSIONS_PER_USER", 2)
+        monkeypatch.setattr(upload, "_last_session_sweep", 0.0)
+        request = upload.UploadSessionCreateRequest(filename="long.ogg")
+        stale = await upload.create_upload_session(request, user_id="user_2")
+        await upload.create_upload_session(request, user_id="user_1")
+        await upload.create_upload_session(request, user_id="user_1")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload.create_upload_session(request, user_id="user_1")
+        assert exc_info.value.status_code == 429
+
+        # 过期后创建新会话时清理所有用户的残留会话
+        now = upload.time.time() + upload.SESSION_TTL_SECONDS + 1
+        monkeypatch.setattr(upload.time, "time", lambda: now)
+        await upload.create_upload_session(request, user_id="user_1")
+
+        assert not (upload_dir / "user_2" / upload.SESSION_DIR_NAME / stale.session_id).exists()
+        assert len(list((upload_dir / "user_1" / upload.SESSION_DIR_NAME).iterdir())) == 1
@@ -14,7 +14,7 @@ from src.core.exceptions import (
     RateLimitError,
     SensitiveContentError,
 )
-from src.core.models import ASRLanguage, HotwordSet
+from src.core.models import ASRLanguage, HotwordSet, Segment
 from src.providers.azure_asr import AzureASR
 from src.providers.volcano_asr import VolcanoASR
 
@@ -156,9 +156,8 @@ async def test_volcano_poll_result_success(volcano_asr):
     mock_response.text = "some text"
 
     with patch("httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-            return_value=mock_response
-        )
+        mock_client.return_value.is_closed = False
+        mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
         result = await volcano_asr._poll_result("task_123", "logid_123")
 
@@ -190,8 +189,11 @@ async def test_volcano_poll_result_processing(volcano_asr):
     }
     mock_response_success.text = "some text"
 
+    volcano_asr.poller.poll_interval = 0.01
+
     with patch("httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+        mock_client.return_value.is_closed = False
+        mock_client.return_value.post = AsyncMock(
             side_effect=[mock_response_processing, mock_response_success]
         )
 
@@ -281,13 +283,42 @@ async def test_azure_transcribe_short_audio(azure_asr):
     mock_audio_data = b"fake_audio_data"
 
     with patch.object(azure_asr, "_download_audio", return_value=mock_audio_data):
-        with patch.object(azure_asr.audio_processor, "get_duration", return_value=60.0):
+        with patch.object(azure_asr.audio_processor, "get_duration", new_callable=AsyncMock, return_value=60.0):
             with patch.object(azure_asr, "_transcribe_audio", return_value=[]):
                 result = await azure_asr.transcribe("http://example.com/audio.wav")
 
                 assert result.provider == "azure"
 
 
+async def test_azure_transcribe_long_audio_slices_wav_file(azure_asr, tmp_path):
+    """测试 Azure 转写超长音频: 从转换后的 WAV 文件切分,转写后再清理"""
+    wav_path = tmp_path / "converted.wav"
+    wav_path.write_bytes(b"RIFF")
+    processor = azure_asr.audio_processor
+
+    async def fake_transcribe(chunk, asr_language, hotword_set, offset=0.0, **kwargs):
+        return [Segment(text=chunk.decode(), start_time=offset, end_time=offset + 1.0, speaker="Speaker 0")]
+
+    with patch.object(azure_asr, "_download_audio", return_value=b"ogg"), \
+         patch.object(processor, "convert_format", new_callable=AsyncMock, return_value=str(wav_path)), \
+         patch.object(processor, "get_duration", new_callable=AsyncMock, return_value=9000.0), \
+         patch.object(processor, "extract_segment", new_callable=AsyncMock,
+                      side_effect=lambda path, start, end: f"{start:.0f}-{end:.0f}".encode()) as extract, \
+         patch.object(azure_asr, "_transcribe_audio", side_effect=fake_transcribe):
+        result = await azure_asr.transcribe("http://example.com/audio.ogg")
+
+    assert [call.args for call in extract.await_args_list] == [
+        (str(wav_path), 0.0, 7200.0),
+        (str(wav_path), 7200.0, 9000.0),
+    ]
+    assert [(seg.text, seg.start_time) for seg in result.segments] == [
+        ("0-7200", 0.0),
+        ("7200-9000", 7200.0),
+    ]
+    assert result.duration == 9000.0
+    assert not wav_path.exists()
+
+
 def test_azure_parse_result(azure_asr):
     """测试 Azure 解析结果"""
     result = {
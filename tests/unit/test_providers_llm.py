@@ -1,5 +1,6 @@
 """Unit tests for LLM providers."""
 
+import asyncio
 import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -22,7 +23,20 @@ from src.core.models import (
     Segment,
     TranscriptionResult,
 )
-from src.providers.gemini_llm import GeminiLLM
+from src.providers.gemini_llm import ContentStreamDecoder, GeminiLLM, get_gemini_llm
+
+
+def mock_genai_client(**generate_kwargs):
+    """替换 genai.Client,各密钥的客户端共用同一个异步 generate_content mock"""
+    generate = AsyncMock(**generate_kwargs)
+
+    def build(api_key, http_options):
+        client = MagicMock()
+        client.api_key = api_key
+        client.aio.models.generate_content = generate
+        return client
+
+    return patch("src.providers.gemini_llm.genai.Client", side_effect=build), generate
 
 
 @pytest.fixture
@@ -130,6 +144,28 @@ class TestGeminiLLM:
         assert "00:00:00 - 00:00:03" in formatted
         assert "00:00:03 - 00:00:07" in formatted
 
+    def test_format_transcript_with_timestamp_interval(self, gemini_config):
+        """测试稀疏时间戳格式: 只在达到间隔的行标注开始时间"""
+        llm = GeminiLLM(gemini_config)
+        transcript = TranscriptionResult(
+            segments=[
+                Segment(text="开场", start_time=5.0, end_time=20.0, speaker="张三"),
+                Segment(text="回应", start_time=30.0, end_time=50.0, speaker="李四"),
+                Segment(text="补充", start_time=70.0, end_time=80.0, speaker="张三"),
+            ],
+            full_text="开场回应补充",
+            duration=80.0,
+            provider="volcano",
+        )
+
+        formatted = llm.format_transcript(transcript, timestamp_interval=60)
+
+        assert formatted.splitlines() == [
+            "[张三] 开场 (00:00:05)",
+            "[李四] 回应",
+            "[张三] 补充 (00:01:10)",
+        ]
+
     def test_format_transcript_empty(self, gemini_config):
         """测试空转写文本格式化"""
         llm = GeminiLLM(gemini_config)
@@ -266,21 +302,20 @@ class TestGeminiLLM:
         mock_response.usage_metadata.candidates_token_count = 50
         mock_response.usage_metadata.total_token_count = 150
 
-        with patch.object(llm.client.models, "generate_content", return_value=mock_response):
+        client_patch, generate = mock_genai_client(return_value=mock_response)
+        with client_patch:
             result_text, usage_metadata = await llm._call_gemini_api("test prompt")
             assert "测试会议" in result_text
             assert usage_metadata["total_token_count"] == 150
+            generate.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_call_gemini_api_token_limit(self, gemini_config):
         """测试 Token 超限"""
         llm = GeminiLLM(gemini_config)
 
-        with patch.object(
-            llm.client.models,
-            "generate_content",
-            side_effect=Exception("Token limit exceeded")
-        ):
+        client_patch, _ = mock_genai_client(side_effect=Exception("Token limit exceeded"))
+        with client_patch:
             with pytest.raises(LLMTokenLimitError):
                 await llm._call_gemini_api("test prompt")
 
@@ -306,19 +341,16 @@ class TestGeminiLLM:
                 raise Exception("Rate limit exceeded (429)")
             return mock_response
 
-        # Mock 第一个客户端
-        with patch.object(llm.client.models, "generate_content", side_effect=side_effect):
-            # Mock Client 构造函数，以便轮换密钥时返回一个新的 mock 客户端
-            with patch("google.genai.Client") as mock_client_class:
-                # 创建一个新的 mock 客户端用于轮换后
-                new_mock_client = MagicMock()
-                new_mock_client.models.generate_content.return_value = mock_response
-                mock_client_class.return_value = new_mock_client
-                
-                result_text, usage_metadata = await llm._call_gemini_api("test prompt")
-                assert result_text == "success"
-                assert usage_metadata["total_token_count"] == 150
-                assert llm.current_key_index == 1  # 已轮换到第二个密钥
+        client_patch, _ = mock_genai_client(side_effect=side_effect)
+        with client_patch as client_class:
+            result_text, usage_metadata = await llm._call_gemini_api("test prompt")
+            assert result_text == "success"
+            assert usage_metadata["total_token_count"] == 150
+            assert llm.current_key_index == 1  # 已轮换到第二个密钥
+            assert [c.kwargs["api_key"] for c in client_class.call_args_list] == [
+                gemini_config.api_keys[0],
+                gemini_config.api_keys[1],
+            ]
 
     @pytest.mark.asyncio
     async def test_call_gemini_api_rate_limit_no_more_keys(self):
@@ -329,11 +361,8 @@ class TestGeminiLLM:
         )
         llm = GeminiLLM(config)
 
-        with patch.object(
-            llm.client.models,
-            "generate_content",
-            side_effect=Exception("Rate limit exceeded (429)")
-        ):
+        client_patch, _ = mock_genai_client(side_effect=Exception("Rate limit exceeded (429)"))
+        with client_patch:
             with pytest.raises(RateLimitError):
                 await llm._call_gemini_api("test prompt")
 
@@ -356,7 +385,8 @@ class TestGeminiLLM:
             ensure_ascii=False,
         )
 
-        with patch.object(llm.client.models, "generate_content", return_value=mock_response):
+        client_patch, _ = mock_genai_client(return_value=mock_response)
+        with client_patch:
             artifact = await llm.generate_artifact(
                 transcript=transcript,
                 prompt_instance=prompt_instance,
@@ -398,3 +428,201 @@ class TestGeminiLLM:
         template = await llm.get_prompt_template("tpl_001")
         assert "会议纪要助手" in template
         assert "JSON" in template
+
+
+class TestGeminiChunkNotes:
+    """map-reduce 的 map 阶段"""
+
+    @pytest.mark.asyncio
+    async def test_summarize_transcript_chunk(self, gemini_config, transcript):
+        llm = GeminiLLM(gemini_config)
+        response = MagicMock(text=json.dumps({"notes": "- 张三: 讨论产品规划"}, ensure_ascii=False))
+        client_patch, generate = mock_genai_client(return_value=response)
+
+        with client_patch:
+            notes = await llm.summarize_transcript_chunk(
+                transcript, chunk_index=2, chunk_count=3, instructions="生成会议纪要"
+            )
+
+        assert notes == "- 张三: 讨论产品规划"
+        prompt = generate.await_args.kwargs["contents"]
+        assert "第 2/3 部分" in prompt
+        assert "[张三]" in prompt
+        assert "生成会议纪要" in prompt
+        assert generate.await_args.kwargs["config"].response_schema is not None
+
+    @pytest.mark.asyncio
+    async def test_empty_notes_raise(self, gemini_config, transcript):
+        llm = GeminiLLM(gemini_config)
+        client_patch, _ = mock_genai_client(return_value=MagicMock(text='{"notes": ""}'))
+
+        with client_patch:
+            with pytest.raises(LLMError, match="Empty notes"):
+                await llm.summarize_transcript_chunk(transcript)
+
+
+class TestGeminiClientReuse:
+    """Gemini 客户端复用、并发限制与密钥轮换"""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_pool_and_are_not_rebuilt(self, gemini_config):
+        llm = GeminiLLM(gemini_config)
+        client_patch, _ = mock_genai_client()
+        with client_patch as client_class:
+            first = llm._get_client()
+            llm._rotate_api_key()
+            second = llm._get_client()
+            llm._rotate_api_key()
+
+            assert llm.current_key_index == 0  # 循环轮换
+            assert llm._get_client() is first
+            assert second is not first
+            assert client_class.call_count == 2
+
+        pools = {c.kwargs["http_options"].httpx_async_client for c in client_class.call_args_list}
+        assert len(pools) == 1
+        await llm.aclose()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_rotation_per_call_does_not_exhaust_keys(self, gemini_config):
+        llm = GeminiLLM(gemini_config)
+        llm.current_key_index = 1
+        mock_response = MagicMock(text="ok", usage_metadata=None)
+        client_patch, _ = mock_genai_client(
+            side_effect=[Exception("429 quota"), mock_response, Exception("429 quota"), mock_response]
+        )
+        with client_patch:
+            assert (await llm._call_gemini_api("p"))[0] == "ok"
+            assert (await llm._call_gemini_api("p"))[0] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_limited(self, gemini_config):
+        gemini_config.max_concurrency = 2
+        llm = GeminiLLM(gemini_config)
+        running = 0
+        peak = 0
+
+        async def slow_generate(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return MagicMock(text="ok", usage_metadata=None)
+
+        client_patch, _ = mock_genai_client(side_effect=slow_generate)
+        with client_patch:
+            await asyncio.gather(*(llm._call_gemini_api("p") for _ in range(6)))
+
+        assert peak == 2
+
+    def test_get_gemini_llm_is_shared(self, gemini_config):
+        assert get_gemini_llm(gemini_config) is get_gemini_llm(gemini_config)
+        other = gemini_config.model_copy(update={"model": "gemini-2.5-pro"})
+        assert get_gemini_llm(other) is not get_gemini_llm(gemini_config)
+
+
+def mock_genai_stream(*attempts):
+    """替换 genai.Client,每次 generate_content_stream 调用按顺序返回一个分块序列(或抛出异常)"""
+
+    def make_stream(chunks):
+        async def iterate():
+            for chunk in chunks:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield MagicMock(text=chunk, usage_metadata=None)
+
+        return iterate()
+
+    stream = AsyncMock(
+        side_effect=[a if isinstance(a, Exception) else make_stream(a) for a in attempts]
+    )
+
+    def build(api_key, http_options):
+        client = MagicMock()
+        client.aio.models.generate_content_stream = stream
+        return client
+
+    return patch("src.providers.gemini_llm.genai.Client", side_effect=build), stream
+
+
+class TestContentStreamDecoder:
+    """流式 JSON 的 content 字段增量解码"""
+
+    @pytest.mark.parametrize("step", [1, 2, 5, 1000])
+    def test_decodes_content_across_arbitrary_chunk_boundaries(self, step):
+        content = '# 会议纪要\n- 行动项 "上线" \\ 😀\t完成'
+        document = json.dumps({"content": content, "metadata": {"title": "周会"}})
+        decoder = ContentStreamDecoder()
+
+        decoded = "".join(
+            decoder.feed(document[i:i + step]) for i in range(0, len(document), step)
+        )
+
+        assert decoded == content
+        assert decoder.text == document
+
+    def test_ignores_text_before_content_key(self):
+        decoder = ContentStreamDecoder()
+        assert decoder.feed('```json\n{"con') == ""
+        assert decoder.feed('tent": "ab') == "ab"
+        assert decoder.feed('c", "metadata": {"summary": "x"}}') == "c"
+
+
+class TestGeminiStreaming:
+    """流式生成"""
+
+    @pytest.mark.asyncio
+    async def test_deltas_are_forwarded_and_artifact_is_complete(
+        self, gemini_config, prompt_template, prompt_instance, transcript
+    ):
+        llm = GeminiLLM(gemini_config)
+        deltas = []
+
+        async def on_delta(text):
+            deltas.append(text)
+
+        client_patch, stream = mock_genai_stream(
+            ['{"content": "# 纪要\\n', "- 讨论产品", '规划"}']
+        )
+        with client_patch:
+            artifact = await llm.generate_artifact(
+                transcript=transcript,
+                prompt_instance=prompt_instance,
+                template=prompt_template,
+                stream_callback=on_delta,
+            )
+
+        assert deltas == ["# 纪要\n", "- 讨论产品", "规划"]
+        assert artifact.get_content_dict() == {"content": "# 纪要\n- 讨论产品规划"}
+        stream.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failure_before_first_delta_is_retried(self, gemini_config):
+        llm = GeminiLLM(gemini_config)
+        on_delta = AsyncMock()
+        client_patch, stream = mock_genai_stream(
+            Exception("connection reset"), ['{"content": "ok"}']
+        )
+
+        with client_patch, patch("src.providers.gemini_llm.asyncio.sleep", AsyncMock()):
+            text, _ = await llm._stream_gemini_api("prompt", None, on_delta)
+
+        assert text == '{"content": "ok"}'
+        assert stream.await_count == 2
+        on_delta.assert_awaited_once_with("ok")
+
+    @pytest.mark.asyncio
+    async def test_failure_after_delta_is_not_retried(self, gemini_config):
+        llm = GeminiLLM(gemini_config)
+        on_delta = AsyncMock()
+        client_patch, stream = mock_genai_stream(
+            ['{"content": "部分', Exception("connection reset")], ['{"content": "重复"}']
+        )
+
+        with client_patch:
+            with pytest.raises(LLMError, match="stream interrupted"):
+                await llm._stream_gemini_api("prompt", None, on_delta)
+
+        assert stream.await_count == 1
+        on_delta.assert_awaited_once_with("部分")
@@ -401,7 +401,7 @@ class TestIFlyTekVoiceprint:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = MagicMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             mock_response = MagicMock()
             mock_response.status_code = 200
@@ -419,7 +419,7 @@ class TestIFlyTekVoiceprint:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = MagicMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             mock_response = MagicMock()
             mock_response.status_code = 401
@@ -436,7 +436,7 @@ class TestIFlyTekVoiceprint:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = MagicMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             mock_response = MagicMock()
             mock_response.status_code = 429
@@ -456,7 +456,7 @@ class TestIFlyTekVoiceprint:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = MagicMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             mock_response = MagicMock()
             mock_response.status_code = 200
@@ -473,9 +473,95 @@ class TestIFlyTekVoiceprint:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = MagicMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             mock_client.post = AsyncMock(side_effect=httpx.HTTPError("Connection failed"))
 
             with pytest.raises(VoiceprintError, match="HTTP error"):
                 await iflytek_provider._make_request(request_body)
+
+    @pytest.mark.anyio
+    async def test_identify_speakers_concurrently(self, iflytek_config, known_speakers):
+        """测试说话人并发识别且不超过并发上限"""
+        import asyncio
+
+        config = iflytek_config.model_copy(update={"max_concurrency": 2})
+        provider = IFlyTekVoiceprint(config)
+        transcript = TranscriptionResult(
+            segments=[
+                Segment(text=f"发言{i}", start_time=i * 5.0, end_time=i * 5.0 + 4.0, speaker=f"spk_{i}")
+                for i in range(5)
+            ],
+            full_text="",
+            duration=25.0,
+            language="zh-CN",
+            provider="volcano",
+        )
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_search(audio_sample, known):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return {"name": audio_sample.decode(), "score": 0.9, "speaker_id": "feat"}
+
+        async def fake_extract(transcript, audio_path, speaker_label):
+            return f"name_{speaker_label}".encode()
+
+        with patch.object(provider, "_extract_speaker_sample", side_effect=fake_extract):
+            with patch.object(provider, "_search_speaker", side_effect=fake_search):
+                result = await provider.identify_speakers(transcript, "/tmp/audio.wav", known_speakers)
+
+        assert result == {f"spk_{i}": f"name_spk_{i}" for i in range(5)}
+        assert peak == 2
+
+    @pytest.mark.anyio
+    async def test_make_request_reuses_client(self, iflytek_provider):
+        """测试多次请求复用同一个 HTTP 客户端"""
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_client.is_closed = False
+            mock_client_class.return_value = mock_client
+
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {"header": {"code": 0}, "payload": {}}
+            mock_client.post = AsyncMock(return_value=mock_response)
+
+            await iflytek_provider._make_request({"n": 1})
+            await iflytek_provider._make_request({"n": 2})
+
+            assert mock_client_class.call_count == 1
+            assert mock_client.post.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_identify_speakers_uses_provided_samples(
+        self, iflytek_provider, sample_transcript, known_speakers
+    ):
+        """测试提供预提取样本时不再重复提取"""
+        with patch.object(
+            iflytek_provider, "_extract_speaker_sample", new_callable=AsyncMock
+        ) as mock_extract:
+            mock_extract.return_value = b"extracted"
+
+            with patch.object(
+                iflytek_provider, "_search_speaker", new_callable=AsyncMock
+            ) as mock_search:
+                mock_search.return_value = None
+
+                await iflytek_provider.identify_speakers(
+                    sample_transcript,
+                    "/tmp/audio.wav",
+                    known_speakers,
+                    speaker_samples={"spk_0": b"sample_0"},
+                )
+
+                # 仅缺失样本的说话人需要提取
+                mock_extract.assert_called_once()
+                assert mock_extract.call_args[0][2] == "spk_1"
+                searched = sorted(call[0][0] for call in mock_search.call_args_list)
+                assert searched == [b"extracted", b"sample_0"]
@@ -0,0 +1,207 @@
+"""Unit tests for the shared Volcano ASR result poller."""
+
+import asyncio
+from typing import Dict, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from src.config.models import VolcanoConfig
+from src.core.exceptions import ASRError
+from src.providers.volcano_poller import VolcanoResultPoller
+
+
+@pytest.fixture
+def volcano_config():
+    return VolcanoConfig(
+        access_key="test_access_key",
+        secret_key="test_secret_key",
+        app_id="test_app_id",
+        cluster_id="test_cluster_id",
+        tos_bucket="test-bucket",
+        poll_interval=0.01,
+        max_poll_interval=0.05,
+    )
+
+
+def make_response(status_code: str, result: dict = None) -> MagicMock:
+    response = MagicMock()
+    response.headers = {"X-Api-Status-Code": status_code, "X-Api-Message": status_code}
+    response.text = "body" if result is not None else ""
+    response.json.return_value = {"result": result} if result is not None else {}
+    return response
+
+
+class FakeQueryClient:
+    """按任务 ID 返回预设响应序列的共享客户端"""
+
+    def __init__(self, scripts: Dict[str, List]):
+        self.scripts = {task_id: list(steps) for task_id, steps in scripts.items()}
+        self.calls: List[str] = []
+        self.is_closed = False
+
+    async def post(self, url, json, headers):
+        task_id = headers["X-Api-Request-Id"]
+        self.calls.append(task_id)
+        step = self.scripts[task_id].pop(0) if len(self.scripts[task_id]) > 1 else self.scripts[task_id][0]
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+    async def aclose(self):
+        self.is_closed = True
+
+
+def make_poller(volcano_config, client: FakeQueryClient):
+    poller = VolcanoResultPoller(volcano_config, "https://example.com/query", "volc.bigasr.auc")
+    return poller, patch("httpx.AsyncClient", return_value=client)
+
+
+class TestVolcanoResultPoller:
+    """共享轮询器测试"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_jobs_share_one_client(self, volcano_config):
+        processing = make_response("20000001")
+        client = FakeQueryClient({
+            f"task_{i}": [processing] * (i + 1) + [make_response("20000000", {"text": f"text {i}"})]
+            for i in range(5)
+        })
+        poller, client_patch = make_poller(volcano_config, client)
+
+        with client_patch as client_class:
+            results = await asyncio.gather(
+                *(poller.wait_for_result(f"task_{i}", "logid") for i in range(5))
+            )
+
+        assert [r["text"] for r in results] == [f"text {i}" for i in range(5)]
+        client_class.assert_called_once()
+        assert poller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_long_running_job_has_no_default_cap(self, volcano_config):
+        """默认不限制等待时间,长任务持续轮询直到完成"""
+        client = FakeQueryClient({
+            "long": [make_response("20000002")] * 30 + [make_response("20000000", {"text": "done"})]
+        })
+        volcano_config.max_poll_interval = 0.01
+        poller, client_patch = make_poller(volcano_config, client)
+
+        with client_patch:
+            result = await poller.wait_for_result("long", "logid")
+
+        assert result == {"text": "done"}
+        assert len(client.calls) == 31
+
+    @pytest.mark.asyncio
+    async def test_explicit_max_wait_times_out(self, volcano_config):
+        client = FakeQueryClient({"slow": [make_response("20000001")]})
+        poller, client_patch = make_poller(volcano_config, client)
+
+        with client_patch:
+            with pytest.raises(ASRError, match="timeout"):
+                await poller.wait_for_result("slow", "logid", max_wait=0.05)
+
+        assert poller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_provider_caps_wait_by_default(self, volcano_config):
+        from src.providers.volcano_asr import VolcanoASR
+
+        provider = VolcanoASR(volcano_config)
+        with patch.object(provider.poller, "wait_for_result", return_value={}) as wait:
+            await provider._poll_result("task", "logid")
+
+        assert volcano_config.max_poll_wait == 300
+        wait.assert_called_once_with("task", "logid", 300)
+
+    @pytest.mark.asyncio
+    async def test_failed_job_does_not_affect_others(self, volcano_config):
+        client = FakeQueryClient({
+            "bad": [make_response("45000001")],
+            "good": [make_response("20000001"), make_response("20000000", {"text": "ok"})],
+        })
+        poller, client_patch = make_poller(volcano_config, client)
+
+        with client_patch:
+            bad, good = await asyncio.gather(
+                poller.wait_for_result("bad", "logid"),
+                poller.wait_for_result("good", "logid"),
+                return_exceptions=True,
+            )
+
+        assert isinstance(bad, ASRError)
+        assert good == {"text": "ok"}
+
+    @pytest.mark.asyncio
+    async def test_malformed_response_only_fails_its_job(self, volcano_config):
+        malformed = make_response("20000000", {})
+        malformed.json.side_effect = ValueError("Expecting value: line 1 column 1")
+        client = FakeQueryClient({
+            "bad": [malformed],
+            "good": [make_response("20000001"), make_response("20000000", {"text": "ok"})],
+        })
+        poller, client_patch = make_poller(volcano_config, client)
+
+        with client_patch:
+            bad, good = await asyncio.gather(
+                poller.wait_for_result("bad", "logid"),
+                poller.wait_for_result("good", "logid"),
+                return_exceptions=True,
+            )
+
+        assert isinstance(bad, ASRError)
+        assert "Expecting value" in str(bad)
+        assert good == {"text": "ok"}
+
+    @pytest.mark.asyncio
+    async def test_transient_http_errors_are_retried(self, volcano_config):
+        error = httpx.ConnectError("reset")
+        client = FakeQueryClient({
+            "flaky": [error, error, make_response("20000000", {"text": "ok"})],
+            "dead": [error],
+        })
+        poller, client_patch = make_poller(volcano_config, client)
+
+        with client_patch:
+            flaky, dead = await asyncio.gather(
+                poller.wait_for_result("flaky", "logid"),
+                poller.wait_for_result("dead", "logid"),
+                return_exceptions=True,
+            )
+
+        assert flaky == {"text": "ok"}
+        assert isinstance(dead, ASRError)
+        assert client.calls.count("dead") == volcano_config.max_retries
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_stops_polling(self, volcano_config):
+        client = FakeQueryClient({"job": [make_response("20000001")]})
+        poller, client_patch = make_poller(volcano_config, client)
+
+        with client_patch:
+            waiter = asyncio.ensure_future(poller.wait_for_result("job", "logid"))
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            calls = len(client.calls)
+            await asyncio.sleep(0.05)
+
+        assert poller.in_flight == 0
+        assert len(client.calls) == calls
+
+    @pytest.mark.asyncio
+    async def test_aclose_fails_pending_waiters(self, volcano_config):
+        client = FakeQueryClient({"job": [make_response("20000001")]})
+        poller, client_patch = make_poller(volcano_config, client)
+
+        with client_patch:
+            waiter = asyncio.ensure_future(poller.wait_for_result("job", "logid"))
+            await asyncio.sleep(0.02)
+            await poller.aclose()
+            with pytest.raises(ASRError, match="closed"):
+                await waiter
+
+        assert client.is_closed
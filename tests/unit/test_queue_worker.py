@@ -0,0 +1,132 @@
+"""Unit tests for TaskWorker."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.queue.worker import TaskWorker
+
+
+class FakeQueue:
+    """按顺序返回预置消息的队列"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    def pull(self, timeout: int = 1):
+        if self.messages:
+            return self.messages.pop(0)
+        return None
+
+
+@pytest.fixture
+def make_worker():
+    """创建不依赖 Redis 的 Worker"""
+
+    def _make(messages, max_concurrent_tasks, providers=None):
+        with patch.dict("sys.modules", {"redis": None}):
+            worker = TaskWorker(
+                queue_manager=FakeQueue(messages),
+                pipeline_service=MagicMock(),
+                max_shutdown_wait=5,
+                max_concurrent_tasks=max_concurrent_tasks,
+                providers=providers,
+            )
+        return worker
+
+    return _make
+
+
+def _messages(count):
+    return [{"task_id": f"task_{i}", "data": {"user_id": "user_1"}} for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_mode_respects_limit(make_worker):
+    """测试并发模式下在途任务数不超过上限"""
+    worker = make_worker(_messages(5), max_concurrent_tasks=2)
+    in_flight = 0
+    peak = 0
+    processed = []
+
+    async def fake_process(task_id, task_data):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        processed.append(task_id)
+        if len(processed) == 5:
+            worker.running = False
+
+    worker._process_task = fake_process
+    worker.running = True
+    await asyncio.wait_for(worker._run_concurrent(), timeout=5)
+
+    assert sorted(processed) == [f"task_{i}" for i in range(5)]
+    assert peak == 2
+    assert worker.active_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_mode_marks_failed_task(make_worker):
+    """测试并发模式下单个任务失败不影响其他任务"""
+    worker = make_worker(_messages(2), max_concurrent_tasks=2)
+    worker._mark_task_failed = MagicMock()
+    done = []
+
+    async def fake_process(task_id, task_data):
+        done.append(task_id)
+        if len(done) == 2:
+            worker.running = False
+        if task_id == "task_0":
+            raise RuntimeError("boom")
+
+    worker._process_task = fake_process
+    worker.running = True
+    await asyncio.wait_for(worker._run_concurrent(), timeout=5)
+
+    worker._mark_task_failed.assert_called_once_with("task_0", "boom")
+    assert sorted(done) == ["task_0", "task_1"]
+
+
+def _provider():
+    provider = MagicMock()
+    provider.aclose = AsyncMock()
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_serial_task_closes_provider_clients(make_worker):
+    """测试逐个处理模式下任务结束(包括失败)时关闭提供商连接池"""
+    providers = [_provider(), _provider()]
+    providers[0].aclose.side_effect = RuntimeError("already closed")
+    worker = make_worker([], max_concurrent_tasks=1, providers=providers)
+
+    async def fake_process(task_id, task_data):
+        raise RuntimeError("boom")
+
+    worker._process_task = fake_process
+    with pytest.raises(RuntimeError, match="boom"):
+        await worker._run_serial_task("task_0", {"user_id": "user_1"})
+
+    for provider in providers:
+        provider.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_mode_closes_provider_clients_on_shutdown(make_worker):
+    """测试并发模式下停机时关闭提供商连接池"""
+    provider = _provider()
+    worker = make_worker(_messages(1), max_concurrent_tasks=2, providers=[provider])
+
+    async def fake_process(task_id, task_data):
+        provider.aclose.assert_not_awaited()
+        worker.running = False
+
+    worker._process_task = fake_process
+    worker.running = True
+    await asyncio.wait_for(worker._run_concurrent(), timeout=5)
+
+    provider.aclose.assert_awaited_once()
@@ -0,0 +1,165 @@
+"""Tests for streamed artifact content delivery."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.api.routes.artifacts import _make_stream_callback, artifact_content_stream
+from src.services.artifact_stream import ArtifactStreamHub
+
+
+def parse_sse(messages):
+    events = []
+    for message in messages:
+        if message.startswith(":"):
+            continue
+        lines = message.strip().split("\n")
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+
+class FakeBroadcaster:
+    """subscribe 返回预置队列;queue 为 None 时模拟 Redis 不可用"""
+
+    def __init__(self, queue=None):
+        self.queue = queue
+        self.subscribed = []
+
+    @asynccontextmanager
+    async def _subscription(self, task_id):
+        if self.queue is None:
+            raise RedisConnectionError("redis down")
+        self.subscribed.append(task_id)
+        yield self.queue
+
+    def subscribe(self, task_id):
+        return self._subscription(task_id)
+
+
+class TestArtifactStreamHub:
+    """进程内分发"""
+
+    def test_late_subscriber_gets_snapshot_then_deltas(self):
+        hub = ArtifactStreamHub()
+        hub.start("art_1")
+        hub.publish("art_1", "# 纪要\n")
+
+        snapshot, queue = hub.subscribe("art_1")
+        hub.publish("art_1", "- 要点")
+        hub.finish("art_1", "complete", {"state": "success"})
+
+        assert snapshot == "# 纪要\n"
+        assert queue.get_nowait() == ("delta", {"text": "- 要点"})
+        assert queue.get_nowait() == ("complete", {"state": "success"})
+        assert not hub.is_active("art_1")
+        assert hub.subscribe("art_1") is None
+
+    def test_unsubscribed_queue_stops_receiving(self):
+        hub = ArtifactStreamHub()
+        hub.start("art_1")
+        _, queue = hub.subscribe("art_1")
+        hub.unsubscribe("art_1", queue)
+
+        hub.publish("art_1", "text")
+
+        assert queue.empty()
+        assert hub.text("art_1") == "text"
+
+
+class TestArtifactContentStream:
+    """SSE 内容流"""
+
+    @pytest.mark.asyncio
+    async def test_relays_in_process_generation(self):
+        hub = ArtifactStreamHub()
+        hub.start("art_1")
+        hub.publish("art_1", "第一段")
+
+        async def consume():
+            return [m async for m in artifact_content_stream("art_1", "task_1")]
+
+        with patch("src.api.routes.artifacts.get_artifact_stream_hub", return_value=hub), \
+                patch("src.api.routes.artifacts.get_task_event_broadcaster", return_value=FakeBroadcaster()):
+            consumer = asyncio.create_task(consume())
+            await asyncio.sleep(0)
+            hub.publish("art_1", "第二段")
+            hub.finish("art_1", "complete", {"state": "success", "content": {"content": "第一段第二段"}})
+            events = parse_sse(await consumer)
+
+        assert events == [
+            ("snapshot", {"artifact_id": "art_1", "text": "第一段"}),
+            ("delta", {"text": "第二段"}),
+            ("complete", {"state": "success", "content": {"content": "第一段第二段"}}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_polls_partial_content_when_events_unavailable(self):
+        states = [
+            {"state": "processing", "content": {"status": "generating"}},
+            {"state": "processing", "content": {"content": "# 纪要"}},
+            {"state": "processing", "content": {"content": "# 纪要\n- 要点"}},
+            {"state": "success", "content": {"content": "# 纪要\n- 要点完成"}},
+        ]
+
+        with patch("src.api.routes.artifacts.get_artifact_stream_hub", return_value=ArtifactStreamHub()), \
+                patch("src.api.routes.artifacts.get_task_event_broadcaster", return_value=FakeBroadcaster()), \
+                patch("src.api.routes.artifacts._read_artifact_stream_state", side_effect=states):
+            events = parse_sse(
+                [m async for m in artifact_content_stream("art_1", "task_1", poll_interval=0)]
+            )
+
+        assert events == [
+            ("snapshot", {"artifact_id": "art_1", "text": ""}),
+            ("delta", {"text": "# 纪要"}),
+            ("delta", {"text": "\n- 要点"}),
+            ("complete", {"artifact_id": "art_1", "state": "success", "content": {"content": "# 纪要\n- 要点完成"}}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reads_partial_content_only_on_artifact_events(self):
+        queue = asyncio.Queue()
+        broadcaster = FakeBroadcaster(queue)
+        states = [
+            {"state": "processing", "content": {"content": "# 纪要"}},
+            {"state": "processing", "content": {"content": "# 纪要\n- 要点"}},
+            {"state": "success", "content": {"content": "# 纪要\n- 要点完成"}},
+        ]
+        read = MagicMock(side_effect=states)
+        for event in [
+            {"type": "task", "task_id": "task_1", "state": "summarizing"},
+            {"type": "artifact", "task_id": "task_1", "artifact_id": "art_2", "state": "processing"},
+            {"type": "artifact", "task_id": "task_1", "artifact_id": "art_1", "state": "processing"},
+            None,  # 订阅中断过,重新读取
+        ]:
+            queue.put_nowait(event)
+
+        with patch("src.api.routes.artifacts.get_artifact_stream_hub", return_value=ArtifactStreamHub()), \
+                patch("src.api.routes.artifacts.get_task_event_broadcaster", return_value=broadcaster), \
+                patch("src.api.routes.artifacts._read_artifact_stream_state", read):
+            events = parse_sse([m async for m in artifact_content_stream("art_1", "task_1")])
+
+        assert broadcaster.subscribed == ["task_1"]
+        assert read.call_count == 3
+        assert [event for event, _ in events] == ["snapshot", "delta", "complete"]
+
+
+class TestStreamCallback:
+    """生成进程的增量回调"""
+
+    @pytest.mark.asyncio
+    async def test_partial_content_is_flushed_off_the_event_loop(self):
+        hub = ArtifactStreamHub()
+        hub.start("art_1")
+        flush = MagicMock()
+
+        with patch("src.api.routes.artifacts.get_artifact_stream_hub", return_value=hub), \
+                patch("src.api.routes.artifacts._flush_partial_content", flush):
+            on_delta = _make_stream_callback("art_1", "task_1", flush_interval=0)
+            await on_delta("# 纪要")
+            await on_delta("\n- 要点")
+
+        assert flush.call_args_list[-1].args == ("art_1", "task_1", "# 纪要\n- 要点")
@@ -0,0 +1,218 @@
+"""Unit tests for the ASR result cache."""
+
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.models import ASRLanguage, Segment, TranscriptionResult
+from src.services.asr_cache import ASRResultCache
+from src.services.transcription import TranscriptionService
+from src.utils.metrics import get_metrics_collector, reset_metrics_collector
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    reset_metrics_collector()
+    yield
+    reset_metrics_collector()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ASRResultCache(str(tmp_path / "asr"), ttl_seconds=3600, max_size_bytes=10 * 1024 * 1024)
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "meeting.wav"
+    path.write_bytes(b"RIFF" + b"\x01" * 1000)
+    return str(path)
+
+
+def make_result(provider: str = "volcano", text: str = "大家好") -> TranscriptionResult:
+    return TranscriptionResult(
+        segments=[Segment(text=text, start_time=0.0, end_time=1.0, speaker="Speaker 1")],
+        full_text=text,
+        duration=1.0,
+        provider=provider,
+    )
+
+
+class TestASRResultCache:
+    """缓存存取、过期与淘汰"""
+
+    @pytest.mark.asyncio
+    async def test_put_then_get_round_trip(self, cache):
+        key = ASRResultCache.make_key("abc", ASRLanguage.ZH_EN, "none", "volcano")
+        await cache.put(key, make_result())
+
+        result = await cache.get(key)
+
+        assert result == make_result().model_copy(update={"created_at": result.created_at})
+        assert get_metrics_collector().get_counter("asr_cache_hits_total", {"provider": "volcano"}) == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_records_metric(self, cache):
+        assert await cache.get("missing-1", "missing-2") is None
+        assert get_metrics_collector().get_counter("asr_cache_misses_total") == 1
+
+    def test_key_depends_on_every_component(self):
+        base = ("hash", ASRLanguage.ZH_EN, "hw1", "volcano")
+        keys = {
+            ASRResultCache.make_key(*base),
+            ASRResultCache.make_key("other", *base[1:]),
+            ASRResultCache.make_key(base[0], ASRLanguage.EN_US, *base[2:]),
+            ASRResultCache.make_key(*base[:2], "hw2", base[3]),
+            ASRResultCache.make_key(*base[:3], "azure"),
+        }
+        assert len(keys) == 5
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self, cache):
+        await cache.put("k1", make_result())
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+        assert await cache.get("k1") is None
+
+    @pytest.mark.asyncio
+    async def test_size_eviction_drops_least_recently_used(self, tmp_path):
+        cache = ASRResultCache(str(tmp_path / "asr"), ttl_seconds=3600, max_size_bytes=10**9)
+        for i, key in enumerate(["old", "used", "new"]):
+            await cache.put(key, make_result(text="x" * 200))
+            path = cache._entry_path(key)
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+        # 访问 "used" 刷新其访问时间
+        assert await cache.get("used") is not None
+
+        cache.max_size_bytes = sum(
+            cache._entry_path(key).stat().st_size for key in ("used", "new")
+        )
+        cache._evict()
+
+        assert not cache._entry_path("old").exists()
+        assert cache._entry_path("used").exists()
+        assert cache._entry_path("new").exists()
+
+    @pytest.mark.asyncio
+    async def test_corrupt_entry_is_discarded(self, cache):
+        path = cache._entry_path("bad")
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json", encoding="utf-8")
+        assert await cache.get("bad") is None
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_hash_depends_on_content_and_order(self, tmp_path):
+        a = tmp_path / "a.wav"
+        b = tmp_path / "b.wav"
+        a.write_bytes(b"aaaa")
+        b.write_bytes(b"bbbb")
+
+        ab = await ASRResultCache.hash_audio_files([str(a), str(b)])
+        ba = await ASRResultCache.hash_audio_files([str(b), str(a)])
+        assert ab != ba
+        assert ab == await ASRResultCache.hash_audio_files([str(a), str(b)])
+
+
+class TestTranscriptionServiceCache:
+    """TranscriptionService 与缓存集成"""
+
+    @pytest.fixture
+    def service(self, cache):
+        primary = MagicMock()
+        primary.get_provider_name.return_value = "volcano"
+        primary.get_default_hotword_resource.return_value = "global_table"
+        primary.transcribe = AsyncMock(return_value=make_result("volcano"))
+        fallback = MagicMock()
+        fallback.get_provider_name.return_value = "azure"
+        fallback.get_default_hotword_resource.return_value = None
+        fallback.transcribe = AsyncMock(return_value=make_result("azure"))
+        storage = MagicMock()
+        storage.upload_file = AsyncMock(return_value="https://tos/audio.wav")
+        storage.generate_presigned_url = AsyncMock(return_value="https://tos/audio.wav?sig")
+        return TranscriptionService(
+            primary_asr=primary,
+            fallback_asr=fallback,
+            storage_client=storage,
+            audio_processor=MagicMock(),
+            asr_cache=cache,
+        )
+
+    @pytest.mark.asyncio
+    async def test_second_run_skips_upload_and_asr(self, service, audio_file):
+        first, url, _ = await service.transcribe([audio_file], asr_language=ASRLanguage.ZH_EN)
+        second, cached_url, local_path = await service.transcribe(
+            [audio_file], asr_language=ASRLanguage.ZH_EN
+        )
+
+        assert second.full_text == first.full_text
+        assert url and cached_url == ""
+        assert local_path == audio_file
+        service.primary_asr.transcribe.assert_awaited_once()
+        service.storage.upload_file.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_different_language_or_hotwords_miss(self, service, audio_file):
+        with patch.object(service, "_load_hotword_version", return_value="hw_1:table:t1"):
+            await service.transcribe([audio_file], asr_language=ASRLanguage.ZH_EN)
+            await service.transcribe([audio_file], asr_language=ASRLanguage.EN_US)
+            await service.transcribe(
+                [audio_file], asr_language=ASRLanguage.ZH_EN, hotword_set_id="hw_1"
+            )
+        assert service.primary_asr.transcribe.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_updated_hotword_set_misses(self, service, audio_file):
+        with patch.object(
+            service, "_load_hotword_version", side_effect=["hw_1:table:t1", "hw_1:table:t2"]
+        ) as load:
+            await service.transcribe([audio_file], hotword_set_id="hw_1")
+            await service.transcribe([audio_file], hotword_set_id="hw_1")
+
+        assert [c.args for c in load.call_args_list] == [("hw_1",), ("hw_1",)]
+        assert service.primary_asr.transcribe.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_global_boosting_table_misses(self, service, audio_file):
+        await service.transcribe([audio_file])
+        service.primary_asr.get_default_hotword_resource.return_value = "global_table_v2"
+        await service.transcribe([audio_file])
+
+        assert service.primary_asr.transcribe.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_merged_parts_result_not_served_for_whole_transcription(
+        self, service, tmp_path
+    ):
+        parts = []
+        for name in ("a.wav", "b.wav"):
+            path = tmp_path / name
+            path.write_bytes(b"RIFF" + name.encode() * 100)
+            parts.append(str(path))
+        concatenated = str(tmp_path / "concat.wav")
+        service.parallel_multi_file = True
+        service.audio_processor.concatenate_audio = AsyncMock(return_value=(concatenated, [0.0, 1.0]))
+
+        merged, _, _ = await service.transcribe(parts, speaker_recognition=True)
+        whole, _, _ = await service.transcribe(parts, speaker_recognition=False)
+        again, url, _ = await service.transcribe(parts, speaker_recognition=False)
+
+        assert merged.provider == "volcano"
+        # 两个分片各转写一次,整体转写一次,第三次命中整体转写的缓存
+        assert service.primary_asr.transcribe.await_count == 3
+        assert url == ""
+        assert [seg.speaker for seg in whole.segments] == ["Speaker 1"]
+
+    @pytest.mark.asyncio
+    async def test_fallback_result_is_cached_under_fallback_provider(self, service, audio_file):
+        from src.core.exceptions import ASRError
+
+        service.primary_asr.transcribe.side_effect = ASRError("down", provider="volcano")
+        await service.transcribe([audio_file])
+        result, _, _ = await service.transcribe([audio_file])
+
+        assert result.provider == "azure"
+        assert service.fallback_asr.transcribe.await_count == 1
@@ -0,0 +1,217 @@
+"""Unit tests for hedged ASR requests."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.exceptions import ASRError
+from src.core.models import Segment, TranscriptionResult
+from src.services.asr_hedging import ASRHedgingPolicy
+from src.services.transcription import TranscriptionService
+from src.utils.metrics import get_metrics_collector, reset_metrics_collector
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    reset_metrics_collector()
+    yield
+    reset_metrics_collector()
+
+
+def make_result(provider: str) -> TranscriptionResult:
+    return TranscriptionResult(
+        segments=[Segment(text="你好", start_time=0.0, end_time=1.0, speaker="Speaker 1")],
+        full_text="你好",
+        duration=1.0,
+        provider=provider,
+    )
+
+
+class TestASRHedgingPolicy:
+    """对冲等待时间计算"""
+
+    def test_initial_delay_until_enough_samples(self):
+        policy = ASRHedgingPolicy(initial_delay=120, min_delay=1, max_delay=1000, min_samples=3)
+        policy.record_latency(10, 60)
+        policy.record_latency(20, 60)
+        assert policy.hedge_delay(60) == 120
+
+    def test_percentile_of_recent_latencies(self):
+        policy = ASRHedgingPolicy(
+            percentile=90, min_delay=1, max_delay=1000, min_samples=1, window_size=10
+        )
+        for latency in range(1, 1001):
+            policy.record_latency(latency, 1.0)
+
+        # 只保留最近 10 个样本: 991..1000
+        assert policy.sample_count == 10
+        assert policy.hedge_delay(1.0) == pytest.approx(999.1)
+        # 时长未知时使用初始等待时间
+        assert policy.hedge_delay(None) == policy.initial_delay
+
+    def test_delay_is_clamped(self):
+        policy = ASRHedgingPolicy(min_delay=30, max_delay=60, min_samples=1)
+        policy.record_latency(5, 1.0)
+        assert policy.hedge_delay(1.0) == 30
+        policy.record_latency(500, 1.0)
+        policy.record_latency(500, 1.0)
+        assert policy.hedge_delay(1.0) == 60
+
+    def test_delay_scales_with_audio_duration_in_mixed_workload(self):
+        policy = ASRHedgingPolicy(
+            percentile=95, min_delay=0, max_delay=100000, min_samples=1, window_size=100
+        )
+        # 多数为 1 分钟短录音,少量 1 小时会议,两者每秒音频耗时相同(0.2 秒/秒)
+        for _ in range(95):
+            policy.record_latency(12, 60)
+        for _ in range(5):
+            policy.record_latency(720, 3600)
+
+        assert policy.hedge_delay(60) == pytest.approx(12)
+        # 长会议的等待时间按时长放大,不会因为短录音主导的百分位被对冲
+        assert policy.hedge_delay(3600) == pytest.approx(720)
+
+
+class TestHedgedTranscription:
+    """TranscriptionService 对冲请求"""
+
+    @pytest.fixture
+    def policy(self):
+        return ASRHedgingPolicy(initial_delay=0.05, min_delay=0.0, max_delay=10)
+
+    @pytest.fixture
+    def service(self, policy):
+        primary = MagicMock()
+        primary.get_provider_name.return_value = "volcano"
+        fallback = MagicMock()
+        fallback.get_provider_name.return_value = "azure"
+        return TranscriptionService(
+            primary_asr=primary,
+            fallback_asr=fallback,
+            storage_client=MagicMock(),
+            audio_processor=MagicMock(),
+            hedging_policy=policy,
+        )
+
+    @staticmethod
+    def delayed(provider: str, seconds: float, error: bool = False, state: dict = None):
+        async def call(**kwargs):
+            try:
+                await asyncio.sleep(seconds)
+            except asyncio.CancelledError:
+                if state is not None:
+                    state["cancelled"] = True
+                raise
+            if error:
+                raise ASRError(f"{provider} failed", provider=provider)
+            return make_result(provider)
+
+        return AsyncMock(side_effect=call)
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_does_not_hedge(self, service, policy):
+        service.primary_asr.transcribe = self.delayed("volcano", 0)
+        service.fallback_asr.transcribe = self.delayed("azure", 0)
+
+        result = await service._run_asr("https://tos/a.wav", None, None, audio_duration=1.0)
+
+        assert result.provider == "volcano"
+        service.fallback_asr.transcribe.assert_not_called()
+        assert policy.sample_count == 1
+        assert get_metrics_collector().get_counter("asr_hedges_total", {"provider": "volcano"}) == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self, service):
+        state = {}
+        service.primary_asr.transcribe = self.delayed("volcano", 5, state=state)
+        service.fallback_asr.transcribe = self.delayed("azure", 0.01)
+
+        result = await service._run_asr("https://tos/a.wav", None, None, audio_duration=1.0)
+
+        metrics = get_metrics_collector()
+        assert result.provider == "azure"
+        assert state["cancelled"]
+        assert metrics.get_counter("asr_hedges_total", {"provider": "volcano"}) == 1
+        assert metrics.get_counter("asr_hedge_wins_total", {"provider": "azure"}) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_primary_is_recorded_as_lower_bound(self, service, policy):
+        service.primary_asr.transcribe = self.delayed("volcano", 5)
+        service.fallback_asr.transcribe = self.delayed("azure", 0.01)
+
+        await service._run_asr("https://tos/a.wav", None, None, audio_duration=1.0)
+
+        assert policy.sample_count == 1
+        assert policy._latencies[0] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_delay_does_not_collapse_under_repeated_hedging(self, service):
+        policy = ASRHedgingPolicy(
+            initial_delay=0.05, min_delay=0.0, max_delay=10, min_samples=1, window_size=4
+        )
+        service.hedging_policy = policy
+        service.fallback_asr.transcribe = self.delayed("azure", 0.01)
+        for _ in range(4):
+            policy.record_latency(0.05, 1.0)
+
+        # 快慢请求交替: 慢请求每次都被对冲取消
+        for i in range(8):
+            service.primary_asr.transcribe = self.delayed("volcano", 0 if i % 2 == 0 else 5)
+            await service._run_asr("https://tos/a.wav", None, None, audio_duration=1.0)
+
+        assert policy.hedge_delay() >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_long_audio_waits_proportionally_longer(self, service, policy):
+        policy.min_samples = 1
+        policy.record_latency(0.05, 1.0)
+        service.primary_asr.transcribe = self.delayed("volcano", 0.2)
+        service.fallback_asr.transcribe = self.delayed("azure", 0)
+
+        # 同样 0.2 秒的耗时: 10 秒音频不对冲,1 秒音频被对冲
+        long_result = await service._run_asr("https://tos/a.wav", None, None, audio_duration=10.0)
+        short_result = await service._run_asr("https://tos/b.wav", None, None, audio_duration=1.0)
+
+        assert long_result.provider == "volcano"
+        assert short_result.provider == "azure"
+        assert policy._latencies[1] == pytest.approx(0.02, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_primary_can_still_win_after_hedge(self, service):
+        state = {}
+        service.primary_asr.transcribe = self.delayed("volcano", 0.1)
+        service.fallback_asr.transcribe = self.delayed("azure", 5, state=state)
+
+        result = await service._run_asr("https://tos/a.wav", None, None, audio_duration=1.0)
+
+        assert result.provider == "volcano"
+        assert state["cancelled"]
+        assert get_metrics_collector().get_counter("asr_hedge_wins_total", {"provider": "volcano"}) == 1
+
+    @pytest.mark.asyncio
+    async def test_hedged_fallback_failure_waits_for_primary(self, service):
+        service.primary_asr.transcribe = self.delayed("volcano", 0.1)
+        service.fallback_asr.transcribe = self.delayed("azure", 0.01, error=True)
+
+        result = await service._run_asr("https://tos/a.wav", None, None, audio_duration=1.0)
+
+        assert result.provider == "volcano"
+
+    @pytest.mark.asyncio
+    async def test_early_primary_failure_falls_back_without_hedge(self, service):
+        service.primary_asr.transcribe = self.delayed("volcano", 0, error=True)
+        service.fallback_asr.transcribe = self.delayed("azure", 0)
+
+        result = await service._run_asr("https://tos/a.wav", None, None, audio_duration=1.0)
+
+        assert result.provider == "azure"
+        assert get_metrics_collector().get_counter("asr_hedges_total", {"provider": "volcano"}) == 0
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises(self, service):
+        service.primary_asr.transcribe = self.delayed("volcano", 0.1, error=True)
+        service.fallback_asr.transcribe = self.delayed("azure", 0.01, error=True)
+
+        with pytest.raises(ASRError):
+            await service._run_asr("https://tos/a.wav", None, None, audio_duration=1.0)
@@ -0,0 +1,157 @@
+"""Unit tests for long-audio chunk planning, stitching and chunked transcription."""
+
+import asyncio
+import struct
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.models import Segment, TranscriptionResult
+from src.services.chunking import AudioChunk, plan_chunks, stitch_chunk_results
+from src.services.transcription import TranscriptionService
+from src.utils.audio import AudioProcessor, PCMWaveBuffer, build_wav_header
+
+SAMPLE_RATE = 16000
+
+
+def write_wav(path, duration: float, silences=()) -> str:
+    """写入 16kHz 单声道 WAV: 全程有声,silences 中的区间静音"""
+    frames = int(duration * SAMPLE_RATE)
+    loud = struct.pack("<h", 8000)
+    quiet = struct.pack("<h", 0)
+    samples = bytearray()
+    for second in range(int(duration)):
+        is_quiet = any(start <= second < end for start, end in silences)
+        samples += (quiet if is_quiet else loud) * SAMPLE_RATE
+    samples += loud * (frames - len(samples) // 2)
+    path.write_bytes(build_wav_header(len(samples), SAMPLE_RATE, 1, 2) + bytes(samples))
+    return str(path)
+
+
+def seg(text, start, end, speaker):
+    return Segment(text=text, start_time=start, end_time=end, speaker=speaker)
+
+
+def result(segments, provider="volcano"):
+    return TranscriptionResult(
+        segments=segments,
+        full_text="".join(s.text for s in segments),
+        duration=max((s.end_time for s in segments), default=0.0),
+        provider=provider,
+    )
+
+
+class TestPlanChunks:
+    """静音切分规划"""
+
+    def test_cuts_inside_silent_gap_near_boundary(self, tmp_path):
+        path = write_wav(tmp_path / "a.wav", 250, silences=[(112, 114)])
+        with PCMWaveBuffer(path) as buffer:
+            chunks = plan_chunks(buffer, chunk_seconds=100, overlap_seconds=5, search_seconds=15)
+
+        assert len(chunks) == 2
+        assert 112 <= chunks[0].keep_end <= 114
+        assert chunks[1].keep_start == chunks[0].keep_end
+        assert chunks[0].end == pytest.approx(chunks[0].keep_end + 5)
+        assert chunks[1].start == pytest.approx(chunks[1].keep_start - 5)
+        assert chunks[-1].keep_end == pytest.approx(250)
+
+    def test_uniform_audio_cuts_at_boundary(self, tmp_path):
+        path = write_wav(tmp_path / "b.wav", 320)
+        with PCMWaveBuffer(path) as buffer:
+            chunks = plan_chunks(buffer, chunk_seconds=100, overlap_seconds=0, search_seconds=10)
+
+        # 能量处处相同时取离边界最近的帧;尾块不短于半个分块
+        assert [round(c.keep_start) for c in chunks] == [0, 100, 200]
+        assert chunks[-1].keep_end == pytest.approx(320)
+
+
+class TestStitchChunkResults:
+    """分块结果拼接"""
+
+    def test_overlap_is_deduplicated_and_speakers_aligned(self):
+        chunks = [
+            AudioChunk(index=0, start=0, end=105, keep_start=0, keep_end=100),
+            AudioChunk(index=1, start=95, end=200, keep_start=100, keep_end=200),
+        ]
+        first = result([
+            seg("a", 10, 20, "Speaker 0"),
+            seg("b", 96, 99, "Speaker 1"),   # 重叠区,中点在第一块
+            seg("c", 101, 104, "Speaker 0"),  # 重叠区,中点在第二块 -> 丢弃
+        ])
+        second = result([
+            seg("b", 1, 4, "Speaker 5"),      # 96-99 -> 丢弃,与 Speaker 1 对齐
+            seg("c", 6, 9, "Speaker 3"),      # 101-104 -> 保留,与 Speaker 0 对齐
+            seg("d", 50, 60, "Speaker 7"),    # 新说话人
+        ], provider="azure")
+
+        stitched = stitch_chunk_results([first, second], chunks)
+
+        assert [(s.text, s.start_time, s.speaker) for s in stitched.segments] == [
+            ("a", 10, "Speaker 1"),
+            ("b", 96, "Speaker 2"),
+            ("c", 101, "Speaker 1"),
+            ("d", 145, "Speaker 3"),
+        ]
+        assert stitched.full_text == "a\nb\nc\nd"
+        assert stitched.provider == "volcano+azure"
+
+
+class TestChunkedTranscription:
+    """TranscriptionService 长音频分块转写"""
+
+    @pytest.fixture
+    def service(self):
+        storage = MagicMock()
+        storage.upload_file = AsyncMock(side_effect=lambda local_path, **kw: local_path)
+        storage.generate_presigned_url = AsyncMock(
+            side_effect=lambda object_key, **kw: f"https://tos/{object_key}"
+        )
+        fallback = MagicMock()
+        fallback.get_provider_name.return_value = "azure"
+        return TranscriptionService(
+            primary_asr=MagicMock(),
+            fallback_asr=fallback,
+            storage_client=storage,
+            audio_processor=AudioProcessor(),
+            long_audio_chunk_seconds=60,
+            chunk_overlap_seconds=2,
+            chunk_search_seconds=5,
+            max_chunk_concurrency=2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_chunks_run_with_bounded_concurrency(self, service, tmp_path):
+        path = write_wav(tmp_path / "long.wav", 300)
+        running = 0
+        peak = 0
+
+        async def fake_transcribe(audio_url, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return result([seg("x", 10, 20, "Speaker 1")])
+
+        service.primary_asr.transcribe = AsyncMock(side_effect=fake_transcribe)
+
+        transcript, audio_url, local_path = await service.transcribe([path])
+
+        assert service.primary_asr.transcribe.await_count == 5
+        assert peak == 2
+        assert audio_url == ""
+        assert local_path == path
+        assert [s.start_time for s in transcript.segments] == pytest.approx(
+            [10, 68, 128, 188, 248], abs=0.5
+        )
+
+    @pytest.mark.asyncio
+    async def test_short_audio_is_not_chunked(self, service, tmp_path):
+        path = write_wav(tmp_path / "short.wav", 80)
+        service.primary_asr.transcribe = AsyncMock(return_value=result([seg("x", 0, 1, "Speaker 1")]))
+
+        _, audio_url, _ = await service.transcribe([path])
+
+        service.primary_asr.transcribe.assert_awaited_once()
+        assert audio_url.startswith("https://tos/")
@@ -0,0 +1,240 @@
+"""Tests for the LLM artifact cache."""
+
+import json
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.config.models import LLMCacheConfig
+from src.core.models import (
+    GeneratedArtifact,
+    OutputLanguage,
+    PromptInstance,
+    PromptTemplate,
+    Segment,
+    TranscriptionResult,
+)
+from src.services.artifact_generation import ArtifactGenerationService
+from src.services.llm_cache import LLMArtifactCache, get_llm_artifact_cache
+from src.utils.metrics import get_metrics_collector, reset_metrics_collector
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    reset_metrics_collector()
+    yield
+    reset_metrics_collector()
+
+
+@pytest.fixture
+def transcript():
+    return TranscriptionResult(
+        segments=[
+            Segment(text="我们讨论一下预算", start_time=0.0, end_time=3.0, speaker="张三"),
+            Segment(text="好的", start_time=3.0, end_time=4.0, speaker="李四"),
+        ],
+        full_text="我们讨论一下预算好的",
+        duration=4.0,
+        provider="volcano",
+    )
+
+
+@pytest.fixture
+def template():
+    return PromptTemplate(
+        template_id="tpl_001",
+        title="标准会议纪要",
+        description="生成标准会议纪要",
+        prompt_body="请生成会议纪要:\n{transcript}",
+        artifact_type="meeting_minutes",
+        supported_languages=["zh-CN"],
+        parameter_schema={},
+        is_system=True,
+    )
+
+
+@pytest.fixture
+def prompt_instance():
+    return PromptInstance(template_id="tpl_001", language="zh-CN", parameters={})
+
+
+def make_key(template, prompt_instance, **overrides):
+    args = dict(
+        formatted_transcript="[00:00:00] 张三: 我们讨论一下预算",
+        template=template,
+        prompt_instance=prompt_instance,
+        output_language=OutputLanguage.ZH_CN,
+        model_fingerprint="gemini:gemini-2.5-flash",
+    )
+    args.update(overrides)
+    return LLMArtifactCache.make_key(**args)
+
+
+class TestCacheKey:
+    """缓存键"""
+
+    def test_key_is_deterministic(self, template, prompt_instance):
+        assert make_key(template, prompt_instance) == make_key(template, prompt_instance)
+
+    def test_key_changes_with_every_input(self, template, prompt_instance):
+        base = make_key(template, prompt_instance)
+        variants = [
+            make_key(template, prompt_instance, formatted_transcript="[00:00:00] 张三: 改了"),
+            make_key(
+                template.model_copy(update={"prompt_body": "请总结:\n{transcript}"}),
+                prompt_instance,
+            ),
+            make_key(
+                template,
+                prompt_instance.model_copy(update={"parameters": {"detail": "high"}}),
+            ),
+            make_key(
+                template,
+                prompt_instance.model_copy(update={"custom_instructions": "突出风险"}),
+            ),
+            make_key(template, prompt_instance, output_language=OutputLanguage.EN_US),
+            make_key(template, prompt_instance, model_fingerprint="gemini:gemini-2.5-pro"),
+            make_key(template, prompt_instance, meeting_date="2025-01-01"),
+        ]
+        assert base not in variants
+        assert len(set(variants)) == len(variants)
+
+
+class TestLLMArtifactCache:
+    """缓存读写"""
+
+    @pytest.mark.asyncio
+    async def test_put_then_get(self, tmp_path):
+        cache = LLMArtifactCache(cache_dir=str(tmp_path))
+
+        assert await cache.get("ab" * 32, "meeting_minutes") is None
+        await cache.put("ab" * 32, {"summary": "预算"}, {"model": "gemini"})
+        entry = await cache.get("ab" * 32, "meeting_minutes")
+
+        assert entry == {"content": {"summary": "预算"}, "metadata": {"model": "gemini"}}
+        metrics = get_metrics_collector()
+        labels = {"artifact_type": "meeting_minutes"}
+        assert metrics.get_counter("llm_cache_hits_total", labels) == 1
+        assert metrics.get_counter("llm_cache_misses_total", labels) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self, tmp_path):
+        cache = LLMArtifactCache(cache_dir=str(tmp_path), ttl_seconds=60)
+        await cache.put("cd" * 32, {"summary": "旧"}, {})
+
+        path = cache._entry_path("cd" * 32)
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        entry["cached_at"] = time.time() - 120
+        path.write_text(json.dumps(entry), encoding="utf-8")
+
+        assert await cache.get("cd" * 32, "summary_notes") is None
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = LLMArtifactCache(cache_dir=str(tmp_path), max_size_bytes=10**6)
+        await cache.put("01" * 32, {"text": "x" * 400}, {})
+        await cache.put("02" * 32, {"text": "y" * 400}, {})
+        old = time.time() - 100
+        os.utime(cache._entry_path("01" * 32), (old, old))
+
+        cache.max_size_bytes = cache._entry_path("02" * 32).stat().st_size + 10
+        await cache.put("03" * 32, {"text": "z"}, {})
+
+        assert not cache._entry_path("01" * 32).exists()
+        assert cache._entry_path("03" * 32).exists()
+        assert get_metrics_collector().get_counter("llm_cache_evictions_total") >= 1
+
+    def test_disabled_config_returns_none(self, tmp_path):
+        assert get_llm_artifact_cache(LLMCacheConfig(enabled=False)) is None
+        config = LLMCacheConfig(directory=str(tmp_path))
+        assert get_llm_artifact_cache(config) is get_llm_artifact_cache(config)
+
+
+class TestArtifactGenerationCaching:
+    """ArtifactGenerationService 使用缓存"""
+
+    @pytest.fixture
+    def llm(self):
+        provider = MagicMock()
+        provider.format_transcript.side_effect = lambda t, timestamp_interval=None: "\n".join(
+            f"{s.speaker}: {s.text}" for s in t.segments
+        )
+        provider.get_model_fingerprint.return_value = "gemini:test"
+
+        async def generate_artifact(transcript, prompt_instance, **kwargs):
+            return GeneratedArtifact(
+                artifact_id=kwargs["artifact_id"],
+                task_id=kwargs["task_id"],
+                artifact_type="meeting_minutes",
+                version=kwargs["version"],
+                prompt_instance=prompt_instance,
+                content=json.dumps({"summary": "讨论了预算"}, ensure_ascii=False),
+                metadata={"model": "gemini-test"},
+                created_by=kwargs["created_by"],
+            )
+
+        provider.generate_artifact = AsyncMock(side_effect=generate_artifact)
+        return provider
+
+    async def _generate(self, service, transcript, template, prompt_instance, **kwargs):
+        return await service.generate_artifact(
+            task_id="task_1",
+            transcript=transcript,
+            artifact_type="meeting_minutes",
+            prompt_instance=prompt_instance,
+            template=template,
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeat_generation_hits_cache(
+        self, llm, tmp_path, transcript, template, prompt_instance
+    ):
+        service = ArtifactGenerationService(
+            llm_provider=llm, artifact_cache=LLMArtifactCache(cache_dir=str(tmp_path))
+        )
+
+        first = await self._generate(service, transcript, template, prompt_instance)
+        second = await self._generate(service, transcript, template, prompt_instance)
+
+        assert llm.generate_artifact.await_count == 1
+        assert second.get_content_dict() == first.get_content_dict()
+        assert second.metadata["cache_hit"] is True
+        assert second.metadata["model"] == "gemini-test"
+        assert second.artifact_id != first.artifact_id
+        assert "cache_hit" not in first.metadata
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses_cache(
+        self, llm, tmp_path, transcript, template, prompt_instance
+    ):
+        service = ArtifactGenerationService(
+            llm_provider=llm, artifact_cache=LLMArtifactCache(cache_dir=str(tmp_path))
+        )
+
+        await self._generate(service, transcript, template, prompt_instance)
+        await self._generate(service, transcript, template, prompt_instance, use_cache=False)
+
+        assert llm.generate_artifact.await_count == 2
+        assert "use_cache" not in llm.generate_artifact.await_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_changed_parameters_miss_cache(
+        self, llm, tmp_path, transcript, template, prompt_instance
+    ):
+        service = ArtifactGenerationService(
+            llm_provider=llm, artifact_cache=LLMArtifactCache(cache_dir=str(tmp_path))
+        )
+
+        await self._generate(service, transcript, template, prompt_instance)
+        await self._generate(
+            service,
+            transcript,
+            template,
+            prompt_instance.model_copy(update={"parameters": {"detail": "high"}}),
+        )
+
+        assert llm.generate_artifact.await_count == 2
@@ -0,0 +1,227 @@
+"""Tests for map-reduce artifact generation of long transcripts."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.models import (
+    GeneratedArtifact,
+    OutputLanguage,
+    PromptInstance,
+    PromptTemplate,
+    Segment,
+    TranscriptionResult,
+)
+from src.services.artifact_generation import ArtifactGenerationService
+from src.services.map_reduce import (
+    build_condensed_transcript,
+    estimate_transcript_tokens,
+    segment_tokens,
+    split_transcript,
+)
+
+
+def make_transcript(speakers, text="这是一段比较长的发言内容" * 5):
+    segments = [
+        Segment(text=text, start_time=i * 10.0, end_time=i * 10.0 + 9.0, speaker=speaker)
+        for i, speaker in enumerate(speakers)
+    ]
+    return TranscriptionResult(
+        segments=segments,
+        full_text="".join(s.text for s in segments),
+        duration=segments[-1].end_time,
+        provider="volcano",
+    )
+
+
+@pytest.fixture
+def template():
+    return PromptTemplate(
+        template_id="tpl_001",
+        title="标准会议纪要",
+        description="生成标准会议纪要",
+        prompt_body="请生成会议纪要:\n{transcript}",
+        artifact_type="meeting_minutes",
+        supported_languages=["zh-CN"],
+        parameter_schema={},
+        is_system=True,
+    )
+
+
+@pytest.fixture
+def prompt_instance():
+    return PromptInstance(template_id="tpl_001", language="zh-CN", parameters={})
+
+
+class TestSplitTranscript:
+    """按 Token 预算切分"""
+
+    def test_splits_at_speaker_turn_boundaries(self):
+        transcript = make_transcript(["张三", "张三", "李四", "李四", "王五", "王五"])
+        per_segment = segment_tokens(transcript.segments[0])
+
+        chunks = split_transcript(transcript, max_tokens=per_segment * 3)
+
+        # 每个轮次 2 个片段,预算只够一个轮次
+        assert [[s.speaker for s in c.segments] for c in chunks] == [
+            ["张三", "张三"], ["李四", "李四"], ["王五", "王五"],
+        ]
+        assert sum(len(c.segments) for c in chunks) == 6
+
+    def test_oversized_turn_is_split_at_segments(self):
+        transcript = make_transcript(["张三"] * 5)
+        per_segment = segment_tokens(transcript.segments[0])
+
+        chunks = split_transcript(transcript, max_tokens=per_segment * 2)
+
+        assert [len(c.segments) for c in chunks] == [2, 2, 1]
+        assert all(estimate_transcript_tokens(c) <= per_segment * 2 for c in chunks)
+
+    def test_condensed_transcript_keeps_chunk_time_ranges(self):
+        transcript = make_transcript(["张三", "李四", "王五", "赵六"])
+        chunks = split_transcript(transcript, max_tokens=segment_tokens(transcript.segments[0]) * 2)
+
+        condensed = build_condensed_transcript(["要点一", "要点二"], chunks, transcript)
+
+        assert [(s.start_time, s.end_time, s.text) for s in condensed.segments] == [
+            (0.0, 19.0, "要点一"),
+            (20.0, 39.0, "要点二"),
+        ]
+
+
+class TestMapReduceGeneration:
+    """ArtifactGenerationService map-reduce 模式"""
+
+    @pytest.fixture
+    def llm(self):
+        provider = AsyncMock()
+
+        async def generate_artifact(transcript, prompt_instance, **kwargs):
+            return GeneratedArtifact(
+                artifact_id=kwargs["artifact_id"],
+                task_id=kwargs["task_id"],
+                artifact_type="meeting_minutes",
+                version=kwargs["version"],
+                prompt_instance=prompt_instance,
+                content=json.dumps({"content": transcript.full_text}, ensure_ascii=False),
+                metadata=kwargs.get("metadata") or {},
+                created_by=kwargs["created_by"],
+            )
+
+        provider.generate_artifact.side_effect = generate_artifact
+        provider.supports_chunk_summaries = MagicMock(return_value=True)
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_long_transcript_is_mapped_concurrently_then_reduced(
+        self, llm, template, prompt_instance
+    ):
+        transcript = make_transcript(["张三", "李四"] * 8)
+        per_segment = segment_tokens(transcript.segments[0])
+        running = 0
+        peak = 0
+
+        async def summarize(chunk, output_language, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return f"第{kwargs['chunk_index']}/{kwargs['chunk_count']}部分要点"
+
+        llm.summarize_transcript_chunk.side_effect = summarize
+        service = ArtifactGenerationService(
+            llm_provider=llm,
+            map_reduce_threshold_tokens=per_segment * 4,
+            map_chunk_tokens=per_segment * 4,
+            max_map_concurrency=3,
+        )
+
+        artifact = await service.generate_artifact(
+            task_id="task_1",
+            transcript=transcript,
+            artifact_type="meeting_minutes",
+            prompt_instance=prompt_instance,
+            template=template,
+        )
+
+        assert llm.summarize_transcript_chunk.await_count == 4
+        assert peak == 3
+        instructions = llm.summarize_transcript_chunk.await_args.kwargs["instructions"]
+        assert "请生成会议纪要" in instructions and "{transcript}" not in instructions
+
+        reduce_call = llm.generate_artifact.await_args
+        assert reduce_call.kwargs["transcript"].full_text.splitlines() == [
+            f"第{i}/4部分要点" for i in range(1, 5)
+        ]
+        assert artifact.metadata["map_reduce"]["chunks"] == 4
+
+    @pytest.mark.asyncio
+    async def test_short_transcript_uses_single_pass(self, llm, template, prompt_instance):
+        transcript = make_transcript(["张三", "李四"])
+        service = ArtifactGenerationService(
+            llm_provider=llm, map_reduce_threshold_tokens=100000
+        )
+
+        await service.generate_artifact(
+            task_id="task_1",
+            transcript=transcript,
+            artifact_type="meeting_minutes",
+            prompt_instance=prompt_instance,
+            output_language=OutputLanguage.ZH_CN,
+            template=template,
+        )
+
+        llm.summarize_transcript_chunk.assert_not_called()
+        assert llm.generate_artifact.await_args.kwargs["transcript"] is transcript
+
+    @pytest.mark.asyncio
+    async def test_provider_without_chunk_summaries_uses_single_pass(
+        self, llm, template, prompt_instance
+    ):
+        transcript = make_transcript(["张三", "李四"] * 8)
+        per_segment = segment_tokens(transcript.segments[0])
+        llm.supports_chunk_summaries.return_value = False
+        service = ArtifactGenerationService(
+            llm_provider=llm,
+            map_reduce_threshold_tokens=per_segment * 4,
+            map_chunk_tokens=per_segment * 4,
+        )
+
+        await service.generate_artifact(
+            task_id="task_1",
+            transcript=transcript,
+            artifact_type="meeting_minutes",
+            prompt_instance=prompt_instance,
+            template=template,
+        )
+
+        llm.summarize_transcript_chunk.assert_not_called()
+        assert llm.generate_artifact.await_args.kwargs["transcript"] is transcript
+
+    @pytest.mark.asyncio
+    async def test_each_map_call_takes_a_rate_limit_slot(self, llm, template, prompt_instance):
+        transcript = make_transcript(["张三", "李四"] * 8)
+        per_segment = segment_tokens(transcript.segments[0])
+        limiter = MagicMock()
+        limiter.acquire = AsyncMock()
+        llm.summarize_transcript_chunk.return_value = "要点"
+        service = ArtifactGenerationService(
+            llm_provider=llm,
+            map_reduce_threshold_tokens=per_segment * 4,
+            map_chunk_tokens=per_segment * 4,
+            llm_rate_limiter=limiter,
+        )
+
+        await service.generate_artifact(
+            task_id="task_1",
+            transcript=transcript,
+            artifact_type="meeting_minutes",
+            prompt_instance=prompt_instance,
+            template=template,
+        )
+
+        assert llm.summarize_transcript_chunk.await_count == 4
+        assert limiter.acquire.await_count == 4
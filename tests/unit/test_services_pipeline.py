@@ -490,3 +490,35 @@ class TestPipelineService:
         assert status["task_id"] == "task_123"
         assert status["state"] == "unknown"
         assert "not configured" in status["message"]
+
+    def test_bind_repositories_does_not_mutate_shared_pipeline(
+        self,
+        mock_transcription_service,
+        mock_speaker_recognition_service,
+        mock_correction_service,
+    ):
+        """Test binding per-task repositories returns an isolated copy"""
+        from unittest.mock import MagicMock
+
+        from src.services.artifact_generation import ArtifactGenerationService
+
+        artifact_service = ArtifactGenerationService(llm_provider=MagicMock())
+        pipeline = PipelineService(
+            transcription_service=mock_transcription_service,
+            speaker_recognition_service=mock_speaker_recognition_service,
+            correction_service=mock_correction_service,
+            artifact_generation_service=artifact_service,
+        )
+
+        task_repo, artifact_repo = MagicMock(), MagicMock()
+        bound = pipeline.bind_repositories(task_repo=task_repo, artifact_repo=artifact_repo)
+
+        # 副本持有新仓库,共享服务实例
+        assert bound.tasks is task_repo
+        assert bound.artifact_generation.artifacts is artifact_repo
+        assert bound.artifact_generation.llm is artifact_service.llm
+        assert bound.transcription is pipeline.transcription
+
+        # 原管线不受影响
+        assert pipeline.tasks is None
+        assert pipeline.artifact_generation.artifacts is None
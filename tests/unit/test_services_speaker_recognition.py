@@ -22,6 +22,7 @@ def mock_audio_processor():
     """Mock audio processor"""
     processor = MagicMock()
     processor.extract_segment = AsyncMock(return_value=b"audio_sample_data")
+    processor.open_pcm_buffer = MagicMock(return_value=None)
     return processor
 
 
@@ -106,6 +107,26 @@ class TestSpeakerRecognitionService:
         assert result == {"Speaker 0": "张三", "Speaker 1": "李四"}
         mock_voiceprint.identify_speakers.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_recognize_speakers_passes_extracted_samples(
+        self, speaker_recognition_service, sample_transcript, mock_voiceprint, mock_audio_processor
+    ):
+        """测试样本只提取一次并传给声纹提供商"""
+        mock_audio_processor.convert_format = AsyncMock(return_value="/tmp/audio.wav")
+
+        await speaker_recognition_service.recognize_speakers(
+            transcript=sample_transcript,
+            audio_path="/tmp/audio.wav",
+        )
+
+        # 每个说话人提取一次
+        assert mock_audio_processor.extract_segment.call_count == 2
+        call_kwargs = mock_voiceprint.identify_speakers.call_args[1]
+        assert call_kwargs["speaker_samples"] == {
+            "Speaker 0": b"audio_sample_data",
+            "Speaker 1": b"audio_sample_data",
+        }
+
     @pytest.mark.asyncio
     async def test_recognize_speakers_with_known_speakers(
         self, speaker_recognition_service, sample_transcript, mock_voiceprint, mock_audio_processor
@@ -299,3 +320,38 @@ class TestSpeakerRecognitionService:
         stats = await speaker_recognition_service.get_speaker_statistics(transcript)
 
         assert stats["Speaker 0"]["avg_confidence"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_extract_speaker_samples_slices_pcm_buffer(mock_voiceprint, mock_storage, sample_transcript):
+    """测试目标格式 WAV 从同一内存映射中切片所有样本"""
+    import os
+    import tempfile
+    import wave
+
+    from src.utils.audio import AudioProcessor
+
+    temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    temp_file.close()
+    with wave.open(temp_file.name, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\x00\x00" * 16000 * 14)
+
+    processor = AudioProcessor()
+    processor.extract_segment = AsyncMock()
+    service = SpeakerRecognitionService(
+        voiceprint_provider=mock_voiceprint,
+        audio_processor=processor,
+        storage_client=mock_storage,
+    )
+    try:
+        samples = await service._extract_speaker_samples(sample_transcript, temp_file.name)
+    finally:
+        os.remove(temp_file.name)
+
+    processor.extract_segment.assert_not_called()
+    # Speaker 0: 5.5-9.0s, Speaker 1: 9.0-13.0s (3-6 秒内置信度最高的片段)
+    assert len(samples["Speaker 0"]) == 44 + int(3.5 * 16000) * 2
+    assert len(samples["Speaker 1"]) == 44 + 4 * 16000 * 2
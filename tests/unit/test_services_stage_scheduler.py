@@ -0,0 +1,86 @@
+"""Unit tests for pipeline stage scheduler."""
+
+import asyncio
+
+import pytest
+
+from src.services.stage_scheduler import PipelineStage, StageScheduler
+
+
+async def _occupy(scheduler, stage, counters, peak, delay=0.02):
+    async with scheduler.stage(stage, "task"):
+        counters[stage] += 1
+        peak[stage] = max(peak[stage], counters[stage])
+        await asyncio.sleep(delay)
+        counters[stage] -= 1
+
+
+@pytest.mark.asyncio
+async def test_stage_limits_are_independent():
+    """测试各阶段并发限制互相独立"""
+    scheduler = StageScheduler(limits={PipelineStage.ASR: 3, PipelineStage.LLM: 1})
+    counters = {stage: 0 for stage in PipelineStage}
+    peak = {stage: 0 for stage in PipelineStage}
+
+    jobs = [_occupy(scheduler, PipelineStage.ASR, counters, peak) for _ in range(6)]
+    jobs += [_occupy(scheduler, PipelineStage.LLM, counters, peak) for _ in range(3)]
+    jobs += [_occupy(scheduler, PipelineStage.VOICEPRINT, counters, peak) for _ in range(4)]
+    await asyncio.gather(*jobs)
+
+    assert peak[PipelineStage.ASR] == 3
+    assert peak[PipelineStage.LLM] == 1
+    # 未配置的阶段不限制
+    assert peak[PipelineStage.VOICEPRINT] == 4
+
+
+@pytest.mark.asyncio
+async def test_stage_stats_report_waiting_tasks():
+    """测试阶段统计中的排队数量"""
+    scheduler = StageScheduler(limits={PipelineStage.VOICEPRINT: 1})
+    release = asyncio.Event()
+
+    async def hold():
+        async with scheduler.stage(PipelineStage.VOICEPRINT):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+
+    stats = scheduler.get_stats()["voiceprint"]
+    assert stats == {"limit": 1, "running": 1, "waiting": 1}
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert scheduler.get_stats()["voiceprint"]["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_rate_limit_spaces_calls():
+    """测试 LLM 阶段按每分钟调用数限速"""
+    scheduler = StageScheduler(llm_requests_per_minute=1200)  # 间隔 0.05s
+    starts = []
+
+    async def call():
+        async with scheduler.stage(PipelineStage.LLM):
+            starts.append(asyncio.get_running_loop().time())
+
+    await asyncio.gather(*(call() for _ in range(3)))
+    assert starts[2] - starts[0] >= 0.09
+
+
+def test_scheduler_usable_across_event_loops():
+    """测试逐个处理模式下(每个任务一个事件循环)调度器可重复使用"""
+    scheduler = StageScheduler(limits={PipelineStage.ASR: 1})
+
+    async def run_two():
+        counters = {stage: 0 for stage in PipelineStage}
+        peak = {stage: 0 for stage in PipelineStage}
+        await asyncio.gather(
+            _occupy(scheduler, PipelineStage.ASR, counters, peak),
+            _occupy(scheduler, PipelineStage.ASR, counters, peak),
+        )
+        return peak[PipelineStage.ASR]
+
+    assert asyncio.run(run_two()) == 1
+    assert asyncio.run(run_two()) == 1
@@ -0,0 +1,115 @@
+"""Tests for coalesced task status writes."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.models import TaskState
+from src.services.pipeline import PipelineService
+from src.services.status_writer import TaskStatusWriter
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, updates):
+        self.batches.append([dict(update) for update in updates])
+
+
+async def wait_for_batches(recorder, count, timeout=1.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while len(recorder.batches) < count:
+        assert loop.time() < deadline, f"expected {count} batches, got {recorder.batches}"
+        await asyncio.sleep(0.005)
+
+
+class TestTaskStatusWriter:
+    """合并写入"""
+
+    @pytest.mark.asyncio
+    async def test_progress_ticks_are_coalesced_per_interval(self):
+        recorder = RecordingWriter()
+        writer = TaskStatusWriter(flush_interval=0.1, write_batch=recorder)
+
+        writer.submit("task_1", "transcribing", progress=1.0)
+        await wait_for_batches(recorder, 1)
+        for progress in (2.0, 3.0, 4.0, 5.0):
+            writer.submit("task_1", "transcribing", progress=progress, estimated_time=60 - progress)
+        await asyncio.sleep(0.02)
+        assert len(recorder.batches) == 1
+
+        await wait_for_batches(recorder, 2)
+        assert recorder.batches == [
+            [{"task_id": "task_1", "state": "transcribing", "progress": 1.0}],
+            [{"task_id": "task_1", "state": "transcribing", "progress": 5.0, "estimated_time": 55.0}],
+        ]
+        await writer.aclose()
+
+    @pytest.mark.asyncio
+    async def test_terminal_state_flushes_immediately_with_other_tasks(self):
+        recorder = RecordingWriter()
+        writer = TaskStatusWriter(flush_interval=10, write_batch=recorder)
+
+        writer.submit("task_1", "summarizing", progress=70.0)
+        await wait_for_batches(recorder, 1)
+        writer.submit("task_2", "identifying", progress=45.0)
+        writer.submit("task_1", "success", progress=100.0)
+
+        await wait_for_batches(recorder, 2)
+        assert sorted(recorder.batches[1], key=lambda u: u["task_id"]) == [
+            {"task_id": "task_1", "state": "success", "progress": 100.0},
+            {"task_id": "task_2", "state": "identifying", "progress": 45.0},
+        ]
+        await writer.aclose()
+
+    @pytest.mark.asyncio
+    async def test_updates_from_threads_and_flush(self):
+        recorder = RecordingWriter()
+        writer = TaskStatusWriter(flush_interval=10, write_batch=recorder)
+
+        writer.submit("task_1", "transcribing", progress=0.0)
+        await wait_for_batches(recorder, 1)
+        await asyncio.to_thread(writer.submit, "task_1", "transcribing", 12.5)
+        await writer.flush()
+
+        assert recorder.batches[-1] == [{"task_id": "task_1", "state": "transcribing", "progress": 12.5}]
+        await writer.aclose()
+
+    def test_writes_synchronously_without_event_loop(self):
+        recorder = RecordingWriter()
+        writer = TaskStatusWriter(write_batch=recorder)
+
+        writer.submit("task_1", "failed", error_details="boom")
+
+        assert recorder.batches == [[{"task_id": "task_1", "state": "failed", "error_details": "boom"}]]
+
+
+class TestPipelineStatusUpdates:
+    """管线通过写入器上报状态"""
+
+    def test_pipeline_submits_to_writer(self):
+        writer = MagicMock()
+        task_repo = MagicMock()
+        pipeline = PipelineService(
+            transcription_service=MagicMock(),
+            speaker_recognition_service=MagicMock(),
+            correction_service=MagicMock(),
+            artifact_generation_service=MagicMock(),
+            task_repo=task_repo,
+            status_writer=writer,
+        )
+
+        pipeline._update_task_status("task_1", TaskState.IDENTIFYING, progress=50.0, audio_duration=100.0)
+
+        writer.submit.assert_called_once_with(
+            task_id="task_1",
+            state="identifying",
+            progress=50.0,
+            estimated_time=12,
+            error_details=None,
+            audio_duration=100.0,
+        )
+        task_repo.update_status.assert_not_called()
@@ -0,0 +1,233 @@
+"""Tests for transcript compaction before prompting."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.config.models import GeminiConfig, TranscriptCompactionConfig
+from src.core.models import (
+    GeneratedArtifact,
+    PromptInstance,
+    PromptTemplate,
+    Segment,
+    TranscriptionResult,
+)
+from src.providers.gemini_llm import GeminiLLM
+from src.services.artifact_generation import ArtifactGenerationService
+from src.services.transcript_compaction import compact_transcript, strip_fillers
+from src.utils.cost import estimate_text_tokens
+from src.utils.metrics import get_metrics_collector, reset_metrics_collector
+
+
+def make_transcript(rows):
+    segments = [
+        Segment(text=text, start_time=start, end_time=end, speaker=speaker)
+        for speaker, text, start, end in rows
+    ]
+    return TranscriptionResult(
+        segments=segments,
+        full_text="".join(s.text for s in segments),
+        duration=segments[-1].end_time if segments else 0.0,
+        provider="volcano",
+    )
+
+
+class TestStripFillers:
+    """语气词过滤"""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("嗯，我们先看预算", "我们先看预算"),
+            ("这个呃方案可以", "这个方案可以"),
+            ("嗯嗯。", ""),
+            ("Um, I think uh we should ship", "I think we should ship"),
+            ("金额和额度不变", "金额和额度不变"),
+            ("Hmm.", ""),
+        ],
+    )
+    def test_strip_fillers(self, text, expected):
+        assert strip_fillers(text) == expected
+
+
+class TestCompactTranscript:
+    """转写压缩"""
+
+    def test_merges_consecutive_same_speaker_segments(self):
+        transcript = make_transcript([
+            ("张三", "我们先看预算。", 0.0, 2.0),
+            ("张三", "然后看排期。", 2.5, 4.0),
+            ("李四", "嗯。", 4.2, 4.5),
+            ("张三", "最后是人员。", 5.0, 7.0),
+            ("李四", "我同意。", 20.0, 21.0),
+        ])
+
+        compacted = compact_transcript(transcript)
+
+        # 李四的附和被丢弃后,张三的三段合并为一个轮次
+        assert [(s.speaker, s.text, s.start_time, s.end_time) for s in compacted.segments] == [
+            ("张三", "我们先看预算。然后看排期。最后是人员。", 0.0, 7.0),
+            ("李四", "我同意。", 20.0, 21.0),
+        ]
+        assert len(transcript.segments) == 5
+
+    def test_gap_and_turn_length_limit_merging(self):
+        transcript = make_transcript([
+            ("张三", "第一段", 0.0, 50.0),
+            ("张三", "第二段", 50.0, 100.0),
+            ("张三", "第三段", 100.0, 150.0),
+            ("张三", "隔了很久", 170.0, 171.0),
+        ])
+
+        compacted = compact_transcript(
+            transcript, merge_gap_seconds=5.0, max_turn_seconds=120.0
+        )
+
+        assert [s.text for s in compacted.segments] == ["第一段第二段", "第三段", "隔了很久"]
+
+    def test_timestamps_are_not_rounded(self):
+        transcript = make_transcript([
+            ("张三", "开场", 3.2, 8.7),
+            ("李四", "回应", 12.1, 13.4),
+        ])
+
+        compacted = compact_transcript(transcript)
+
+        assert [(s.start_time, s.end_time) for s in compacted.segments] == [
+            (3.2, 8.7),
+            (12.1, 13.4),
+        ]
+
+    def test_english_text_is_joined_with_spaces(self):
+        transcript = make_transcript([
+            ("Alice", "Let's review the budget", 0.0, 2.0),
+            ("Alice", "and then the schedule", 2.0, 4.0),
+        ])
+
+        compacted = compact_transcript(transcript)
+
+        assert compacted.segments[0].text == "Let's review the budget and then the schedule"
+
+
+class TestCompactionInGeneration:
+    """ArtifactGenerationService 在生成前压缩转写"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_metrics(self):
+        reset_metrics_collector()
+        yield
+        reset_metrics_collector()
+
+    @pytest.fixture
+    def llm(self):
+        provider = MagicMock()
+        provider.get_model_fingerprint.return_value = "gemini:gemini-2.5-flash"
+        provider.get_pricing_model.return_value = "gemini-flash"
+        provider.format_transcript.side_effect = GeminiLLM(GeminiConfig(api_keys=["key"])).format_transcript
+
+        async def generate_artifact(transcript, prompt_instance, **kwargs):
+            return GeneratedArtifact(
+                artifact_id=kwargs["artifact_id"],
+                task_id=kwargs["task_id"],
+                artifact_type="meeting_minutes",
+                version=kwargs["version"],
+                prompt_instance=prompt_instance,
+                content=json.dumps({"summary": "ok"}),
+                metadata=kwargs.get("metadata") or {},
+                created_by=kwargs["created_by"],
+            )
+
+        provider.generate_artifact = AsyncMock(side_effect=generate_artifact)
+        return provider
+
+    @pytest.fixture
+    def template(self):
+        return PromptTemplate(
+            template_id="tpl_001",
+            title="标准会议纪要",
+            description="生成标准会议纪要",
+            prompt_body="请生成会议纪要:\n{transcript}",
+            artifact_type="meeting_minutes",
+            supported_languages=["zh-CN"],
+            parameter_schema={},
+            is_system=True,
+        )
+
+    @pytest.mark.asyncio
+    async def test_compacted_transcript_is_sent_and_reported(self, llm, template):
+        transcript = make_transcript(
+            [("张三" if i % 4 else "李四", "嗯，这是一句话。", i * 2.0, i * 2.0 + 1.5) for i in range(40)]
+        )
+        service = ArtifactGenerationService(
+            llm_provider=llm, compaction_config=TranscriptCompactionConfig(enabled=True)
+        )
+
+        artifact = await service.generate_artifact(
+            task_id="task_1",
+            transcript=transcript,
+            artifact_type="meeting_minutes",
+            prompt_instance=PromptInstance(template_id="tpl_001", language="zh-CN"),
+            template=template,
+        )
+
+        sent = llm.generate_artifact.await_args.kwargs["transcript"]
+        assert len(sent.segments) < len(transcript.segments)
+        assert "嗯" not in sent.full_text
+
+        # 节省按实际发送给模型的格式化文本计算
+        interval = llm.generate_artifact.await_args.kwargs["timestamp_interval"]
+        assert interval == 60.0
+        sent_text = llm.format_transcript(sent, timestamp_interval=interval)
+        assert sent_text.count("(00:") < len(sent.segments)
+        info = artifact.metadata["compaction"]
+        assert info["original_tokens"] == estimate_text_tokens(llm.format_transcript(transcript))
+        assert info["compacted_tokens"] == estimate_text_tokens(sent_text)
+        assert info["compacted_tokens"] < info["original_tokens"]
+
+        metrics = get_metrics_collector()
+        assert metrics.get_counter("llm_prompt_tokens_original_total") == info["original_tokens"]
+        assert metrics.get_counter("llm_prompt_tokens_compacted_total") == info["compacted_tokens"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_compaction_sends_original_transcript(self, llm, template):
+        transcript = make_transcript([("张三", "嗯，好的。", 0.0, 1.0)])
+        service = ArtifactGenerationService(
+            llm_provider=llm, compaction_config=TranscriptCompactionConfig(enabled=False)
+        )
+
+        artifact = await service.generate_artifact(
+            task_id="task_1",
+            transcript=transcript,
+            artifact_type="meeting_minutes",
+            prompt_instance=PromptInstance(template_id="tpl_001", language="zh-CN"),
+            template=template,
+        )
+
+        assert llm.generate_artifact.await_args.kwargs["transcript"] is transcript
+        assert "timestamp_interval" not in llm.generate_artifact.await_args.kwargs
+        assert "compaction" not in artifact.metadata
+
+    @pytest.mark.asyncio
+    async def test_savings_are_priced_with_provider_pricing_model(self, llm, template):
+        transcript = make_transcript([("张三", "嗯，这是一句话。", i * 2.0, i * 2.0 + 1.5) for i in range(4)])
+        llm.get_pricing_model.return_value = "gemini-pro"
+        cost_tracker = MagicMock()
+        cost_tracker.record_prompt_compaction.return_value = {
+            "original_tokens": 10, "compacted_tokens": 5, "saved_tokens": 5, "saved_cost": 0.1,
+        }
+        service = ArtifactGenerationService(
+            llm_provider=llm,
+            compaction_config=TranscriptCompactionConfig(enabled=True),
+            cost_tracker=cost_tracker,
+        )
+
+        await service.generate_artifact(
+            task_id="task_1",
+            transcript=transcript,
+            artifact_type="meeting_minutes",
+            prompt_instance=PromptInstance(template_id="tpl_001", language="zh-CN"),
+            template=template,
+        )
+
+        assert cost_tracker.record_prompt_compaction.call_args.kwargs["model"] == "gemini-pro"
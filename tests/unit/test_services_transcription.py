@@ -42,7 +42,7 @@ def mock_audio_processor():
     processor.concatenate_audio = AsyncMock(
         return_value=("/tmp/concatenated.wav", [0.0, 10.0, 20.0])
     )
-    processor.get_duration = MagicMock(return_value=30.0)
+    processor.get_duration = AsyncMock(return_value=30.0)
     return processor
 
 
@@ -228,13 +228,28 @@ class TestTranscriptionService:
         presigned_kwargs = mock_storage.generate_presigned_url.call_args[1]
         assert presigned_kwargs["expires_in"] == 86400  # 24 hours
 
+    @pytest.mark.asyncio
+    async def test_transcribe_passes_upload_progress_callback(
+        self, transcription_service, mock_primary_asr, mock_storage, sample_transcript
+    ):
+        """测试上传进度回调传递到存储客户端"""
+        mock_primary_asr.transcribe = AsyncMock(return_value=sample_transcript)
+        callback = MagicMock()
+
+        await transcription_service.transcribe(
+            audio_files=["/tmp/test.wav"],
+            upload_progress_callback=callback,
+        )
+
+        assert mock_storage.upload_file.call_args[1]["progress_callback"] is callback
+
     @pytest.mark.asyncio
     async def test_get_audio_duration(self, transcription_service, mock_audio_processor):
         """测试获取音频时长"""
         duration = await transcription_service.get_audio_duration("/tmp/test.wav")
 
         assert duration == 30.0
-        mock_audio_processor.get_duration.assert_called_once_with("/tmp/test.wav")
+        mock_audio_processor.get_duration.assert_awaited_once_with("/tmp/test.wav")
 
     @pytest.mark.asyncio
     async def test_transcribe_cleanup_temp_file(
@@ -251,3 +266,164 @@ class TestTranscriptionService:
         # 验证返回了拼接后的文件路径
         assert local_path == "/tmp/concatenated.wav"
         # 注意: 临时文件不再在这里清理,而是由 pipeline 在使用完后清理
+
+
+class TestParallelMultiFileTranscription:
+    """多文件并行转写测试"""
+
+    @pytest.fixture
+    def part_files(self, tmp_path):
+        paths = []
+        for i, size in enumerate([100, 300, 200]):
+            path = tmp_path / f"part{i}.wav"
+            path.write_bytes(b"\x00" * size)
+            paths.append(str(path))
+        return paths
+
+    @pytest.fixture
+    def parallel_service(
+        self, mock_primary_asr, mock_fallback_asr, mock_storage, mock_audio_processor
+    ):
+        return TranscriptionService(
+            primary_asr=mock_primary_asr,
+            fallback_asr=mock_fallback_asr,
+            storage_client=mock_storage,
+            audio_processor=mock_audio_processor,
+            parallel_multi_file=True,
+        )
+
+    @staticmethod
+    def part_result(labels, provider="volcano"):
+        return TranscriptionResult(
+            segments=[
+                Segment(text=f"{label} says", start_time=float(i), end_time=float(i) + 1.0, speaker=label)
+                for i, label in enumerate(labels)
+            ],
+            full_text=" ".join(labels),
+            duration=float(len(labels)),
+            provider=provider,
+        )
+
+    @pytest.mark.asyncio
+    async def test_parts_transcribed_concurrently_and_merged(
+        self, parallel_service, mock_primary_asr, mock_storage, mock_audio_processor, part_files
+    ):
+        """各分片并发转写,片段按偏移合并,说话人标签全局重编号"""
+        import asyncio
+
+        results = {
+            "part0": self.part_result(["Speaker 1", "Speaker 2"]),
+            "part1": self.part_result(["Speaker 1"]),
+            "part2": self.part_result(["Speaker 2", "Speaker 1"]),
+        }
+        running = 0
+        peak = 0
+
+        async def upload_file(local_path, object_key, content_type, progress_callback):
+            return local_path
+
+        async def presign(object_key, expires_in):
+            return object_key
+
+        async def transcribe(audio_url, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            part = next(name for name in results if name in audio_url)
+            return results[part]
+
+        mock_storage.upload_file = AsyncMock(side_effect=upload_file)
+        mock_storage.generate_presigned_url = AsyncMock(side_effect=presign)
+        mock_primary_asr.transcribe = AsyncMock(side_effect=transcribe)
+        mock_audio_processor.concatenate_audio = AsyncMock(
+            return_value=("/tmp/concatenated.wav", [0.0, 10.0, 20.0])
+        )
+
+        result, audio_url, local_path = await parallel_service.transcribe(
+            audio_files=part_files, file_order=[0, 1, 2]
+        )
+
+        assert peak == 3
+        assert local_path == "/tmp/concatenated.wav"
+        assert audio_url == ""
+        assert [(s.start_time, s.speaker) for s in result.segments] == [
+            (0.0, "Speaker 1"),
+            (1.0, "Speaker 2"),
+            (10.0, "Speaker 3"),
+            (20.0, "Speaker 4"),
+            (21.0, "Speaker 5"),
+        ]
+        assert result.duration == 22.0
+        assert result.provider == "volcano"
+
+    @pytest.mark.asyncio
+    async def test_part_falls_back_independently(
+        self, parallel_service, mock_primary_asr, mock_fallback_asr, mock_storage, part_files
+    ):
+        """单个分片主 ASR 失败时只有该分片降级"""
+        calls = []
+
+        async def primary(audio_url, **kwargs):
+            calls.append(audio_url)
+            if len(calls) == 2:
+                raise ASRError("primary down", provider="volcano")
+            return self.part_result(["Speaker 1"])
+
+        mock_primary_asr.transcribe = AsyncMock(side_effect=primary)
+        mock_fallback_asr.transcribe = AsyncMock(return_value=self.part_result(["Speaker 1"], "azure"))
+
+        result, _, _ = await parallel_service.transcribe(audio_files=part_files)
+
+        assert mock_fallback_asr.transcribe.await_count == 1
+        assert result.provider == "volcano+azure"
+        assert len(result.segments) == 3
+
+    @pytest.mark.asyncio
+    async def test_upload_progress_aggregated_across_parts(
+        self, parallel_service, mock_primary_asr, mock_storage, part_files, sample_transcript
+    ):
+        """上传进度按所有分片的总字节数汇总"""
+        import os
+
+        async def upload_file(local_path, object_key, content_type, progress_callback):
+            size = os.path.getsize(local_path)
+            progress_callback(size, size)
+            return local_path
+
+        mock_storage.upload_file = AsyncMock(side_effect=upload_file)
+        mock_primary_asr.transcribe = AsyncMock(return_value=sample_transcript)
+        progress = []
+
+        await parallel_service.transcribe(
+            audio_files=part_files,
+            upload_progress_callback=lambda sent, total: progress.append((sent, total)),
+        )
+
+        assert progress[-1] == (600, 600)
+        assert all(total == 600 for _, total in progress)
+
+    @pytest.mark.asyncio
+    async def test_without_speaker_recognition_concatenates(
+        self, parallel_service, mock_primary_asr, mock_storage, part_files, sample_transcript
+    ):
+        """跳过说话人识别时无法统一各分片的说话人标签,回退为拼接后整体转写"""
+        mock_primary_asr.transcribe = AsyncMock(return_value=sample_transcript)
+
+        await parallel_service.transcribe(audio_files=part_files, speaker_recognition=False)
+
+        mock_primary_asr.transcribe.assert_awaited_once()
+        mock_storage.upload_file.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default_concatenates(
+        self, transcription_service, mock_primary_asr, mock_storage, part_files, sample_transcript
+    ):
+        """默认模式仍拼接后整体转写"""
+        mock_primary_asr.transcribe = AsyncMock(return_value=sample_transcript)
+
+        await transcription_service.transcribe(audio_files=part_files)
+
+        mock_primary_asr.transcribe.assert_awaited_once()
+        mock_storage.upload_file.assert_awaited_once()
@@ -0,0 +1,183 @@
+"""Unit tests for header-based audio duration probing."""
+
+import struct
+import tempfile
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.audio import AudioProcessor
+from src.utils.audio_probe import probe_duration
+
+
+def write_temp(data: bytes, suffix: str) -> str:
+    """写入临时文件并返回路径"""
+    temp_file = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    temp_file.write(data)
+    temp_file.close()
+    return temp_file.name
+
+
+@pytest.fixture
+def temp_paths():
+    """收集并清理测试生成的临时文件"""
+    paths = []
+    yield paths
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
+
+def make_wav(duration: float, sample_rate: int = 16000, channels: int = 1) -> str:
+    temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    temp_file.close()
+    with wave.open(temp_file.name, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x00\x00" * channels * int(sample_rate * duration))
+    return temp_file.name
+
+
+def ogg_page(granule: int, serial: int, payload: bytes, header_type: int = 0) -> bytes:
+    """构造一个 Ogg 页(不校验 CRC)"""
+    segments = []
+    remaining = len(payload)
+    while remaining >= 255:
+        segments.append(255)
+        remaining -= 255
+    segments.append(remaining)
+    header = b"OggS" + struct.pack(
+        "<BBqIIIB", 0, header_type, granule, serial, 0, 0, len(segments)
+    )
+    return header + bytes(segments) + payload
+
+
+def make_mp3_frame(bitrate_index: int = 9, padding: int = 0) -> bytes:
+    """MPEG1 Layer III, 44.1kHz, 立体声帧"""
+    header = bytes([0xFF, 0xFB, (bitrate_index << 4) | (padding << 1), 0x00])
+    bitrate = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128][bitrate_index] * 1000
+    frame_size = 144 * bitrate // 44100 + padding
+    return header + b"\x00" * (frame_size - 4)
+
+
+def mp4_atom(name: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), name) + payload
+
+
+class TestProbeDuration:
+    """容器头部时长解析测试"""
+
+    @pytest.mark.parametrize("duration,sample_rate,channels", [
+        (1.5, 16000, 1),
+        (2.0, 44100, 2),
+    ])
+    def test_wav(self, temp_paths, duration, sample_rate, channels):
+        path = make_wav(duration, sample_rate, channels)
+        temp_paths.append(path)
+        assert probe_duration(path) == pytest.approx(duration)
+
+    def test_wav_with_unfilled_data_size(self, temp_paths):
+        """流式写入未回填 data 大小时按文件大小计算"""
+        path = make_wav(1.0)
+        temp_paths.append(path)
+        data = bytearray(Path(path).read_bytes())
+        data[40:44] = struct.pack("<I", 0xFFFFFFFF)
+        Path(path).write_bytes(bytes(data))
+        assert probe_duration(path) == pytest.approx(1.0)
+
+    def test_ogg_vorbis(self, temp_paths):
+        ident = b"\x01vorbis" + struct.pack("<IBI", 0, 2, 44100) + b"\x00" * 15
+        data = (
+            ogg_page(0, 7, ident, header_type=2)
+            + ogg_page(44100, 7, b"\x00" * 300)
+            + ogg_page(44100 * 3, 7, b"\x00" * 100, header_type=4)
+        )
+        path = write_temp(data, ".ogg")
+        temp_paths.append(path)
+        assert probe_duration(path) == pytest.approx(3.0)
+
+    def test_ogg_opus_subtracts_pre_skip(self, temp_paths):
+        ident = b"OpusHead" + struct.pack("<BBHIhB", 1, 1, 312, 16000, 0, 0)
+        data = (
+            ogg_page(0, 3, ident, header_type=2)
+            + ogg_page(48000 * 2 + 312, 3, b"\x00" * 50, header_type=4)
+            # 其他逻辑流的页不应被采用
+            + ogg_page(999999999, 4, b"\x00" * 10)
+        )
+        path = write_temp(data, ".opus")
+        temp_paths.append(path)
+        assert probe_duration(path) == pytest.approx(2.0)
+
+    def test_mp3_cbr(self, temp_paths):
+        frame = make_mp3_frame()  # 128 kbps
+        id3 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+        data = id3 + frame * 100
+        path = write_temp(data, ".mp3")
+        temp_paths.append(path)
+        assert probe_duration(path) == pytest.approx(len(frame) * 100 * 8 / 128000)
+
+    def test_mp3_xing_frame_count(self, temp_paths):
+        first = bytearray(make_mp3_frame())
+        xing_pos = 4 + 32  # 立体声 MPEG1 side information
+        first[xing_pos:xing_pos + 12] = b"Xing" + struct.pack(">II", 1, 500)
+        data = bytes(first) + make_mp3_frame() * 10
+        path = write_temp(data, ".mp3")
+        temp_paths.append(path)
+        assert probe_duration(path) == pytest.approx(500 * 1152 / 44100)
+
+    @pytest.mark.parametrize("version", [0, 1])
+    def test_mp4_mvhd(self, temp_paths, version):
+        if version == 0:
+            mvhd = struct.pack(">B3xIIII", 0, 0, 0, 1000, 93500)
+        else:
+            mvhd = struct.pack(">B3xQQIQ", 1, 0, 0, 44100, 44100 * 60)
+        data = (
+            mp4_atom(b"ftyp", b"M4A \x00\x00\x00\x00")
+            + mp4_atom(b"mdat", b"\x00" * 64)
+            + mp4_atom(b"moov", mp4_atom(b"mvhd", mvhd + b"\x00" * 80))
+        )
+        path = write_temp(data, ".m4a")
+        temp_paths.append(path)
+        expected = 93.5 if version == 0 else 60.0
+        assert probe_duration(path) == pytest.approx(expected)
+
+    def test_unknown_format_returns_none(self, temp_paths):
+        path = write_temp(b"\x1aE\xdf\xa3" + b"\x00" * 64, ".webm")
+        temp_paths.append(path)
+        assert probe_duration(path) is None
+
+    def test_truncated_header_returns_none(self, temp_paths):
+        path = write_temp(b"RIFF\x00\x00\x00\x00WAVEfmt ", ".wav")
+        temp_paths.append(path)
+        assert probe_duration(path) is None
+
+    def test_missing_file_returns_none(self):
+        assert probe_duration("/nonexistent/audio.wav") is None
+
+
+class TestGetDurationFastPath:
+    """AudioProcessor.get_duration 头部快速路径测试"""
+
+    @pytest.mark.asyncio
+    async def test_header_probe_skips_ffprobe(self, temp_paths):
+        path = make_wav(2.5)
+        temp_paths.append(path)
+        with patch("src.utils.audio.run_process") as mock_run:
+            duration = await AudioProcessor().get_duration(path)
+        assert duration == pytest.approx(2.5)
+        mock_run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_ffprobe(self, temp_paths):
+        path = write_temp(b"\x1aE\xdf\xa3" + b"\x00" * 64, ".webm")
+        temp_paths.append(path)
+
+        async def fake_run(cmd, timeout):
+            assert cmd[0] == "ffprobe"
+            return 0, b"42.0\n", b""
+
+        with patch("src.utils.audio.run_process", side_effect=fake_run):
+            duration = await AudioProcessor().get_duration(path)
+        assert duration == 42.0
@@ -326,3 +326,256 @@ class TestTimestampOffsets:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+# ============================================================================
+# PCM 缓冲区切片
+# ============================================================================
+
+
+def create_pcm_wav(duration_s: float, sample_rate: int = 16000, channels: int = 1) -> str:
+    """用标准库创建 16-bit PCM WAV,采样值为帧序号(便于校验偏移)"""
+    import struct
+    import wave
+
+    frames = int(duration_s * sample_rate)
+    temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    temp_file.close()
+    with wave.open(temp_file.name, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        data = b"".join(struct.pack("<h", i % 32768) * channels for i in range(frames))
+        wav.writeframes(data)
+    return temp_file.name
+
+
+class TestPCMWaveBuffer:
+    """内存映射 WAV 切片测试"""
+
+    @given(
+        start=st.floats(min_value=0.0, max_value=1.5),
+        length=st.floats(min_value=0.0, max_value=1.0),
+    )
+    def test_slice_matches_sample_offsets(self, start: float, length: float):
+        """切片内容应与采样偏移一致,且为合法 WAV"""
+        import io
+        import wave
+
+        from src.utils.audio import PCMWaveBuffer
+
+        path = create_pcm_wav(2.0)
+        try:
+            with PCMWaveBuffer(path) as buffer:
+                assert buffer.duration == pytest.approx(2.0)
+                sample = buffer.slice(start, start + length)
+
+            with wave.open(io.BytesIO(sample), "rb") as wav:
+                assert wav.getframerate() == 16000
+                assert wav.getnchannels() == 1
+                assert wav.getsampwidth() == 2
+                frames = wav.readframes(wav.getnframes())
+
+            start_frame = min(int(round(start * 16000)), 32000)
+            end_frame = min(int(round((start + length) * 16000)), 32000)
+            with wave.open(path, "rb") as wav:
+                wav.setpos(start_frame)
+                expected = wav.readframes(end_frame - start_frame)
+            assert frames == expected
+        finally:
+            Path(path).unlink(missing_ok=True)
+
+    @pytest.mark.asyncio
+    async def test_extract_segment_uses_buffer_for_target_wav(self):
+        """目标格式 WAV 提取片段不应启动 ffmpeg"""
+        from unittest.mock import patch
+
+        path = create_pcm_wav(3.0)
+        try:
+            processor = AudioProcessor()
+            with patch("src.utils.audio.asyncio.create_subprocess_exec") as mock_exec:
+                sample = await processor.extract_segment(path, 1.0, 2.0)
+            mock_exec.assert_not_called()
+            # 44 字节头 + 1 秒 16kHz 16-bit
+            assert len(sample) == 44 + 16000 * 2
+        finally:
+            Path(path).unlink(missing_ok=True)
+
+    def test_open_pcm_buffer_rejects_non_target_format(self):
+        """非目标格式(如 44.1kHz 立体声)不走快速路径"""
+        path = create_pcm_wav(0.5, sample_rate=44100, channels=2)
+        try:
+            assert AudioProcessor().open_pcm_buffer(path) is None
+        finally:
+            Path(path).unlink(missing_ok=True)
+
+    def test_invalid_file_raises_audio_format_error(self):
+        """非 WAV 文件应抛出 AudioFormatError"""
+        from src.utils.audio import PCMWaveBuffer
+
+        temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        temp_file.write(b"not a wave file at all")
+        temp_file.close()
+        try:
+            with pytest.raises(AudioFormatError):
+                PCMWaveBuffer(temp_file.name)
+        finally:
+            Path(temp_file.name).unlink(missing_ok=True)
+
+
+class FakeStream:
+    """模拟 asyncio 子进程输出流"""
+
+    def __init__(self, data: bytes):
+        import io
+
+        self._buffer = io.BytesIO(data)
+
+    async def read(self, n: int = -1) -> bytes:
+        return self._buffer.read(n)
+
+
+class FakeDecodeProcess:
+    """模拟 ffmpeg 解码进程: stdout 输出指定时长的 PCM"""
+
+    def __init__(self, pcm: bytes, returncode: int = 0):
+        self.stdout = FakeStream(pcm)
+        self.stderr = FakeStream(b"" if returncode == 0 else b"decode error")
+        self._exit_code = returncode
+        self.returncode = None
+
+    async def wait(self):
+        self.returncode = self._exit_code
+        return self.returncode
+
+    async def communicate(self):
+        await self.wait()
+        return await self.stdout.read(), await self.stderr.read()
+
+    def kill(self):
+        self.returncode = -9
+
+
+class TestStreamingConcatenation:
+    """流式拼接测试(模拟 ffmpeg 解码输出)"""
+
+    @given(durations=st.lists(st.integers(min_value=1, max_value=3000), min_size=1, max_size=4))
+    @pytest.mark.asyncio
+    async def test_concatenate_streams_pcm_and_offsets(self, durations: List[int]):
+        """拼接结果时长等于输入之和,偏移为累计时长"""
+        import wave
+        from unittest.mock import patch
+
+        pcm_parts = [b"\x01\x00" * (16 * ms) for ms in durations]  # 16 帧/毫秒
+        processes = iter(FakeDecodeProcess(pcm) for pcm in pcm_parts)
+        processor = AudioProcessor()
+
+        async def fake_exec(*args, **kwargs):
+            return next(processes)
+
+        with patch("src.utils.audio.asyncio.create_subprocess_exec", side_effect=fake_exec):
+            output_file, offsets = await processor.concatenate_audio(
+                [f"part_{i}.ogg" for i in range(len(durations))]
+            )
+
+        try:
+            with wave.open(output_file, "rb") as wav:
+                assert wav.getframerate() == 16000
+                assert wav.getnchannels() == 1
+                assert wav.getsampwidth() == 2
+                assert wav.getnframes() == 16 * sum(durations)
+
+            expected = [sum(durations[:i]) / 1000.0 for i in range(len(durations))]
+            assert offsets == pytest.approx(expected)
+        finally:
+            Path(output_file).unlink(missing_ok=True)
+
+    @pytest.mark.asyncio
+    async def test_concatenate_decode_failure_cleans_up(self):
+        """解码失败时抛出 AudioFormatError 并删除临时输出"""
+        from unittest.mock import patch
+
+        processor = AudioProcessor()
+        created = []
+        original = tempfile.NamedTemporaryFile
+
+        def tracking_tempfile(*args, **kwargs):
+            temp = original(*args, **kwargs)
+            created.append(temp.name)
+            return temp
+
+        async def fake_exec(*args, **kwargs):
+            return FakeDecodeProcess(b"", 1)
+
+        with patch("src.utils.audio.asyncio.create_subprocess_exec", side_effect=fake_exec), \
+             patch("src.utils.audio.tempfile.NamedTemporaryFile", side_effect=tracking_tempfile):
+            with pytest.raises(AudioFormatError, match="无法解码"):
+                await processor.concatenate_audio(["broken.ogg"])
+
+        assert created and not Path(created[0]).exists()
+
+
+class TestProcessLimiter:
+    """ffmpeg/ffprobe 进程数限制测试"""
+
+    @pytest.mark.asyncio
+    async def test_run_process_respects_global_limit(self):
+        """并发执行的外部进程数不超过限制"""
+        import asyncio
+        from unittest.mock import patch
+
+        from src.utils import audio
+
+        running = 0
+        peak = 0
+
+        class SlowProcess(FakeDecodeProcess):
+            async def communicate(self):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return await super().communicate()
+
+        async def fake_exec(*args, **kwargs):
+            return SlowProcess(b"12.5\n")
+
+        with patch.object(audio, "_process_limiter", audio._ProcessLimiter(2)), \
+             patch("src.utils.audio.asyncio.create_subprocess_exec", side_effect=fake_exec):
+            durations = await asyncio.gather(
+                *(AudioProcessor().get_duration(f"file_{i}.ogg") for i in range(6))
+            )
+
+        assert durations == [12.5] * 6
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_run_process_kills_on_timeout(self):
+        """超时后终止进程并抛出 AudioFormatError"""
+        import asyncio
+        from unittest.mock import patch
+
+        class HangingProcess(FakeDecodeProcess):
+            killed = False
+
+            async def communicate(self):
+                await asyncio.sleep(10)
+
+            def kill(self):
+                HangingProcess.killed = True
+                super().kill()
+
+        async def fake_exec(*args, **kwargs):
+            return HangingProcess(b"")
+
+        async def immediate_timeout(awaitable, timeout):
+            awaitable.close()
+            raise asyncio.TimeoutError
+
+        with patch("src.utils.audio.asyncio.create_subprocess_exec", side_effect=fake_exec), \
+             patch("src.utils.audio.asyncio.wait_for", side_effect=immediate_timeout):
+            with pytest.raises(AudioFormatError, match="超时"):
+                await AudioProcessor().get_duration("slow.ogg")
+
+        assert HangingProcess.killed
@@ -293,6 +293,147 @@ class TestStorageClientURLHandling:
                 Path(temp_output.name).unlink(missing_ok=True)
 
 
+# ============================================================================
+# 分片上传
+# ============================================================================
+
+
+def create_multipart_client(mock_client, **kwargs) -> StorageClient:
+    """创建使用小分片的 StorageClient"""
+    with patch('src.utils.storage.tos.TosClientV2') as mock_tos:
+        mock_tos.return_value = mock_client
+        return StorageClient(
+            bucket="test-bucket",
+            region="test-region",
+            access_key="test-key",
+            secret_key="test-secret",
+            multipart_threshold=10,
+            multipart_part_size=4,
+            **kwargs,
+        )
+
+
+def create_multipart_tos_client(received: dict, fail_parts: dict = None):
+    """模拟支持分片上传的 TOS 客户端,记录收到的分片内容"""
+    fail_parts = dict(fail_parts or {})
+    mock_client = create_mock_tos_client()
+    mock_client.create_multipart_upload.return_value = MagicMock(upload_id="upload-1")
+
+    def upload_part(bucket, key, upload_id, part_number, content, content_length):
+        if fail_parts.get(part_number, 0) > 0:
+            fail_parts[part_number] -= 1
+            raise ConnectionError(f"part {part_number} reset")
+        assert len(content) == content_length
+        received[part_number] = content
+        return MagicMock(etag=f"etag-{part_number}")
+
+    mock_client.upload_part.side_effect = upload_part
+    return mock_client
+
+
+class TestMultipartUpload:
+    """分片并发上传测试"""
+
+    @pytest.mark.asyncio
+    async def test_large_file_uploaded_in_parts_with_progress(self):
+        """大文件按分片上传,合并顺序正确,进度单调递增到总大小"""
+        received = {}
+        mock_client = create_multipart_tos_client(received)
+        client = create_multipart_client(mock_client, multipart_concurrency=2)
+        content = bytes(range(23))
+        progress = []
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+        temp_file.write(content)
+        temp_file.close()
+        try:
+            await client.upload_file(
+                temp_file.name,
+                "audio/big.wav",
+                progress_callback=lambda sent, total: progress.append((sent, total)),
+            )
+        finally:
+            Path(temp_file.name).unlink(missing_ok=True)
+
+        mock_client.put_object_from_file.assert_not_called()
+        assert b"".join(received[n] for n in sorted(received)) == content
+        assert sorted(received) == [1, 2, 3, 4, 5, 6]
+
+        parts = mock_client.complete_multipart_upload.call_args[1]["parts"]
+        assert [(p.part_number, p.etag) for p in parts] == [(n, f"etag-{n}") for n in range(1, 7)]
+
+        sent = [s for s, _ in progress]
+        assert sent == sorted(sent) and sent[-1] == 23
+        assert all(total == 23 for _, total in progress)
+
+    @pytest.mark.asyncio
+    async def test_failed_part_is_retried(self):
+        """单个分片失败后独立重试"""
+        received = {}
+        mock_client = create_multipart_tos_client(received, fail_parts={2: 2})
+        client = create_multipart_client(mock_client, part_max_retries=3)
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+        temp_file.write(b"x" * 12)
+        temp_file.close()
+        try:
+            with patch('src.utils.storage.asyncio.sleep', new_callable=AsyncMock):
+                await client.upload_file(temp_file.name, "audio/big.wav")
+        finally:
+            Path(temp_file.name).unlink(missing_ok=True)
+
+        assert sorted(received) == [1, 2, 3]
+        assert mock_client.upload_part.call_count == 5
+        mock_client.complete_multipart_upload.assert_called_once()
+        mock_client.abort_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_abort_upload(self):
+        """分片重试耗尽时取消分片上传并抛出 UploadError"""
+        from src.core.exceptions import UploadError
+
+        mock_client = create_multipart_tos_client({}, fail_parts={1: 10})
+        client = create_multipart_client(mock_client, part_max_retries=2)
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+        temp_file.write(b"x" * 12)
+        temp_file.close()
+        try:
+            with patch('src.utils.storage.asyncio.sleep', new_callable=AsyncMock):
+                with pytest.raises(UploadError):
+                    await client.upload_file(temp_file.name, "audio/big.wav")
+        finally:
+            Path(temp_file.name).unlink(missing_ok=True)
+
+        mock_client.complete_multipart_upload.assert_not_called()
+        mock_client.abort_multipart_upload.assert_called_once_with(
+            bucket="test-bucket", key="audio/big.wav", upload_id="upload-1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_small_file_uses_single_put(self):
+        """小于阈值的文件仍使用单次上传"""
+        mock_client = create_mock_tos_client()
+        client = create_multipart_client(mock_client)
+        progress = []
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+        temp_file.write(b"tiny")
+        temp_file.close()
+        try:
+            await client.upload_file(
+                temp_file.name,
+                "audio/small.wav",
+                progress_callback=lambda sent, total: progress.append((sent, total)),
+            )
+        finally:
+            Path(temp_file.name).unlink(missing_ok=True)
+
+        mock_client.put_object_from_file.assert_called_once()
+        mock_client.create_multipart_upload.assert_not_called()
+        assert progress == [(4, 4)]
+
+
 # ============================================================================
 # Run tests
 # ============================================================================
@@ -0,0 +1,340 @@
+"""Tests for Redis-driven task progress events."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.api.routes.sse import task_progress_stream, user_progress_stream
+from src.utils.task_events import TASK_EVENTS_CHANNEL, TaskEventBroadcaster, stream_id_key
+
+
+class FakePubSub:
+    """按顺序产出消息的订阅连接,收到异常对象时模拟连接中断"""
+
+    def __init__(self):
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.channels = []
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def listen(self):
+        while True:
+            message = await self.messages.get()
+            if isinstance(message, Exception):
+                raise message
+            yield {"type": "message", "data": json.dumps(message)}
+
+    async def aclose(self):
+        pass
+
+
+class FakeStreamClient:
+    """只实现 xrange/xrevrange 的用户事件流"""
+
+    def __init__(self, entries=()):
+        self.entries = list(entries)
+
+    async def xrange(self, stream, min="-", max="+", count=None):
+        entries = self.entries
+        if min.startswith("("):
+            entries = [e for e in entries if stream_id_key(e[0]) > stream_id_key(min[1:])]
+        return entries[:count] if count else entries
+
+    async def xrevrange(self, stream, count=None):
+        return list(reversed(self.entries))[:count]
+
+
+def stream_entry(event_id, event):
+    return event_id, {"event": json.dumps(event)}
+
+
+def install_fake_connections(broadcaster, stream=None):
+    connections = []
+
+    async def connect():
+        pubsub = FakePubSub()
+        await pubsub.subscribe(TASK_EVENTS_CHANNEL)
+        connections.append(pubsub)
+        broadcaster._pubsub = pubsub
+        broadcaster._client = stream or FakeStreamClient()
+
+    broadcaster._connect = connect
+    return connections
+
+
+def parse_sse(messages):
+    events = []
+    for message in messages:
+        if message.startswith(":"):
+            continue
+        lines = message.strip().split("\n")
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+
+class TestTaskEventBroadcaster:
+    """进程内分发"""
+
+    @pytest.mark.asyncio
+    async def test_single_subscription_fans_out_by_task(self):
+        broadcaster = TaskEventBroadcaster(reconnect_delay=0)
+        connections = install_fake_connections(broadcaster)
+
+        async with broadcaster.subscribe("task_1") as first, \
+                broadcaster.subscribe("task_1") as second, \
+                broadcaster.subscribe("task_2") as other:
+            connections[0].messages.put_nowait({"task_id": "task_1", "state": "transcribing"})
+            assert (await asyncio.wait_for(first.get(), 1))["state"] == "transcribing"
+            assert (await asyncio.wait_for(second.get(), 1))["state"] == "transcribing"
+            assert other.empty()
+
+        assert len(connections) == 1
+        assert broadcaster._subscribers == {}
+        await broadcaster.aclose()
+
+    @pytest.mark.asyncio
+    async def test_reconnect_asks_subscribers_to_resync(self):
+        broadcaster = TaskEventBroadcaster(reconnect_delay=0)
+        connections = install_fake_connections(broadcaster)
+
+        async with broadcaster.subscribe("task_1") as queue:
+            connections[0].messages.put_nowait(RedisConnectionError("connection reset"))
+            assert await asyncio.wait_for(queue.get(), 1) is None
+
+            connections[1].messages.put_nowait({"task_id": "task_1", "state": "success"})
+            assert (await asyncio.wait_for(queue.get(), 1))["state"] == "success"
+
+        await broadcaster.aclose()
+
+    @pytest.mark.asyncio
+    async def test_user_subscription_receives_all_user_tasks(self):
+        broadcaster = TaskEventBroadcaster(reconnect_delay=0)
+        connections = install_fake_connections(broadcaster)
+
+        async with broadcaster.subscribe_user("user_1") as queue:
+            connections[0].messages.put_nowait({"task_id": "task_1", "user_id": "user_1", "state": "running"})
+            connections[0].messages.put_nowait({"task_id": "task_9", "user_id": "user_2", "state": "running"})
+            connections[0].messages.put_nowait({"task_id": "task_2", "user_id": "user_1", "state": "success"})
+            assert (await asyncio.wait_for(queue.get(), 1))["task_id"] == "task_1"
+            assert (await asyncio.wait_for(queue.get(), 1))["task_id"] == "task_2"
+
+        await broadcaster.aclose()
+
+    @pytest.mark.asyncio
+    async def test_replay_returns_events_after_last_id(self):
+        broadcaster = TaskEventBroadcaster()
+        broadcaster._client = FakeStreamClient([
+            stream_entry("100-0", {"task_id": "task_1", "state": "running"}),
+            stream_entry("200-0", {"task_id": "task_1", "state": "summarizing"}),
+            stream_entry("200-1", {"task_id": "task_1", "state": "success"}),
+        ])
+
+        events = await broadcaster.replay_user_events("user_1", "200-0")
+
+        assert events == [{"task_id": "task_1", "state": "success", "event_id": "200-1"}]
+        # 早于保留范围或格式无效的 ID 需要改发快照
+        assert await broadcaster.replay_user_events("user_1", "50-0") is None
+        assert await broadcaster.replay_user_events("user_1", "garbage") is None
+
+    @pytest.mark.asyncio
+    async def test_stream_reads_raise_while_reconnecting(self):
+        broadcaster = TaskEventBroadcaster()
+
+        with pytest.raises(RedisConnectionError):
+            await broadcaster.last_user_event_id("user_1")
+        with pytest.raises(RedisConnectionError):
+            await broadcaster.replay_user_events("user_1", "100-0")
+
+
+def parse_user_sse(messages):
+    events = []
+    for message in messages:
+        fields = dict(
+            line.split(": ", 1) for line in message.strip().split("\n") if not line.startswith(":")
+        )
+        if "event" in fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestUserProgressStream:
+    """用户级多路复用进度流"""
+
+    SNAPSHOT = {"tasks": [{"task_id": "task_1", "state": "running"}], "artifacts": []}
+
+    async def run_stream(self, broadcaster, connections, last_event_id, events):
+        async def consume():
+            return [
+                m async for m in user_progress_stream(
+                    "user_1", last_event_id, max_wait_seconds=0.2, heartbeat_seconds=0.05
+                )
+            ]
+
+        with patch("src.api.routes.sse.get_task_event_broadcaster", return_value=broadcaster), \
+                patch("src.api.routes.sse._read_user_snapshot", return_value=self.SNAPSHOT) as snapshot:
+            consumer = asyncio.create_task(consume())
+            while not connections or not broadcaster._subscribers:
+                await asyncio.sleep(0)
+            for event in events:
+                connections[0].messages.put_nowait(event)
+            messages = await asyncio.wait_for(consumer, 2)
+        await broadcaster.aclose()
+        return parse_user_sse(messages), snapshot
+
+    @pytest.mark.asyncio
+    async def test_new_connection_gets_snapshot_then_live_events(self):
+        broadcaster = TaskEventBroadcaster(reconnect_delay=0)
+        stream = FakeStreamClient([stream_entry("100-0", {"task_id": "task_1", "state": "running"})])
+        connections = install_fake_connections(broadcaster, stream)
+
+        events, snapshot = await self.run_stream(broadcaster, connections, None, [
+            # 已包含在快照中的事件被跳过
+            {"type": "task", "task_id": "task_1", "user_id": "user_1", "state": "running", "event_id": "100-0"},
+            {"type": "task", "task_id": "task_1", "user_id": "user_1", "state": "success",
+             "progress": 100.0, "event_id": "101-0"},
+            {"type": "artifact", "task_id": "task_1", "user_id": "user_1", "artifact_id": "art_1",
+             "state": "processing", "event_id": "102-0"},
+        ])
+
+        assert events == [
+            ("100-0", "snapshot", self.SNAPSHOT),
+            ("101-0", "progress", {"task_id": "task_1", "state": "success", "progress": 100.0}),
+            ("102-0", "artifact", {"task_id": "task_1", "artifact_id": "art_1", "state": "processing"}),
+        ]
+        snapshot.assert_called_once_with("user_1")
+
+    @pytest.mark.asyncio
+    async def test_reconnect_replays_missed_events_without_snapshot(self):
+        broadcaster = TaskEventBroadcaster(reconnect_delay=0)
+        stream = FakeStreamClient([
+            stream_entry("100-0", {"type": "task", "task_id": "task_1", "state": "running"}),
+            stream_entry("101-0", {"type": "task", "task_id": "task_1", "state": "summarizing"}),
+        ])
+        connections = install_fake_connections(broadcaster, stream)
+
+        events, snapshot = await self.run_stream(broadcaster, connections, "100-0", [
+            {"type": "task", "task_id": "task_1", "user_id": "user_1", "state": "summarizing", "event_id": "101-0"},
+            {"type": "task", "task_id": "task_1", "user_id": "user_1", "state": "success", "event_id": "102-0"},
+        ])
+
+        assert events == [
+            ("101-0", "progress", {"task_id": "task_1", "state": "summarizing"}),
+            ("102-0", "progress", {"task_id": "task_1", "state": "success"}),
+        ]
+        snapshot.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_events_are_deduplicated_per_entity(self):
+        broadcaster = TaskEventBroadcaster(reconnect_delay=0)
+        connections = install_fake_connections(broadcaster, FakeStreamClient())
+
+        events, _ = await self.run_stream(broadcaster, connections, None, [
+            {"type": "task", "task_id": "task_1", "user_id": "user_1", "state": "success", "event_id": "102-0"},
+            # 另一任务的事件 ID 更小但晚到,仍需推送
+            {"type": "task", "task_id": "task_2", "user_id": "user_1", "state": "running", "event_id": "101-0"},
+            # 同一任务的过期事件被跳过
+            {"type": "task", "task_id": "task_1", "user_id": "user_1", "state": "summarizing", "event_id": "100-0"},
+        ])
+
+        assert events == [
+            (None, "snapshot", self.SNAPSHOT),
+            ("102-0", "progress", {"task_id": "task_1", "state": "success"}),
+            ("101-0", "progress", {"task_id": "task_2", "state": "running"}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_replay_failure_falls_back_to_snapshot(self):
+        broadcaster = TaskEventBroadcaster(reconnect_delay=0)
+        connections = install_fake_connections(broadcaster)
+
+        async def stream_unavailable(*args):
+            raise RedisConnectionError("reconnecting")
+
+        broadcaster.replay_user_events = stream_unavailable
+        broadcaster.last_user_event_id = stream_unavailable
+        events, snapshot = await self.run_stream(broadcaster, connections, "100-0", [
+            {"type": "task", "task_id": "task_1", "user_id": "user_1", "state": "success", "event_id": "101-0"},
+        ])
+
+        assert events == [
+            (None, "snapshot", self.SNAPSHOT),
+            ("101-0", "progress", {"task_id": "task_1", "state": "success"}),
+        ]
+        snapshot.assert_called_once_with("user_1")
+
+
+class TestTaskProgressStream:
+    """事件驱动的 SSE 进度流"""
+
+    def make_task(self, state="transcribing", progress=10.0):
+        return SimpleNamespace(
+            task_id="task_1",
+            user_id="user_1",
+            state=state,
+            progress=progress,
+            estimated_time=60,
+            updated_at=None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_pushes_only_changes_without_querying_db(self):
+        broadcaster = TaskEventBroadcaster(reconnect_delay=0)
+        connections = install_fake_connections(broadcaster)
+        repo = MagicMock()
+        repo.get_by_id.return_value = self.make_task()
+        db = MagicMock()
+
+        async def consume():
+            return [m async for m in task_progress_stream("task_1", "user_1", db)]
+
+        with patch("src.api.routes.sse.get_task_event_broadcaster", return_value=broadcaster), \
+                patch("src.api.routes.sse.TaskRepository", return_value=repo):
+            consumer = asyncio.create_task(consume())
+            while not connections or not broadcaster._subscribers:
+                await asyncio.sleep(0)
+            for event in [
+                {"task_id": "task_1", "state": "transcribing", "progress": 40.0, "updated_at": "t1"},
+                {"task_id": "task_1", "state": "transcribing", "progress": 40.0, "updated_at": "t1"},
+                {"task_id": "task_2", "state": "failed", "progress": 0.0, "updated_at": "t1"},
+                {"task_id": "task_1", "state": "success", "progress": 100.0, "updated_at": "t2"},
+            ]:
+                connections[0].messages.put_nowait(event)
+            events = parse_sse(await asyncio.wait_for(consumer, 2))
+
+        assert [(e, d.get("state"), d.get("progress")) for e, d in events] == [
+            ("progress", "transcribing", 10.0),
+            ("progress", "transcribing", 40.0),
+            ("progress", "success", 100.0),
+            ("complete", "success", None),
+        ]
+        assert repo.get_by_id.call_count == 1
+        db.close.assert_called_once()
+        await broadcaster.aclose()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_polling_when_redis_is_down(self):
+        broadcaster = TaskEventBroadcaster()
+
+        async def refuse():
+            raise RedisConnectionError("connection refused")
+
+        broadcaster._connect = refuse
+        repo = MagicMock()
+        repo.get_by_id.return_value = self.make_task(state="success", progress=100.0)
+
+        with patch("src.api.routes.sse.get_task_event_broadcaster", return_value=broadcaster), \
+                patch("src.api.routes.sse.TaskRepository", return_value=repo), \
+                patch("src.api.routes.sse.asyncio.sleep") as sleep:
+            sleep.return_value = None
+            events = parse_sse([m async for m in task_progress_stream("task_1", "user_1", MagicMock())])
+
+        assert events[0] == ("progress", {
+            "task_id": "task_1", "state": "success", "progress": 100.0,
+            "estimated_time": 60, "updated_at": None,
+        })
+        assert events[-1] == ("complete", {"state": "success"})
@@ -0,0 +1,139 @@
+"""Tests for the write-through task status cache."""
+
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.api.routes.tasks import get_task_status
+from src.database.repositories import TaskRepository
+from src.utils.task_status_cache import (
+    ACTIVE_TTL_SECONDS,
+    TERMINAL_TTL_SECONDS,
+    TaskStatusCache,
+    status_version,
+)
+
+
+def make_cache(script_result=1):
+    cache = TaskStatusCache(redis_url="redis://unused")
+    cache._client = MagicMock()
+    cache._write_script = MagicMock(return_value=script_result)
+    return cache
+
+
+def make_task(state="transcribing", progress=40.0, updated_at=datetime(2026, 1, 1, 10, 0, 0)):
+    return SimpleNamespace(
+        task_id="task_1",
+        user_id="user_1",
+        state=state,
+        progress=progress,
+        estimated_time=30,
+        audio_duration=120.0,
+        asr_language="zh-CN+en-US",
+        error_code=None,
+        error_message=None,
+        error_details=None,
+        retryable=None,
+        updated_at=updated_at,
+        completed_at=None,
+    )
+
+
+class TestTaskStatusCache:
+    """版本化写入"""
+
+    def test_write_passes_version_and_ttl_by_state(self):
+        cache = make_cache()
+
+        assert cache.write("task_1", {"state": "transcribing", "version": 5})
+        cache.write("task_1", {"state": "success", "version": 6})
+
+        (first, second) = cache._write_script.call_args_list
+        assert first.kwargs["keys"] == ["task_status:task_1"]
+        assert first.kwargs["args"][1:] == [5, ACTIVE_TTL_SECONDS]
+        assert second.kwargs["args"][1:] == [6, TERMINAL_TTL_SECONDS]
+        assert json.loads(first.kwargs["args"][0]) == {"state": "transcribing", "version": 5}
+
+    def test_stale_write_is_reported(self):
+        cache = make_cache(script_result=0)
+
+        assert cache.write("task_1", {"state": "queued", "version": 1}) is False
+        cache._client.delete.assert_not_called()
+
+    def test_failed_write_clears_key(self):
+        cache = make_cache()
+        cache._write_script.side_effect = RedisConnectionError("connection reset")
+
+        assert cache.write("task_1", {"state": "running", "version": 1}) is False
+        cache._client.delete.assert_called_once_with("task_status:task_1")
+
+    def test_version_follows_updated_at(self):
+        earlier = datetime(2026, 1, 1, 10, 0, 0)
+        later = datetime(2026, 1, 1, 10, 0, 0, 1)
+
+        assert status_version(later) > status_version(earlier)
+        assert status_version(None) == 0
+
+
+class TestWriteThrough:
+    """worker 状态更新写入缓存"""
+
+    def test_update_state_writes_fresh_status(self):
+        task = make_task()
+        session = MagicMock()
+        session.query.return_value.filter.return_value.all.return_value = [task]
+
+        @contextmanager
+        def fake_scope():
+            yield session
+
+        cache = make_cache()
+        with patch("src.database.session.session_scope", fake_scope), \
+                patch("src.database.repositories.get_task_status_cache", return_value=cache), \
+                patch("src.database.repositories.publish_task_event"):
+            TaskRepository(MagicMock()).update_state("task_1", "summarizing", progress=80.0)
+
+        status = json.loads(cache._write_script.call_args.kwargs["args"][0])
+        assert status["state"] == "summarizing"
+        assert status["progress"] == 80.0
+        assert status["user_id"] == "user_1"
+        assert status["version"] == status_version(task.updated_at)
+        cache._client.delete.assert_not_called()
+
+
+class TestGetTaskStatus:
+    """状态查询接口"""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_database(self):
+        repo = TaskRepository(MagicMock())
+        cache = make_cache()
+        cache._client.get.return_value = json.dumps(
+            repo.get_status_payload(make_task())
+        )
+        db = MagicMock()
+
+        response = await get_task_status("task_1", user_id="user_1", db=db, status_cache=cache)
+
+        assert response.state.value == "transcribing"
+        assert response.audio_duration == 120.0
+        db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_backfills_with_version(self):
+        task = make_task(state="success", progress=100.0)
+        cache = make_cache()
+        cache._client.get.return_value = None
+        db = MagicMock()
+
+        with patch.object(TaskRepository, "get_by_id", return_value=task):
+            response = await get_task_status("task_1", user_id="user_1", db=db, status_cache=cache)
+
+        assert response.progress == 100.0
+        args = cache._write_script.call_args.kwargs["args"]
+        assert args[1:] == [status_version(task.updated_at), TERMINAL_TTL_SECONDS]
@@ -15,16 +15,22 @@ from src.config.loader import get_config
 from src.queue.manager import QueueManager, QueueBackend
 from src.queue.worker import TaskWorker
 from src.services.pipeline import PipelineService
+from src.services.status_writer import TaskStatusWriter
+from src.services.asr_cache import ASRResultCache
+from src.services.asr_hedging import ASRHedgingPolicy
+from src.services.llm_cache import get_llm_artifact_cache
 from src.services.transcription import TranscriptionService
 from src.services.speaker_recognition import SpeakerRecognitionService
 from src.services.correction import CorrectionService
 from src.services.artifact_generation import ArtifactGenerationService
+from src.services.stage_scheduler import PipelineStage, StageScheduler
 from src.providers.volcano_asr import VolcanoASR
 from src.providers.azure_asr import AzureASR
 from src.providers.iflytek_voiceprint import IFlyTekVoiceprint
-from src.providers.gemini_llm import GeminiLLM
+from src.providers.gemini_llm import get_gemini_llm
 from src.utils.storage import StorageClient
 from src.utils.audio import AudioProcessor
+from src.utils.cost import CostTracker
 from src.database.session import init_db
 from src.utils.logger import setup_logger
 
@@ -60,7 +66,7 @@ def create_worker() -> TaskWorker:
     volcano_asr = VolcanoASR(config.volcano)
     azure_asr = AzureASR(config.azure)
     iflytek_voiceprint = IFlyTekVoiceprint(config.iflytek)
-    gemini_llm = GeminiLLM(config.gemini)
+    gemini_llm = get_gemini_llm(config.gemini)
     
     # 创建工具
     storage_client = StorageClient(
@@ -68,21 +74,54 @@ def create_worker() -> TaskWorker:
         region=config.storage.region,
         access_key=config.storage.access_key,
         secret_key=config.storage.secret_key,
+        multipart_threshold=config.storage.multipart_threshold,
+        multipart_part_size=config.storage.multipart_part_size,
+        multipart_concurrency=config.storage.multipart_concurrency,
+        part_max_retries=config.storage.part_max_retries,
     )
     audio_processor = AudioProcessor()
     
+    asr_cache = None
+    if config.asr_cache.enabled:
+        asr_cache = ASRResultCache(
+            cache_dir=config.asr_cache.directory,
+            ttl_seconds=config.asr_cache.ttl_hours * 3600,
+            max_size_bytes=config.asr_cache.max_size_mb * 1024 * 1024,
+        )
+    
+    hedging_policy = None
+    if config.asr_hedging.enabled:
+        hedging_policy = ASRHedgingPolicy(
+            percentile=config.asr_hedging.percentile,
+            initial_delay=config.asr_hedging.initial_delay_seconds,
+            min_delay=config.asr_hedging.min_delay_seconds,
+            max_delay=config.asr_hedging.max_delay_seconds,
+            min_samples=config.asr_hedging.min_samples,
+            window_size=config.asr_hedging.window_size,
+        )
+    
     # 创建服务
     transcription_service = TranscriptionService(
         primary_asr=volcano_asr,
         fallback_asr=azure_asr,
         storage_client=storage_client,
         audio_processor=audio_processor,
+        asr_cache=asr_cache,
+        parallel_multi_file=config.parallel_multi_file_asr,
+        long_audio_chunk_seconds=(
+            config.long_audio.chunk_seconds if config.long_audio.enabled else None
+        ),
+        chunk_overlap_seconds=config.long_audio.overlap_seconds,
+        chunk_search_seconds=config.long_audio.silence_search_seconds,
+        max_chunk_concurrency=config.long_audio.max_concurrency,
+        hedging_policy=hedging_policy,
     )
     
     speaker_recognition_service = SpeakerRecognitionService(
         voiceprint_provider=iflytek_voiceprint,
         audio_processor=audio_processor,
         storage_client=storage_client,
+        max_concurrency=config.iflytek.max_concurrency,
     )
     
     correction_service = CorrectionService()
@@ -91,24 +130,54 @@ def create_worker() -> TaskWorker:
     from src.database.session import session_scope
     from src.database.repositories import PromptTemplateRepository, TranscriptRepository, ArtifactRepository
     
+    # 阶段调度器: 各阶段独立限流,避免慢速 LLM 调用占用 ASR 槽位
+    worker_config = config.worker
+    stage_limits = {
+        PipelineStage.ASR: worker_config.asr_concurrency,
+        PipelineStage.VOICEPRINT: worker_config.voiceprint_concurrency,
+        PipelineStage.LLM: worker_config.llm_concurrency,
+    }
+    stage_scheduler = StageScheduler(
+        limits={stage: limit for stage, limit in stage_limits.items() if limit},
+        llm_requests_per_minute=worker_config.llm_requests_per_minute,
+    )
+    
     # 注意：这里我们需要为每次使用创建新的 session
     # 但为了简化，我们先传 None，让 artifact_generation_service 在需要时创建
     artifact_generation_service = ArtifactGenerationService(
         llm_provider=gemini_llm,
         template_repo=None,  # 将在 pipeline 中通过 session 传递
         artifact_repo=None,  # 将在 TaskWorker 中通过 session 传递
+        map_reduce_threshold_tokens=(
+            config.map_reduce.threshold_tokens if config.map_reduce.enabled else None
+        ),
+        map_chunk_tokens=config.map_reduce.chunk_tokens,
+        max_map_concurrency=config.map_reduce.max_concurrency,
+        artifact_cache=get_llm_artifact_cache(config.llm_cache),
+        compaction_config=config.transcript_compaction,
+        cost_tracker=CostTracker(config.pricing),
+        llm_rate_limiter=stage_scheduler.llm_rate_limiter,
     )
     
     # 创建 transcript repository (使用 session_scope)
     # 注意：这里我们传递 None，在 pipeline 中使用 session_scope 创建
     transcript_repo = None  # 将在 TaskWorker 中通过 session 传递
     
+    # 进度更新合并写库,减少 tasks 表写放大
+    status_writer = None
+    if worker_config.status_flush_interval_ms > 0:
+        status_writer = TaskStatusWriter(
+            flush_interval=worker_config.status_flush_interval_ms / 1000,
+        )
+    
     pipeline_service = PipelineService(
         transcription_service=transcription_service,
         speaker_recognition_service=speaker_recognition_service,
         correction_service=correction_service,
         artifact_generation_service=artifact_generation_service,
         transcript_repo=transcript_repo,
+        stage_scheduler=stage_scheduler,
+        status_writer=status_writer,
     )
     
     # 创建队列管理器
@@ -130,6 +199,10 @@ def create_worker() -> TaskWorker:
     worker = TaskWorker(
         queue_manager=queue_manager,
         pipeline_service=pipeline_service,
+        max_shutdown_wait=config.worker.max_shutdown_wait,
+        max_concurrent_tasks=config.worker.max_concurrent_tasks,
+        status_writer=status_writer,
+        providers=[volcano_asr, iflytek_voiceprint, gemini_llm],
     )
     
     return worker